@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Benchmark the lightweight scraping browser profile against a full page load.
+
+Each page is loaded twice in a fresh context: once as before (1920x1080, no
+request blocking) and once with the vendor's ScrapeProfile (small viewport,
+images/media/fonts/trackers blocked). Reports requests, blocked requests,
+bytes transferred and time to a ready page for both.
+
+Pages are URLs, or a directory of saved pages (recorded fixtures) that is
+served locally:
+
+    python benchmarks/browser_profile.py --url https://lumencor.com/products/celesta-light-engine
+    python benchmarks/browser_profile.py --fixtures path/to/saved_pages --vendor Lumencor
+"""
+
+import sys
+import time
+import argparse
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.laser_ci_lg.browser import ScrapeProfile, browser_page, scrape_profile_for
+from src.laser_ci_lg.readiness import wait_until_ready
+
+
+def full_profile() -> ScrapeProfile:
+    """The previous behaviour: nothing blocked, desktop viewport (still counts bytes)."""
+    return ScrapeProfile(block_resources=(), block_domains=(),
+                         viewport={"width": 1920, "height": 1080})
+
+
+def load(url: str, profile: ScrapeProfile) -> Dict:
+    """Load one page with profile and return its request/byte counts and time to ready."""
+    profile.stats.update(requests=0, blocked=0, bytes=0)
+    with browser_page(profile=profile) as page:
+        start = time.perf_counter()
+        page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        wait_until_ready(page, url, learn=False)
+        seconds = time.perf_counter() - start
+        html_chars = len(page.content())
+    return dict(profile.stats, seconds=seconds, html_chars=html_chars)
+
+
+def serve_fixtures(directory: Path) -> List[str]:
+    """Serve saved pages on localhost and return their URLs."""
+    handler = partial(SimpleHTTPRequestHandler, directory=str(directory))
+    handler.log_message = lambda *args: None
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    return [f"http://127.0.0.1:{port}/{p.relative_to(directory).as_posix()}"
+            for p in sorted(directory.rglob("*.htm*"))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", action="append", default=[], help="Page to load (repeatable)")
+    parser.add_argument("--fixtures", help="Directory of saved .html pages to serve locally")
+    parser.add_argument("--vendor", help="Use this vendor's `browser:` config from target_products.yml")
+    args = parser.parse_args()
+
+    urls = list(args.url)
+    if args.fixtures:
+        urls += serve_fixtures(Path(args.fixtures))
+    if not urls:
+        parser.error("give --url and/or --fixtures")
+
+    light = scrape_profile_for(args.vendor) if args.vendor else ScrapeProfile()
+    totals = {"full": {"bytes": 0, "seconds": 0.0}, "light": {"bytes": 0, "seconds": 0.0}}
+    print(f"{'page':50} {'profile':>7} {'reqs':>5} {'blocked':>7} {'KB':>8} {'ready s':>8} {'html':>8}")
+    for url in urls:
+        for name, profile in (("full", full_profile()), ("light", light)):
+            r = load(url, profile)
+            totals[name]["bytes"] += r["bytes"]
+            totals[name]["seconds"] += r["seconds"]
+            print(f"{url[-50:]:50} {name:>7} {r['requests']:>5} {r['blocked']:>7} "
+                  f"{r['bytes'] / 1024:>8.0f} {r['seconds']:>8.2f} {r['html_chars']:>8}")
+
+    full, lite = totals["full"], totals["light"]
+    if full["bytes"] and full["seconds"]:
+        print(f"\nBytes: {full['bytes'] / 1024:.0f} KB -> {lite['bytes'] / 1024:.0f} KB "
+              f"({1 - lite['bytes'] / full['bytes']:.0%} less)")
+        print(f"Time:  {full['seconds']:.2f}s -> {lite['seconds']:.2f}s "
+              f"({1 - lite['seconds'] / full['seconds']:.0%} less)")
+
+
+if __name__ == "__main__":
+    main()
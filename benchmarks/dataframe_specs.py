@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+"""
+Benchmark vectorized DataFrame-to-spec conversion against the previous row loops.
+
+Builds wide multi-model datasheet tables (OBIS/LuxX/LBX-style comparison
+tables and two-level-header spec tables), checks both implementations return
+identical specs and reports CPU time.
+
+    python benchmarks/dataframe_specs.py [--tables 50] [--models 40] [--repeat 3]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, Any, List
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+from src.laser_ci_lg.extraction import AdvancedHTMLExtractor, AdvancedPDFExtractor
+
+
+class LegacyHTMLExtractor(AdvancedHTMLExtractor):
+    """Previous implementation: iterrows() over every cell."""
+
+    def _dataframe_to_specs(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Convert a pandas DataFrame to a specs dictionary with clean keys."""
+        specs = {}
+        
+        # Check if this is a product comparison table (multiple products as columns)
+        # vs a single product spec table (spec names in first column)
+        first_col_values = df.iloc[:, 0] if len(df.columns) > 0 else []
+        
+        # If columns look like product names, treat as comparison table
+        if len(df.columns) > 1 and all(isinstance(col, str) for col in df.columns):
+            # Each column is a product, rows are specs
+            for col in df.columns:
+                if col and not col.startswith('Unnamed'):
+                    product_key = str(col).strip()
+                    for index, row in df.iterrows():
+                        spec_name = str(index).strip()
+                        value = row[col]
+                        if pd.notna(value):
+                            # Clean the spec name
+                            clean_spec = self._clean_spec_name(spec_name)
+                            # Create key with product suffix
+                            key = f"{clean_spec}_{product_key}"
+                            specs[key] = str(value)
+        else:
+            # Standard extraction - append column to row
+            for index, row in df.iterrows():
+                spec_name = str(index)
+                for col in df.columns:
+                    value = row[col]
+                    if pd.notna(value):
+                        # Clean the spec name
+                        clean_spec = self._clean_spec_name(spec_name)
+                        # Only append column if it's meaningful
+                        if col and not str(col).startswith('Unnamed'):
+                            key = f"{clean_spec}_{col}"
+                        else:
+                            key = clean_spec
+                        specs[key] = str(value)
+        
+        return specs
+
+    def _clean_spec_name(self, spec_name: str) -> str:
+        """Clean a spec name to make it more normalizable."""
+        import re
+        
+        # Remove footnote numbers anywhere in the string
+        # "Wavelength 1 2" -> "Wavelength"
+        cleaned = re.sub(r'\s+\d+\s*', ' ', spec_name)
+        
+        # Remove units in parentheses
+        # "Output Power (mW)" -> "Output Power"
+        cleaned = re.sub(r'\s*\([^)]+\)', '', cleaned)
+        
+        # Remove extra whitespace
+        cleaned = ' '.join(cleaned.split())
+        
+        return cleaned
+
+
+class LegacyPDFExtractor(AdvancedPDFExtractor):
+    """Previous implementation: iterrows() over every cell."""
+
+    def _dataframe_to_specs(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Convert DataFrame to specs dictionary with clean keys."""
+        specs = {}
+        
+        # Check if this is a product comparison table
+        if len(df.columns) > 1 and all(isinstance(col, str) for col in df.columns):
+            # Each column is a product, rows are specs
+            for col in df.columns:
+                if col and not col.startswith('Unnamed'):
+                    product_key = str(col).strip()
+                    for index, row in df.iterrows():
+                        spec_name = str(index).strip()
+                        value = row[col]
+                        if pd.notna(value):
+                            # Clean the spec name
+                            clean_spec = self._clean_spec_name(spec_name)
+                            # Create key with product suffix
+                            key = f"{clean_spec}_{product_key}"
+                            specs[key] = self._parse_technical_value(str(value))
+        else:
+            # Standard extraction
+            for index, row in df.iterrows():
+                spec_name = str(index)
+                for col in df.columns:
+                    value = row[col]
+                    if pd.notna(value):
+                        # Clean the spec name
+                        clean_spec = self._clean_spec_name(spec_name)
+                        # Only append column if it's meaningful
+                        if col and not str(col).startswith('Unnamed'):
+                            key = f"{clean_spec}_{col}"
+                        else:
+                            key = clean_spec
+                        specs[key] = self._parse_technical_value(str(value))
+        
+        return specs
+
+    def _clean_spec_name(self, spec_name: str) -> str:
+        """Clean a spec name to make it more normalizable."""
+        import re
+        
+        # Remove footnote numbers anywhere in the string
+        # "Wavelength 1 2" -> "Wavelength"
+        cleaned = re.sub(r'\s+\d+\s*', ' ', spec_name)
+        
+        # Remove units in parentheses
+        # "Output Power (mW)" -> "Output Power"
+        cleaned = re.sub(r'\s*\([^)]+\)', '', cleaned)
+        
+        # Remove extra whitespace
+        cleaned = ' '.join(cleaned.split())
+        
+        return cleaned
+
+
+SPEC_ROWS = [
+    "Wavelength 1 (nm)", "Output Power (mW)", "Power Stability 2", "RMS Noise (20 Hz - 20 MHz)",
+    "Beam Diameter (mm)", "Beam Divergence (mrad)", "M²", "Polarization Ratio",
+    "Warm-up Time (min)", "Analog Modulation", "Digital Modulation", "Operating Temperature",
+]
+
+VALUES = ["405 ± 5", "100", "<0.5%", "<0.2 %", "0.7\u00a0 mm", "1.2", "<1.1", ">100:1",
+          "<5", "500 kHz", "150  MHz", "10 to 40 °C", np.nan, 1.5, 20]
+
+
+def comparison_table(seed: int, models: int) -> pd.DataFrame:
+    """Spec rows by model columns, like an OBIS/LuxX family table."""
+    rng = np.random.default_rng(seed)
+    columns = [f"LBX-{375 + 10 * i}-{seed}" for i in range(models)] + ["Unnamed: 99"]
+    cells = rng.choice(np.array(VALUES, dtype=object), size=(len(SPEC_ROWS), len(columns)))
+    return pd.DataFrame(cells, index=SPEC_ROWS, columns=columns)
+
+
+def two_level_table(seed: int, models: int) -> pd.DataFrame:
+    """Spec table with two-level headers, as read_html(header=[0, 1]) returns."""
+    rng = np.random.default_rng(seed)
+    columns = pd.MultiIndex.from_tuples(
+        [("Model", f"LuxX {375 + 10 * i}") for i in range(models)] + [("Unnamed: 0_level_0", "Notes")]
+    )
+    cells = rng.choice(np.array(VALUES, dtype=object), size=(len(SPEC_ROWS), len(columns)))
+    return pd.DataFrame(cells, index=SPEC_ROWS, columns=columns)
+
+
+def build_tables(tables: int, models: int) -> List[pd.DataFrame]:
+    return [
+        comparison_table(i, models) if i % 2 == 0 else two_level_table(i, models)
+        for i in range(tables)
+    ]
+
+
+def run(extractor, frames: List[pd.DataFrame], repeat: int):
+    best, results = None, None
+    for _ in range(repeat):
+        start = time.process_time()
+        results = [extractor._dataframe_to_specs(df) for df in frames]
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+
+def compare(frames: List[pd.DataFrame], repeat: int = 1) -> Dict[str, Any]:
+    """Run old and new converters; raises AssertionError if any output differs."""
+    timings = {}
+    pairs = {
+        "html": (LegacyHTMLExtractor(), AdvancedHTMLExtractor()),
+        "pdf": (LegacyPDFExtractor(), AdvancedPDFExtractor()),
+    }
+    for name, (legacy, vectorized) in pairs.items():
+        legacy_time, old = run(legacy, frames, repeat)
+        new_time, new = run(vectorized, frames, repeat)
+        for i, (a, b) in enumerate(zip(old, new)):
+            assert list(a.items()) == list(b.items()), f"{name} output differs for table {i}"
+        timings[name] = (legacy_time, new_time)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tables", type=int, default=50)
+    parser.add_argument("--models", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frames = build_tables(args.tables, args.models)
+    cells = sum(df.size for df in frames)
+    print(f"Tables: {len(frames)} ({cells} cells, {args.models} models each)")
+
+    timings = compare(frames, args.repeat)
+    print("Outputs identical: yes")
+    for name, (legacy_time, new_time) in timings.items():
+        print(f"  {name}: row loops {legacy_time:.3f}s CPU, vectorized {new_time:.3f}s CPU "
+              f"({legacy_time / new_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
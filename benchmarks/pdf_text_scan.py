@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+"""
+Benchmark the single-scan PDF text extractor against the previous multi-pass one.
+
+Runs both implementations over a corpus of Docling-style markdown exports,
+checks they return identical specs and reports CPU time. The corpus is the
+stored PDF text in data/laser-ci.sqlite (if present) plus synthetic datasheets.
+
+    python benchmarks/pdf_text_scan.py [--docs 200] [--repeat 3]
+"""
+
+import re
+import sqlite3
+import sys
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, Any, List
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.laser_ci_lg.extraction import AdvancedPDFExtractor
+
+
+class LegacyPDFTextExtractor(AdvancedPDFExtractor):
+    """Previous implementation: two line passes plus one findall per pattern."""
+
+    def _extract_from_pdf_text(self, text: str) -> Dict[str, Any]:
+        """Extract specs from PDF text using advanced patterns."""
+        specs = {}
+        
+        # First try to extract markdown tables
+        if '|' in text and '---|' in text:
+            # Find all markdown tables
+            lines = text.split('\n')
+            table_start = None
+            for i, line in enumerate(lines):
+                if '|' in line:
+                    if table_start is None:
+                        table_start = i
+                elif table_start is not None:
+                    # End of table, process it
+                    table_text = '\n'.join(lines[table_start:i])
+                    if '---|' in table_text:  # Valid markdown table
+                        table_specs = self._parse_markdown_table(table_text)
+                        specs.update(table_specs)
+                    table_start = None
+            
+            # Process last table if exists
+            if table_start is not None:
+                table_text = '\n'.join(lines[table_start:])
+                if '---|' in table_text:
+                    table_specs = self._parse_markdown_table(table_text)
+                    specs.update(table_specs)
+        
+        lines = text.split('\n')
+        
+        # Parse markdown tables
+        in_table = False
+        table_headers = []
+        
+        for i, line in enumerate(lines):
+            # Skip empty lines
+            if not line.strip():
+                in_table = False
+                table_headers = []
+                continue
+            
+            # Detect markdown table
+            if '|' in line:
+                cells = [cell.strip() for cell in line.split('|')]
+                cells = [c for c in cells if c]  # Remove empty cells
+                
+                # Check if this is a separator line
+                if any('---' in cell for cell in cells):
+                    in_table = True
+                    # Previous line should be headers
+                    if i > 0 and '|' in lines[i-1]:
+                        header_cells = [h.strip() for h in lines[i-1].split('|')]
+                        table_headers = [h for h in header_cells if h]
+                    continue
+                
+                # Process table row
+                if in_table and len(cells) >= 2:
+                    spec_name = cells[0]
+                    if spec_name and not spec_name.lower() in ['specifications', 'parameter', '']:
+                        # Clean the spec name
+                        clean_spec = self._clean_spec_name(spec_name)
+                        if len(table_headers) > 1 and len(cells) == len(table_headers):
+                            # Map to headers
+                            for j in range(1, len(cells)):
+                                if j < len(table_headers):
+                                    key = f"{clean_spec}_{table_headers[j]}"
+                                    value = cells[j]
+                                    if value and value not in ['-', 'N/A', '']:
+                                        specs[key] = self._parse_technical_value(value)
+                        else:
+                            # No headers or mismatch, just extract values
+                            values = cells[1:]
+                            values = [v for v in values if v and v not in ['-', 'N/A', '']]
+                            if values:
+                                if len(values) == 1:
+                                    specs[clean_spec] = self._parse_technical_value(values[0])
+                                else:
+                                    specs[clean_spec] = [self._parse_technical_value(v) for v in values]
+            
+            # Look for spec patterns with colons (but don't split ratios)
+            elif ':' in line:
+                # Check if it's a ratio (e.g., "50:1")
+                if re.search(r'\d+\s*:\s*\d+', line):
+                    # It's a ratio, try to extract the spec name and value
+                    # Pattern: "Polarization Ratio: >50:1"
+                    match = re.match(r'^([^:]+?):\s*([<>≤≥]?\s*\d+\s*:\s*\d+.*)$', line)
+                    if match:
+                        key = match.group(1).strip().replace('*', '').replace('#', '')
+                        value = match.group(2).strip()
+                        if key and value and len(key) < 100:
+                            specs[key] = value
+                else:
+                    # Regular key:value pattern
+                    parts = line.split(':', 1)
+                    if len(parts) == 2:
+                        key = parts[0].strip().replace('*', '').replace('#', '')
+                        value = parts[1].strip()
+                        if key and value and len(key) < 100:  # Reasonable key length
+                            specs[key] = self._parse_technical_value(value)
+        
+        # Extract using regex patterns on full text
+        pattern_specs = self._extract_pattern_specs(text)
+        specs.update(pattern_specs)
+        
+        return specs
+    
+    def _extract_pattern_specs(self, text: str) -> Dict[str, Any]:
+        """Extract specs using regex patterns."""
+        specs = {}
+        
+        # M² (beam quality)
+        m2_matches = re.findall(r'M[²2]\s*(?:\(.*?\))?\s*([<>≤≥]?\s*\d+(?:\.\d+)?)', text)
+        if m2_matches:
+            specs['beam_quality_m2'] = m2_matches[0] if len(m2_matches) == 1 else m2_matches
+        
+        # Wavelength with context
+        wavelength_matches = re.findall(
+            r'(?:Wavelength|λ).*?(\d+(?:\.\d+)?)\s*(?:±\s*\d+(?:\.\d+)?)?\s*(nm|μm)',
+            text, re.IGNORECASE
+        )
+        if wavelength_matches:
+            specs['wavelengths'] = [f"{v}{u}" for v, u in wavelength_matches]
+        
+        # Power specifications
+        power_matches = re.findall(
+            r'(?:Output Power|Power).*?(\d+(?:\.\d+)?)\s*(?:-\s*\d+(?:\.\d+)?)?\s*(mW|W)',
+            text, re.IGNORECASE
+        )
+        if power_matches:
+            specs['power_specs'] = [f"{v}{u}" for v, u in power_matches]
+        
+        # Noise specifications
+        noise_matches = re.findall(
+            r'(?:RMS Noise|Noise).*?([<>≤≥]?\s*\d+(?:\.\d+)?)\s*%',
+            text, re.IGNORECASE
+        )
+        if noise_matches:
+            specs['noise_specs'] = noise_matches
+        
+        # Temperature range
+        temp_matches = re.findall(
+            r'(?:Operating Temperature|Temperature).*?(-?\d+)\s*(?:to|–)\s*\+?(-?\d+)\s*°?C',
+            text, re.IGNORECASE
+        )
+        if temp_matches:
+            specs['temperature_range'] = [f"{t1} to {t2}°C" for t1, t2 in temp_matches]
+        
+        return specs
+
+
+LBX_TABLE = """| | Emission wavelength (nm) | Output power (mW) | Power stability | Beam diameter (mm) | M² |
+|---|---|---|---|---|---|
+| LBX-405-{p} | 405 ± 5 | {p} | <0.5% | 0.{d} | <1.2 |
+| LBX-488-{p} | 488 ± 2 | {p} | <0.5% | 0.{d} | <1.1 |
+| LCX-532-{p} | 532 | {p} | <1% | 0.{d} | <1.1 |
+"""
+
+SPEC_TABLE = """| Specifications | Value |
+|---|---|
+| Wavelength 1 (nm) | {w} ± 1 |
+| Output Power (mW) | {p} |
+| RMS Noise (20 Hz - 20 MHz) | <0.{n}% |
+| Polarization Ratio | >100:1 |
+| Operating Temperature | 10 to 40 °C |
+"""
+
+PROSE = """## Overview
+
+The {name} delivers {p} mW of Output Power at a Wavelength of {w} nm with
+RMS Noise below 0.{n}% and a beam quality M2 < 1.{n} (TEM00). Power stability
+over 8 hours is <2 %, warm-up time: <5 minutes.
+Polarization: >100:1, vertical
+**Beam Diameter**: 0.{d} mm
+Temperature range -20 to +60°C (storage), λ = {w} nm
+Noise is specified as
+0.{n} %, and M² (typ.)
+1.1 measured at full power; power consumption 30 W.
+"""
+
+
+def synthetic_document(seed: int) -> str:
+    """A Docling-style markdown export for one product family."""
+    parts = []
+    for section in range(8):
+        values = {
+            "name": f"Model {seed}-{section}",
+            "w": 375 + (seed * 7 + section * 13) % 400,
+            "p": 10 + (seed * 11 + section) % 490,
+            "n": 1 + (seed + section) % 9,
+            "d": 5 + (seed + section) % 4,
+        }
+        parts.append(PROSE.format(**values))
+        parts.append(SPEC_TABLE.format(**values))
+        if section % 2 == 0:
+            parts.append(LBX_TABLE.format(**values))
+        parts.append("Notes\n\n" + "Read the safety manual before operation. " * 20 + "\n")
+    return "\n".join(parts)
+
+
+def load_corpus(docs: int) -> List[str]:
+    corpus = []
+    db_path = Path("data/laser-ci.sqlite")
+    if db_path.exists():
+        conn = sqlite3.connect(db_path)
+        try:
+            rows = conn.execute(
+                "SELECT text FROM raw_documents WHERE content_type = 'pdf_text' AND text IS NOT NULL"
+            ).fetchall()
+            corpus.extend(row[0] for row in rows)
+        except sqlite3.Error:
+            pass
+        finally:
+            conn.close()
+    corpus.extend(synthetic_document(i) for i in range(max(docs - len(corpus), 0)))
+    return corpus
+
+
+def run(extractor: AdvancedPDFExtractor, corpus: List[str], repeat: int):
+    best, results = None, None
+    for _ in range(repeat):
+        start = time.process_time()
+        results = [extractor._extract_from_pdf_text(text) for text in corpus]
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+
+def compare(corpus: List[str], repeat: int = 1) -> Dict[str, Any]:
+    """Run both implementations; raises AssertionError if any output differs."""
+    legacy_time, legacy = run(LegacyPDFTextExtractor(), corpus, repeat)
+    scan_time, scanned = run(AdvancedPDFExtractor(), corpus, repeat)
+
+    for i, (old, new) in enumerate(zip(legacy, scanned)):
+        assert list(old.items()) == list(new.items()), f"Output differs for document {i}"
+
+    return {"legacy": legacy_time, "single_scan": scan_time}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.docs)
+    size_mb = sum(len(text) for text in corpus) / 1e6
+    print(f"Corpus: {len(corpus)} documents, {size_mb:.1f} MB of text")
+
+    timings = compare(corpus, args.repeat)
+    print("Outputs identical: yes")
+    print(f"  legacy (multi-pass):  {timings['legacy']:.3f}s CPU")
+    print(f"  single scan:          {timings['single_scan']:.3f}s CPU")
+    print(f"  speedup:              {timings['legacy'] / timings['single_scan']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Benchmark CLI cold-start time and find the imports that dominate it.
+
+Runs each entry module in a fresh interpreter under `python -X importtime`,
+reports the wall time, the slowest imports by cumulative time, and which
+heavy dependencies (Docling, torch, pandas, Playwright, OpenAI, LangGraph)
+were loaded. Lightweight commands should load none of them.
+
+    python benchmarks/startup.py [--module src.laser_ci_lg.cli] [--repeat 5] [--top 15]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).parent.parent
+
+# Top-level packages that must only load on first use
+HEAVY_MODULES = ("docling", "torch", "transformers", "pandas", "playwright", "openai", "langgraph")
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def cold_start(module: str) -> Tuple[float, List[str]]:
+    """Wall time to import module in a fresh interpreter, and the heavy packages it loaded."""
+    code = (
+        "import sys, time, json\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"heavy = sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)\n"
+        "print(json.dumps([elapsed, heavy]))\n"
+    )
+    env = dict(os.environ, PYTHONWARNINGS="ignore")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    elapsed, heavy = json.loads(out.strip().splitlines()[-1])
+    return elapsed, heavy
+
+
+def import_profile(module: str) -> List[Dict]:
+    """Parsed `-X importtime` rows: module, depth, self and cumulative microseconds."""
+    env = dict(os.environ, PYTHONWARNINGS="ignore")
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         cwd=ROOT, env=env, capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in err.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append({"module": name, "depth": len(indent) // 2,
+                         "self_us": int(self_us), "cumulative_us": int(cumulative_us)})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", action="append",
+                        help="Module to import (repeatable; default: the CLI and the package)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for module in args.module or ["src.laser_ci_lg.cli", "src.laser_ci_lg"]:
+        timings, heavy = [], []
+        for _ in range(args.repeat):
+            elapsed, heavy = cold_start(module)
+            timings.append(elapsed)
+        timings.sort()
+        print(f"{module}")
+        print(f"  cold import:    {timings[len(timings) // 2] * 1000:.0f} ms median, "
+              f"{timings[0] * 1000:.0f} ms best of {args.repeat}")
+        print(f"  heavy modules:  {', '.join(heavy) or 'none'}")
+
+        rows = import_profile(module)
+        print(f"  slowest imports (cumulative):")
+        for row in sorted(rows, key=lambda r: r["cumulative_us"], reverse=True)[:args.top]:
+            print(f"    {row['cumulative_us'] / 1000:8.1f} ms  {'  ' * row['depth']}{row['module']}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+"""
+Benchmark batch unit parsing (parse_values_to_unit) against the previous
+one-value-at-a-time if-chain.
+
+Builds a column of raw values per canonical key, checks the batch API agrees
+with the old parser and reports CPU time.
+
+    python benchmarks/unit_parsing.py [--skus 5000] [--repeat 3]
+"""
+
+import re
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.laser_ci_lg.specs import parse_values_to_unit
+
+
+def legacy_parse_value_to_unit(key: str, value: str) -> Any:
+    """Previous scalar if-chain, kept as the reference implementation."""
+    v = value.strip()
+
+    def to_float(x: str):
+        try:
+            # Handle comparison operators
+            x = re.sub(r'^[<>≤≥]\s*', '', x)
+            # Remove commas from numbers
+            x = x.replace(',', '')
+            return float(x)
+        except:
+            return None
+
+    if key == "wavelength_nm":
+        m = re.search(r"([\d\.]+)\s*nm", v, re.I)
+        return to_float(m.group(1)) if m else to_float(v)
+
+    if key in {"output_power_mw_nominal", "output_power_mw_min"}:
+        m = re.search(r"([\d\.]+)\s*(mW|W)", v, re.I)
+        if not m:
+            return to_float(v)
+        num, unit = float(m.group(1)), m.group(2).lower()
+        return num * 1000.0 if unit == "w" else num
+
+    if key in {"rms_noise_pct", "power_stability_pct"}:
+        m = re.search(r"([\d\.]+)\s*%", v, re.I)
+        return to_float(m.group(1)) if m else to_float(v)
+
+    if key in {"linewidth_mhz", "linewidth_nm"}:
+        mhz = re.search(r"([\d\.]+)\s*MHz", v, re.I)
+        if mhz:
+            return to_float(mhz.group(1))
+        nm = re.search(r"([\d\.]+)\s*(nm|pm)", v, re.I)
+        if nm:
+            return to_float(nm.group(1))
+        return to_float(v)
+
+    if key == "beam_diameter_mm":
+        m = re.search(r"([\d\.]+)\s*mm", v, re.I)
+        return to_float(m.group(1)) if m else to_float(v)
+
+    if key == "beam_divergence_mrad":
+        m = re.search(r"([\d\.]+)\s*mrad", v, re.I)
+        return to_float(m.group(1)) if m else to_float(v)
+
+    if key == "m2":
+        return to_float(v)
+
+    if key in {"modulation_analog_hz", "modulation_digital_hz"}:
+        m = re.search(r"([\d\.]+)\s*(Hz|kHz|MHz)", v, re.I)
+        if not m:
+            return to_float(v)
+        factor = {"hz": 1, "khz": 1e3, "mhz": 1e6}[m.group(2).lower()]
+        return float(m.group(1)) * factor
+
+    if key == "ttl_shutter":
+        return v.lower() in {"yes", "true", "1"} or "shutter" in v.lower()
+
+    if key == "fiber_output":
+        return v.lower() in {
+            "yes",
+            "true",
+            "1",
+            "smf",
+            "mmf",
+            "fiber",
+            "integrated fiber",
+        }
+
+    if key == "fiber_na":
+        m = re.search(r"na\s*=?\s*([\d\.]+)", v, re.I)
+        return float(m.group(1)) if m else to_float(v)
+
+    if key == "fiber_mfd_um":
+        m = re.search(r"([\d\.]+)\s*µ?m", v, re.I)
+        return float(m.group(1)) if m else to_float(v)
+
+    if key == "warmup_time_min":
+        m = re.search(r"([\d\.]+)\s*(min|s)", v, re.I)
+        if not m:
+            return to_float(v)
+        num, unit = float(m.group(1)), m.group(2).lower()
+        return num / 60.0 if unit == "s" else num
+
+    if key == "interfaces":
+        import re as _re
+
+        toks = _re.split(r"[,/;]| and ", v, flags=_re.I)
+        return [t.strip().upper().replace("RS232", "RS-232") for t in toks if t.strip()]
+
+    if key == "dimensions_mm":
+        m = re.search(r"([\d\.]+)\s*[x×]\s*([\d\.]+)\s*[x×]\s*([\d\.]+)\s*mm", v, re.I)
+        if m:
+            return {
+                "x": float(m.group(1)),
+                "y": float(m.group(2)),
+                "z": float(m.group(3)),
+            }
+        return None
+
+    if key == "polarization":
+        return v.upper()
+    return v
+
+
+RAW_VALUES = {
+    "wavelength_nm": ["405 nm", "488±2 nm", "640", "1,064 nm", "375-380 nm", "UV", ". nm", "λ = 561nm"],
+    "output_power_mw_nominal": ["100 mW", "1.5 W", ">50 mW", "20", "2 kW", "up to 500mW", "n/a", "..mW"],
+    "output_power_mw_min": ["5 mW", "0.5 W", "<1 mW", "", "1,000 mW"],
+    "rms_noise_pct": ["<0.2 %", "0.25%", "< 0.1", "typ. 0.3 % rms", "low"],
+    "power_stability_pct": ["<2%", "±0.5 %", "0.5", "1 % over 8 h"],
+    "linewidth_mhz": ["<1 MHz", "0.1 nm", "5 pm", "narrow", "<5"],
+    "linewidth_nm": ["2 nm", "100 MHz", "<0.5"],
+    "beam_diameter_mm": ["0.7 mm", "1.0 ± 0.1 mm", "0.8", "Ø 2 mm"],
+    "beam_divergence_mrad": ["<1.2 mrad", "0.5", "1 mrad full angle"],
+    "m2": ["<1.1", "1.2", "≤1.3", "TEM00", "1,1"],
+    "modulation_analog_hz": ["500 kHz", "100 Hz", "1 MHz", "DC", "2.5kHz"],
+    "modulation_digital_hz": ["150 MHz", "20kHz", "1"],
+    "ttl_shutter": ["yes", "No", "TTL shutter", "1", "electronic Shutter"],
+    "fiber_output": ["SMF", "mmf", "free space", "Yes", "integrated fiber"],
+    "fiber_na": ["NA = 0.12", "na 0.22", "0.1", "n/a"],
+    "fiber_mfd_um": ["3.5 µm", "4 um", "5 m", "10"],
+    "warmup_time_min": ["<5 min", "30 s", "2", "1 minute", "90s"],
+    "interfaces": ["USB, RS232", "RS-232/USB and Ethernet", "Analog; TTL"],
+    "dimensions_mm": ["125 x 70 x 45 mm", "10×20×30 mm", "small", "1..2 x 3 x 4 mm"],
+    "polarization": ["vertical", ">100:1", "Linear"],
+    "vendor_other": ["anything", " padded "],
+}
+
+
+def legacy_or_none(key: str, value: str) -> Any:
+    """Old parser result; values it crashed on are expected to parse as None."""
+    try:
+        return legacy_parse_value_to_unit(key, value)
+    except ValueError:
+        return None
+
+
+def expected_difference(key: str, value: str) -> bool:
+    """kW is a new unit; the old parser returned None for it."""
+    return key.startswith("output_power") and re.search(r"\d\s*kW", value, re.I) is not None
+
+
+def build_columns(skus: int) -> Dict[str, List[str]]:
+    rng = random.Random(0)
+    return {key: [rng.choice(raw) for _ in range(skus)] for key, raw in RAW_VALUES.items()}
+
+
+def compare(columns: Dict[str, List[str]], repeat: int = 1) -> Dict[str, float]:
+    """Parse every column both ways; raises AssertionError on any mismatch."""
+    legacy_time = batch_time = None
+    for _ in range(repeat):
+        start = time.process_time()
+        old = {key: [legacy_or_none(key, v) for v in values] for key, values in columns.items()}
+        elapsed = time.process_time() - start
+        legacy_time = elapsed if legacy_time is None else min(legacy_time, elapsed)
+
+        start = time.process_time()
+        new = {key: parse_values_to_unit(key, values) for key, values in columns.items()}
+        elapsed = time.process_time() - start
+        batch_time = elapsed if batch_time is None else min(batch_time, elapsed)
+
+    for key, values in columns.items():
+        for value, a, b in zip(values, old[key], new[key]):
+            if expected_difference(key, value):
+                continue
+            same = a == b or (a != a and b != b)  # NaN from float("nan")
+            assert same and type(a) is type(b), f"{key}: {value!r} -> {a!r} (old) vs {b!r} (batch)"
+
+    return {"legacy": legacy_time, "batch": batch_time}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--skus", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    columns = build_columns(args.skus)
+    total = sum(len(values) for values in columns.values())
+    print(f"Values: {total} ({args.skus} SKUs x {len(columns)} keys)")
+
+    timings = compare(columns, args.repeat)
+    print("Results agree: yes")
+    print(f"  one at a time:  {timings['legacy']:.3f}s CPU")
+    print(f"  batch columns:  {timings['batch']:.3f}s CPU")
+    print(f"  speedup:        {timings['legacy'] / timings['batch']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
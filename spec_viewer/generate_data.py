@@ -1,222 +1,297 @@
 #!/usr/bin/env python3
 """
-Generate JavaScript data file from the SQLite database for the spec viewer.
+Generate the spec viewer data files from the SQLite database.
 Run this script to update the data displayed in the HTML viewer.
+
+Data is written as one content-hashed shard per vendor plus a manifest:
+
+    js/data/manifest.js                  vendor list, counts and shard files
+    js/data/<vendor>.<hash>.js           that vendor's products
+    js/data/state.json                   per-vendor fingerprints (generator only)
+
+A vendor is only re-queried when its database fingerprint changed, and a
+shard is only rewritten when its content hash changed. Shards are JS files
+(not bare JSON) so the viewer also works when opened from file://.
+
+Each shard also carries the indexed numeric specs as typed-array columns
+(base64 little-endian Float64, NaN when unknown) and their precomputed sort
+orders (base64 Uint32 row positions, unknown values left out), which the
+viewer merges into its filter index without re-sorting.
 """
 
+import re
+import sys
 import json
+import base64
 import sqlite3
+import hashlib
+from array import array
 from datetime import datetime
 from pathlib import Path
 
-def extract_database_data():
-    """Extract product and spec data from the database."""
-    
-    # Database path
-    db_path = Path(__file__).parent.parent / "data" / "laser-ci.sqlite"
-    
-    if not db_path.exists():
-        print(f"Database not found at {db_path}")
-        return None
-    
-    conn = sqlite3.connect(db_path)
+DB_PATH = Path(__file__).parent.parent / "data" / "laser-ci.sqlite"
+DATA_DIR = Path(__file__).parent / "js" / "data"
+STATE_FILE = "state.json"
+MANIFEST_FILE = "manifest.js"
+
+SPEC_FIELDS = [
+    "wavelength_nm",
+    "output_power_mw_nominal",
+    "output_power_mw_min",
+    "rms_noise_pct",
+    "power_stability_pct",
+    "linewidth_mhz",
+    "linewidth_nm",
+    "m2",
+    "beam_diameter_mm",
+    "beam_divergence_mrad",
+    "polarization",
+    "modulation_analog_hz",
+    "modulation_digital_hz",
+    "ttl_shutter",
+    "fiber_output",
+    "fiber_na",
+    "fiber_mfd_um",
+    "warmup_time_min"
+]
+
+JSON_FIELDS = ["interfaces", "dimensions_mm", "vendor_fields"]
+
+# Numeric specs shipped as typed columns with sort orders for range filters
+INDEXED_FIELDS = ["wavelength_nm", "output_power_mw_nominal"]
+
+# Products with their normalized specs AND latest raw specs, for one vendor
+VENDOR_QUERY = f"""
+SELECT
+    p.id,
+    p.name as product_name,
+    m.name as vendor_name,
+    {", ".join(f"ns.{field}" for field in SPEC_FIELDS + JSON_FIELDS)},
+    rd.raw_specs as raw_specs_json
+FROM products p
+JOIN manufacturers m ON p.manufacturer_id = m.id
+LEFT JOIN normalized_specs ns ON p.id = ns.product_id
+LEFT JOIN (
+    SELECT product_id, raw_specs,
+           ROW_NUMBER() OVER (PARTITION BY product_id ORDER BY fetched_at DESC) as rn
+    FROM raw_documents
+    WHERE raw_specs IS NOT NULL
+      AND product_id IN (SELECT id FROM products WHERE manufacturer_id = :vendor_id)
+) rd ON p.id = rd.product_id AND rd.rn = 1
+WHERE m.id = :vendor_id
+ORDER BY p.name, ns.id
+"""
+
+# Cheap per-vendor summary over ids, names and content hashes (no spec
+# payloads); a vendor's rows are only re-read when it changes.
+# Normalized specs are insert-only; raw documents are updated in place
+# with a new content hash.
+FINGERPRINT_QUERY = """
+SELECT
+    m.id,
+    m.name,
+    (SELECT GROUP_CONCAT(p.id || '=' || p.name, ',') FROM products p
+      WHERE p.manufacturer_id = m.id),
+    (SELECT COUNT(*) || ':' || IFNULL(MAX(ns.id), 0) FROM normalized_specs ns
+      JOIN products p ON ns.product_id = p.id WHERE p.manufacturer_id = m.id),
+    (SELECT GROUP_CONCAT(rd.id || '=' || IFNULL(rd.content_hash, '') || '@' || IFNULL(rd.fetched_at, ''), ',')
+      FROM raw_documents rd JOIN products p ON rd.product_id = p.id
+      WHERE p.manufacturer_id = m.id)
+FROM manufacturers m
+ORDER BY m.name
+"""
+
+
+def _load_json(text, default):
+    if not text:
+        return default
+    try:
+        return json.loads(text)
+    except (TypeError, ValueError):
+        return default
+
+
+def row_to_product(row):
+    """Convert one query row into the viewer's product dict."""
+    product = {
+        "id": row["id"],
+        "name": row["product_name"],
+        "vendor": row["vendor_name"],
+        "specs": {}
+    }
+
+    for field in SPEC_FIELDS:
+        value = row[field]
+        # Convert SQLite boolean (0/1) to JavaScript boolean
+        if field in ["ttl_shutter", "fiber_output"]:
+            if value is not None:
+                value = bool(value)
+        product["specs"][field] = value
+
+    # JSON fields
+    for field in JSON_FIELDS:
+        product["specs"][field] = _load_json(row[field], None)
+
+    # Raw specs
+    product["raw_specs"] = _load_json(row["raw_specs_json"], {})
+    return product
+
+
+def vendor_fingerprints(conn):
+    """{vendor_name: (vendor_id, fingerprint)} from ids, names and content hashes."""
+    fingerprints = {}
+    for vendor_id, name, *parts in conn.execute(FINGERPRINT_QUERY):
+        summary = "|".join(str(part or "") for part in parts)
+        fingerprints[name] = (vendor_id, hashlib.sha256(summary.encode("utf-8")).hexdigest())
+    return fingerprints
+
+
+def extract_vendor_products(conn, vendor_id):
+    """Product dicts for one vendor."""
     conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    # Query to get all products with their normalized specs AND raw specs
-    query = """
-    SELECT 
-        p.id,
-        p.name as product_name,
-        m.name as vendor_name,
-        ns.wavelength_nm,
-        ns.output_power_mw_nominal,
-        ns.output_power_mw_min,
-        ns.rms_noise_pct,
-        ns.power_stability_pct,
-        ns.linewidth_mhz,
-        ns.linewidth_nm,
-        ns.m2,
-        ns.beam_diameter_mm,
-        ns.beam_divergence_mrad,
-        ns.polarization,
-        ns.modulation_analog_hz,
-        ns.modulation_digital_hz,
-        ns.ttl_shutter,
-        ns.fiber_output,
-        ns.fiber_na,
-        ns.fiber_mfd_um,
-        ns.warmup_time_min,
-        ns.interfaces,
-        ns.dimensions_mm,
-        ns.vendor_fields,
-        rd.raw_specs as raw_specs_json
-    FROM products p
-    JOIN manufacturers m ON p.manufacturer_id = m.id
-    LEFT JOIN normalized_specs ns ON p.id = ns.product_id
-    LEFT JOIN (
-        SELECT product_id, raw_specs, 
-               ROW_NUMBER() OVER (PARTITION BY product_id ORDER BY fetched_at DESC) as rn
-        FROM raw_documents
-        WHERE raw_specs IS NOT NULL
-    ) rd ON p.id = rd.product_id AND rd.rn = 1
-    ORDER BY m.name, p.name
-    """
-    
-    cursor.execute(query)
-    rows = cursor.fetchall()
-    
-    # Convert to list of dictionaries
-    products = []
-    for row in rows:
-        product = {
-            "id": row["id"],
-            "name": row["product_name"],
-            "vendor": row["vendor_name"],
-            "specs": {}
-        }
-        
-        # Add all spec fields
-        spec_fields = [
-            "wavelength_nm",
-            "output_power_mw_nominal", 
-            "output_power_mw_min",
-            "rms_noise_pct",
-            "power_stability_pct",
-            "linewidth_mhz",
-            "linewidth_nm",
-            "m2",
-            "beam_diameter_mm",
-            "beam_divergence_mrad",
-            "polarization",
-            "modulation_analog_hz",
-            "modulation_digital_hz",
-            "ttl_shutter",
-            "fiber_output",
-            "fiber_na",
-            "fiber_mfd_um",
-            "warmup_time_min"
+    try:
+        return [row_to_product(row) for row in conn.execute(VENDOR_QUERY, {"vendor_id": vendor_id})]
+    finally:
+        conn.row_factory = None
+
+
+def shard_filename(vendor, digest):
+    slug = re.sub(r"[^a-z0-9]+", "-", vendor.lower()).strip("-") or "vendor"
+    return f"{slug}.{digest[:12]}.js"
+
+
+def _b64_array(typecode, values):
+    data = array(typecode, values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return base64.b64encode(data.tobytes()).decode("ascii")
+
+
+def encode_columns(products):
+    """Typed-array columns and sort orders for INDEXED_FIELDS."""
+    columns, order = {}, {}
+    for field in INDEXED_FIELDS:
+        values = [
+            float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else float("nan")
+            for v in (p["specs"].get(field) for p in products)
         ]
-        
-        for field in spec_fields:
-            value = row[field]
-            # Convert SQLite boolean (0/1) to JavaScript boolean
-            if field in ["ttl_shutter", "fiber_output"]:
-                if value is not None:
-                    value = bool(value)
-            product["specs"][field] = value
-        
-        # Handle JSON fields
-        if row["interfaces"]:
-            try:
-                product["specs"]["interfaces"] = json.loads(row["interfaces"])
-            except:
-                product["specs"]["interfaces"] = None
-        else:
-            product["specs"]["interfaces"] = None
-            
-        if row["dimensions_mm"]:
-            try:
-                product["specs"]["dimensions_mm"] = json.loads(row["dimensions_mm"])
-            except:
-                product["specs"]["dimensions_mm"] = None
-        else:
-            product["specs"]["dimensions_mm"] = None
-        
-        # Parse vendor_fields JSON if present
-        if row["vendor_fields"]:
-            try:
-                product["specs"]["vendor_fields"] = json.loads(row["vendor_fields"])
-            except:
-                product["specs"]["vendor_fields"] = None
-        else:
-            product["specs"]["vendor_fields"] = None
-        
-        # Add raw specs
-        if row["raw_specs_json"]:
-            try:
-                product["raw_specs"] = json.loads(row["raw_specs_json"])
-            except:
-                product["raw_specs"] = {}
-        else:
-            product["raw_specs"] = {}
-            
-        products.append(product)
-    
-    conn.close()
-    
-    # Get last update time from raw_documents
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    cursor.execute("SELECT MAX(fetched_at) as last_update FROM raw_documents")
-    last_update = cursor.fetchone()[0]
-    conn.close()
-    
+        known = [i for i, v in enumerate(values) if v == v]
+        columns[field] = _b64_array("d", values)
+        order[field] = _b64_array("I", sorted(known, key=lambda i: (values[i], i)))
+    return columns, order
+
+
+def shard_content(vendor, products):
+    """Shard file body and its content hash."""
+    columns, order = encode_columns(products)
+    payload = json.dumps({"vendor": vendor, "products": products,
+                          "count": len(products), "columns": columns, "order": order},
+                         ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    js = f"// Auto-generated spec viewer shard\nwindow.LASER_SHARDS.register({payload});\n"
+    return js, digest
+
+
+def last_updated_date(conn):
+    last_update = conn.execute("SELECT MAX(fetched_at) FROM raw_documents").fetchone()[0]
     if last_update:
-        # Parse and format the date
         try:
             dt = datetime.fromisoformat(last_update.replace('Z', '+00:00'))
-            last_updated = dt.strftime("%Y-%m-%d")
-        except:
-            last_updated = datetime.now().strftime("%Y-%m-%d")
-    else:
-        last_updated = datetime.now().strftime("%Y-%m-%d")
-    
-    return {
-        "products": products,
-        "lastUpdated": last_updated
-    }
+            return dt.strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+    return datetime.now().strftime("%Y-%m-%d")
 
-def generate_javascript_file(data):
-    """Generate the JavaScript data file."""
-    
-    if not data:
-        print("No data to generate")
-        return
-    
-    # Create the JavaScript content
-    js_content = f"""// Auto-generated data from database
-// Last generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
-const LASER_DATA = {json.dumps(data, indent=2, ensure_ascii=False)};
+def generate_shards(db_path=DB_PATH, out_dir=DATA_DIR):
+    """
+    Write changed vendor shards and the manifest.
+    Returns {"written": [...], "unchanged": [...], "removed": [...]} vendor/file names.
+    """
+    db_path, out_dir = Path(db_path), Path(out_dir)
+    if not db_path.exists():
+        print(f"Database not found at {db_path}")
+        return None
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    state_path = out_dir / STATE_FILE
+    previous = _load_json(state_path.read_text(encoding="utf-8"), {}) if state_path.exists() else {}
+
+    summary = {"written": [], "unchanged": [], "removed": []}
+    state = {}
+    conn = sqlite3.connect(db_path)
+    try:
+        for vendor, (vendor_id, fingerprint) in vendor_fingerprints(conn).items():
+            old = previous.get(vendor)
+            if old and old.get("fingerprint") == fingerprint and (out_dir / old["file"]).exists():
+                state[vendor] = old
+                summary["unchanged"].append(vendor)
+                continue
+
+            products = extract_vendor_products(conn, vendor_id)
+            js, digest = shard_content(vendor, products)
+            filename = shard_filename(vendor, digest)
+            if (out_dir / filename).exists():
+                summary["unchanged"].append(vendor)
+            else:
+                (out_dir / filename).write_text(js, encoding="utf-8")
+                summary["written"].append(vendor)
+            state[vendor] = {
+                "fingerprint": fingerprint,
+                "file": filename,
+                "hash": digest,
+                "count": len(products),
+            }
+        last_updated = last_updated_date(conn)
+    finally:
+        conn.close()
+
+    # Drop shards no longer referenced
+    live = {entry["file"] for entry in state.values()}
+    for path in out_dir.glob("*.js"):
+        if path.name != MANIFEST_FILE and path.name not in live:
+            path.unlink()
+            summary["removed"].append(path.name)
+
+    manifest = {
+        "lastUpdated": last_updated,
+        "specFields": SPEC_FIELDS + JSON_FIELDS,
+        "indexedFields": INDEXED_FIELDS,
+        "shards": [
+            {"vendor": vendor, "file": entry["file"], "hash": entry["hash"], "count": entry["count"]}
+            for vendor, entry in sorted(state.items())
+        ],
+    }
+    manifest_js = (
+        "// Auto-generated spec viewer manifest\n"
+        f"window.LASER_MANIFEST = {json.dumps(manifest, indent=2, ensure_ascii=False)};\n"
+    )
+    manifest_path = out_dir / MANIFEST_FILE
+    if not manifest_path.exists() or manifest_path.read_text(encoding="utf-8") != manifest_js:
+        manifest_path.write_text(manifest_js, encoding="utf-8")
+    state_path.write_text(json.dumps(state, indent=2, ensure_ascii=False), encoding="utf-8")
+    return summary
 
-// Make data available globally
-window.LASER_DATA = LASER_DATA;
-"""
-    
-    # Write to file
-    output_path = Path(__file__).parent / "js" / "data.js"
-    output_path.write_text(js_content, encoding='utf-8')
-    
-    print(f"Generated {output_path}")
-    print(f"  - {len(data['products'])} products")
-    print(f"  - Last updated: {data['lastUpdated']}")
-    
-    # Show vendor breakdown
-    vendors = {}
-    for product in data['products']:
-        vendor = product['vendor']
-        vendors[vendor] = vendors.get(vendor, 0) + 1
-    
-    print("\nVendor breakdown:")
-    for vendor, count in sorted(vendors.items()):
-        print(f"  - {vendor}: {count} products")
 
 def main():
     """Main function."""
-    print("Extracting data from database...")
-    data = extract_database_data()
-    
-    if data:
-        print(f"\nFound {len(data['products'])} products")
-        generate_javascript_file(data)
-        print("\nData generation complete!")
-        print("\nTo view the spec viewer:")
-        print("  1. Open spec_viewer/index.html in a web browser")
-        print("  2. Or run: python -m http.server 8000 in the spec_viewer directory")
-        print("     then navigate to http://localhost:8000")
-    else:
+    print("Generating spec viewer data shards...")
+    summary = generate_shards()
+
+    if summary is None:
         print("Failed to extract data from database")
+        return
+
+    print(f"  - {len(summary['written'])} vendor shards written: {', '.join(summary['written']) or 'none'}")
+    print(f"  - {len(summary['unchanged'])} vendor shards unchanged")
+    if summary["removed"]:
+        print(f"  - {len(summary['removed'])} stale shards removed")
+    print(f"\nData written to {DATA_DIR}")
+    print("\nTo view the spec viewer:")
+    print("  1. Open spec_viewer/index.html in a web browser")
+    print("  2. Or run: python -m http.server 8000 in the spec_viewer directory")
+    print("     then navigate to http://localhost:8000")
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,3 +1,161 @@
+// ===== Data Shards =====
+// manifest.js lists one content-hashed shard file per vendor; shards are
+// loaded on demand and register themselves here.
+const LASER_DATA = {
+    products: [],
+    lastUpdated: (window.LASER_MANIFEST || {}).lastUpdated || '--'
+};
+
+window.LASER_SHARDS = {
+    loaded: {},
+    pending: {},
+    register(shard) {
+        this.loaded[shard.vendor] = shard;
+    }
+};
+
+function manifestShards() {
+    return (window.LASER_MANIFEST && window.LASER_MANIFEST.shards) || [];
+}
+
+function loadShard(entry) {
+    const shards = window.LASER_SHARDS;
+    if (shards.loaded[entry.vendor]) return Promise.resolve();
+    if (!shards.pending[entry.vendor]) {
+        shards.pending[entry.vendor] = new Promise((resolve, reject) => {
+            const script = document.createElement('script');
+            script.src = `js/data/${entry.file}`;
+            script.onload = () => resolve();
+            script.onerror = () => {
+                delete shards.pending[entry.vendor];
+                reject(new Error(`Failed to load ${entry.file}`));
+            };
+            document.head.appendChild(script);
+        });
+    }
+    return shards.pending[entry.vendor];
+}
+
+function ensureVendorsLoaded(vendors) {
+    const wanted = manifestShards().filter(entry => vendors.size === 0 || vendors.has(entry.vendor));
+    return Promise.all(wanted.map(loadShard)).then(() => {
+        // Keep products in manifest (vendor) order
+        const loaded = manifestShards()
+            .filter(entry => window.LASER_SHARDS.loaded[entry.vendor])
+            .map(entry => window.LASER_SHARDS.loaded[entry.vendor]);
+        if (specIndex && specIndex.vendors.length === loaded.length) return;
+        LASER_DATA.products = loaded.flatMap(shard => shard.products);
+        specIndex = buildSpecIndex(loaded);
+    });
+}
+
+// ===== Column Index =====
+// Each shard carries typed-array columns (Float64, NaN = unknown) and sort
+// orders for the indexed specs. They are concatenated in LASER_DATA.products
+// order and the per-shard orders merged, so range filters are binary searches.
+let specIndex = null;
+
+function decodeBase64(b64, ArrayType) {
+    const binary = atob(b64);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+    return new ArrayType(bytes.buffer);
+}
+
+function mergeSorted(a, b, values) {
+    const out = new Uint32Array(a.length + b.length);
+    let i = 0, j = 0, k = 0;
+    while (i < a.length && j < b.length) {
+        out[k++] = values[b[j]] < values[a[i]] ? b[j++] : a[i++];
+    }
+    while (i < a.length) out[k++] = a[i++];
+    while (j < b.length) out[k++] = b[j++];
+    return out;
+}
+
+function buildSpecIndex(shards) {
+    const fields = (window.LASER_MANIFEST || {}).indexedFields || [];
+    const size = shards.reduce((n, shard) => n + shard.products.length, 0);
+    const index = {
+        size,
+        vendors: shards.map(shard => shard.vendor),
+        vendorCode: new Uint16Array(size),
+        values: {},
+        sorted: {},
+        unknown: {}
+    };
+    const runs = {};
+    fields.forEach(field => {
+        index.values[field] = new Float64Array(size);
+        runs[field] = [];
+    });
+
+    let offset = 0;
+    shards.forEach((shard, code) => {
+        index.vendorCode.fill(code, offset, offset + shard.products.length);
+        fields.forEach(field => {
+            index.values[field].set(decodeBase64(shard.columns[field], Float64Array), offset);
+            const order = decodeBase64(shard.order[field], Uint32Array);
+            for (let i = 0; i < order.length; i++) order[i] += offset;
+            runs[field].push(order);
+        });
+        offset += shard.products.length;
+    });
+
+    fields.forEach(field => {
+        // Pairwise merges of the shard orders: O(n log shards)
+        let pending = runs[field].length ? runs[field] : [new Uint32Array(0)];
+        while (pending.length > 1) {
+            const next = [];
+            for (let i = 0; i < pending.length; i += 2) {
+                next.push(i + 1 < pending.length
+                    ? mergeSorted(pending[i], pending[i + 1], index.values[field])
+                    : pending[i]);
+            }
+            pending = next;
+        }
+        index.sorted[field] = pending[0];
+
+        const values = index.values[field];
+        const unknown = [];
+        for (let i = 0; i < size; i++) {
+            if (Number.isNaN(values[i])) unknown.push(i);
+        }
+        index.unknown[field] = Uint32Array.from(unknown);
+    });
+    return index;
+}
+
+function lowerBound(sorted, values, x) {
+    let lo = 0, hi = sorted.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (values[sorted[mid]] < x) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+}
+
+function upperBound(sorted, values, x) {
+    let lo = 0, hi = sorted.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (values[sorted[mid]] <= x) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+}
+
+// Count a hit for every row inside [min, max]; rows without the spec pass
+function markRange(hits, field, range) {
+    const sorted = specIndex.sorted[field];
+    const values = specIndex.values[field];
+    if (!sorted) return;
+    const start = range.min === null ? 0 : lowerBound(sorted, values, range.min);
+    const stop = range.max === null ? sorted.length : upperBound(sorted, values, range.max);
+    for (let i = start; i < stop; i++) hits[sorted[i]]++;
+    const unknown = specIndex.unknown[field];
+    for (let i = 0; i < unknown.length; i++) hits[unknown[i]]++;
+}
+
 // ===== Application State =====
 let state = {
     selectedVendors: new Set(),
@@ -6,9 +164,14 @@ let state = {
     powerRange: { min: null, max: null },
     currentView: 'table',
     showRawSpecs: false,
-    filteredProducts: []
+    filteredProducts: [],
+    renderedWindow: null
 };
 
+// Virtualized table: only rows in (or near) the viewport are in the DOM
+const VIRTUAL_OVERSCAN = 10;
+let virtualRowHeight = 45;
+
 // ===== Initialize Application =====
 document.addEventListener('DOMContentLoaded', () => {
     initializeDropdowns();
@@ -70,7 +233,7 @@ function closeAllDropdowns() {
 function initializeFilters() {
     // Populate vendor list
     const vendorList = document.getElementById('vendor-list');
-    const vendors = [...new Set(LASER_DATA.products.map(p => p.vendor))].sort();
+    const vendors = manifestShards().map(entry => entry.vendor).sort();
     
     vendors.forEach(vendor => {
         const item = createDropdownItem(vendor, 'vendor');
@@ -231,11 +394,26 @@ function setupEventListeners() {
         state.showRawSpecs = e.target.checked;
         if (state.showRawSpecs) {
             // Add raw spec fields to selected specs
-            updateSpecListForRawSpecs();
+            ensureVendorsLoaded(state.selectedVendors).then(() => {
+                updateSpecListForRawSpecs();
+                renderResults();
+            });
+            return;
         }
         renderResults();
     });
     
+    // Virtualized table: re-render the visible window once per frame while scrolling
+    let scrollScheduled = false;
+    document.querySelector('.table-wrapper').addEventListener('scroll', () => {
+        if (scrollScheduled) return;
+        scrollScheduled = true;
+        requestAnimationFrame(() => {
+            scrollScheduled = false;
+            if (state.currentView === 'table') renderVisibleRows();
+        });
+    }, { passive: true });
+    
     // Range inputs
     document.getElementById('wavelength-min').addEventListener('input', (e) => {
         state.wavelengthRange.min = e.target.value ? parseFloat(e.target.value) : null;
@@ -257,14 +435,15 @@ function setupEventListeners() {
 // ===== Data Loading =====
 function loadInitialData() {
     // Update header stats
-    const vendors = [...new Set(LASER_DATA.products.map(p => p.vendor))];
+    const vendors = manifestShards().map(entry => entry.vendor);
+    const productCount = manifestShards().reduce((sum, entry) => sum + entry.count, 0);
     document.getElementById('vendor-count').textContent = `${vendors.length} Vendors`;
-    document.getElementById('product-count').textContent = `${LASER_DATA.products.length} Products`;
+    document.getElementById('product-count').textContent = `${productCount} Products`;
     document.getElementById('last-updated').textContent = `Updated: ${LASER_DATA.lastUpdated}`;
     
     // Set default selections
     state.selectedVendors = new Set(vendors);
-    state.selectedSpecs = new Set(['wavelength_nm', 'output_power_mw', 'rms_noise_pct', 'power_stability_pct']);
+    state.selectedSpecs = new Set(['wavelength_nm', 'output_power_mw_nominal', 'rms_noise_pct', 'power_stability_pct']);
     
     // Check default checkboxes
     state.selectedVendors.forEach(vendor => {
@@ -286,33 +465,40 @@ function loadInitialData() {
 
 // ===== Filtering Logic =====
 function applyFilters() {
-    // Filter products based on selected criteria
-    state.filteredProducts = LASER_DATA.products.filter(product => {
-        // Vendor filter
-        if (state.selectedVendors.size > 0 && !state.selectedVendors.has(product.vendor)) {
-            return false;
-        }
-        
-        // Wavelength filter
-        if (state.wavelengthRange.min !== null || state.wavelengthRange.max !== null) {
-            const wavelength = product.specs.wavelength_nm;
-            if (wavelength) {
-                if (state.wavelengthRange.min !== null && wavelength < state.wavelengthRange.min) return false;
-                if (state.wavelengthRange.max !== null && wavelength > state.wavelengthRange.max) return false;
-            }
-        }
-        
-        // Power filter
-        if (state.powerRange.min !== null || state.powerRange.max !== null) {
-            const power = product.specs.output_power_mw;
-            if (power) {
-                if (state.powerRange.min !== null && power < state.powerRange.min) return false;
-                if (state.powerRange.max !== null && power > state.powerRange.max) return false;
-            }
-        }
-        
-        return true;
+    // Load shards for the selected vendors first (no-op once loaded)
+    return ensureVendorsLoaded(state.selectedVendors)
+        .then(filterLoadedProducts)
+        .catch(err => console.error(err));
+}
+
+function filterLoadedProducts() {
+    // Filter through the column index: vendor codes plus binary-searched ranges
+    const size = specIndex ? specIndex.size : 0;
+    const selectedCodes = new Uint8Array(specIndex ? specIndex.vendors.length : 0);
+    if (specIndex) {
+        specIndex.vendors.forEach((vendor, code) => {
+            selectedCodes[code] = state.selectedVendors.size === 0 || state.selectedVendors.has(vendor) ? 1 : 0;
+        });
+    }
+
+    const hits = new Uint8Array(size);
+    let required = 0;
+    [
+        ['wavelength_nm', state.wavelengthRange],
+        ['output_power_mw_nominal', state.powerRange]
+    ].forEach(([field, range]) => {
+        if (range.min === null && range.max === null) return;
+        required++;
+        markRange(hits, field, range);
     });
+
+    const products = [];
+    for (let i = 0; i < size; i++) {
+        if (selectedCodes[specIndex.vendorCode[i]] && hits[i] === required) {
+            products.push(LASER_DATA.products[i]);
+        }
+    }
+    state.filteredProducts = products;
     
     renderResults();
 }
@@ -354,18 +540,20 @@ function renderTableView() {
     const tableHeader = document.getElementById('table-header');
     const tableBody = document.getElementById('table-body');
     const noResults = document.getElementById('no-results-table');
+    const wrapper = document.querySelector('.table-wrapper');
     
     // Clear existing content
     tableBody.innerHTML = '';
+    state.renderedWindow = null;
     
     // Show/hide no results message
     if (state.filteredProducts.length === 0) {
         noResults.style.display = 'flex';
-        document.querySelector('.table-wrapper').style.display = 'none';
+        wrapper.style.display = 'none';
         return;
     } else {
         noResults.style.display = 'none';
-        document.querySelector('.table-wrapper').style.display = 'block';
+        wrapper.style.display = 'block';
     }
     
     // Build header
@@ -375,41 +563,84 @@ function renderTableView() {
     });
     tableHeader.innerHTML = headerHTML;
     
-    // Build rows
-    state.filteredProducts.forEach(product => {
-        const row = document.createElement('tr');
-        
-        // Product name cell
-        let productCell = `<td class="sticky-col">${product.name}`;
-        if (product.vendor === 'Coherent') {
-            productCell += '<span class="vendor-badge coherent">Coherent</span>';
+    wrapper.scrollTop = 0;
+    renderVisibleRows();
+}
+
+function renderVisibleRows() {
+    const wrapper = document.querySelector('.table-wrapper');
+    const tableBody = document.getElementById('table-body');
+    const total = state.filteredProducts.length;
+    const viewport = wrapper.clientHeight || 600;
+    const first = Math.max(0, Math.floor(wrapper.scrollTop / virtualRowHeight) - VIRTUAL_OVERSCAN);
+    const last = Math.min(total, Math.ceil((wrapper.scrollTop + viewport) / virtualRowHeight) + VIRTUAL_OVERSCAN);
+    
+    if (state.renderedWindow && state.renderedWindow[0] === first && state.renderedWindow[1] === last) {
+        return;
+    }
+    state.renderedWindow = [first, last];
+    
+    // Spacer rows stand in for the rows above and below the window
+    const fragment = document.createDocumentFragment();
+    fragment.appendChild(createSpacerRow(first * virtualRowHeight));
+    for (let i = first; i < last; i++) {
+        fragment.appendChild(createTableRow(state.filteredProducts[i]));
+    }
+    fragment.appendChild(createSpacerRow((total - last) * virtualRowHeight));
+    tableBody.replaceChildren(fragment);
+    
+    // Use the real row height once a row has been laid out
+    const sample = tableBody.children[1];
+    if (sample && sample.offsetHeight && Math.abs(sample.offsetHeight - virtualRowHeight) > 1) {
+        virtualRowHeight = sample.offsetHeight;
+        state.renderedWindow = null;
+        renderVisibleRows();
+    }
+}
+
+function createSpacerRow(height) {
+    const row = document.createElement('tr');
+    row.className = 'virtual-spacer';
+    const cell = document.createElement('td');
+    cell.colSpan = state.selectedSpecs.size + 1;
+    cell.style.height = `${height}px`;
+    row.appendChild(cell);
+    return row;
+}
+
+function createTableRow(product) {
+    const row = document.createElement('tr');
+    
+    // Product name cell
+    let productCell = `<td class="sticky-col">${product.name}`;
+    if (product.vendor === 'Coherent') {
+        productCell += '<span class="vendor-badge coherent">Coherent</span>';
+    } else {
+        productCell += `<span class="vendor-badge">${product.vendor}</span>`;
+    }
+    productCell += '</td>';
+    row.innerHTML = productCell;
+    
+    // Spec cells
+    state.selectedSpecs.forEach(spec => {
+        let value;
+        if (spec.startsWith('raw_')) {
+            // Get value from raw_specs
+            const rawSpecName = spec.substring(4);
+            value = product.raw_specs ? product.raw_specs[rawSpecName] : null;
         } else {
-            productCell += `<span class="vendor-badge">${product.vendor}</span>`;
+            // Get value from normalized specs
+            value = product.specs[spec];
         }
-        productCell += '</td>';
-        row.innerHTML = productCell;
-        
-        // Spec cells
-        state.selectedSpecs.forEach(spec => {
-            let value;
-            if (spec.startsWith('raw_')) {
-                // Get value from raw_specs
-                const rawSpecName = spec.substring(4);
-                value = product.raw_specs ? product.raw_specs[rawSpecName] : null;
-            } else {
-                // Get value from normalized specs
-                value = product.specs[spec];
-            }
-            const cell = document.createElement('td');
-            cell.textContent = formatSpecValue(value, spec);
-            if (spec.startsWith('raw_')) {
-                cell.style.background = '#FFF9E6'; // Light yellow background for raw specs
-            }
-            row.appendChild(cell);
-        });
-        
-        tableBody.appendChild(row);
+        const cell = document.createElement('td');
+        cell.textContent = formatSpecValue(value, spec);
+        if (spec.startsWith('raw_')) {
+            cell.style.background = '#FFF9E6'; // Light yellow background for raw specs
+        }
+        row.appendChild(cell);
     });
+    
+    return row;
 }
 
 function renderCardView() {
@@ -506,15 +737,14 @@ function exportToCSV() {
 // ===== Helper Functions =====
 function getAvailableSpecs() {
     const specs = new Set();
+    // Normalized specs come from the manifest, before any shard is loaded
+    ((window.LASER_MANIFEST || {}).specFields || []).forEach(spec => {
+        if (spec !== 'vendor_fields' && spec !== 'interfaces' && spec !== 'dimensions_mm') {
+            specs.add(spec);
+        }
+    });
     LASER_DATA.products.forEach(product => {
-        // Add normalized specs
-        Object.keys(product.specs).forEach(spec => {
-            if (spec !== 'vendor_fields' && spec !== 'interfaces' && spec !== 'dimensions_mm') {
-                specs.add(spec);
-            }
-        });
-        
-        // If showing raw specs, add raw spec fields
+        // If showing raw specs, add raw spec fields from loaded shards
         if (state.showRawSpecs && product.raw_specs) {
             Object.keys(product.raw_specs).forEach(spec => {
                 specs.add(`raw_${spec}`);
@@ -5,7 +5,6 @@ Built on LangGraph with OpenAI for intelligent spec normalization
 
 __version__ = "0.1.0"
 
-from .graph import build_graph, GraphState
 from .db import SessionLocal, engine, bootstrap_db
 from .models import Manufacturer, Product, RawDocument, NormalizedSpec
 
@@ -19,4 +18,12 @@ __all__ = [
     "Product",
     "RawDocument",
     "NormalizedSpec",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # The graph pulls in LangGraph and the pipeline stages; load it on first use
+    if name in ("build_graph", "GraphState"):
+        from . import graph
+        return getattr(graph, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,27 +3,191 @@ AI-powered competitive intelligence analysis using OpenAI GPT.
 
 This module sends competitive data to OpenAI for deep analysis,
 generating strategic insights and recommendations.
+
+Small catalogs are analyzed in a single call. When the payload would not
+fit the token budget, the analysis runs map-reduce: per-vendor chunks are
+summarized concurrently by a cheaper model (cached by payload hash under
+data/ai_cache/), then the summaries are reduced into the final report.
 """
 
 import json
 import sqlite3
 import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any
-from openai import OpenAI
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Token budgets for a single prompt (the input side; outputs are capped separately)
+PROMPT_TOKEN_BUDGET = int(os.getenv("AI_PROMPT_TOKEN_BUDGET", "60000"))
+MAP_CHUNK_TOKENS = int(os.getenv("AI_MAP_CHUNK_TOKENS", "12000"))
+MAP_OUTPUT_TOKENS = 1500
+REPORT_OUTPUT_TOKENS = 8000
+MAP_WORKERS = 4
+AI_CACHE_DIR = "data/ai_cache"
+
+# Rough chars-per-token for English/JSON; errs on the side of more tokens
+CHARS_PER_TOKEN = 3.5
+
+REASONING_MODELS = ["o3-pro", "o3-2025-04-16", "openai/o3-2025-04-16", "o3-mini"]
+
+SYSTEM_PROMPT = "You are an expert competitive intelligence analyst in the laser and photonics industry, providing strategic insights for executive decision-making. Focus on actionable recommendations and competitive advantages."
+
+REPORT_INSTRUCTIONS = """
+Generate a detailed competitive intelligence report with the following sections:
+
+1. EXECUTIVE SUMMARY
+   - Key findings and immediate action items
+   - Coherent's current market position
+   - Critical competitive threats and opportunities
+
+2. MARKET LANDSCAPE ANALYSIS
+   - Market segmentation and size
+   - Vendor positioning and specialization
+   - Technology trends and gaps
+
+3. COMPETITIVE POSITIONING
+   - Coherent's strengths vs. competitors
+   - Wavelength coverage comparison
+   - Power output capabilities
+   - Product portfolio gaps
+
+4. TECHNICAL DIFFERENTIATION
+   - Feature comparison matrix
+   - Control interface capabilities
+   - Unique selling propositions by vendor
+   - Technology leadership areas
+
+5. COMPETITIVE THREATS
+   - Direct competitive overlaps
+   - Emerging threats from each competitor
+   - Market share risks
+
+6. STRATEGIC OPPORTUNITIES
+   - Unserved wavelength ranges
+   - Power output gaps in the market
+   - Feature differentiation opportunities
+   - Potential partnership or acquisition targets
+
+7. STRATEGIC RECOMMENDATIONS
+   - Short-term actions (0-6 months)
+   - Medium-term initiatives (6-18 months)
+   - Long-term strategic positioning
+   - R&D investment priorities
+
+8. COMPETITIVE INTELLIGENCE INSIGHTS
+   - Notable patterns in competitor offerings
+   - Pricing strategy implications
+   - Customer segment targeting recommendations
+
+Format the report in Markdown with clear headers, bullet points, and emphasis where appropriate.
+Focus on actionable insights rather than just data presentation.
+Highlight Coherent's position using **bold** text.
+"""
+
+MAP_INSTRUCTIONS = """
+Summarize the following slice of competitive data ({label}) for a later strategic analysis
+of Coherent Corporation's position. Keep every fact a strategist would need and drop the rest:
+- Segments and product lines, with wavelength coverage and power ranges
+- Control interfaces and notable features
+- Direct overlaps with, or gaps versus, Coherent
+Answer in compact Markdown bullets, no introduction.
+
+DATA:
+{payload}
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Conservative token estimate for a prompt (no tokenizer dependency)."""
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+def split_text(text: str, max_tokens: int) -> List[str]:
+    """Split text at line breaks into parts of at most max_tokens; overlong lines are cut."""
+    max_chars = max(1, int((max_tokens - 1) * CHARS_PER_TOKEN))
+    parts, current = [], ""
+    for line in text.splitlines(keepends=True):
+        while len(line) > max_chars:
+            if current:
+                parts.append(current)
+                current = ""
+            parts.append(line[:max_chars])
+            line = line[max_chars:]
+        if current and len(current) + len(line) > max_chars:
+            parts.append(current)
+            current = ""
+        current += line
+    if current:
+        parts.append(current)
+    return parts
+
+
+def chunk_vendor_data(data: Dict[str, Any], max_tokens: Optional[int] = None) -> List[Tuple[str, Any]]:
+    """
+    Split the per-vendor payload into (label, payload) chunks whose JSON fits
+    max_tokens (default MAP_CHUNK_TOKENS). A vendor that does not fit is
+    split by segment, then by product count. A single product (or vendor
+    header) that still does not fit is split into JSON text parts.
+    """
+    max_tokens = max_tokens or MAP_CHUNK_TOKENS
+
+    def fits(payload):
+        return estimate_tokens(json.dumps(payload, indent=2)) <= max_tokens
+
+    chunks = []
+    for vendor, vdata in data['vendors'].items():
+        payload = {'vendor': vendor, **vdata}
+        if fits(payload):
+            chunks.append((vendor, payload))
+            continue
+
+        header = {k: v for k, v in payload.items() if k != 'products'}
+        by_segment = {}
+        for product in vdata['products']:
+            by_segment.setdefault(product.get('segment') or 'unsegmented', []).append(product)
+
+        for segment, products in sorted(by_segment.items()):
+            batch = []
+            part = 1
+            for product in products:
+                candidate = {**header, 'segment': segment, 'products': batch + [product]}
+                if batch and not fits(candidate):
+                    chunks.append((f"{vendor} / {segment} #{part}",
+                                   {**header, 'segment': segment, 'products': batch}))
+                    batch, part = [], part + 1
+                batch.append(product)
+            if batch:
+                label = f"{vendor} / {segment}" + (f" #{part}" if part > 1 else "")
+                chunks.append((label, {**header, 'segment': segment, 'products': batch}))
+
+    sized = []
+    for label, payload in chunks:
+        if fits(payload):
+            sized.append((label, payload))
+            continue
+        parts = split_text(json.dumps(payload, indent=2), max_tokens)
+        sized.extend((f"{label} ({i}/{len(parts)})", text) for i, text in enumerate(parts, 1))
+    return sized
+
 
 class AICompetitiveAnalyzer:
     """Generate AI-powered competitive analysis using OpenAI."""
     
     def __init__(self):
+        from openai import OpenAI
+
         self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         # Use o3-pro for maximum reasoning performance
         # Available models: o3-pro, o3-2025-04-16, o3-mini, gpt-4o, gpt-4.1
         self.model = os.getenv("OPENAI_MODEL", "o3-pro")
+        # Cheaper model for the per-vendor map step of large catalogs
+        self.map_model = os.getenv("OPENAI_MAP_MODEL", "gpt-4o-mini")
+        self.cache_dir = Path(AI_CACHE_DIR)
         
         # Check model and provide info
         if self.model == "o3-pro":
@@ -157,108 +321,124 @@ Analyze the following competitive data and generate a comprehensive strategic re
 
 COMPETITIVE DATA:
 {json.dumps(data, indent=2)}
+{REPORT_INSTRUCTIONS}"""
+        
+        try:
+            if estimate_tokens(SYSTEM_PROMPT + prompt) > PROMPT_TOKEN_BUDGET:
+                print(f"Payload exceeds {PROMPT_TOKEN_BUDGET} tokens; using map-reduce analysis...")
+                return self.generate_map_reduce_analysis(data)
+            return self._complete(self.model, prompt, REPORT_OUTPUT_TOKENS)
+            
+        except Exception as e:
+            print(f"Error calling OpenAI: {e}")
+            return self._generate_fallback_report(data)
 
-Generate a detailed competitive intelligence report with the following sections:
+    def generate_map_reduce_analysis(self, data: Dict[str, Any]) -> str:
+        """Summarize vendor chunks concurrently with the map model, then reduce."""
+        chunks = chunk_vendor_data(data)
+        print(f"  → Summarizing {len(chunks)} data chunks with {self.map_model}...")
+        with ThreadPoolExecutor(max_workers=MAP_WORKERS) as pool:
+            summaries = list(pool.map(lambda chunk: self._summarize_chunk(*chunk), chunks))
+        sections = [f"### {label}\n{summary}" for (label, _), summary in zip(chunks, summaries)]
 
-1. EXECUTIVE SUMMARY
-   - Key findings and immediate action items
-   - Coherent's current market position
-   - Critical competitive threats and opportunities
+        overview = json.dumps(data['market_overview'], indent=2)
 
-2. MARKET LANDSCAPE ANALYSIS
-   - Market segmentation and size
-   - Vendor positioning and specialization
-   - Technology trends and gaps
+        def reduce_prompt(parts):
+            return f"""
+You are a competitive intelligence analyst specializing in the laser and photonics industry. 
+Analyze the following competitive data and generate a comprehensive strategic report for Coherent Corporation.
 
-3. COMPETITIVE POSITIONING
-   - Coherent's strengths vs. competitors
-   - Wavelength coverage comparison
-   - Power output capabilities
-   - Product portfolio gaps
+MARKET OVERVIEW:
+{overview}
 
-4. TECHNICAL DIFFERENTIATION
-   - Feature comparison matrix
-   - Control interface capabilities
-   - Unique selling propositions by vendor
-   - Technology leadership areas
+VENDOR SUMMARIES:
+{chr(10).join(parts)}
+{REPORT_INSTRUCTIONS}"""
 
-5. COMPETITIVE THREATS
-   - Direct competitive overlaps
-   - Emerging threats from each competitor
-   - Market share risks
+        # Summaries that still overflow the budget are condensed again in groups;
+        # a summary too large for one group is split first
+        while estimate_tokens(SYSTEM_PROMPT + reduce_prompt(sections)) > PROMPT_TOKEN_BUDGET:
+            size = estimate_tokens("\n".join(sections))
+            groups, group = [], []
+            for piece in (p for section in sections for p in split_text(section, MAP_CHUNK_TOKENS)):
+                if group and estimate_tokens("\n".join(group + [piece])) > MAP_CHUNK_TOKENS:
+                    groups.append(group)
+                    group = []
+                group.append(piece)
+            groups.append(group)
+            print(f"  → Condensing {len(sections)} summaries into {len(groups)}...")
+            with ThreadPoolExecutor(max_workers=MAP_WORKERS) as pool:
+                sections = list(pool.map(
+                    lambda group: self._summarize_chunk("vendor summaries", "\n".join(group)), groups
+                ))
+            if estimate_tokens("\n".join(sections)) >= size:
+                break  # no longer shrinking; the budget check in _complete reports it
 
-6. STRATEGIC OPPORTUNITIES
-   - Unserved wavelength ranges
-   - Power output gaps in the market
-   - Feature differentiation opportunities
-   - Potential partnership or acquisition targets
+        return self._complete(self.model, reduce_prompt(sections), REPORT_OUTPUT_TOKENS)
 
-7. STRATEGIC RECOMMENDATIONS
-   - Short-term actions (0-6 months)
-   - Medium-term initiatives (6-18 months)
-   - Long-term strategic positioning
-   - R&D investment priorities
+    def _summarize_chunk(self, label: str, payload: Any) -> str:
+        """Map step for one chunk, cached by the hash of model and prompt."""
+        body = payload if isinstance(payload, str) else json.dumps(payload, indent=2, sort_keys=True)
+        prompt = MAP_INSTRUCTIONS.format(label=label, payload=body)
+        digest = hashlib.sha256(f"{self.map_model}\n{prompt}".encode("utf-8")).hexdigest()
+        cache_file = self.cache_dir / f"{digest}.md"
+        if cache_file.exists():
+            return cache_file.read_text(encoding="utf-8")
 
-8. COMPETITIVE INTELLIGENCE INSIGHTS
-   - Notable patterns in competitor offerings
-   - Pricing strategy implications
-   - Customer segment targeting recommendations
+        summary = (self._complete(self.map_model, prompt, MAP_OUTPUT_TOKENS) or "").strip()
+        if not summary:
+            # Not cached, so the next run asks again
+            print(f"  → Empty summary for {label}")
+            return ""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(summary, encoding="utf-8")
+        return summary
 
-Format the report in Markdown with clear headers, bullet points, and emphasis where appropriate.
-Focus on actionable insights rather than just data presentation.
-Highlight Coherent's position using **bold** text.
-"""
+    def _complete(self, model: str, prompt: str, max_output_tokens: int) -> str:
+        """One chat completion with the parameters each model family expects."""
+        tokens = estimate_tokens(SYSTEM_PROMPT + prompt)
+        if tokens > PROMPT_TOKEN_BUDGET:
+            raise ValueError(
+                f"Prompt of ~{tokens} tokens exceeds the {PROMPT_TOKEN_BUDGET}-token budget "
+                f"(AI_PROMPT_TOKEN_BUDGET); not sending it to {model}"
+            )
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
         
-        # Call OpenAI with latest API patterns
-        try:
-            # Use structured output for better analysis if available
-            messages = [
-                {
-                    "role": "system", 
-                    "content": "You are an expert competitive intelligence analyst in the laser and photonics industry, providing strategic insights for executive decision-making. Focus on actionable recommendations and competitive advantages."
-                },
-                {
-                    "role": "user", 
-                    "content": prompt
-                }
-            ]
-            
-            # Configure for o3 reasoning models
-            completion_params = {
-                "model": self.model,
-                "messages": messages,
-                "max_completion_tokens": 8000,  # o3 uses max_completion_tokens
-            }
-            
-            # Add o3 specific parameters for reasoning models
-            if self.model in ["o3-pro", "o3-2025-04-16", "openai/o3-2025-04-16", "o3-mini"]:
-                # o3 reasoning models support reasoning_effort parameter
-                if self.model == "o3-pro":
-                    completion_params["reasoning_effort"] = "high"  # Maximum for o3-pro
-                    print(f"Using o3-pro with high reasoning effort for deep analysis...")
-                elif self.model == "o3-mini":
-                    completion_params["reasoning_effort"] = "medium"  # Options: low, medium, high
-                    print(f"Using o3-mini with medium reasoning effort...")
-                else:
-                    completion_params["reasoning_effort"] = "high"  # High for full o3
-                    print(f"Using o3 with high reasoning effort...")
-            else:
-                # Standard models use temperature
-                completion_params["temperature"] = 0.7
-                completion_params["max_tokens"] = completion_params.pop("max_completion_tokens")
-            
-            response = self.client.chat.completions.create(**completion_params)
-            
-            # Handle response based on model type
-            if hasattr(response.choices[0].message, 'content'):
-                return response.choices[0].message.content
+        # Configure for o3 reasoning models
+        completion_params = {
+            "model": model,
+            "messages": messages,
+            "max_completion_tokens": max_output_tokens,  # o3 uses max_completion_tokens
+        }
+        
+        # Add o3 specific parameters for reasoning models
+        if model in REASONING_MODELS:
+            # o3 reasoning models support reasoning_effort parameter
+            if model == "o3-pro":
+                completion_params["reasoning_effort"] = "high"  # Maximum for o3-pro
+                print(f"Using o3-pro with high reasoning effort for deep analysis...")
+            elif model == "o3-mini":
+                completion_params["reasoning_effort"] = "medium"  # Options: low, medium, high
+                print(f"Using o3-mini with medium reasoning effort...")
             else:
-                # Handle potential new response format
-                return str(response.choices[0].message)
-            
-        except Exception as e:
-            print(f"Error calling OpenAI: {e}")
-            return self._generate_fallback_report(data)
+                completion_params["reasoning_effort"] = "high"  # High for full o3
+                print(f"Using o3 with high reasoning effort...")
+        else:
+            # Standard models use temperature
+            completion_params["temperature"] = 0.7
+            completion_params["max_tokens"] = completion_params.pop("max_completion_tokens")
+        
+        response = self.client.chat.completions.create(**completion_params)
+        
+        # Handle response based on model type
+        if hasattr(response.choices[0].message, 'content'):
+            return response.choices[0].message.content
+        else:
+            # Handle potential new response format
+            return str(response.choices[0].message)
     
     def _generate_fallback_report(self, data: Dict[str, Any]) -> str:
         """Generate a basic report if OpenAI fails."""
@@ -1,73 +1,70 @@
-from collections import defaultdict
-from sqlalchemy import select
-from .db import SessionLocal
-from .models import NormalizedSpec, Product, Manufacturer
+import numpy as np
+from .catalog import SpecCatalog, distance_matrix, top_k
 
+# Specs compared when matching competitors; wavelength and power must be known
+MATCH_FIELDS = [
+    "wavelength_nm",
+    "output_power_mw_nominal",
+    "rms_noise_pct",
+    "power_stability_pct",
+    "linewidth_mhz",
+]
+REQUIRED_FIELDS = ["wavelength_nm", "output_power_mw_nominal"]
 
-def benchmark_vs_coherent(segment_id: str = "diode_instrumentation"):
-    s = SessionLocal()
-    try:
-        rows = s.execute(
-            select(NormalizedSpec, Product, Manufacturer)
-            .join(Product, NormalizedSpec.product_id == Product.id)
-            .join(Manufacturer, Product.manufacturer_id == Manufacturer.id)
-            .where(Product.segment_id == segment_id)
-            .order_by(NormalizedSpec.snapshot_ts.desc())
-        ).all()
+# Coherent rows per distance block, bounds memory to BLOCK x competitors
+BLOCK_ROWS = 1024
 
-        latest = {}
-        for ns, p, m in rows:
-            if p.id not in latest:
-                latest[p.id] = (ns, p, m)
 
-        def band_nm(w):
-            return None if w is None else int(round(w))
+def match_competitors(catalog: SpecCatalog, k: int = 3, max_distance: float = 3.0):
+    """
+    Top-k nearest competitor models for every Coherent model.
 
-        def pclass(mw):
-            if mw is None:
-                return "unknown"
-            if mw < 50:
-                return "<50 mW"
-            if mw < 150:
-                return "50–150 mW"
-            if mw < 500:
-                return "150–500 mW"
-            return ">=500 mW"
+    Distances for all Coherent x competitor pairs are computed in one NumPy
+    broadcast over MATCH_FIELDS (see catalog.DISTANCE_SCALES); pairs further
+    apart than max_distance are not reported. Coherent rows are processed in
+    blocks of BLOCK_ROWS so memory stays bounded for large catalogs.
+    """
+    is_coherent = np.array([str(v).startswith("Coherent") for v in catalog.meta["vendor"]], dtype=bool)
+    coh = np.flatnonzero(is_coherent)
+    comp = np.flatnonzero(~is_coherent)
+    if not len(coh) or not len(comp):
+        return []
 
-        buckets = defaultdict(list)
-        for ns, p, m in latest.values():
-            buckets[
-                (band_nm(ns.wavelength_nm), pclass(ns.output_power_mw_nominal))
-            ].append((ns, p, m))
+    right = {f: catalog.columns[f][comp] for f in MATCH_FIELDS}
 
-        rows_out = []
-        for (wl, pc), items in sorted(buckets.items()):
-            coh = [t for t in items if t[2].name.startswith("Coherent")]
-            comp = [t for t in items if not t[2].name.startswith("Coherent")]
-            if not coh or not comp:
-                continue
-            base = coh[0][0]
-            for ns, p, m in comp:
-                rows_out.append(
-                    {
-                        "wl_nm": wl,
-                        "power_class": pc,
-                        "vendor": m.name,
-                        "model": p.name,
-                        "Δnoise_pct": None
-                        if (ns.rms_noise_pct is None or base.rms_noise_pct is None)
-                        else ns.rms_noise_pct - base.rms_noise_pct,
-                        "Δstability_pct": None
-                        if (
-                            ns.power_stability_pct is None
-                            or base.power_stability_pct is None
-                        )
-                        else ns.power_stability_pct - base.power_stability_pct,
-                        "Δlinewidth_MHz": None
-                        if (ns.linewidth_mhz is None or base.linewidth_mhz is None)
-                        else ns.linewidth_mhz - base.linewidth_mhz,
-                    }
-                )
-        return rows_out
-    finally:
-        s.close()
+    def delta(field, a, b):
+        va, vb = catalog.columns[field][a], catalog.columns[field][b]
+        return None if np.isnan(va) or np.isnan(vb) else float(vb - va)
+
+    rows_out = []
+    for start in range(0, len(coh), BLOCK_ROWS):
+        block = coh[start:start + BLOCK_ROWS]
+        left = {f: catalog.columns[f][block] for f in MATCH_FIELDS}
+        distances = distance_matrix(left, right, MATCH_FIELDS, required=REQUIRED_FIELDS)
+        nearest = top_k(distances, k)
+        rows = np.repeat(np.arange(len(block)), nearest.shape[1])
+        cols = nearest.ravel()
+        picked = distances[rows, cols]
+        keep = np.isfinite(picked) & (picked <= max_distance)
+        for row, col, d in zip(rows[keep], cols[keep], picked[keep]):
+            base, other = block[row], comp[col]
+            rows_out.append(
+                {
+                    "coherent_model": catalog.meta["model"][base],
+                    "vendor": catalog.meta["vendor"][other],
+                    "model": catalog.meta["model"][other],
+                    "wavelength_nm": float(catalog.columns["wavelength_nm"][other]),
+                    "power_mw": float(catalog.columns["output_power_mw_nominal"][other]),
+                    "distance": round(float(d), 3),
+                    "Δwl_nm": delta("wavelength_nm", base, other),
+                    "Δpower_mw": delta("output_power_mw_nominal", base, other),
+                    "Δnoise_pct": delta("rms_noise_pct", base, other),
+                    "Δstability_pct": delta("power_stability_pct", base, other),
+                    "Δlinewidth_MHz": delta("linewidth_mhz", base, other),
+                }
+            )
+    return rows_out
+
+
+def benchmark_vs_coherent(segment_id: str = "diode_instrumentation", k: int = 3):
+    return match_competitors(SpecCatalog.from_db(segment_id=segment_id), k=k)
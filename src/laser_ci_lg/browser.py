@@ -0,0 +1,269 @@
+"""
+Headless Chromium for the scrapers.
+
+browser_page() yields a fresh page in its own browser context. When a
+BrowserPool is active (the `serve` worker keeps one), pages come from its
+resident Chromium; otherwise a browser is launched for the call and closed
+afterwards. Playwright's sync API is bound to the thread that started it,
+so the pool only serves pages to its owner thread and other threads fall
+back to a per-call browser.
+
+Scrapers pass a ScrapeProfile: a small viewport, no service workers, and
+request interception that aborts images, media, fonts and tracker domains,
+since only the DOM text and tables are needed. Vendors can extend or relax
+the blocklists with a `browser:` block in config/target_products.yml.
+"""
+
+import inspect
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+_active_pool: Optional["BrowserPool"] = None
+
+# Chromium features a scraping browser never needs
+LAUNCH_ARGS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-sync",
+    "--disable-gpu",
+    "--mute-audio",
+    "--blink-settings=imagesEnabled=false",
+]
+
+BLOCKED_RESOURCES = ("image", "media", "font")
+
+# Analytics, ads, chat and embedded video hosts (a host and its subdomains)
+BLOCKED_DOMAINS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "googlesyndication.com", "googleadservices.com", "facebook.net", "hotjar.com",
+    "clarity.ms", "hs-analytics.net", "hs-scripts.com", "hs-banner.com", "licdn.com",
+    "ads.linkedin.com", "bat.bing.com", "zdassets.com", "intercom.io", "drift.com",
+    "youtube.com", "ytimg.com", "vimeo.com", "vimeocdn.com",
+)
+
+DEFAULT_VIEWPORT = {"width": 1280, "height": 800}
+
+
+class ScrapeProfile:
+    """Lightweight browser context for spec scraping, with request blocking."""
+
+    def __init__(self, block_resources: Iterable[str] = BLOCKED_RESOURCES,
+                 block_domains: Iterable[str] = BLOCKED_DOMAINS,
+                 allow_domains: Iterable[str] = (), viewport: Optional[Dict] = None):
+        self.block_resources = set(block_resources)
+        self.block_domains = tuple(d.lower() for d in block_domains)
+        self.allow_domains = tuple(d.lower() for d in allow_domains)
+        self.viewport = dict(viewport or DEFAULT_VIEWPORT)
+        self.stats = {"requests": 0, "blocked": 0, "bytes": 0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]]) -> "ScrapeProfile":
+        """
+        Profile from a vendor's `browser:` config block:
+        block_resources replaces the default resource types, block_domains
+        adds to the default trackers, allow_domains are never blocked and
+        viewport sets the page size.
+        """
+        cfg = cfg or {}
+        return cls(
+            block_resources=cfg.get("block_resources", BLOCKED_RESOURCES),
+            block_domains=tuple(BLOCKED_DOMAINS) + tuple(cfg.get("block_domains", ())),
+            allow_domains=cfg.get("allow_domains", ()),
+            viewport=cfg.get("viewport"),
+        )
+
+    def context_options(self, **overrides) -> Dict[str, Any]:
+        options = {"viewport": self.viewport, "service_workers": "block",
+                   "reduced_motion": "reduce"}
+        options.update(overrides)
+        return options
+
+    @staticmethod
+    def _matches(host: str, domains) -> bool:
+        return any(host == d or host.endswith("." + d) for d in domains)
+
+    def should_block(self, url: str, resource_type: str, is_main_document: bool = False) -> bool:
+        if is_main_document:
+            return False
+        host = (urlparse(url).hostname or "").lower()
+        if self._matches(host, self.allow_domains):
+            return False
+        return resource_type in self.block_resources or self._matches(host, self.block_domains)
+
+    def install(self, context):
+        """
+        Intercept the context's requests and count requests, blocks and bytes.
+        Works with sync and async API contexts; for an async context, await
+        the returned value (context.route is a coroutine there).
+        """
+        def route(route):
+            request = route.request
+            main = request.is_navigation_request() and request.frame.parent_frame is None
+            blocked = self.should_block(request.url, request.resource_type, main)
+            with self._lock:
+                self.stats["requests"] += 1
+                self.stats["blocked"] += blocked
+            return route.abort() if blocked else route.continue_()
+
+        def count(sizes):
+            with self._lock:
+                self.stats["bytes"] += sizes["responseBodySize"] + sizes["responseHeadersSize"]
+
+        async def count_async(pending):
+            try:
+                count(await pending)
+            except Exception:
+                pass
+
+        def finished(request):
+            try:
+                sizes = request.sizes()
+            except Exception:
+                return
+            if inspect.isawaitable(sizes):
+                return count_async(sizes)
+            count(sizes)
+
+        context.on("requestfinished", finished)
+        return context.route("**/*", route)
+
+    def format_stats(self) -> str:
+        s = self.stats
+        return f"{s['requests']} requests, {s['blocked']} blocked, {s['bytes'] / 1024:.0f} KB transferred"
+
+
+def scrape_profile_for(vendor: str, config_path: str = "config/target_products.yml") -> ScrapeProfile:
+    """ScrapeProfile for a vendor, from its `browser:` block if it has one."""
+    from ruamel.yaml import YAML
+
+    try:
+        with open(config_path) as f:
+            cfg = YAML(typ="safe").load(f) or {}
+    except OSError:
+        cfg = {}
+    for vendor_cfg in cfg.get("vendors", []):
+        if vendor_cfg.get("name") == vendor:
+            return ScrapeProfile.from_config(vendor_cfg.get("browser"))
+    return ScrapeProfile()
+
+
+class BrowserPool:
+    """One resident Chromium handing out isolated contexts, relaunched periodically."""
+
+    def __init__(self, headless: bool = True, max_contexts: int = 200):
+        self.headless = headless
+        # Relaunch after this many contexts to bound Chromium's memory growth
+        self.max_contexts = max_contexts
+        self.owner_thread = None
+        self._playwright = None
+        self._browser = None
+        self._contexts = 0
+
+    def start(self):
+        from playwright.sync_api import sync_playwright
+
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+            self.owner_thread = threading.get_ident()
+        self._launch()
+        return self
+
+    def _launch(self):
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+        self._browser = self._playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+        self._contexts = 0
+        print("  → Browser pool: Chromium launched")
+
+    @contextmanager
+    def page(self, profile: Optional[ScrapeProfile] = None, **context_options):
+        """A new page in a fresh context; the context is closed on exit."""
+        if self._playwright is None:
+            self.start()
+        elif not self._browser.is_connected() or self._contexts >= self.max_contexts:
+            self._launch()
+        self._contexts += 1
+        context = _new_context(self._browser, profile, context_options)
+        try:
+            yield context.new_page()
+        finally:
+            context.close()
+
+    def close(self):
+        """Close the browser and Playwright (from the owner thread)."""
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+        if self._playwright is not None:
+            self._playwright.stop()
+        self._browser = self._playwright = self.owner_thread = None
+
+
+def activate_pool(pool: Optional[BrowserPool]):
+    """Serve browser_page() from pool (None deactivates)."""
+    global _active_pool
+    _active_pool = pool
+
+
+def _new_context(browser, profile: Optional[ScrapeProfile], context_options):
+    if profile is None:
+        return browser.new_context(**context_options)
+    context = browser.new_context(**profile.context_options(**context_options))
+    profile.install(context)
+    return context
+
+
+@contextmanager
+def browser_page(headless: bool = True, profile: Optional[ScrapeProfile] = None, **context_options):
+    """
+    A page from the active pool if this thread owns it, else from a per-call
+    browser. With a profile, the context is a lightweight scraping context
+    (context_options still override its settings).
+    """
+    pool = _active_pool
+    if pool is not None and pool.owner_thread in (None, threading.get_ident()):
+        with pool.page(profile, **context_options) as page:
+            yield page
+        return
+
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless, args=LAUNCH_ARGS)
+        try:
+            context = _new_context(browser, profile, context_options)
+            yield context.new_page()
+        finally:
+            browser.close()
+
+
+@asynccontextmanager
+async def async_browser_context(headless: bool = True, profile: Optional[ScrapeProfile] = None,
+                                **context_options):
+    """
+    A browser context on Playwright's async API, in a per-call browser, for
+    opening several pages concurrently. Run it in an event loop of its own
+    thread: the sync API (and the pool) may already own this thread's loop.
+    """
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless, args=LAUNCH_ARGS)
+        try:
+            if profile is None:
+                context = await browser.new_context(**context_options)
+            else:
+                context = await browser.new_context(**profile.context_options(**context_options))
+                await profile.install(context)
+            yield context
+        finally:
+            await browser.close()
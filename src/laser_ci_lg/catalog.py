@@ -0,0 +1,261 @@
+"""
+In-memory spec catalog over the latest normalized specs.
+
+Each numeric spec is a NumPy column (NaN when unknown) with a sorted index,
+so range filters are binary searches instead of table scans:
+
+    catalog = SpecCatalog.from_db()
+    catalog.query(wavelength_nm=(483, 493), output_power_mw_nominal=(50, 150),
+                  rms_noise_pct=(None, 0.2))
+    catalog.nearest(k=5, wavelength_nm=488, output_power_mw_nominal=100)
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+from .db import SessionLocal
+from .models import Manufacturer, Product, NormalizedSpec
+
+NUMERIC_FIELDS = [
+    "wavelength_nm",
+    "output_power_mw_nominal",
+    "output_power_mw_min",
+    "rms_noise_pct",
+    "power_stability_pct",
+    "linewidth_mhz",
+    "linewidth_nm",
+    "m2",
+    "beam_diameter_mm",
+    "beam_divergence_mrad",
+    "modulation_analog_hz",
+    "modulation_digital_hz",
+    "fiber_na",
+    "fiber_mfd_um",
+    "warmup_time_min",
+]
+
+META_FIELDS = ["product_id", "vendor", "segment_id", "product_name", "model"]
+
+# Distance scale per field: one unit of distance is a 10 nm wavelength step,
+# a 2x power ratio, 0.1 % noise, 0.5 % stability or a 10x linewidth ratio.
+# Power and linewidth span decades, so they are compared on a log scale.
+DISTANCE_SCALES = {
+    "wavelength_nm": ("linear", 10.0),
+    "output_power_mw_nominal": ("log", np.log(2.0)),
+    "rms_noise_pct": ("linear", 0.1),
+    "power_stability_pct": ("linear", 0.5),
+    "linewidth_mhz": ("log", np.log(10.0)),
+}
+
+# Penalty (in distance units) for a field that is unknown on either side
+MISSING_PENALTY = 0.5
+
+Range = Tuple[Optional[float], Optional[float]]
+
+
+def scaled_features(values: np.ndarray, field: str) -> np.ndarray:
+    """Map a column into distance units (log for ratio-like specs)."""
+    kind, scale = DISTANCE_SCALES[field]
+    values = np.asarray(values, dtype=np.float64)
+    if kind == "log":
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = np.where(values > 0, np.log(values), np.nan)
+    return values / scale
+
+
+def distance_matrix(
+    left: Dict[str, np.ndarray],
+    right: Dict[str, np.ndarray],
+    fields: Sequence[str],
+    required: Sequence[str] = (),
+) -> np.ndarray:
+    """
+    Normalized Euclidean distance between every left row and every right row.
+    left/right map field -> column. A missing value costs MISSING_PENALTY,
+    except in required fields where it makes the pair unmatched (inf).
+    """
+    n_left = len(next(iter(left.values()))) if left else 0
+    n_right = len(next(iter(right.values()))) if right else 0
+    total = np.zeros((n_left, n_right))
+    for field in fields:
+        a = scaled_features(left[field], field)[:, None]
+        b = scaled_features(right[field], field)[None, :]
+        diff = a - b
+        missing = np.isnan(diff)
+        if field in required:
+            total[missing] = np.inf
+            np.add(total, np.where(missing, 0.0, diff * diff), out=total)
+        else:
+            np.add(total, np.where(missing, MISSING_PENALTY ** 2, diff * diff), out=total)
+    return np.sqrt(total)
+
+
+def top_k(distances: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k smallest finite distances in each row, nearest first."""
+    if distances.shape[1] == 0 or k <= 0:
+        return np.empty((distances.shape[0], 0), dtype=np.int64)
+    k = min(k, distances.shape[1])
+    if k < distances.shape[1]:
+        part = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    else:
+        part = np.tile(np.arange(distances.shape[1]), (distances.shape[0], 1))
+    order = np.take_along_axis(distances, part, axis=1).argsort(axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1)
+
+
+class SpecCatalog:
+    """Column store of the latest spec per product model with sorted indexes."""
+
+    def __init__(self, records: List[Dict[str, Any]]):
+        self.meta = {}
+        for field in META_FIELDS:
+            column = np.empty(len(records), dtype=object)
+            column[:] = [r.get(field) for r in records]
+            self.meta[field] = column
+        self.columns = {
+            field: np.array(
+                [np.nan if r.get(field) is None else float(r[field]) for r in records],
+                dtype=np.float64,
+            )
+            for field in NUMERIC_FIELDS
+        }
+        # Sorted index per column: positions ordered by value, NaNs excluded
+        self._order = {}
+        self._sorted = {}
+        for field, values in self.columns.items():
+            order = np.argsort(values, kind="stable")
+            known = int(np.count_nonzero(~np.isnan(values)))
+            self._order[field] = order[:known]
+            self._sorted[field] = values[order[:known]]
+
+    def __len__(self) -> int:
+        return len(self.meta["product_id"])
+
+    @classmethod
+    def from_db(cls, segment_id: Optional[str] = None, session=None) -> "SpecCatalog":
+        """Load the newest snapshot of each (product, model) from the database."""
+        s = session or SessionLocal()
+        try:
+            stmt = (
+                select(NormalizedSpec, Product, Manufacturer)
+                .join(Product, NormalizedSpec.product_id == Product.id)
+                .join(Manufacturer, Product.manufacturer_id == Manufacturer.id)
+                .order_by(NormalizedSpec.snapshot_ts.desc(), NormalizedSpec.id.desc())
+            )
+            if segment_id:
+                stmt = stmt.where(Product.segment_id == segment_id)
+
+            records, seen = [], set()
+            for ns, p, m in s.execute(stmt):
+                vendor_fields = ns.vendor_fields if isinstance(ns.vendor_fields, dict) else {}
+                model = str(vendor_fields.get("model") or p.name)
+                if (p.id, model) in seen:
+                    continue
+                seen.add((p.id, model))
+                record = {
+                    "product_id": p.id,
+                    "vendor": m.name,
+                    "segment_id": p.segment_id,
+                    "product_name": p.name,
+                    "model": model,
+                }
+                for field in NUMERIC_FIELDS:
+                    record[field] = getattr(ns, field)
+                records.append(record)
+            return cls(records)
+        finally:
+            if session is None:
+                s.close()
+
+    def _range_positions(self, field: str, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        """Row positions with low <= value <= high, via binary search on the sorted index."""
+        values = self._sorted[field]
+        start = 0 if low is None else int(np.searchsorted(values, low, side="left"))
+        stop = len(values) if high is None else int(np.searchsorted(values, high, side="right"))
+        return self._order[field][start:stop]
+
+    def select(
+        self,
+        vendor: Optional[str] = None,
+        segment_id: Optional[str] = None,
+        exclude_vendor: Optional[str] = None,
+        **ranges: Range,
+    ) -> np.ndarray:
+        """
+        Row positions matching every inclusive (low, high) range; None leaves
+        a side open. The narrowest range drives the index lookup and the
+        others are checked on its candidates only.
+        """
+        unknown = set(ranges) - set(NUMERIC_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown spec fields: {', '.join(sorted(unknown))}")
+
+        if ranges:
+            spans = {field: self._range_positions(field, *bounds) for field, bounds in ranges.items()}
+            driver = min(spans, key=lambda field: len(spans[field]))
+            rows = np.sort(spans[driver])
+            for field, (low, high) in ranges.items():
+                if field == driver or not len(rows):
+                    continue
+                values = self.columns[field][rows]
+                keep = ~np.isnan(values)
+                if low is not None:
+                    keep &= values >= low
+                if high is not None:
+                    keep &= values <= high
+                rows = rows[keep]
+        else:
+            rows = np.arange(len(self))
+
+        for field, wanted, equal in (
+            ("vendor", vendor, True),
+            ("segment_id", segment_id, True),
+            ("vendor", exclude_vendor, False),
+        ):
+            if wanted is not None and len(rows):
+                rows = rows[(self.meta[field][rows] == wanted) == equal]
+        return rows
+
+    def query(self, **filters) -> List[Dict[str, Any]]:
+        """Records matching select() filters, e.g. wavelength_nm=(483, 493)."""
+        return self.records(self.select(**filters))
+
+    def nearest(
+        self,
+        k: int = 5,
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        **target: float,
+    ) -> List[Dict[str, Any]]:
+        """
+        The k rows closest to target (e.g. wavelength_nm=488, output_power_mw_nominal=100)
+        under the normalized distance, optionally restricted by select() filters.
+        Each record gets a 'distance' entry.
+        """
+        fields = list(fields or target)
+        unknown = set(fields) - set(DISTANCE_SCALES)
+        if unknown:
+            raise ValueError(f"No distance scale for: {', '.join(sorted(unknown))}")
+        rows = self.select(**(filters or {}))
+        left = {field: np.array([target.get(field, np.nan)], dtype=np.float64) for field in fields}
+        right = {field: self.columns[field][rows] for field in fields}
+        distances = distance_matrix(left, right, fields, required=list(target))[0]
+        best = top_k(distances[None, :], k)[0]
+        best = best[np.isfinite(distances[best])]
+
+        results = self.records(rows[best])
+        for record, d in zip(results, distances[best]):
+            record["distance"] = round(float(d), 4)
+        return results
+
+    def records(self, rows: Sequence[int]) -> List[Dict[str, Any]]:
+        out = []
+        for i in rows:
+            record = {field: self.meta[field][i] for field in META_FIELDS}
+            for field in NUMERIC_FIELDS:
+                value = self.columns[field][i]
+                record[field] = None if np.isnan(value) else float(value)
+            out.append(record)
+        return out
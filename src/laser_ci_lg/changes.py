@@ -0,0 +1,129 @@
+"""
+Spec change log: per-field deltas between consecutive snapshots of a model.
+
+Changes are detected once, when normalization writes new snapshots
+(record_spec_changes), so reports only read the deltas in their window.
+backfill_spec_changes rebuilds the log from the full snapshot history.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Float, delete, func, select
+
+from .models import NormalizedSpec, Product, SpecChange
+
+# Numeric spec columns whose changes are logged
+TRACKED_FIELDS = [
+    c.name for c in NormalizedSpec.__table__.columns
+    if isinstance(c.type, Float)
+]
+
+
+def _model_of(ns: NormalizedSpec) -> Optional[str]:
+    vendor_fields = ns.vendor_fields if isinstance(ns.vendor_fields, dict) else {}
+    model = vendor_fields.get("model")
+    return str(model) if model else None
+
+
+def diff_snapshots(prev: NormalizedSpec, new: NormalizedSpec, model: str) -> List[SpecChange]:
+    """SpecChange rows for every tracked field that differs between two snapshots."""
+    changes = []
+    for field in TRACKED_FIELDS:
+        old_value, new_value = getattr(prev, field), getattr(new, field)
+        if old_value == new_value:
+            continue
+        rel_change = None
+        if old_value is not None and new_value is not None and old_value != 0:
+            rel_change = (new_value - old_value) / abs(old_value)
+        changes.append(
+            SpecChange(
+                product_id=new.product_id,
+                model=model,
+                field=field,
+                old_value=old_value,
+                new_value=new_value,
+                rel_change=rel_change,
+                prev_spec_id=prev.id,
+                spec_id=new.id,
+                prev_snapshot_ts=prev.snapshot_ts,
+                snapshot_ts=new.snapshot_ts,
+            )
+        )
+    return changes
+
+
+def _product_names(session, product_ids: Iterable[int]) -> Dict[int, str]:
+    return dict(
+        session.execute(select(Product.id, Product.name).where(Product.id.in_(set(product_ids)))).all()
+    )
+
+
+def record_spec_changes(session, new_specs: List[NormalizedSpec]) -> int:
+    """
+    Log field changes of freshly added snapshots against the previous
+    snapshot of the same (product, model). Flushes the session; the caller
+    commits. Returns the number of SpecChange rows added.
+    """
+    if not new_specs:
+        return 0
+    session.flush()
+
+    new_ids = [ns.id for ns in new_specs]
+    product_ids = {ns.product_id for ns in new_specs}
+    model_expr = NormalizedSpec.vendor_fields["model"].as_string()
+    ranked = (
+        select(
+            NormalizedSpec.id,
+            func.row_number()
+            .over(
+                partition_by=(NormalizedSpec.product_id, model_expr),
+                order_by=(NormalizedSpec.snapshot_ts.desc(), NormalizedSpec.id.desc()),
+            )
+            .label("rank"),
+        )
+        .where(NormalizedSpec.product_id.in_(product_ids), NormalizedSpec.id.not_in(new_ids))
+        .subquery()
+    )
+    previous = {}
+    for ns in session.execute(
+        select(NormalizedSpec).join(ranked, ranked.c.id == NormalizedSpec.id).where(ranked.c.rank == 1)
+    ).scalars():
+        previous[(ns.product_id, _model_of(ns))] = ns
+
+    names = _product_names(session, product_ids)
+    added = 0
+    for ns in new_specs:
+        model = _model_of(ns)
+        prev = previous.get((ns.product_id, model))
+        if prev is not None:
+            changes = diff_snapshots(prev, ns, model or names.get(ns.product_id, ""))
+            session.add_all(changes)
+            added += len(changes)
+        # Later snapshots of the same model in this batch compare against this one
+        previous[(ns.product_id, model)] = ns
+    return added
+
+
+def backfill_spec_changes(session) -> int:
+    """Rebuild the change log from the full snapshot history. The caller commits."""
+    session.execute(delete(SpecChange))
+    rows = session.execute(
+        select(NormalizedSpec).order_by(
+            NormalizedSpec.product_id, NormalizedSpec.snapshot_ts, NormalizedSpec.id
+        )
+    ).scalars()
+
+    names: Dict[int, str] = {}
+    previous: Dict[Tuple[int, Optional[str]], NormalizedSpec] = {}
+    added = 0
+    for ns in rows:
+        model = _model_of(ns)
+        prev = previous.get((ns.product_id, model))
+        if prev is not None:
+            if ns.product_id not in names:
+                names.update(_product_names(session, [ns.product_id]))
+            changes = diff_snapshots(prev, ns, model or names.get(ns.product_id, ""))
+            session.add_all(changes)
+            added += len(changes)
+        previous[(ns.product_id, model)] = ns
+    return added
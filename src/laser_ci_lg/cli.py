@@ -1,12 +1,9 @@
 import os
-import shutil
 import typer
 from tabulate import tabulate
-from apscheduler.schedulers.blocking import BlockingScheduler
 from dotenv import load_dotenv
-from .graph import GraphState, build_graph
 from .db import SessionLocal
-from .models import Manufacturer, Product, RawDocument
+from .models import Manufacturer, Product, RawDocument, ProductFeature
 
 load_dotenv()
 
@@ -22,6 +19,8 @@ def run(
     scraper: str = typer.Option(None, help="Run specific scraper (e.g., coherent, hubner, omicron, oxxius)"),
 ):
     """Run end-to-end pipeline once."""
+    from .graph import GraphState, build_graph
+
     if not os.getenv("OPENAI_API_KEY"):
         typer.echo(
             "Warning: OPENAI_API_KEY not set; LLM fallback will fail if enabled."
@@ -67,6 +66,9 @@ def schedule(
     Schedule a monthly run (default: 03:10 on the 1st).
     Cron format: 'M H DOM MON DOW'
     """
+    from apscheduler.schedulers.blocking import BlockingScheduler
+    from .graph import GraphState, build_graph
+
     M, H, DOM, MON, DOW = cron.split()
     graph = build_graph()
 
@@ -122,20 +124,23 @@ def clean(
     
     # Clean PDF cache
     if cache:
-        cache_path = f"data/pdf_cache/{cache_vendor}"
-        if os.path.exists(cache_path):
-            pdf_files = os.listdir(cache_path)
+        from .pdf_cache import shared_pdf_cache
+        pdf_cache = shared_pdf_cache()
+        cache_path = pdf_cache.root / cache_vendor
+        found = pdf_cache.remove_vendor(cache_vendor, dry_run=True)
+        if found["files"]:
             typer.echo(f"\n📁 PDF Cache: {cache_path}")
-            typer.echo(f"   Found {len(pdf_files)} PDF files")
+            typer.echo(f"   Found {found['files']} PDF files ({found['bytes'] / 1e6:.1f} MB not shared with other vendors)")
             if dry_run:
+                pdf_files = sorted(os.listdir(cache_path)) if cache_path.exists() else []
                 typer.echo("   [DRY RUN] Would delete:")
                 for pdf in pdf_files[:5]:  # Show first 5
                     typer.echo(f"     - {pdf}")
                 if len(pdf_files) > 5:
                     typer.echo(f"     ... and {len(pdf_files) - 5} more")
             else:
-                shutil.rmtree(cache_path)
-                typer.echo(f"   ✅ Deleted {len(pdf_files)} PDF files")
+                removed = pdf_cache.remove_vendor(cache_vendor)
+                typer.echo(f"   ✅ Deleted {removed['files']} PDF files, reclaimed {removed['bytes'] / 1e6:.1f} MB")
         else:
             typer.echo(f"\n📁 PDF Cache: No cache found for {cache_vendor}")
     
@@ -175,6 +180,9 @@ def clean(
                         session.query(RawDocument).filter(
                             RawDocument.product_id == product.id
                         ).delete()
+                        session.query(ProductFeature).filter(
+                            ProductFeature.product_id == product.id
+                        ).delete()
                     
                     # Delete products
                     session.query(Product).filter(
@@ -202,9 +210,49 @@ def clean(
         typer.echo(f"\n✨ Cleanup complete for {vendor}")
 
 
+@app.command()
+def cache(
+    verify: bool = typer.Option(False, help="Re-hash cached PDFs and drop corrupt ones"),
+    max_mb: float = typer.Option(None, help="Evict least recently used PDFs down to this size (MB)"),
+    adopt: bool = typer.Option(False, help="Move PDFs cached before the object store into it"),
+):
+    """Report PDF cache usage and reclaim space."""
+    from .pdf_cache import shared_pdf_cache
+    pdf_cache = shared_pdf_cache()
+
+    if adopt:
+        session = SessionLocal()
+        try:
+            paths = dict(
+                session.query(RawDocument.file_path, RawDocument.url)
+                .filter(RawDocument.file_path != None).all()
+            )
+        finally:
+            session.close()
+        typer.echo(f"📥 Adopted {pdf_cache.adopt(paths)} PDF files into the object store")
+    if verify:
+        result = pdf_cache.verify()
+        typer.echo(f"🔍 Verified {result['ok']} PDFs: {result['corrupt']} corrupt, "
+                   f"{result['missing']} missing, {result['relinked']} relinked")
+    if max_mb is not None:
+        freed = pdf_cache.evict(int(max_mb * 1024 * 1024))
+        typer.echo(f"🧹 Evicted {freed / 1e6:.1f} MB")
+
+    stats = pdf_cache.stats()
+    total = stats.pop("total")
+    rows = [{"Vendor": vendor, "Files": s["files"], "MB": round(s["bytes"] / 1e6, 1)}
+            for vendor, s in sorted(stats.items())]
+    typer.echo(f"\n📁 PDF Cache: {pdf_cache.root}\n")
+    print(tabulate(rows, headers="keys", tablefmt="grid"))
+    typer.echo(f"\n{total['files']} unique PDFs, {total['bytes'] / 1e6:.1f} MB on disk "
+               f"(limit {pdf_cache.max_bytes / 1e6:.0f} MB)")
+
+
 @app.command()
 def list_vendors():
     """List all vendors in the database with their data counts."""
+    from .pdf_cache import shared_pdf_cache, vendor_dir_name
+    pdf_cache = shared_pdf_cache()
     session = SessionLocal()
     try:
         manufacturers = session.query(Manufacturer).all()
@@ -238,14 +286,8 @@ def list_vendors():
                         html_count += 1
             
             # Check cache
-            cache_names = ["coherent", "hübner_photonics_cobolt", "omicron", "oxxius"]
-            cache_pdfs = 0
-            for cache_name in cache_names:
-                if mfr.name.lower() in cache_name or cache_name in mfr.name.lower():
-                    cache_path = f"data/pdf_cache/{cache_name}"
-                    if os.path.exists(cache_path):
-                        cache_pdfs = len(os.listdir(cache_path))
-                        break
+            cache_path = pdf_cache.root / vendor_dir_name(mfr.name)
+            cache_pdfs = len(os.listdir(cache_path)) if cache_path.exists() else 0
             
             data.append({
                 "Vendor": mfr.name,
@@ -263,5 +305,121 @@ def list_vendors():
         session.close()
 
 
+
+@app.command()
+def export(
+    out_dir: str = typer.Option("data/export", help="Export root directory"),
+    file_format: str = typer.Option("parquet", "--format", help="parquet or arrow (Arrow IPC)"),
+):
+    """Export normalized and raw specs to partitioned Parquet/Arrow datasets."""
+    from .export import export_catalog
+
+    try:
+        counts = export_catalog(out_dir, file_format)
+    except ValueError as e:
+        typer.echo(f"❌ {e}")
+        raise typer.Exit(1)
+
+    typer.echo(f"\n📦 Exported to {out_dir} ({file_format}, partitioned by vendor/month)")
+    print(tabulate([{"Dataset": k, "Rows": v} for k, v in counts.items()], headers="keys"))
+
+
+
+@app.command()
+def query(
+    wavelength: float = typer.Option(None, help="Target wavelength in nm"),
+    wl_tol: float = typer.Option(5.0, help="Wavelength tolerance (± nm) for range matching"),
+    power_min: float = typer.Option(None, help="Minimum nominal output power (mW)"),
+    power_max: float = typer.Option(None, help="Maximum nominal output power (mW)"),
+    noise_max: float = typer.Option(None, help="Maximum RMS noise (%)"),
+    stability_max: float = typer.Option(None, help="Maximum power stability (%)"),
+    vendor: str = typer.Option(None, help="Only this vendor (exact name)"),
+    segment: str = typer.Option(None, help="Only this segment id"),
+    nearest: int = typer.Option(0, help="Rank the N nearest models to --wavelength/--power instead of filtering by wavelength"),
+    power: float = typer.Option(None, help="Target output power (mW) for --nearest"),
+):
+    """Query the latest specs by range, e.g. 488±5 nm, 50–150 mW, noise <0.2%."""
+    from .catalog import SpecCatalog
+
+    catalog = SpecCatalog.from_db(segment_id=segment)
+    ranges = {}
+    if power_min is not None or power_max is not None:
+        ranges["output_power_mw_nominal"] = (power_min, power_max)
+    if noise_max is not None:
+        ranges["rms_noise_pct"] = (None, noise_max)
+    if stability_max is not None:
+        ranges["power_stability_pct"] = (None, stability_max)
+
+    if nearest:
+        target = {}
+        if wavelength is not None:
+            target["wavelength_nm"] = wavelength
+        if power is not None:
+            target["output_power_mw_nominal"] = power
+        if not target:
+            typer.echo("❌ --nearest needs --wavelength and/or --power")
+            raise typer.Exit(1)
+        rows = catalog.nearest(k=nearest, filters=dict(vendor=vendor, **ranges), **target)
+    else:
+        if wavelength is not None:
+            ranges["wavelength_nm"] = (wavelength - wl_tol, wavelength + wl_tol)
+        rows = catalog.query(vendor=vendor, **ranges)
+
+    typer.echo(f"\n🔎 {len(rows)} of {len(catalog)} models match\n")
+    if rows:
+        columns = ["vendor", "model", "wavelength_nm", "output_power_mw_nominal",
+                   "rms_noise_pct", "power_stability_pct"]
+        if nearest:
+            columns.append("distance")
+        print(tabulate([{c: r.get(c) for c in columns} for r in rows], headers="keys"))
+
+
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", help="Interface to listen on"),
+    port: int = typer.Option(8765, help="TCP port (env LASER_CI_WORKER_PORT for submit)"),
+    warm: bool = typer.Option(True, help="Load Docling and Chromium before accepting jobs"),
+    browser: bool = typer.Option(True, help="Keep a Chromium browser resident"),
+    config_path: str = typer.Option("config/competitors.yml", help="Config for crawl jobs"),
+):
+    """Run a warm worker that keeps Docling, a browser and DB connections resident."""
+    from .worker import serve as serve_worker
+
+    serve_worker(host=host, port=port, warm=warm, browser=browser, config_path=config_path)
+
+
+@app.command()
+def submit(
+    job: str = typer.Argument(..., help="crawl, extract_pdf, normalize, ping or shutdown"),
+    vendor: str = typer.Option(None, help="crawl: vendor/scraper filter (e.g., omicron)"),
+    path: str = typer.Option(None, help="extract_pdf: local PDF path"),
+    url: str = typer.Option(None, help="extract_pdf: PDF URL"),
+    product_id: int = typer.Option(None, help="normalize: product id"),
+    force_refresh: bool = typer.Option(False, help="crawl: re-download everything"),
+    host: str = typer.Option("127.0.0.1", help="Worker host"),
+    port: int = typer.Option(None, help="Worker port (default 8765)"),
+):
+    """Send a job to a running `serve` worker."""
+    import json
+    from .worker import submit_job, DEFAULT_PORT
+
+    params = {"vendor": vendor, "path": path, "url": url, "product_id": product_id}
+    if force_refresh:
+        params["force_refresh"] = True
+    try:
+        response = submit_job(job, host=host, port=port or DEFAULT_PORT, **params)
+    except OSError as e:
+        typer.echo(f"❌ Could not reach worker at {host}:{port or DEFAULT_PORT}: {e}")
+        raise typer.Exit(1)
+
+    if not response.get("ok"):
+        typer.echo(f"❌ {response.get('error')}")
+        raise typer.Exit(1)
+    typer.echo(json.dumps(response.get("result"), indent=2, ensure_ascii=False, default=str))
+    if "seconds" in response:
+        typer.echo(f"✅ {job} done in {response['seconds']:.2f}s")
+
+
 if __name__ == "__main__":
     app()
@@ -1,6 +1,12 @@
+from typing import Dict, Tuple
+import requests
 from ruamel.yaml import YAML
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from .db import SessionLocal, bootstrap_db
 from .models import Manufacturer, Product
+from .pdf_cache import shared_pdf_cache
+from .resilience import fetch_metrics, shared_fetcher
 from .scrapers.coherent import CoherentScraper
 from .scrapers.hubner_cobolt import CoboltScraper
 from .scrapers.omicron_luxx import OmicronLuxxScraper
@@ -8,82 +14,99 @@ from .scrapers.oxxius_lbx import OxxiusLbxScraper
 from .scrapers.lumencor import LumencorScraper
 
 
-def seed_from_config(path="config/competitors.yml"):
+def load_config(path="config/competitors.yml"):
     yaml = YAML(typ="safe")
     with open(path) as f:
-        cfg = yaml.load(f)
+        return yaml.load(f)
+
+
+def sync_config_to_db(cfg, session) -> Dict[Tuple[str, str, str], int]:
+    """
+    Reconcile the config's vendors and products with the DB in a constant
+    number of set-based statements: insert missing manufacturers, insert
+    missing products, then read back every configured product's id.
+    Existing rows are left as they are. Returns
+    {(vendor_name, segment_id, product_name): product_id}; the caller commits.
+    """
+    vendors = {}
+    for v in cfg["vendors"]:
+        vendors.setdefault(v["name"], v.get("homepage"))
+    if not vendors:
+        return {}
+
+    session.execute(
+        sqlite_insert(Manufacturer).on_conflict_do_nothing(index_elements=["name"]),
+        [{"name": name, "homepage": homepage} for name, homepage in vendors.items()],
+    )
+    man_ids = dict(
+        session.execute(
+            select(Manufacturer.name, Manufacturer.id).where(Manufacturer.name.in_(list(vendors)))
+        ).all()
+    )
+
+    products = {}
+    for v in cfg["vendors"]:
+        for seg in v["segments"]:
+            for p in seg["products"]:
+                products.setdefault(
+                    (v["name"], seg["id"], p["name"]),
+                    {
+                        "manufacturer_id": man_ids[v["name"]],
+                        "segment_id": seg["id"],
+                        "name": p["name"],
+                        "product_url": p.get("product_url"),
+                    },
+                )
+    if not products:
+        return {}
+
+    session.execute(
+        sqlite_insert(Product).on_conflict_do_nothing(
+            index_elements=["manufacturer_id", "segment_id", "name"]
+        ),
+        list(products.values()),
+    )
+    vendor_by_id = {mid: name for name, mid in man_ids.items()}
+    rows = session.execute(
+        select(Product.id, Product.manufacturer_id, Product.segment_id, Product.name)
+        .where(Product.manufacturer_id.in_(list(vendor_by_id)))
+    )
+    id_map = {}
+    for pid, mid, segment_id, name in rows:
+        key = (vendor_by_id[mid], segment_id, name)
+        if key in products:
+            id_map[key] = pid
+    return id_map
+
+
+def seed_from_config(path="config/competitors.yml"):
+    cfg = load_config(path)
     s = SessionLocal()
     try:
-        for v in cfg["vendors"]:
-            m = s.query(Manufacturer).filter_by(name=v["name"]).one_or_none()
-            if not m:
-                m = Manufacturer(name=v["name"], homepage=v.get("homepage"))
-                s.add(m)
-                s.flush()
-            for seg in v["segments"]:
-                for p in seg["products"]:
-                    exists = (
-                        s.query(Product)
-                        .filter_by(
-                            manufacturer_id=m.id, segment_id=seg["id"], name=p["name"]
-                        )
-                        .one_or_none()
-                    )
-                    if not exists:
-                        s.add(
-                            Product(
-                                manufacturer_id=m.id,
-                                segment_id=seg["id"],
-                                name=p["name"],
-                                product_url=p.get("product_url"),
-                            )
-                        )
+        sync_config_to_db(cfg, s)
         s.commit()
     finally:
         s.close()
 
 
 def run_scrapers_from_config(path="config/competitors.yml", force_refresh=False, scraper_filter=None):
-    yaml = YAML(typ="safe")
-    with open(path) as f:
-        cfg = yaml.load(f)
+    cfg = load_config(path)
     s = SessionLocal()
     try:
-        pid_map = {
-            (p.manufacturer_id, p.segment_id, p.name): p.id
-            for p in s.query(Product).all()
-        }
+        pid_map = sync_config_to_db(cfg, s)
+        s.commit()
     finally:
         s.close()
 
     def make_targets(vendor_name, seg):
-        # rebuild Product ids per vendor/segment/name
-        s2 = SessionLocal()
-        try:
-            from sqlalchemy import select
-            from .models import Manufacturer, Product
-
-            man = s2.query(Manufacturer).filter_by(name=vendor_name).one()
-            targets = []
-            for p in seg["products"]:
-                pid = (
-                    s2.query(Product)
-                    .filter_by(
-                        manufacturer_id=man.id, segment_id=seg["id"], name=p["name"]
-                    )
-                    .one()
-                    .id
-                )
-                targets.append(
-                    {
-                        "product_id": pid,
-                        "product_url": p.get("product_url"),
-                        "datasheets": p.get("datasheets", []),
-                    }
-                )
-            return targets
-        finally:
-            s2.close()
+        return [
+            {
+                "product_id": pid_map[(vendor_name, seg["id"], p["name"])],
+                "product_url": p.get("product_url"),
+                "datasheets": p.get("datasheets", []),
+            }
+            for p in seg["products"]
+        ]
 
     def should_run_scraper(vendor_name: str, scraper_filter: str) -> bool:
         """Check if a scraper should run based on the filter"""
@@ -148,6 +171,42 @@ def run_scrapers_from_config(path="config/competitors.yml", force_refresh=False,
         print("  - lumencor (or celesta, spectra, sola)")
         return
     
+    fetcher = shared_fetcher()
+    fetcher.reset()
     for sc in scrapers:
         print(f"\nRunning {sc.vendor()} scraper...")
-        sc.run()
+        sc.pdf_extractor.reset_tier_stats()
+        try:
+            sc.run()
+        except requests.RequestException as e:
+            # An unreachable vendor stops its own scraper, not the whole crawl
+            print(f"  ✗ {sc.vendor()} scraper stopped: {e}")
+        for line in sc.pdf_extractor.format_tier_stats():
+            print(f"  → PDF tier {line}")
+        for line in sc.format_browser_stats():
+            print(f"  → Browser {line}")
+
+    shared_pdf_cache().flush()
+    tag_features()
+    print_fetch_stats()
+    return fetch_metrics()
+
+
+def print_fetch_stats():
+    """Per-host failure accounting for the crawl just run."""
+    for line in shared_fetcher().format_stats():
+        print(f"  → Fetch {line}")
+
+
+def tag_features():
+    """Tag features of products whose documents changed in this crawl."""
+    from .features import refresh_product_features
+
+    s = SessionLocal()
+    try:
+        tagged = refresh_product_features(s)
+        s.commit()
+    finally:
+        s.close()
+    if tagged:
+        print(f"  → Feature tags updated for {tagged} products")
@@ -5,6 +5,9 @@ Unified crawler that supports both smart discovery and static configurations.
 from ruamel.yaml import YAML
 from .db import SessionLocal, bootstrap_db
 from .models import Manufacturer, Product
+from .crawler import tag_features, print_fetch_stats
+from .pdf_cache import shared_pdf_cache
+from .resilience import shared_fetcher
 
 # Import unified scrapers
 from .scrapers.unified_coherent import UnifiedCoherentScraper
@@ -45,7 +48,8 @@ def run_unified_scrapers(
     config_path: str = "config/target_products.yml",
     force_refresh: bool = False,
     vendor_filter: str = None,
-    use_smart: bool = None
+    use_smart: bool = None,
+    discovery_mode: str = None
 ):
     """
     Run unified scrapers with smart discovery support.
@@ -55,6 +59,8 @@ def run_unified_scrapers(
         force_refresh: Force refresh all content (ignore SHA-256 cache)
         vendor_filter: Optional filter to run specific vendor
         use_smart: Override discovery mode (None = use config setting)
+        discovery_mode: Override discovery mode by name ("smart", "sitemap" or
+            "static"); takes precedence over use_smart
     """
     yaml = YAML(typ="safe")
     with open(config_path) as f:
@@ -84,6 +90,7 @@ def run_unified_scrapers(
         vendor_filter = alias_map.get(vendor_filter.lower(), vendor_filter)
     
     scrapers_run = 0
+    shared_fetcher().reset()
     
     for vendor_cfg in cfg["vendors"]:
         vendor_name = vendor_cfg["name"]
@@ -99,8 +106,10 @@ def run_unified_scrapers(
             continue
         
         # Override discovery mode if requested
-        if use_smart is not None:
-            vendor_cfg["discovery_mode"] = "smart" if use_smart else "static"
+        if discovery_mode is None and use_smart is not None:
+            discovery_mode = "smart" if use_smart else "static"
+        if discovery_mode is not None:
+            vendor_cfg["discovery_mode"] = discovery_mode
         
         print(f"\nRunning {vendor_name} scraper...")
         print(f"  Config: {config_path}")
@@ -110,6 +119,7 @@ def run_unified_scrapers(
         try:
             # Create and run scraper
             scraper = scraper_class(config_path=config_path, force_refresh=force_refresh)
+            scraper.discovery_mode = vendor_cfg.get("discovery_mode", "static")
             scraper.run()
             scrapers_run += 1
         except Exception as e:
@@ -121,6 +131,11 @@ def run_unified_scrapers(
         for vendor in cfg["vendors"]:
             print(f"  - {vendor['name']}")
     
+    shared_pdf_cache().flush()
+    if scrapers_run:
+        tag_features()
+        print_fetch_stats()
+    
     return scrapers_run
 
 
@@ -1,5 +1,5 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 
@@ -14,5 +14,34 @@ SessionLocal = sessionmaker(
 )
 
 def bootstrap_db():
+    from sqlalchemy import inspect
     from .models import Base
+    inspector = inspect(engine)
+    had_change_log = inspector.has_table("spec_changes")
+    had_features = inspector.has_table("product_features")
+    needs_matrix = inspector.has_table("raw_documents") and "model_matrix" not in {
+        c["name"] for c in inspector.get_columns("raw_documents")
+    }
     Base.metadata.create_all(engine)
+    if needs_matrix:
+        # New column on an existing table; normalization fills it in as it reads documents
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE raw_documents ADD COLUMN model_matrix JSON"))
+    if not had_change_log:
+        # New change-log table on an existing database: fill it from history once
+        from .changes import backfill_spec_changes
+        s = SessionLocal()
+        try:
+            backfill_spec_changes(s)
+            s.commit()
+        finally:
+            s.close()
+    if not had_features:
+        # Same for feature tags of already crawled documents
+        from .features import refresh_product_features
+        s = SessionLocal()
+        try:
+            refresh_product_features(s)
+            s.commit()
+        finally:
+            s.close()
@@ -3,86 +3,179 @@ Enhanced reporting system for comprehensive competitive intelligence analysis.
 
 This module provides detailed reports comparing Coherent products against competitors,
 including market positioning, technical advantages, and feature comparisons.
+
+All sections render from one ReportDataset loaded with a handful of queries
+per run. Sections are rendered concurrently and memoized by the dataset
+hash and the report code version (in memory and under data/report_cache/),
+so re-rendering unchanged data skips the section work entirely.
 """
 
 from datetime import datetime, timedelta
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Dict, List, Any, Optional
+import hashlib
 import json
+import threading
 from sqlalchemy import select
 from .db import SessionLocal
-from .models import Manufacturer, Product, NormalizedSpec, RawDocument
+from .features import FEATURE_NAMES
+from .models import Manufacturer, Product, NormalizedSpec, ProductFeature
+
+REPORT_CACHE_DIR = "data/report_cache"
+
+# Bump when section output changes in ways the source digest below cannot see
+REPORT_FORMAT_VERSION = 1
+# Cached sections are only reused by the code that rendered them
+_CODE_DIGEST = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+
+# Sections of the full report, in output order
+REPORT_SECTIONS = ["executive_summary", "market_positioning", "technical_comparison",
+                   "feature_comparison", "recommendations"]
+
+# (cache key, section) -> rendered markdown
+_SECTION_CACHE: Dict[tuple, str] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+class ReportDataset:
+    """Everything the report sections read, loaded once with set-based queries."""
+
+    def __init__(self, vendors: List[str], products: List[Dict], specs: List[Dict],
+                 feature_masks: Dict[int, int]):
+        self.vendors = vendors          # manufacturer names, sorted
+        self.products = products        # one dict per product, in id order
+        self.specs = specs              # one dict per normalized snapshot, in id order
+        self.feature_masks = feature_masks  # product_id -> feature bitmask
+        self.products_by_id = {p['id']: p for p in products}
+        self._digest = None
+
+    @classmethod
+    def load(cls, session) -> "ReportDataset":
+        vendors = list(session.execute(select(Manufacturer.name).order_by(Manufacturer.name)).scalars())
+        products = [
+            {'id': pid, 'name': name, 'segment_id': segment_id, 'vendor': vendor}
+            for pid, name, segment_id, vendor in session.execute(
+                select(Product.id, Product.name, Product.segment_id, Manufacturer.name)
+                .join(Manufacturer, Product.manufacturer_id == Manufacturer.id)
+                .order_by(Product.id)
+            )
+        ]
+        specs = [
+            dict(row._mapping) for row in session.execute(
+                select(NormalizedSpec.product_id, NormalizedSpec.wavelength_nm,
+                       NormalizedSpec.output_power_mw_nominal, NormalizedSpec.rms_noise_pct,
+                       NormalizedSpec.power_stability_pct, NormalizedSpec.linewidth_mhz,
+                       NormalizedSpec.m2)
+                .order_by(NormalizedSpec.id)
+            )
+        ]
+        feature_masks = dict(
+            session.execute(select(ProductFeature.product_id, ProductFeature.feature_mask)).all()
+        )
+        return cls(vendors, products, specs, feature_masks)
+
+    @property
+    def digest(self) -> str:
+        """SHA-256 over the dataset content; equal digests render equal sections."""
+        if self._digest is None:
+            masks = sorted(self.feature_masks.items())
+            payload = json.dumps([self.vendors, self.products, self.specs, masks],
+                                 sort_keys=True, default=str, ensure_ascii=False)
+            self._digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return self._digest
 
 
 class CompetitiveIntelligenceReport:
     """Generate comprehensive competitive intelligence reports."""
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = REPORT_CACHE_DIR):
         self.session = SessionLocal()
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._dataset = None
+        self._unsaved = False
         
     def __enter__(self):
         return self
         
     def __exit__(self, exc_type, exc_val, exc_tb):
+        # Sections rendered one at a time are persisted once, here
+        if self._unsaved:
+            self._save_cache()
         self.session.close()
+
+    @property
+    def dataset(self) -> ReportDataset:
+        """The report data, loaded on first use and shared by all sections."""
+        if self._dataset is None:
+            self._dataset = ReportDataset.load(self.session)
+        return self._dataset
+
+    @property
+    def cache_key(self) -> str:
+        """Dataset digest qualified by the report format and code version."""
+        return f"{self.dataset.digest}-v{REPORT_FORMAT_VERSION}-{_CODE_DIGEST}"
     
     def generate_executive_summary(self) -> str:
         """Generate executive summary of competitive landscape."""
         lines = ["# Competitive Intelligence Executive Summary", ""]
         lines.append(f"*Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}*")
         lines.append("")
-        
-        # Get vendor summary
-        vendors = self.session.execute(
-            select(Manufacturer).order_by(Manufacturer.name)
-        ).scalars().all()
-        
+        lines.append(self._render_section("executive_summary"))
+        return "\n".join(lines)
+
+    def _executive_summary_body(self, data: ReportDataset) -> str:
+        lines = []
         lines.append("## Market Overview")
-        lines.append(f"- **Total Vendors Monitored**: {len(vendors)}")
-        lines.append(f"- **Vendors**: {', '.join([v.name for v in vendors])}")
+        lines.append(f"- **Total Vendors Monitored**: {len(data.vendors)}")
+        lines.append(f"- **Vendors**: {', '.join(data.vendors)}")
         lines.append("")
         
         # Product count by vendor
+        products_by_vendor = defaultdict(list)
+        for p in data.products:
+            products_by_vendor[p['vendor']].append(p['name'])
+
         lines.append("## Product Portfolio")
-        for vendor in vendors:
-            products = self.session.query(Product).filter_by(manufacturer_id=vendor.id).all()
-            is_coherent = vendor.name == "Coherent"
+        for vendor in data.vendors:
+            products = products_by_vendor.get(vendor, [])
+            is_coherent = vendor == "Coherent"
             marker = "**" if is_coherent else ""
-            lines.append(f"- {marker}{vendor.name}{marker}: {len(products)} products")
-            for p in products:
-                lines.append(f"  - {p.name}")
+            lines.append(f"- {marker}{vendor}{marker}: {len(products)} products")
+            for name in products:
+                lines.append(f"  - {name}")
         lines.append("")
         
         return "\n".join(lines)
     
     def generate_technical_comparison(self) -> str:
         """Generate detailed technical comparison report."""
+        return self._render_section("technical_comparison")
+
+    def _technical_comparison_body(self, data: ReportDataset) -> str:
         lines = ["## Technical Specifications Comparison", ""]
         
-        # Get all normalized specs grouped by wavelength
+        # Group all normalized specs by wavelength
         specs_by_wavelength = defaultdict(list)
         
-        results = self.session.execute(
-            select(NormalizedSpec, Product, Manufacturer)
-            .join(Product, NormalizedSpec.product_id == Product.id)
-            .join(Manufacturer, Product.manufacturer_id == Manufacturer.id)
-            .order_by(NormalizedSpec.wavelength_nm, Manufacturer.name)
-        ).all()
+        results = [(spec, data.products_by_id[spec['product_id']]) for spec in data.specs
+                   if spec['product_id'] in data.products_by_id]
+        results.sort(key=lambda r: (r[0]['wavelength_nm'] or 0, r[1]['vendor']))
         
-        for spec, product, manufacturer in results:
-            if spec.wavelength_nm:
-                wl_band = int(round(spec.wavelength_nm))
+        for spec, product in results:
+            if spec['wavelength_nm']:
+                wl_band = int(round(spec['wavelength_nm']))
                 specs_by_wavelength[wl_band].append({
-                    'vendor': manufacturer.name,
-                    'product': product.name,
-                    'power_mw': spec.output_power_mw_nominal,
-                    'noise_pct': spec.rms_noise_pct,
-                    'stability_pct': spec.power_stability_pct,
-                    'linewidth_mhz': spec.linewidth_mhz,
-                    'beam_quality': spec.m2,
-                    'is_coherent': manufacturer.name == "Coherent"
+                    'vendor': product['vendor'],
+                    'product': product['name'],
+                    'power_mw': spec['output_power_mw_nominal'],
+                    'noise_pct': spec['rms_noise_pct'],
+                    'stability_pct': spec['power_stability_pct'],
+                    'linewidth_mhz': spec['linewidth_mhz'],
+                    'beam_quality': spec['m2'],
+                    'is_coherent': product['vendor'] == "Coherent"
                 })
-        
         # Generate comparison tables
         for wavelength in sorted(specs_by_wavelength.keys()):
             products = specs_by_wavelength[wavelength]
@@ -160,75 +253,27 @@ class CompetitiveIntelligenceReport:
         return advantages
     
     def generate_feature_comparison(self) -> str:
-        """Generate feature comparison from raw specs."""
+        """Generate feature comparison from the products' feature tags."""
+        return self._render_section("feature_comparison")
+
+    def _feature_comparison_body(self, data: ReportDataset) -> str:
         lines = ["## Feature Comparison", ""]
         
-        # Get raw specs for feature analysis
-        results = self.session.execute(
-            select(RawDocument, Product, Manufacturer)
-            .join(Product, RawDocument.product_id == Product.id)
-            .join(Manufacturer, Product.manufacturer_id == Manufacturer.id)
-            .where(RawDocument.raw_specs != None)
-            .order_by(Manufacturer.name, Product.name)
-        ).all()
+        # Feature bitmasks tagged at crawl time (see features.py), merged per row label
+        feature_matrix = defaultdict(int)
+        for product_id, mask in data.feature_masks.items():
+            product = data.products_by_id.get(product_id)
+            if product and mask:
+                feature_matrix[f"{product['vendor']} - {product['name']}"] |= mask
         
-        feature_matrix = defaultdict(lambda: defaultdict(str))
-        all_features = set()
-        
-        for doc, product, manufacturer in results:
-            if doc.raw_specs:
-                try:
-                    # raw_specs might be dict or JSON string
-                    if isinstance(doc.raw_specs, dict):
-                        specs = doc.raw_specs
-                    else:
-                        specs = json.loads(doc.raw_specs)
-                    key = f"{manufacturer.name} - {product.name}"
-                    
-                    # Extract key features
-                    feature_mappings = {
-                        'TTL Modulation': ['TTL', 'ttl', 'TTL shutter'],
-                        'Analog Modulation': ['Analog', 'analog modulation'],
-                        'RS-232': ['RS-232', 'RS232', 'serial'],
-                        'USB Control': ['USB', 'usb'],
-                        'Ethernet': ['Ethernet', 'ethernet'],
-                        'Fiber Output': ['fiber', 'Fiber Output', 'FC/PC', 'FC/APC'],
-                        'Temperature Control': ['TEC', 'temperature control', 'Temperature Range'],
-                        'Power Monitoring': ['power monitor', 'Power Monitoring'],
-                    }
-                    
-                    for feature_name, keywords in feature_mappings.items():
-                        for keyword in keywords:
-                            if any(keyword in str(v) for v in specs.values()):
-                                feature_matrix[key][feature_name] = "✓"
-                                all_features.add(feature_name)
-                                break
-                    
-                    # Add control interfaces
-                    if 'Control Interfaces' in specs:
-                        interfaces = specs['Control Interfaces']
-                        if 'TTL' in interfaces:
-                            feature_matrix[key]['TTL Modulation'] = "✓"
-                            all_features.add('TTL Modulation')
-                        if 'USB' in interfaces:
-                            feature_matrix[key]['USB Control'] = "✓"
-                            all_features.add('USB Control')
-                        if 'RS-232' in interfaces:
-                            feature_matrix[key]['RS-232'] = "✓"
-                            all_features.add('RS-232')
-                        if 'Ethernet' in interfaces:
-                            feature_matrix[key]['Ethernet'] = "✓"
-                            all_features.add('Ethernet')
-                            
-                except json.JSONDecodeError:
-                    continue
+        all_features = 0
+        for mask in feature_matrix.values():
+            all_features |= mask
         
         if feature_matrix and all_features:
-            # Sort features by importance
-            feature_order = ['TTL Modulation', 'Analog Modulation', 'USB Control', 
-                           'RS-232', 'Ethernet', 'Fiber Output', 
-                           'Temperature Control', 'Power Monitoring']
-            ordered_features = [f for f in feature_order if f in all_features]
+            # Features in order of importance (FEATURES order)
+            ordered_bits = [bit for bit in range(len(FEATURE_NAMES)) if all_features >> bit & 1]
+            ordered_features = [FEATURE_NAMES[bit] for bit in ordered_bits]
             
             # Create feature comparison table
             lines.append("| Product | " + " | ".join(ordered_features) + " |")
@@ -242,9 +287,8 @@ class CompetitiveIntelligenceReport:
                 is_coherent = product.startswith("Coherent")
                 prod_name = f"**{product}**" if is_coherent else product
                 row = [prod_name]
-                for feature in ordered_features:
-                    value = feature_matrix[product].get(feature, "")
-                    row.append(value)
+                for bit in ordered_bits:
+                    row.append("✓" if feature_matrix[product] >> bit & 1 else "")
                 lines.append("| " + " | ".join(row) + " |")
             
             lines.append("")
@@ -253,26 +297,27 @@ class CompetitiveIntelligenceReport:
     
     def generate_market_positioning(self) -> str:
         """Generate market positioning analysis."""
+        return self._render_section("market_positioning")
+
+    def _market_positioning_body(self, data: ReportDataset) -> str:
         lines = ["## Market Positioning Analysis", ""]
         
         # Analyze by segment
         segments = defaultdict(list)
         
-        results = self.session.execute(
-            select(Product, Manufacturer, NormalizedSpec)
-            .join(Manufacturer, Product.manufacturer_id == Manufacturer.id)
-            .outerjoin(NormalizedSpec, Product.id == NormalizedSpec.product_id)
-            .order_by(Product.segment_id, Manufacturer.name)
-        ).all()
-        
-        for product, manufacturer, spec in results:
-            segments[product.segment_id].append({
-                'vendor': manufacturer.name,
-                'product': product.name,
-                'has_specs': spec is not None,
-                'power': spec.output_power_mw_nominal if spec else None,
-                'wavelength': spec.wavelength_nm if spec else None
-            })
+        specs_by_product = defaultdict(list)
+        for spec in data.specs:
+            specs_by_product[spec['product_id']].append(spec)
+        
+        for product in sorted(data.products, key=lambda p: (p['segment_id'] or "", p['vendor'])):
+            for spec in specs_by_product.get(product['id']) or [None]:
+                segments[product['segment_id']].append({
+                    'vendor': product['vendor'],
+                    'product': product['name'],
+                    'has_specs': spec is not None,
+                    'power': spec['output_power_mw_nominal'] if spec else None,
+                    'wavelength': spec['wavelength_nm'] if spec else None
+                })
         
         for segment, products in segments.items():
             lines.append(f"### {segment.replace('_', ' ').title()}")
@@ -308,18 +353,67 @@ class CompetitiveIntelligenceReport:
     
     def generate_full_report(self) -> str:
         """Generate comprehensive competitive intelligence report."""
-        sections = []
+        # Sections only read the shared dataset, so they render in parallel
+        with ThreadPoolExecutor(max_workers=len(REPORT_SECTIONS)) as pool:
+            bodies = dict(zip(REPORT_SECTIONS, pool.map(self._render_section, REPORT_SECTIONS)))
+        if self._unsaved:
+            self._save_cache()
         
-        # Add all sections
-        sections.append(self.generate_executive_summary())
-        sections.append(self.generate_market_positioning())
-        sections.append(self.generate_technical_comparison())
-        sections.append(self.generate_feature_comparison())
-        
-        # Add recommendations
-        sections.append(self._generate_recommendations())
+        header = ["# Competitive Intelligence Executive Summary", "",
+                  f"*Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}*", ""]
+        sections = ["\n".join(header + [bodies["executive_summary"]])]
+        sections.extend(bodies[name] for name in REPORT_SECTIONS[1:])
         
         return "\n".join(sections)
+
+    def _render_section(self, name: str) -> str:
+        """Render one section body, memoized by the cache key."""
+        data = self.dataset
+        cache_key = self.cache_key
+        key = (cache_key, name)
+        if key in _SECTION_CACHE:
+            return _SECTION_CACHE[key]
+
+        cache_file = self.cache_dir / f"{cache_key}.json" if self.cache_dir else None
+        if cache_file and cache_file.exists():
+            try:
+                cached = json.loads(cache_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                cached = {}
+            for section, text in cached.items():
+                _SECTION_CACHE[(cache_key, section)] = text
+            if key in _SECTION_CACHE:
+                return _SECTION_CACHE[key]
+
+        renderers = {
+            "executive_summary": self._executive_summary_body,
+            "market_positioning": self._market_positioning_body,
+            "technical_comparison": self._technical_comparison_body,
+            "feature_comparison": self._feature_comparison_body,
+            "recommendations": lambda _data: self._generate_recommendations(),
+        }
+        text = renderers[name](data)
+        _SECTION_CACHE[key] = text
+        self._unsaved = True
+        return text
+
+    def _save_cache(self):
+        """Persist every section rendered so far for this cache key."""
+        self._unsaved = False
+        if not self.cache_dir:
+            return
+        cache_key = self.cache_key
+        cache_file = self.cache_dir / f"{cache_key}.json"
+        with _CACHE_LOCK:
+            sections = {section: _SECTION_CACHE[(cache_key, section)]
+                        for section in REPORT_SECTIONS if (cache_key, section) in _SECTION_CACHE}
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp = cache_file.with_suffix(".tmp")
+                tmp.write_text(json.dumps(sections, ensure_ascii=False), encoding="utf-8")
+                tmp.replace(cache_file)
+            except OSError as e:
+                print(f"  → Could not write report cache: {e}")
     
     def _generate_recommendations(self) -> str:
         """Generate strategic recommendations based on analysis."""
@@ -0,0 +1,313 @@
+"""
+Columnar export of the spec catalog to partitioned Parquet / Arrow IPC files.
+
+Three datasets are written under the export root, each hive-partitioned by
+vendor and month (vendor=Coherent/month=2025-08/...):
+
+    latest     newest normalized snapshot per product model
+    history    every NormalizedSpec row
+    raw_specs  raw vendor specs flattened to one row per (document, spec)
+
+Rows are read with set-based SQL (no ORM hydration). Readers open the files
+memory-mapped, so analytical consumers scan the catalog without copying it.
+"""
+
+import os
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+from pyarrow import fs
+from sqlalchemy import select
+
+from .db import engine as default_engine
+from .models import Manufacturer, Product, RawDocument, NormalizedSpec
+
+EXPORT_ROOT = "data/export"
+DATASETS = ("latest", "history", "raw_specs")
+FORMATS = {"parquet": "parquet", "arrow": "ipc"}
+PARTITIONING = ["vendor", "month"]
+MANIFEST = "manifest.json"
+
+# Spec value columns, in NormalizedSpec table order
+SPEC_COLUMNS = [
+    c.name for c in NormalizedSpec.__table__.columns
+    if c.name not in {"id", "product_id", "snapshot_ts", "source_raw_id"}
+]
+
+# Spec columns are typed from the NormalizedSpec schema
+_BOOL_SPECS = {"ttl_shutter", "fiber_output"}
+_STRING_SPECS = {"polarization"}
+_JSON_SPECS = {"dimensions_mm", "vendor_fields"}
+
+
+def _spec_type(key: str) -> pa.DataType:
+    if key in _BOOL_SPECS:
+        return pa.bool_()
+    if key in _STRING_SPECS or key in _JSON_SPECS:
+        return pa.string()
+    if key == "interfaces":
+        return pa.list_(pa.string())
+    return pa.float64()
+
+
+SPEC_SCHEMA = pa.schema(
+    [
+        ("spec_id", pa.int64()),
+        ("product_id", pa.int64()),
+        ("vendor", pa.string()),
+        ("segment_id", pa.string()),
+        ("product_name", pa.string()),
+        ("model", pa.string()),
+        ("snapshot_ts", pa.timestamp("us")),
+        ("month", pa.string()),
+    ]
+    + [(key, _spec_type(key)) for key in SPEC_COLUMNS]
+    + [("source_raw_id", pa.int64())]
+)
+
+RAW_SPEC_SCHEMA = pa.schema(
+    [
+        ("raw_id", pa.int64()),
+        ("product_id", pa.int64()),
+        ("vendor", pa.string()),
+        ("segment_id", pa.string()),
+        ("product_name", pa.string()),
+        ("url", pa.string()),
+        ("content_type", pa.string()),
+        ("fetched_at", pa.timestamp("us")),
+        ("month", pa.string()),
+        ("spec_name", pa.string()),
+        ("spec_value", pa.string()),
+    ]
+)
+
+
+def _month(ts: Optional[datetime]) -> str:
+    return f"{ts:%Y-%m}" if ts else "unknown"
+
+
+def _model_name(vendor_fields, product_name: str) -> str:
+    if isinstance(vendor_fields, dict) and vendor_fields.get("model"):
+        return str(vendor_fields["model"])
+    return product_name
+
+
+def _json_or_none(value) -> Optional[str]:
+    return None if value is None else json.dumps(value, ensure_ascii=False, sort_keys=True)
+
+
+def _interfaces(value) -> Optional[List[str]]:
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        return [str(v) for v in value]
+    return [str(value)]
+
+
+def _spec_table(conn) -> pa.Table:
+    """Every NormalizedSpec row joined to its product and vendor."""
+    spec_cols = [getattr(NormalizedSpec, key) for key in SPEC_COLUMNS]
+    rows = conn.execute(
+        select(
+            NormalizedSpec.id,
+            NormalizedSpec.product_id,
+            Manufacturer.name,
+            Product.segment_id,
+            Product.name,
+            NormalizedSpec.snapshot_ts,
+            NormalizedSpec.source_raw_id,
+            *spec_cols,
+        )
+        .join(Product, NormalizedSpec.product_id == Product.id)
+        .join(Manufacturer, Product.manufacturer_id == Manufacturer.id)
+        .order_by(NormalizedSpec.id)
+    ).all()
+
+    columns = list(zip(*rows)) if rows else [()] * (7 + len(spec_cols))
+    ids, pids, vendors, segments, names, stamps, source_ids = columns[:7]
+    specs = dict(zip(SPEC_COLUMNS, columns[7:]))
+
+    data = {
+        "spec_id": ids,
+        "product_id": pids,
+        "vendor": vendors,
+        "segment_id": segments,
+        "product_name": names,
+        "model": [_model_name(vf, name) for vf, name in zip(specs["vendor_fields"], names)],
+        "snapshot_ts": stamps,
+        "month": [_month(ts) for ts in stamps],
+        "source_raw_id": source_ids,
+    }
+    for key, values in specs.items():
+        if key in _JSON_SPECS:
+            values = [_json_or_none(v) for v in values]
+        elif key == "interfaces":
+            values = [_interfaces(v) for v in values]
+        data[key] = values
+    return pa.table({name: list(data[name]) for name in SPEC_SCHEMA.names}, schema=SPEC_SCHEMA)
+
+
+def _latest_rows(history: pa.Table) -> pa.Table:
+    """Keep the newest snapshot of each (product, model)."""
+    if history.num_rows == 0:
+        return history
+    ordered = history.sort_by([("snapshot_ts", "descending"), ("spec_id", "descending")])
+    seen, keep = set(), []
+    for i, key in enumerate(zip(ordered["product_id"].to_pylist(), ordered["model"].to_pylist())):
+        if key not in seen:
+            seen.add(key)
+            keep.append(i)
+    return ordered.take(pa.array(keep, pa.int64())).sort_by("spec_id")
+
+
+def _raw_spec_table(conn) -> pa.Table:
+    """Raw vendor specs, one row per (document, spec)."""
+    rows = conn.execute(
+        select(
+            RawDocument.id,
+            RawDocument.product_id,
+            Manufacturer.name,
+            Product.segment_id,
+            Product.name,
+            RawDocument.url,
+            RawDocument.content_type,
+            RawDocument.fetched_at,
+            RawDocument.raw_specs,
+        )
+        .join(Product, RawDocument.product_id == Product.id)
+        .join(Manufacturer, Product.manufacturer_id == Manufacturer.id)
+        .where(RawDocument.raw_specs.is_not(None))
+        .order_by(RawDocument.id)
+    ).all()
+
+    data = {name: [] for name in RAW_SPEC_SCHEMA.names}
+    for raw_id, pid, vendor, segment, name, url, ctype, fetched, raw_specs in rows:
+        if not isinstance(raw_specs, dict):
+            continue
+        month = _month(fetched)
+        for spec_name, spec_value in raw_specs.items():
+            data["raw_id"].append(raw_id)
+            data["product_id"].append(pid)
+            data["vendor"].append(vendor)
+            data["segment_id"].append(segment)
+            data["product_name"].append(name)
+            data["url"].append(url)
+            data["content_type"].append(ctype)
+            data["fetched_at"].append(fetched)
+            data["month"].append(month)
+            data["spec_name"].append(str(spec_name))
+            data["spec_value"].append(
+                spec_value if isinstance(spec_value, str) or spec_value is None
+                else json.dumps(spec_value, ensure_ascii=False)
+            )
+    return pa.table(data, schema=RAW_SPEC_SCHEMA)
+
+
+def _write_dataset(table: pa.Table, target: Path, file_format: str):
+    """
+    Write one partitioned dataset next to target, then swap it in: the
+    previous export is renamed aside, the new one renamed into place and
+    only then the old one deleted, so target is never left half-written.
+    """
+    staging = target.with_name(f".{target.name}.tmp")
+    previous = target.with_name(f".{target.name}.old")
+    for leftover in (staging, previous):
+        if leftover.exists():
+            shutil.rmtree(leftover)
+    staging.mkdir(parents=True)
+    if table.num_rows:
+        ds.write_dataset(
+            table,
+            staging,
+            format=FORMATS[file_format],
+            partitioning=PARTITIONING,
+            partitioning_flavor="hive",
+            basename_template="part-{i}." + file_format,
+        )
+    if target.exists():
+        os.replace(target, previous)
+    os.replace(staging, target)
+    if previous.exists():
+        shutil.rmtree(previous)
+
+
+def export_catalog(
+    out_dir: str = EXPORT_ROOT,
+    file_format: str = "parquet",
+    engine=None,
+) -> Dict[str, int]:
+    """
+    Export latest/history/raw_specs datasets under out_dir.
+    file_format is 'parquet' or 'arrow' (Arrow IPC, best for memory-mapping).
+    Returns {dataset: row count}.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown export format '{file_format}' (use parquet or arrow)")
+
+    root = Path(out_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    with (engine or default_engine).connect() as conn:
+        history = _spec_table(conn)
+        tables = {
+            "latest": _latest_rows(history),
+            "history": history,
+            "raw_specs": _raw_spec_table(conn),
+        }
+
+    counts = {}
+    for name, table in tables.items():
+        _write_dataset(table, root / name, file_format)
+        counts[name] = table.num_rows
+        print(f"  → Exported {name}: {table.num_rows} rows")
+
+    manifest = {
+        "exported_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "format": file_format,
+        "partitioning": PARTITIONING,
+        "datasets": counts,
+    }
+    (root / MANIFEST).write_text(json.dumps(manifest, indent=2))
+    return counts
+
+
+def open_dataset(name: str, root: str = EXPORT_ROOT) -> ds.Dataset:
+    """
+    Open an exported dataset with memory-mapped file access.
+    Filter and project lazily, e.g.:
+        open_dataset("latest").to_table(filter=ds.field("vendor") == "Coherent")
+    """
+    if name not in DATASETS:
+        raise ValueError(f"Unknown dataset '{name}' (expected one of {', '.join(DATASETS)})")
+    manifest_path = Path(root) / MANIFEST
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"No export found in {root}; run the export command first")
+    file_format = json.loads(manifest_path.read_text())["format"]
+    schema = SPEC_SCHEMA if name != "raw_specs" else RAW_SPEC_SCHEMA
+    return ds.dataset(
+        str(Path(root) / name),
+        schema=schema,
+        format=FORMATS[file_format],
+        partitioning="hive",
+        filesystem=fs.LocalFileSystem(use_mmap=True),
+    )
+
+
+def read_table(
+    name: str,
+    root: str = EXPORT_ROOT,
+    columns: Optional[List[str]] = None,
+    vendor: Optional[str] = None,
+    month: Optional[str] = None,
+) -> pa.Table:
+    """Read an exported dataset, pruning partitions by vendor and month."""
+    condition = None
+    for field, value in (("vendor", vendor), ("month", month)):
+        if value is not None:
+            clause = ds.field(field) == value
+            condition = clause if condition is None else condition & clause
+    return open_dataset(name, root).to_table(columns=columns, filter=condition)
@@ -2,16 +2,18 @@
 Advanced extraction utilities for superior spec extraction from HTML and PDF documents.
 """
 
+import io
 import re
+import time
 from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
 import pandas as pd
+import pdfplumber
 from bs4 import BeautifulSoup
-from docling.document_converter import DocumentConverter
-from docling.datamodel.base_models import InputFormat
-from docling.datamodel.pipeline_options import PdfPipelineOptions, TableFormerMode
-from docling.document_converter import PdfFormatOption
 from pathlib import Path
 import tempfile
+import threading
+from .specs import canonical_key
 
 
 class SpecPattern:
@@ -88,6 +90,156 @@ class SpecPattern:
         r'(minutes?|hours?|seconds?|ms|μs|us|ns)\b',
         re.IGNORECASE
     )
+    
+    # Spec vocabulary used to find spec-bearing pages in long manuals
+    SPEC_KEYWORDS = re.compile(
+        r'\b(?:specifications?|wavelength|output power|rms noise|noise|'
+        r'stability|linewidth|beam diameter|divergence|polari[sz]ation|'
+        r'modulation|warm-?up)\b',
+        re.IGNORECASE
+    )
+    
+    # Unit patterns whose hits indicate a page carries spec values
+    PAGE_SIGNALS = (WAVELENGTH, POWER, PERCENTAGE, BEAM_QUALITY, TEMPERATURE, FREQUENCY)
+    
+    # Keyword-anchored value patterns for PDF text (see PDF_PATTERN_KEYWORDS)
+    PDF_M2 = re.compile(r'M[²2]\s*(?:\(.*?\))?\s*([<>≤≥]?\s*\d+(?:\.\d+)?)')
+    PDF_WAVELENGTH = re.compile(
+        r'(?:Wavelength|λ).*?(\d+(?:\.\d+)?)\s*(?:±\s*\d+(?:\.\d+)?)?\s*(nm|μm)',
+        re.IGNORECASE
+    )
+    PDF_POWER = re.compile(
+        r'(?:Output Power|Power).*?(\d+(?:\.\d+)?)\s*(?:-\s*\d+(?:\.\d+)?)?\s*(mW|W)',
+        re.IGNORECASE
+    )
+    PDF_NOISE = re.compile(
+        r'(?:RMS Noise|Noise).*?([<>≤≥]?\s*\d+(?:\.\d+)?)\s*%',
+        re.IGNORECASE
+    )
+    PDF_TEMPERATURE_RANGE = re.compile(
+        r'(?:Operating Temperature|Temperature).*?(-?\d+)\s*(?:to|–)\s*\+?(-?\d+)\s*°?C',
+        re.IGNORECASE
+    )
+    
+    # Leading keywords of the patterns above, matched in one scan of the
+    # lowercased text (a plain alternation keeps the regex prefix search fast)
+    PDF_PATTERN_KEYWORDS = re.compile(
+        r'm[²2]|wavelength|λ|output power|power|rms noise|noise|'
+        r'operating temperature|temperature'
+    )
+    PDF_KEYWORD_PATTERNS = {
+        'm²': 'm2', 'm2': 'm2',
+        'wavelength': 'wavelength', 'λ': 'wavelength',
+        'output power': 'power', 'power': 'power',
+        'rms noise': 'noise', 'noise': 'noise',
+        'operating temperature': 'temperature', 'temperature': 'temperature',
+    }
+    # Characters IGNORECASE folds onto keyword letters but str.lower() does not
+    PDF_CASE_EXCEPTIONS = re.compile('[İıſ]')
+    PDF_PATTERNS = {
+        'm2': PDF_M2,
+        'wavelength': PDF_WAVELENGTH,
+        'power': PDF_POWER,
+        'noise': PDF_NOISE,
+        'temperature': PDF_TEMPERATURE_RANGE,
+    }
+    
+    # Line-level helpers for PDF text
+    RATIO_IN_LINE = re.compile(r'\d+\s*:\s*\d+')
+    RATIO_LINE = re.compile(r'^([^:]+?):\s*([<>≤≥]?\s*\d+\s*:\s*\d+.*)$')
+    LASER_MODEL = re.compile(r'^L[BCPX]X-\d+')
+    RATIO_VALUE = re.compile(r'.*\d+\s*:\s*\d+.*')
+    WHITESPACE = re.compile(r'\s+')
+    
+    # Spec-name cleanup: footnote numbers and parenthesized units
+    SPEC_NAME_FOOTNOTE = re.compile(r'\s+\d+\s*')
+    SPEC_NAME_UNITS = re.compile(r'\s*\([^)]+\)')
+    
+    # Characters that mark a value as an inequality or range
+    PRESERVED_VALUE = re.compile(r'[<>≤≥±\-–]| to ')
+
+
+# Cleaned spec names by raw header text, shared by all extractors
+_CLEAN_SPEC_NAMES: Dict[str, str] = {}
+_CLEAN_SPEC_NAMES_MAX = 50000
+
+
+def clean_spec_name(spec_name: str) -> str:
+    """
+    Clean a spec name to make it more normalizable (memoized).
+
+    "Wavelength 1" -> "Wavelength", "Output Power (mW)" -> "Output Power"
+    """
+    cleaned = _CLEAN_SPEC_NAMES.get(spec_name)
+    if cleaned is None:
+        cleaned = SpecPattern.SPEC_NAME_FOOTNOTE.sub(' ', spec_name)
+        cleaned = SpecPattern.SPEC_NAME_UNITS.sub('', cleaned)
+        cleaned = ' '.join(cleaned.split())
+        _remember_clean_names({spec_name: cleaned})
+    return cleaned
+
+
+def clean_spec_names(spec_names: List[str]) -> List[str]:
+    """Vectorized clean_spec_name over many names; only unseen names are cleaned."""
+    # Resolve from a local map: remembering new names may clear the shared cache
+    known = {name: _CLEAN_SPEC_NAMES[name] for name in dict.fromkeys(spec_names)
+             if name in _CLEAN_SPEC_NAMES}
+    missing = [name for name in dict.fromkeys(spec_names) if name not in known]
+    if missing:
+        cleaned = (
+            pd.Series(missing, dtype=object)
+            .str.replace(SpecPattern.SPEC_NAME_FOOTNOTE, ' ', regex=True)
+            .str.replace(SpecPattern.SPEC_NAME_UNITS, '', regex=True)
+            .str.split()
+            .str.join(' ')
+        )
+        cleaned = dict(zip(missing, cleaned))
+        known.update(cleaned)
+        _remember_clean_names(cleaned)
+    return [known[name] for name in spec_names]
+
+
+def _remember_clean_names(cleaned: Dict[str, str]):
+    if len(_CLEAN_SPEC_NAMES) + len(cleaned) > _CLEAN_SPEC_NAMES_MAX:
+        _CLEAN_SPEC_NAMES.clear()
+    _CLEAN_SPEC_NAMES.update(cleaned)
+
+
+def dataframe_spec_cells(df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+    """
+    Flatten a spec DataFrame into aligned (key, value) Series, skipping nulls.
+
+    Comparison tables (string headers, one product per column) are melted
+    product by product into "{spec}_{product}" keys. Other tables are read row
+    by row into "{spec}_{column}" keys, or "{spec}" for unnamed columns.
+    Values are the same cells DataFrame.iterrows() would yield, as strings.
+    """
+    cells = df.to_numpy()
+    n_rows, n_cols = cells.shape
+
+    if n_cols > 1 and all(isinstance(col, str) for col in df.columns):
+        kept = [i for i, col in enumerate(df.columns) if col and not col.startswith('Unnamed')]
+        spec_names = np.array(clean_spec_names([str(index).strip() for index in df.index]), dtype=object)
+        suffixes = np.array([f"_{df.columns[i].strip()}" for i in kept], dtype=object)
+        # Melt: one product column after another
+        flat = cells[:, kept].ravel(order='F')
+        specs = np.tile(spec_names, len(kept))
+        suffix = np.repeat(suffixes, n_rows)
+    else:
+        spec_names = np.array(clean_spec_names([str(index) for index in df.index]), dtype=object)
+        suffixes = np.array([
+            f"_{col}" if col and not str(col).startswith('Unnamed') else ""
+            for col in df.columns
+        ], dtype=object)
+        # Row by row, each row across all columns
+        flat = cells.ravel()
+        specs = np.repeat(spec_names, n_cols)
+        suffix = np.tile(suffixes, n_rows)
+
+    present = pd.notna(flat)
+    keys = pd.Series(specs[present], dtype=object) + pd.Series(suffix[present], dtype=object)
+    values = pd.Series(flat[present], dtype=object).map(str)
+    return keys, values
 
 
 class AdvancedHTMLExtractor:
@@ -296,104 +448,352 @@ class AdvancedHTMLExtractor:
     
     def _dataframe_to_specs(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Convert a pandas DataFrame to a specs dictionary with clean keys."""
-        specs = {}
-        
-        # Check if this is a product comparison table (multiple products as columns)
-        # vs a single product spec table (spec names in first column)
-        first_col_values = df.iloc[:, 0] if len(df.columns) > 0 else []
-        
-        # If columns look like product names, treat as comparison table
-        if len(df.columns) > 1 and all(isinstance(col, str) for col in df.columns):
-            # Each column is a product, rows are specs
-            for col in df.columns:
-                if col and not col.startswith('Unnamed'):
-                    product_key = str(col).strip()
-                    for index, row in df.iterrows():
-                        spec_name = str(index).strip()
-                        value = row[col]
-                        if pd.notna(value):
-                            # Clean the spec name
-                            clean_spec = self._clean_spec_name(spec_name)
-                            # Create key with product suffix
-                            key = f"{clean_spec}_{product_key}"
-                            specs[key] = str(value)
-        else:
-            # Standard extraction - append column to row
-            for index, row in df.iterrows():
-                spec_name = str(index)
-                for col in df.columns:
-                    value = row[col]
-                    if pd.notna(value):
-                        # Clean the spec name
-                        clean_spec = self._clean_spec_name(spec_name)
-                        # Only append column if it's meaningful
-                        if col and not str(col).startswith('Unnamed'):
-                            key = f"{clean_spec}_{col}"
-                        else:
-                            key = clean_spec
-                        specs[key] = str(value)
-        
-        return specs
+        # Comparison tables (products as columns) get "{spec}_{product}" keys,
+        # single product tables get "{spec}_{column}" keys
+        keys, values = dataframe_spec_cells(df)
+        return dict(zip(keys, values))
     
     def _clean_spec_name(self, spec_name: str) -> str:
         """Clean a spec name to make it more normalizable."""
-        import re
-        
-        # Remove footnote numbers anywhere in the string
-        # "Wavelength 1 2" -> "Wavelength"
-        cleaned = re.sub(r'\s+\d+\s*', ' ', spec_name)
-        
-        # Remove units in parentheses
-        # "Output Power (mW)" -> "Output Power"
-        cleaned = re.sub(r'\s*\([^)]+\)', '', cleaned)
-        
-        # Remove extra whitespace
-        cleaned = ' '.join(cleaned.split())
-        
-        return cleaned
+        return clean_spec_name(spec_name)
 
 
 class AdvancedPDFExtractor:
     """Enhanced PDF extraction with Docling configured for maximum accuracy."""
-    
-    def __init__(self):
-        # Configure Docling for maximum table extraction accuracy
-        self.pipeline_options = PdfPipelineOptions(
-            do_table_structure=True,
-            do_ocr=False,  # OCR not needed for digital PDFs
-        )
-        # Use FAST mode for quicker processing (change to ACCURATE for production)
-        self.pipeline_options.table_structure_options.mode = TableFormerMode.FAST
-        
-        self.converter = DocumentConverter(
-            format_options={
-                InputFormat.PDF: PdfFormatOption(
-                    pipeline_options=self.pipeline_options
-                )
-            }
-        )
+
+    # Pages scoring below this fraction of the best page are not sent to Docling
+    MIN_PAGE_SCORE_RATIO = 0.25
+
+    # Selection is only trusted when the best left-out page scores below this
+    # fraction of the weakest selected page; otherwise scores are too flat
+    MAX_EXCLUDED_SCORE_RATIO = 0.8
+
+    # Canonical specs a datasheet is expected to state; used to score completeness
+    CORE_SPEC_KEYS = (
+        "wavelength_nm",
+        "output_power_mw_nominal",
+        "rms_noise_pct",
+        "power_stability_pct",
+        "m2",
+        "beam_diameter_mm",
+    )
+
+    # Extraction tiers, cheapest first
+    TIERS = ("text_layer", "docling_fast", "docling_accurate")
+
+    def __init__(self, max_spec_pages: int = 4, accept_score: float = 0.5):
+        # Page pre-pass: only the top-ranked spec pages go through Docling
+        self.max_spec_pages = max_spec_pages
+
+        # Tiered extraction stops at the first tier reaching this completeness
+        self.accept_score = accept_score
+        self.tier_stats = {
+            tier: {"attempts": 0, "accepted": 0, "seconds": 0.0} for tier in self.TIERS
+        }
+
+        # Docling converters are built on first use, one per TableFormer mode
+        self._converters = {}
+
+    @property
+    def converter(self):
+        """Default Docling converter (FAST table structure mode)."""
+        from docling.datamodel.pipeline_options import TableFormerMode
+        return self._get_converter(TableFormerMode.FAST)
+
+    def _get_converter(self, mode):
+        """Build (once) a Docling converter for the given TableFormer mode."""
+        if mode not in self._converters:
+            # Docling (and torch) only load when a PDF actually needs it
+            from docling.document_converter import DocumentConverter, PdfFormatOption
+            from docling.datamodel.base_models import InputFormat
+            from docling.datamodel.pipeline_options import PdfPipelineOptions
+
+            pipeline_options = PdfPipelineOptions(
+                do_table_structure=True,
+                do_ocr=False,  # OCR not needed for digital PDFs
+            )
+            pipeline_options.table_structure_options.mode = mode
+
+            self._converters[mode] = DocumentConverter(
+                format_options={
+                    InputFormat.PDF: PdfFormatOption(
+                        pipeline_options=pipeline_options
+                    )
+                }
+            )
+        return self._converters[mode]
     
     def _clean_spec_name(self, spec_name: str) -> str:
         """Clean a spec name to make it more normalizable."""
-        import re
-        
-        # Remove footnote numbers anywhere in the string
-        # "Wavelength 1 2" -> "Wavelength"
-        cleaned = re.sub(r'\s+\d+\s*', ' ', spec_name)
-        
-        # Remove units in parentheses
-        # "Output Power (mW)" -> "Output Power"
-        cleaned = re.sub(r'\s*\([^)]+\)', '', cleaned)
-        
-        # Remove extra whitespace
-        cleaned = ' '.join(cleaned.split())
-        
-        return cleaned
+        return clean_spec_name(spec_name)
     
-    def extract_specs(self, pdf_content: bytes) -> Tuple[str, Dict[str, Any]]:
-        """Extract text and structured specs from PDF."""
+    def _scan_pages(self, pdf_content: bytes, with_tables: bool = False) -> List[Dict[str, Any]]:
+        """
+        Single pdfplumber pass collecting per-page text, spec hits and score.
+
+        With with_tables, each page also gets "body" (text outside detected
+        tables) and "tables" (extracted rows), so table cells are not read twice.
+        """
+        pages = []
+        with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
+            for page in pdf.pages:
+                text = page.extract_text() or ""
+                hits = sum(len(p.findall(text)) for p in SpecPattern.PAGE_SIGNALS)
+                hits += 2 * len(SpecPattern.SPEC_KEYWORDS.findall(text))
+                density = hits / (1 + len(text) / 1000)
+                info = {"text": text, "hits": hits, "score": hits + density}
+
+                if with_tables:
+                    tables = page.find_tables()
+                    body = page
+                    for table in tables:
+                        body = body.outside_bbox(table.bbox, strict=False)
+                    info["body"] = (body.extract_text() or "") if tables else text
+                    info["tables"] = [table.extract() for table in tables]
+
+                pages.append(info)
+        return pages
+
+    def score_pages(self, pdf_content: bytes) -> List[float]:
+        """
+        Score each page for spec content using a cheap pdfplumber text pass.
+
+        The score counts unit-pattern hits (nm, mW, %, M², °C, Hz) and spec
+        keyword hits, with a bonus for pages where those hits are dense.
+        """
+        return [page["score"] for page in self._scan_pages(pdf_content)]
+
+    def select_spec_pages(self, scores: List[float]) -> Optional[List[int]]:
+        """
+        Pick the top-ranked spec pages (0-based, in document order).
+        Returns None when the whole document should be processed, including
+        when the top pages are not clearly ahead of the pages left out.
+        """
+        if len(scores) <= self.max_spec_pages:
+            return None
+
+        best = max(scores)
+        if best <= 0:
+            return None
+
+        ranked = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)
+        pages = [
+            i for i in ranked[:self.max_spec_pages]
+            if scores[i] >= best * self.MIN_PAGE_SCORE_RATIO
+        ]
+
+        best_excluded = max(scores[i] for i in ranked if i not in pages)
+        if best_excluded > 0 and best_excluded >= min(scores[i] for i in pages) * self.MAX_EXCLUDED_SCORE_RATIO:
+            return None
+        return sorted(pages)
+
+    def _pages_from_scan(self, scan: Optional[List[Dict[str, Any]]]) -> Optional[List[int]]:
+        """Select spec pages from a pre-pass scan and log the reduction."""
+        if not scan:
+            return None
+
+        pages = self.select_spec_pages([page["score"] for page in scan])
+        if pages is not None:
+            hits = [page["hits"] for page in scan]
+            kept = sum(hits[i] for i in pages)
+            print(f"  → Page pre-pass: {len(pages)}/{len(scan)} pages to Docling "
+                  f"({len(pages) / len(scan):.0%} of pages, {kept}/{sum(hits)} spec hits)")
+        return pages
+
+    def _subset_pdf(self, pdf_content: bytes, pages: List[int]) -> bytes:
+        """Build a new PDF containing only the given pages (pypdfium2, also used by Docling)."""
+        import pypdfium2 as pdfium
+
+        src = pdfium.PdfDocument(pdf_content)
+        dst = pdfium.PdfDocument.new()
+        try:
+            dst.import_pages(src, pages)
+            buf = io.BytesIO()
+            dst.save(buf)
+            return buf.getvalue()
+        finally:
+            dst.close()
+            src.close()
+
+    def spec_completeness(self, specs: Dict[str, Any]) -> float:
+        """
+        Fraction of CORE_SPEC_KEYS found among extracted spec names.
+
+        Snake-case names ("beam_diameter") are read with spaces, and composite
+        "name_model" keys ("Output Power_OBIS 405") are also matched part by part.
+        """
+        found = set()
+        for key in specs:
+            for candidate in [key.replace('_', ' ')] + key.split('_'):
+                ck = canonical_key(candidate)
+                if ck:
+                    found.add(ck)
+        return len(found.intersection(self.CORE_SPEC_KEYS)) / len(self.CORE_SPEC_KEYS)
+
+    def _table_to_markdown(self, rows: List[List[Optional[str]]]) -> str:
+        """Render pdfplumber table rows as a markdown table."""
+        rows = [
+            [str(cell or "").replace("\n", " ").strip() for cell in row]
+            for row in rows if row
+        ]
+        if len(rows) < 2:
+            return ""
+
+        lines = ["| " + " | ".join(rows[0]) + " |",
+                 "|" + "---|" * len(rows[0])]
+        lines += ["| " + " | ".join(row) + " |" for row in rows[1:]]
+        return "\n".join(lines)
+
+    def extract_text_layer(self, pdf_content: bytes,
+                           scan: Optional[List[Dict[str, Any]]] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Fast extraction from the PDF text layer with pdfplumber.
+
+        Text outside tables is kept as-is and each table is rendered once as
+        markdown, so the regular text parser maps it. The returned text is this
+        plain text/markdown mix rather than Docling markdown.
+        """
+        if scan is None:
+            scan = self._scan_pages(pdf_content, with_tables=True)
+
+        parts = []
+        for page in scan:
+            parts.append(page["body"])
+            for table in page["tables"]:
+                markdown = self._table_to_markdown(table)
+                if markdown:
+                    parts.append("\n" + markdown + "\n")
+
+        text = "\n".join(parts)
+        return text, self._extract_from_pdf_text(text)
+
+    def extract_specs_tiered(self, pdf_content: bytes) -> Tuple[str, Dict[str, Any]]:
+        """
+        Extract specs with the cheapest tier that yields complete enough results.
+
+        Tiers run in order: pdfplumber text layer, Docling FAST, Docling ACCURATE.
+        One pdfplumber pre-pass feeds the text layer and the page selection of
+        both Docling tiers. Each tier is scored with spec_completeness(); the
+        first one reaching accept_score wins, otherwise the best-scoring result
+        is returned. If every tier fails the last error is raised.
+        """
+        try:
+            scan = self._scan_pages(pdf_content, with_tables=True)
+        except Exception as e:
+            print(f"  → Page pre-pass failed ({e}), using whole document")
+            scan = None
+        pages = self._pages_from_scan(scan)
+
+        best, best_score, last_error = None, -1.0, None
+        for tier in self.TIERS:
+            stats = self.tier_stats[tier]
+            stats["attempts"] += 1
+            start = time.perf_counter()
+            try:
+                if tier == "text_layer":
+                    text, specs = self.extract_text_layer(pdf_content, scan)
+                else:
+                    from docling.datamodel.pipeline_options import TableFormerMode
+                    mode = TableFormerMode.FAST if tier == "docling_fast" else TableFormerMode.ACCURATE
+                    # The next tier is the fallback, so no whole-document retry here
+                    text, specs = self._docling_extract(pdf_content, mode, pages, scan, retry_whole=False)
+                    if not specs and pages is not None:
+                        print("  → No specs on selected pages, next tier uses whole document")
+                        pages = None
+            except Exception as e:
+                print(f"  → {tier} extraction failed: {e}")
+                last_error = e
+                continue
+            finally:
+                stats["seconds"] += time.perf_counter() - start
+
+            score = self.spec_completeness(specs)
+            if score > best_score:
+                best, best_score = (text, specs), score
+            if score >= self.accept_score:
+                stats["accepted"] += 1
+                print(f"  → {tier}: completeness {score:.0%}, accepted")
+                return text, specs
+            print(f"  → {tier}: completeness {score:.0%}, escalating")
+
+        if best is None:
+            raise last_error
+        return best
+
+    def format_tier_stats(self) -> List[str]:
+        """Per-tier attempt/accept counts and cumulative timings."""
+        lines = []
+        for tier in self.TIERS:
+            stats = self.tier_stats[tier]
+            if stats["attempts"]:
+                lines.append(
+                    f"{tier}: {stats['accepted']}/{stats['attempts']} accepted, "
+                    f"{stats['seconds']:.1f}s total, "
+                    f"{stats['seconds'] / stats['attempts']:.2f}s avg"
+                )
+        return lines
+
+    def reset_tier_stats(self):
+        """Start a new stats window (the extractor itself is shared across scrapers)."""
+        for stats in self.tier_stats.values():
+            stats.update(attempts=0, accepted=0, seconds=0.0)
+
+    def extract_specs(self, pdf_content: bytes, whole_document: bool = False,
+                      mode=None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Extract text and structured specs from PDF with Docling.
+
+        Unless whole_document is set, a pdfplumber pre-pass ranks pages and only
+        the spec-bearing ones are converted with Docling. If those pages yield
+        no specs, or the sub-PDF cannot be built or converted, the whole
+        document is converted instead. mode selects the TableFormer mode
+        (FAST by default).
+        """
+        pages, scan = None, None
+        if not whole_document:
+            try:
+                scan = self._scan_pages(pdf_content)
+                pages = self._pages_from_scan(scan)
+            except Exception as e:
+                print(f"  → Page pre-pass failed ({e}), using whole document")
+
+        if mode is None:
+            from docling.datamodel.pipeline_options import TableFormerMode
+            mode = TableFormerMode.FAST
+        return self._docling_extract(pdf_content, mode, pages, scan)
+
+    def _docling_extract(self, pdf_content: bytes, mode, pages: Optional[List[int]],
+                         scan: Optional[List[Dict[str, Any]]] = None,
+                         retry_whole: bool = True) -> Tuple[str, Dict[str, Any]]:
+        """
+        Convert the selected pages (or the whole document) with Docling.
+
+        On the page-subset path the returned text is the Docling markdown of the
+        selected pages followed by the pre-pass text of the other pages, so the
+        stored document text still covers the whole PDF.
+        """
+        if pages is None:
+            return self._convert_and_extract(pdf_content, mode)
+
+        try:
+            full_text, specs = self._convert_and_extract(self._subset_pdf(pdf_content, pages), mode)
+        except Exception as e:
+            print(f"  → Selected-page conversion failed ({e}), using whole document")
+            return self._convert_and_extract(pdf_content, mode)
+
+        if not specs and retry_whole:
+            print("  → No specs on selected pages, falling back to whole document")
+            return self._convert_and_extract(pdf_content, mode)
+
+        if scan:
+            rest = [page["text"] for i, page in enumerate(scan) if i not in pages]
+            full_text = "\n\n".join([full_text] + [text for text in rest if text])
+        return full_text, specs
+
+    def _convert_and_extract(self, pdf_content: bytes, mode) -> Tuple[str, Dict[str, Any]]:
+        """Run Docling over a PDF and extract specs from its tables and text."""
         specs = {}
-        
+
         # Save to temp file
         with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp_file:
             tmp_file.write(pdf_content)
@@ -401,7 +801,7 @@ class AdvancedPDFExtractor:
         
         try:
             # Convert with Docling
-            result = self.converter.convert(tmp_path)
+            result = self._get_converter(mode).convert(tmp_path)
             
             # Get full text
             full_text = result.document.export_to_markdown()
@@ -602,7 +1002,7 @@ class AdvancedPDFExtractor:
             if len(values) >= 2:
                 model = values[0]
                 # Check for laser model pattern
-                if re.match(r'^L[BCPX]X-\d+', model):
+                if SpecPattern.LASER_MODEL.match(model):
                     # Match values to headers by position
                     for i in range(1, min(len(values), len(clean_headers))):
                         val = values[i]
@@ -614,51 +1014,45 @@ class AdvancedPDFExtractor:
         return specs
     
     def _extract_from_pdf_text(self, text: str) -> Dict[str, Any]:
-        """Extract specs from PDF text using advanced patterns."""
-        specs = {}
-        
-        # First try to extract markdown tables
-        if '|' in text and '---|' in text:
-            # Find all markdown tables
-            lines = text.split('\n')
-            table_start = None
-            for i, line in enumerate(lines):
-                if '|' in line:
-                    if table_start is None:
-                        table_start = i
-                elif table_start is not None:
-                    # End of table, process it
-                    table_text = '\n'.join(lines[table_start:i])
-                    if '---|' in table_text:  # Valid markdown table
-                        table_specs = self._parse_markdown_table(table_text)
-                        specs.update(table_specs)
-                    table_start = None
-            
-            # Process last table if exists
-            if table_start is not None:
-                table_text = '\n'.join(lines[table_start:])
-                if '---|' in table_text:
-                    table_specs = self._parse_markdown_table(table_text)
-                    specs.update(table_specs)
-        
+        """
+        Extract specs from PDF text using advanced patterns.
+
+        One pass over the lines collects markdown table blocks (model tables),
+        header-mapped table rows and key: value lines; keyword-anchored patterns
+        then scan the full text once. Results merge in that order.
+        """
+        table_specs = {}
+        line_specs = {}
+        parse_blocks = '|' in text and '---|' in text
+
         lines = text.split('\n')
-        
-        # Parse markdown tables
+        block_start = None
         in_table = False
         table_headers = []
-        
+
         for i, line in enumerate(lines):
+            has_pipe = '|' in line
+
+            # Markdown table blocks are runs of consecutive lines with '|'
+            if parse_blocks:
+                if has_pipe:
+                    if block_start is None:
+                        block_start = i
+                elif block_start is not None:
+                    self._parse_table_block(lines[block_start:i], table_specs)
+                    block_start = None
+
             # Skip empty lines
             if not line.strip():
                 in_table = False
                 table_headers = []
                 continue
-            
+
             # Detect markdown table
-            if '|' in line:
+            if has_pipe:
                 cells = [cell.strip() for cell in line.split('|')]
                 cells = [c for c in cells if c]  # Remove empty cells
-                
+
                 # Check if this is a separator line
                 if any('---' in cell for cell in cells):
                     in_table = True
@@ -667,7 +1061,7 @@ class AdvancedPDFExtractor:
                         header_cells = [h.strip() for h in lines[i-1].split('|')]
                         table_headers = [h for h in header_cells if h]
                     continue
-                
+
                 # Process table row
                 if in_table and len(cells) >= 2:
                     spec_name = cells[0]
@@ -681,29 +1075,29 @@ class AdvancedPDFExtractor:
                                     key = f"{clean_spec}_{table_headers[j]}"
                                     value = cells[j]
                                     if value and value not in ['-', 'N/A', '']:
-                                        specs[key] = self._parse_technical_value(value)
+                                        line_specs[key] = self._parse_technical_value(value)
                         else:
                             # No headers or mismatch, just extract values
                             values = cells[1:]
                             values = [v for v in values if v and v not in ['-', 'N/A', '']]
                             if values:
                                 if len(values) == 1:
-                                    specs[clean_spec] = self._parse_technical_value(values[0])
+                                    line_specs[clean_spec] = self._parse_technical_value(values[0])
                                 else:
-                                    specs[clean_spec] = [self._parse_technical_value(v) for v in values]
-            
+                                    line_specs[clean_spec] = [self._parse_technical_value(v) for v in values]
+
             # Look for spec patterns with colons (but don't split ratios)
             elif ':' in line:
                 # Check if it's a ratio (e.g., "50:1")
-                if re.search(r'\d+\s*:\s*\d+', line):
+                if SpecPattern.RATIO_IN_LINE.search(line):
                     # It's a ratio, try to extract the spec name and value
                     # Pattern: "Polarization Ratio: >50:1"
-                    match = re.match(r'^([^:]+?):\s*([<>≤≥]?\s*\d+\s*:\s*\d+.*)$', line)
+                    match = SpecPattern.RATIO_LINE.match(line)
                     if match:
                         key = match.group(1).strip().replace('*', '').replace('#', '')
                         value = match.group(2).strip()
                         if key and value and len(key) < 100:
-                            specs[key] = value
+                            line_specs[key] = value
                 else:
                     # Regular key:value pattern
                     parts = line.split(':', 1)
@@ -711,55 +1105,76 @@ class AdvancedPDFExtractor:
                         key = parts[0].strip().replace('*', '').replace('#', '')
                         value = parts[1].strip()
                         if key and value and len(key) < 100:  # Reasonable key length
-                            specs[key] = self._parse_technical_value(value)
-        
+                            line_specs[key] = self._parse_technical_value(value)
+
+        # Process last table if exists
+        if block_start is not None:
+            self._parse_table_block(lines[block_start:], table_specs)
+
+        specs = table_specs
+        specs.update(line_specs)
+
         # Extract using regex patterns on full text
-        pattern_specs = self._extract_pattern_specs(text)
-        specs.update(pattern_specs)
-        
+        specs.update(self._extract_pattern_specs(text))
+
         return specs
-    
+
+    def _parse_table_block(self, block_lines: List[str], specs: Dict[str, Any]):
+        """Parse a run of '|' lines if it is a valid markdown table."""
+        table_text = '\n'.join(block_lines)
+        if '---|' in table_text:  # Valid markdown table
+            specs.update(self._parse_markdown_table(table_text))
+
     def _extract_pattern_specs(self, text: str) -> Dict[str, Any]:
-        """Extract specs using regex patterns."""
+        """
+        Extract specs using regex patterns.
+
+        Every pattern starts with a keyword, so one PDF_PATTERN_KEYWORDS scan
+        finds the candidate starts and each pattern is only tried there. Hits
+        inside a previous match of the same pattern are skipped, giving the
+        same results as re.findall per pattern.
+        """
+        matches = {name: [] for name in SpecPattern.PDF_PATTERNS}
+
+        if SpecPattern.PDF_CASE_EXCEPTIONS.search(text):
+            # Lowercasing would miss these case-folded keywords; scan per pattern
+            for name, pattern in SpecPattern.PDF_PATTERNS.items():
+                matches[name] = [match.groups() for match in pattern.finditer(text)]
+        else:
+            resume_at = dict.fromkeys(SpecPattern.PDF_PATTERNS, 0)
+            for hit in SpecPattern.PDF_PATTERN_KEYWORDS.finditer(text.lower()):
+                name = SpecPattern.PDF_KEYWORD_PATTERNS[hit.group()]
+                start = hit.start()
+                if start < resume_at[name] or (name == 'm2' and text[start] != 'M'):
+                    continue
+                match = SpecPattern.PDF_PATTERNS[name].match(text, start)
+                if match:
+                    matches[name].append(match.groups())
+                    resume_at[name] = match.end()
+
         specs = {}
-        
+
         # M² (beam quality)
-        m2_matches = re.findall(r'M[²2]\s*(?:\(.*?\))?\s*([<>≤≥]?\s*\d+(?:\.\d+)?)', text)
+        m2_matches = [groups[0] for groups in matches['m2']]
         if m2_matches:
             specs['beam_quality_m2'] = m2_matches[0] if len(m2_matches) == 1 else m2_matches
-        
+
         # Wavelength with context
-        wavelength_matches = re.findall(
-            r'(?:Wavelength|λ).*?(\d+(?:\.\d+)?)\s*(?:±\s*\d+(?:\.\d+)?)?\s*(nm|μm)',
-            text, re.IGNORECASE
-        )
-        if wavelength_matches:
-            specs['wavelengths'] = [f"{v}{u}" for v, u in wavelength_matches]
-        
+        if matches['wavelength']:
+            specs['wavelengths'] = [f"{v}{u}" for v, u in matches['wavelength']]
+
         # Power specifications
-        power_matches = re.findall(
-            r'(?:Output Power|Power).*?(\d+(?:\.\d+)?)\s*(?:-\s*\d+(?:\.\d+)?)?\s*(mW|W)',
-            text, re.IGNORECASE
-        )
-        if power_matches:
-            specs['power_specs'] = [f"{v}{u}" for v, u in power_matches]
-        
+        if matches['power']:
+            specs['power_specs'] = [f"{v}{u}" for v, u in matches['power']]
+
         # Noise specifications
-        noise_matches = re.findall(
-            r'(?:RMS Noise|Noise).*?([<>≤≥]?\s*\d+(?:\.\d+)?)\s*%',
-            text, re.IGNORECASE
-        )
-        if noise_matches:
-            specs['noise_specs'] = noise_matches
-        
+        if matches['noise']:
+            specs['noise_specs'] = [groups[0] for groups in matches['noise']]
+
         # Temperature range
-        temp_matches = re.findall(
-            r'(?:Operating Temperature|Temperature).*?(-?\d+)\s*(?:to|–)\s*\+?(-?\d+)\s*°?C',
-            text, re.IGNORECASE
-        )
-        if temp_matches:
-            specs['temperature_range'] = [f"{t1} to {t2}°C" for t1, t2 in temp_matches]
-        
+        if matches['temperature']:
+            specs['temperature_range'] = [f"{t1} to {t2}°C" for t1, t2 in matches['temperature']]
+
         return specs
     
     def _parse_technical_value(self, value: str) -> str:
@@ -768,7 +1183,7 @@ class AdvancedPDFExtractor:
             return value
         
         # Preserve ratios
-        if re.match(r'.*\d+\s*:\s*\d+.*', value):
+        if SpecPattern.RATIO_VALUE.match(value):
             return value
         
         # Preserve inequalities and ranges
@@ -777,59 +1192,47 @@ class AdvancedPDFExtractor:
         
         # Clean up common artifacts
         value = value.replace('\u00a0', ' ')  # Replace non-breaking spaces
-        value = re.sub(r'\s+', ' ', value)  # Normalize whitespace
+        value = SpecPattern.WHITESPACE.sub(' ', value)  # Normalize whitespace
         
         return value.strip()
     
+    def _parse_technical_values(self, values: pd.Series) -> pd.Series:
+        """Vectorized _parse_technical_value over a Series of strings."""
+        preserve = (
+            (values == '')
+            | values.str.match(SpecPattern.RATIO_VALUE)
+            | values.str.contains(SpecPattern.PRESERVED_VALUE)
+        )
+        cleaned = (
+            values.str.replace('\u00a0', ' ', regex=False)
+            .str.replace(SpecPattern.WHITESPACE, ' ', regex=True)
+            .str.strip()
+        )
+        return values.where(preserve, cleaned)
+    
     def _dataframe_to_specs(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Convert DataFrame to specs dictionary with clean keys."""
-        specs = {}
-        
-        # Check if this is a product comparison table
-        if len(df.columns) > 1 and all(isinstance(col, str) for col in df.columns):
-            # Each column is a product, rows are specs
-            for col in df.columns:
-                if col and not col.startswith('Unnamed'):
-                    product_key = str(col).strip()
-                    for index, row in df.iterrows():
-                        spec_name = str(index).strip()
-                        value = row[col]
-                        if pd.notna(value):
-                            # Clean the spec name
-                            clean_spec = self._clean_spec_name(spec_name)
-                            # Create key with product suffix
-                            key = f"{clean_spec}_{product_key}"
-                            specs[key] = self._parse_technical_value(str(value))
-        else:
-            # Standard extraction
-            for index, row in df.iterrows():
-                spec_name = str(index)
-                for col in df.columns:
-                    value = row[col]
-                    if pd.notna(value):
-                        # Clean the spec name
-                        clean_spec = self._clean_spec_name(spec_name)
-                        # Only append column if it's meaningful
-                        if col and not str(col).startswith('Unnamed'):
-                            key = f"{clean_spec}_{col}"
-                        else:
-                            key = clean_spec
-                        specs[key] = self._parse_technical_value(str(value))
-        
-        return specs
+        keys, values = dataframe_spec_cells(df)
+        if values.empty:
+            return {}
+        return dict(zip(keys, self._parse_technical_values(values)))
     
     def _clean_spec_name(self, spec_name: str) -> str:
         """Clean a spec name to make it more normalizable."""
-        import re
-        
-        # Remove footnote numbers (e.g., "Wavelength 1" -> "Wavelength")
-        # Handle both "Name 1" and "Name 1  (unit)" patterns
-        cleaned = re.sub(r'\s+\d+\s*', ' ', spec_name)
-        
-        # Remove units in parentheses
-        cleaned = re.sub(r'\s*\([^)]+\)', '', cleaned)
-        
-        # Remove extra whitespace
-        cleaned = ' '.join(cleaned.split())
-        
-        return cleaned
\ No newline at end of file
+        return clean_spec_name(spec_name)
+
+
+_shared_pdf_extractor = None
+_shared_lock = threading.Lock()
+
+
+def shared_pdf_extractor() -> AdvancedPDFExtractor:
+    """
+    Process-wide AdvancedPDFExtractor, so Docling converters are built once
+    and reused by every scraper (and stay warm in the `serve` worker).
+    """
+    global _shared_pdf_extractor
+    with _shared_lock:
+        if _shared_pdf_extractor is None:
+            _shared_pdf_extractor = AdvancedPDFExtractor()
+        return _shared_pdf_extractor
@@ -0,0 +1,139 @@
+"""
+Feature tagging: a compact bitmask of product features derived from raw specs.
+
+Each product's documents are scanned once, after crawling, with one
+precompiled regex per feature over their joined spec values; the result is stored in
+product_features so reports read bitmasks instead of rescanning raw_specs.
+A product is only rescanned when its documents change.
+"""
+
+import hashlib
+import json
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, select
+
+from .models import ProductFeature, RawDocument
+
+# (feature, keywords). The position is the feature's bit: append only, never reorder.
+FEATURES = [
+    ("TTL Modulation", ["TTL", "ttl", "TTL shutter"]),
+    ("Analog Modulation", ["Analog", "analog modulation"]),
+    ("USB Control", ["USB", "usb"]),
+    ("RS-232", ["RS-232", "RS232", "serial"]),
+    ("Ethernet", ["Ethernet", "ethernet"]),
+    ("Fiber Output", ["fiber", "Fiber Output", "FC/PC", "FC/APC"]),
+    ("Temperature Control", ["TEC", "temperature control", "Temperature Range"]),
+    ("Power Monitoring", ["power monitor", "Power Monitoring"]),
+]
+
+FEATURE_NAMES = [name for name, _ in FEATURES]
+
+
+def _compile_matchers(features: List[tuple]) -> List[tuple]:
+    """
+    (bit, regex) per feature: any of its keywords, case-sensitive substring
+    match. Separate regexes, so keywords of two features starting at the same
+    position are both found (an alternation only reports its first match).
+    """
+    return [
+        (bit, re.compile("|".join(re.escape(k) for k in keywords)))
+        for bit, (_, keywords) in enumerate(features)
+    ]
+
+
+_MATCHERS = _compile_matchers(FEATURES)
+
+# Values are joined with a separator no keyword contains, so matches never span values
+_SEPARATOR = "\x00"
+
+
+def _load_specs(raw_specs: Any) -> Optional[Dict]:
+    if isinstance(raw_specs, dict):
+        return raw_specs
+    if isinstance(raw_specs, str):
+        try:
+            specs = json.loads(raw_specs)
+        except ValueError:
+            return None
+        return specs if isinstance(specs, dict) else None
+    return None
+
+
+def feature_mask(raw_specs: Any) -> int:
+    """Bitmask of FEATURES whose keywords appear in any raw spec value."""
+    specs = _load_specs(raw_specs)
+    if not specs:
+        return 0
+    text = _SEPARATOR.join(str(v) for v in specs.values())
+    mask = 0
+    for bit, matcher in _MATCHERS:
+        if matcher.search(text):
+            mask |= 1 << bit
+    return mask
+
+
+def feature_names(mask: int) -> List[str]:
+    """Feature names set in mask, in FEATURES order."""
+    return [name for bit, name in enumerate(FEATURE_NAMES) if mask >> bit & 1]
+
+
+def refresh_product_features(session, product_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute the feature mask of every product whose documents changed since
+    it was last tagged (or of product_ids only). Reads document ids and hashes
+    first and loads raw_specs only for changed products. The caller commits.
+    Returns the number of products (re)tagged.
+    """
+    stmt = (
+        select(RawDocument.product_id, RawDocument.id, RawDocument.content_hash,
+               RawDocument.fetched_at)
+        .where(RawDocument.raw_specs != None)
+        .order_by(RawDocument.product_id, RawDocument.id)
+    )
+    if product_ids is not None:
+        stmt = stmt.where(RawDocument.product_id.in_(list(product_ids)))
+
+    signatures: Dict[int, Any] = {}
+    for product_id, doc_id, content_hash, fetched_at in session.execute(stmt):
+        signatures.setdefault(product_id, hashlib.sha256()).update(
+            f"{doc_id}:{content_hash}:{fetched_at};".encode("utf-8")
+        )
+    signatures = {pid: h.hexdigest() for pid, h in signatures.items()}
+
+    stored = {
+        pf.product_id: pf
+        for pf in session.execute(
+            select(ProductFeature).where(ProductFeature.product_id.in_(list(signatures)))
+        ).scalars()
+    }
+    if product_ids is None:
+        # Products whose documents are gone lose their tags
+        session.execute(
+            delete(ProductFeature).where(ProductFeature.product_id.not_in(list(signatures)))
+        )
+
+    changed = [pid for pid, sig in signatures.items()
+               if pid not in stored or stored[pid].source_signature != sig]
+    if not changed:
+        return 0
+
+    masks = dict.fromkeys(changed, 0)
+    for product_id, raw_specs in session.execute(
+        select(RawDocument.product_id, RawDocument.raw_specs)
+        .where(RawDocument.product_id.in_(changed), RawDocument.raw_specs != None)
+    ):
+        masks[product_id] |= feature_mask(raw_specs)
+
+    now = datetime.utcnow()
+    for product_id, mask in masks.items():
+        pf = stored.get(product_id)
+        if pf is None:
+            pf = ProductFeature(product_id=product_id)
+            session.add(pf)
+        pf.feature_mask = mask
+        pf.source_signature = signatures[product_id]
+        pf.updated_at = now
+    return len(changed)
@@ -1,10 +1,9 @@
 from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 from langgraph.graph import StateGraph, END
-from .crawler import bootstrap_db, seed_from_config, run_scrapers_from_config
-from .normalize import normalize_all
-from .reporter import monthly_report
-from .benchmark import benchmark_vs_coherent
+
+# Pipeline stages are imported inside their nodes: the scrapers pull in
+# pdfplumber/pandas and normalization pulls in the LLM client.
 
 
 class GraphState(BaseModel):
@@ -14,6 +13,7 @@ class GraphState(BaseModel):
     report_md: str | None = None
     bench_rows: List[Dict[str, Any]] = Field(default_factory=list)
     errors: List[str] = Field(default_factory=list)
+    fetch_stats: Dict[str, Dict[str, float]] = Field(default_factory=dict)
     openai_model: Optional[str] = None
     use_llm: bool = True
     force_refresh: bool = False
@@ -22,6 +22,7 @@ class GraphState(BaseModel):
 
 def node_bootstrap(state: GraphState) -> GraphState:
     try:
+        from .crawler import bootstrap_db, seed_from_config
         bootstrap_db()
         seed_from_config(state.config_path)
     except Exception as e:
@@ -31,11 +32,12 @@ def node_bootstrap(state: GraphState) -> GraphState:
 
 def node_crawl(state: GraphState) -> GraphState:
     try:
-        run_scrapers_from_config(
+        from .crawler import run_scrapers_from_config
+        state.fetch_stats = run_scrapers_from_config(
             state.config_path, 
             force_refresh=state.force_refresh,
             scraper_filter=state.scraper_filter
-        )
+        ) or {}
         state.crawled = 1
     except Exception as e:
         state.errors.append(f"crawl: {e}")
@@ -44,6 +46,7 @@ def node_crawl(state: GraphState) -> GraphState:
 
 def node_normalize(state: GraphState) -> GraphState:
     try:
+        from .normalize import normalize_all
         n = normalize_all(use_llm=state.use_llm, model=state.openai_model)
         state.normalized = n
     except Exception as e:
@@ -53,6 +56,7 @@ def node_normalize(state: GraphState) -> GraphState:
 
 def node_report(state: GraphState) -> GraphState:
     try:
+        from .reporter import monthly_report
         state.report_md = monthly_report()
     except Exception as e:
         state.errors.append(f"report: {e}")
@@ -61,6 +65,7 @@ def node_report(state: GraphState) -> GraphState:
 
 def node_bench(state: GraphState) -> GraphState:
     try:
+        from .benchmark import benchmark_vs_coherent
         state.bench_rows = benchmark_vs_coherent("diode_instrumentation")
     except Exception as e:
         state.errors.append(f"bench: {e}")
@@ -14,7 +14,7 @@ from .benchmark import benchmark_vs_coherent
 class UnifiedGraphState(BaseModel):
     """State for unified pipeline with smart discovery."""
     config_path: str = "config/target_products.yml"
-    discovery_mode: str = "smart"  # "smart" or "static"
+    discovery_mode: str = "smart"  # "smart", "sitemap" or "static"
     force_refresh: bool = False
     vendor_filter: Optional[str] = None
     max_workers: int = 5  # For parallel LLM normalization
@@ -56,15 +56,12 @@ def node_discover_and_crawl(state: UnifiedGraphState) -> UnifiedGraphState:
         print("\n=== Discovery & Crawl Phase ===")
         print(f"  Mode: {state.discovery_mode}")
         
-        # Determine if using smart discovery
-        use_smart = state.discovery_mode == "smart"
-        
         # Run unified scrapers
         state.scrapers_run = run_unified_scrapers(
             config_path=state.config_path,
             force_refresh=state.force_refresh,
             vendor_filter=state.vendor_filter,
-            use_smart=use_smart
+            discovery_mode=state.discovery_mode
         )
         
         print(f"  ✓ Ran {state.scrapers_run} scrapers")
@@ -236,7 +233,7 @@ def run_unified_pipeline(
     
     Args:
         config_path: Path to configuration file
-        discovery_mode: "smart" or "static"
+        discovery_mode: "smart", "sitemap" or "static"
         force_refresh: Force refresh all content
         vendor_filter: Optional vendor name to process
         max_workers: Number of parallel workers for LLM
@@ -1,5 +1,4 @@
 import os, json
-from openai import OpenAI
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -81,6 +80,8 @@ SYSTEM = (
 def llm_normalize(
     raw_specs: dict, free_text: str = "", model: str | None = None
 ) -> dict:
+    from openai import OpenAI
+
     client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
     model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
     prompt = {"raw_specs": raw_specs, "context": free_text[:8000]}
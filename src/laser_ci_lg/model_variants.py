@@ -0,0 +1,104 @@
+"""
+Model-variant engine: per-model spec matrices from raw specs.
+
+Extraction flattens comparison tables into "{spec}_{model}" (or
+"{model}_{spec}") keys. explode_models() splits them back into
+{model: {spec: value}} with a precompiled vocabulary, caching every
+distinct key's split. model_matrix() stores the result compactly,
+{"format": 2, "specs": [spec, ...], "models": {model: [[spec index, value], ...]}},
+on RawDocument.model_matrix when raw_specs are written, so normalization
+reads the matrix instead of re-splitting composite keys on every run.
+Each model lists only the specs it has, in its own key order, so explicit
+None values survive and merged matrices equal explode_models() of the
+merged raw specs.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Words that mark the spec half of a composite key
+SPEC_WORDS = ['wavelength', 'power', 'beam', 'noise', 'stability', 'linewidth', 'm²', 'polarization']
+
+# Product families that mark a model name without digits
+MODEL_FAMILIES = ['LX', 'LS', 'LBX', 'LCX', 'OBIS', 'LUXX', 'CELESTA', 'SPECTRA', 'SOLA']
+
+# Bumped when the stored matrix layout changes; older matrices are rebuilt
+MATRIX_FORMAT = 2
+
+_SPEC_WORD = re.compile("|".join(re.escape(w) for w in SPEC_WORDS))
+# Valid model names contain a digit or a family name (matched upper-cased)
+_MODEL_NAME = re.compile(r"\d|" + "|".join(re.escape(f) for f in MODEL_FAMILIES))
+
+
+@lru_cache(maxsize=65536)
+def split_key(key: str) -> Optional[Tuple[str, str]]:
+    """(model, spec) for a composite key, or None if it names no model."""
+    if '_' not in key:
+        return None
+    first, second = key.split('_', 1)
+    if _SPEC_WORD.search(first.lower()):
+        spec, model = first, second
+    elif _SPEC_WORD.search(second.lower()):
+        model, spec = first, second
+    else:
+        # Default: assume format is spec_model
+        spec, model = first, second
+    if not _MODEL_NAME.search(model.upper()):
+        return None
+    return model, spec
+
+
+def explode_models(raw_specs: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """{model_name: {spec_name: value}} for the raw specs that name a model."""
+    models: Dict[str, Dict[str, Any]] = {}
+    for key, value in raw_specs.items():
+        split = split_key(key)
+        if split is not None:
+            models.setdefault(split[0], {})[split[1]] = value
+    return models
+
+
+def model_matrix(raw_specs: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Compact model x spec matrix of raw_specs (empty if no model is named), or None without specs."""
+    if not isinstance(raw_specs, dict):
+        return None
+    models = explode_models(raw_specs)
+    positions: Dict[str, int] = {}
+    for model_specs in models.values():
+        for spec in model_specs:
+            positions.setdefault(spec, len(positions))
+    return {
+        "format": MATRIX_FORMAT,
+        "specs": list(positions),
+        "models": {model: [[positions[spec], value] for spec, value in model_specs.items()]
+                   for model, model_specs in models.items()},
+    }
+
+
+def is_current(matrix: Optional[Dict[str, Any]]) -> bool:
+    """Whether matrix was built by this version of model_matrix()."""
+    return isinstance(matrix, dict) and matrix.get("format") == MATRIX_FORMAT
+
+
+def matrix_models(matrix: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """{model_name: {spec_name: value}} from a model_matrix()."""
+    if not matrix:
+        return {}
+    specs = matrix["specs"]
+    return {
+        model: {specs[index]: value for index, value in pairs}
+        for model, pairs in matrix["models"].items()
+    }
+
+
+def merge_matrices(matrices: Iterable[Optional[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Models of several documents' matrices, merged in order (later documents
+    override earlier ones, like merging their raw_specs).
+    """
+    models: Dict[str, Dict[str, Any]] = {}
+    for matrix in matrices:
+        for model, specs in matrix_models(matrix).items():
+            models.setdefault(model, {}).update(specs)
+    return models
@@ -8,8 +8,10 @@ from sqlalchemy import (
     Text,
     ForeignKey,
     UniqueConstraint,
+    event,
 )
 from datetime import datetime
+from .model_variants import model_matrix
 
 
 class Base(DeclarativeBase):
@@ -52,6 +54,13 @@ class RawDocument(Base):
     raw_specs: Mapped[dict | None] = mapped_column(JSON)
     content_hash: Mapped[str | None] = mapped_column(String(64))  # SHA-256 hash
     file_path: Mapped[str | None] = mapped_column(String(500))  # Local cache path for PDFs
+    model_matrix: Mapped[dict | None] = mapped_column(JSON)  # Per-model specs, see model_variants
+
+
+@event.listens_for(RawDocument.raw_specs, "set")
+def _raw_specs_set(target, value, oldvalue, initiator):
+    # Split composite spec keys into the model matrix once, when specs are stored
+    target.model_matrix = model_matrix(value)
 
 
 class NormalizedSpec(Base):
@@ -81,3 +90,29 @@ class NormalizedSpec(Base):
     dimensions_mm: Mapped[dict | None] = mapped_column(JSON)
     vendor_fields: Mapped[dict | None] = mapped_column(JSON)
     source_raw_id: Mapped[int | None] = mapped_column(Integer)
+
+
+class SpecChange(Base):
+    """Per-field change between consecutive snapshots of one product model."""
+    __tablename__ = "spec_changes"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), index=True)
+    model: Mapped[str] = mapped_column(String(200))
+    field: Mapped[str] = mapped_column(String(64))
+    old_value: Mapped[float | None] = mapped_column(Float)
+    new_value: Mapped[float | None] = mapped_column(Float)
+    rel_change: Mapped[float | None] = mapped_column(Float)  # (new - old) / |old|
+    prev_spec_id: Mapped[int] = mapped_column(Integer)
+    spec_id: Mapped[int] = mapped_column(Integer, index=True)
+    prev_snapshot_ts: Mapped[datetime] = mapped_column()
+    snapshot_ts: Mapped[datetime] = mapped_column(index=True)
+    detected_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+
+
+class ProductFeature(Base):
+    """Feature bitmask of a product (bits per features.FEATURES), tagged from raw specs."""
+    __tablename__ = "product_features"
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), primary_key=True)
+    feature_mask: Mapped[int] = mapped_column(Integer, default=0)
+    source_signature: Mapped[str] = mapped_column(String(64))  # hash of the tagged documents
+    updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
@@ -1,11 +1,20 @@
-import re
-from collections import defaultdict
+import os
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import groupby
+from operator import attrgetter
 from sqlalchemy import select
+from sqlalchemy.orm import defer
 from .db import SessionLocal
 from .models import RawDocument, NormalizedSpec, Product
-from .specs import canonical_key, parse_value_to_unit, CANONICAL_SPEC_KEYS
+from .changes import record_spec_changes
+from .specs import map_models_to_canonical, CANONICAL_SPEC_KEYS
 from .llm import llm_normalize
+from .model_variants import explode_models, is_current, merge_matrices, model_matrix
+
+# Products normalized and committed together; memory is bounded by one batch
+NORMALIZE_BATCH_PRODUCTS = int(os.getenv("NORMALIZE_BATCH_PRODUCTS", "25"))
+# Rows fetched from the cursor at a time while streaming documents
+DOCS_PER_FETCH = 100
 
 
 def simple_kv_from_text(text: str) -> dict:
@@ -17,163 +26,162 @@ def simple_kv_from_text(text: str) -> dict:
     return kv
 
 
-def extract_models_from_specs(raw_specs: dict) -> dict:
+def iter_product_batches(session, product_ids: list[int] | None = None,
+                         batch_size: int | None = None):
     """
-    Extract individual laser models from raw specs.
-    Returns dict of {model_name: {spec_name: value}}
+    Yield the products to normalize, batch_size at a time, as lists of
+    (product_id, product, docs, {model_name: specs}).
+
+    Documents are streamed (yield_per) grouped by product, newest first,
+    without their text column; text is only read for products that have no
+    raw_specs. Memory is bounded by one batch: commit and expunge the
+    session between batches. batch_size defaults to NORMALIZE_BATCH_PRODUCTS.
     """
-    models = defaultdict(dict)
-    
-    for key, value in raw_specs.items():
-        # Try to identify model from key structure
-        if '_' in key:
-            parts = key.split('_', 1)
+    batch_size = batch_size or NORMALIZE_BATCH_PRODUCTS
+    ids = select(RawDocument.product_id).distinct().order_by(RawDocument.product_id)
+    if product_ids is not None:
+        ids = ids.where(RawDocument.product_id.in_(product_ids))
+    pids = session.execute(ids).scalars().all()
+
+    for start in range(0, len(pids), batch_size):
+        chunk = pids[start:start + batch_size]
+        stmt = (
+            select(RawDocument)
+            .options(defer(RawDocument.text))
+            .where(RawDocument.product_id.in_(chunk))
+            .order_by(RawDocument.product_id, RawDocument.fetched_at.desc())
+            .execution_options(yield_per=DOCS_PER_FETCH)
+        )
+        groups = []
+        for pid, docs in groupby(session.execute(stmt).scalars(), key=attrgetter("product_id")):
+            docs = list(docs)
+            # Merge all raw specs, and their per-model matrices in the same order
+            merged_raw = {}
+            for d in docs:
+                if d.raw_specs:
+                    merged_raw.update(d.raw_specs)
+                    if not is_current(d.model_matrix):
+                        # Stored before model matrices (or this layout) existed: build it once,
+                        # saved with the batch
+                        d.model_matrix = model_matrix(d.raw_specs)
+            groups.append((pid, docs, merged_raw, merge_matrices(d.model_matrix for d in docs)))
+
+        # Try extracting from text where no specs were parsed
+        no_specs = [pid for pid, _, merged_raw, _ in groups if not merged_raw]
+        if no_specs:
+            merged = {pid: merged_raw for pid, _, merged_raw, _ in groups}
+            texts = (
+                select(RawDocument.product_id, RawDocument.text)
+                .where(RawDocument.product_id.in_(no_specs))
+                .order_by(RawDocument.product_id, RawDocument.fetched_at.desc())
+                .execution_options(yield_per=DOCS_PER_FETCH)
+            )
+            for pid, text in session.execute(texts):
+                merged[pid].update(simple_kv_from_text(text or ""))
+            groups = [(pid, docs, merged_raw, models if pid not in no_specs else explode_models(merged_raw))
+                      for pid, docs, merged_raw, models in groups]
+
+        work = []
+        for pid, docs, merged_raw, models in groups:
+            # Get product info
+            product = session.get(Product, pid)
+            if not product or not merged_raw:
+                continue
             
-            # Check if first part looks like a spec name
-            if any(spec_word in parts[0].lower() for spec_word in 
-                   ['wavelength', 'power', 'beam', 'noise', 'stability', 'linewidth', 'm²', 'polarization']):
-                spec_name = parts[0]
-                model_name = parts[1] if len(parts) > 1 else 'Unknown'
-            # Check if second part looks like a spec name
-            elif len(parts) > 1 and any(spec_word in parts[1].lower() for spec_word in 
-                   ['wavelength', 'power', 'beam', 'noise', 'stability', 'linewidth', 'm²', 'polarization']):
-                model_name = parts[0]
-                spec_name = parts[1]
-            else:
-                # Default: assume format is spec_model
-                spec_name = parts[0]
-                model_name = parts[1] if len(parts) > 1 else 'Unknown'
+            if not models:
+                # No individual models found, treat as single product
+                models = {product.name: merged_raw}
             
-            # Only keep if model name looks valid (contains numbers or known patterns)
-            if (re.search(r'\d+', model_name) or 
-                any(pattern in model_name.upper() for pattern in 
-                    ['LX', 'LS', 'LBX', 'LCX', 'OBIS', 'LUXX', 'CELESTA', 'SPECTRA', 'SOLA'])):
-                models[model_name][spec_name] = value
-    
-    return dict(models)
+            work.append((pid, product, docs, models))
+        yield work
 
 
-def normalize_all(use_llm: bool = True, model: str | None = None, max_workers: int = 5) -> int:
+def normalize_all(use_llm: bool = True, model: str | None = None, max_workers: int = 5,
+                  product_ids: list[int] | None = None) -> int:
     """
     Return count of inserted NormalizedSpec rows.
     Creates individual records for each laser model found in specs.
+    product_ids limits normalization to those products.
     """
     s = SessionLocal()
     inserted = 0
     try:
-        raw_docs = (
-            s.execute(
-                select(RawDocument).order_by(
-                    RawDocument.product_id, RawDocument.fetched_at.desc()
-                )
-            )
-            .scalars()
-            .all()
-        )
-        # group by product_id
-        by_pid = {}
-        for d in raw_docs:
-            by_pid.setdefault(d.product_id, []).append(d)
-
-        for pid, docs in by_pid.items():
-            # Get product info
-            product = s.get(Product, pid)
-            if not product:
-                continue
-            
-            # Merge all raw specs
-            merged_raw = {}
-            for d in docs:
-                if d.raw_specs:
-                    merged_raw.update(d.raw_specs)
+        for work in iter_product_batches(s, product_ids):
+            new_specs = []
             
-            if not merged_raw:
-                # Try extracting from text
-                for d in docs:
-                    merged_raw.update(simple_kv_from_text(d.text))
+            # Heuristic mapping for the batch's models: one parse per canonical key
+            heuristics = map_models_to_canonical({
+                (pid, model_name): model_specs
+                for pid, _, _, models in work
+                for model_name, model_specs in models.items()
+            })
             
-            if not merged_raw:
-                continue
-            
-            # Extract individual models
-            models = extract_models_from_specs(merged_raw)
-            
-            if not models:
-                # No individual models found, treat as single product
-                models = {product.name: merged_raw}
-            
-            # Create normalized spec for each model
-            for model_name, model_specs in models.items():
-                # Initialize canonical fields
-                canonical = {k: None for k in CANONICAL_SPEC_KEYS}
-                extras = {}
-                
-                # Try heuristic mapping
-                for spec_name, spec_value in model_specs.items():
-                    ck = canonical_key(spec_name)
-                    if ck:
-                        parsed = parse_value_to_unit(ck, str(spec_value))
-                        if parsed is not None:
-                            canonical[ck] = parsed
-                    else:
-                        extras[spec_name] = spec_value
-                
-                # Add model name to extras
-                extras['model'] = model_name
-                canonical["vendor_fields"] = extras or None
-                
-                # Count non-null fields
-                mapped_count = sum(1 for v in canonical.values() if v is not None and v != {})
-                
-                # Always use LLM for better consistency
-                # Only skip if we already have good heuristic results (>10 fields mapped)
-                if use_llm and mapped_count < 10:
-                    try:
-                        context = f"Laser model: {model_name}\nProduct family: {product.name}"
-                        llm_result = llm_normalize(model_specs, context, model=model)
-                        
-                        # Merge LLM results
-                        for k in CANONICAL_SPEC_KEYS:
-                            if k in llm_result and llm_result[k] is not None:
-                                # Handle different formats from LLM
-                                value = llm_result[k]
-                                if isinstance(value, dict):
-                                    # Extract from dict format
-                                    if 'value' in value:
-                                        canonical[k] = float(value['value']) if isinstance(value['value'], (int, float)) else value['value']
-                                    elif 'typical' in value:
-                                        canonical[k] = float(value['typical']) if isinstance(value['typical'], (int, float)) else value['typical']
-                                    elif 'nominal' in value:
-                                        canonical[k] = float(value['nominal']) if isinstance(value['nominal'], (int, float)) else value['nominal']
-                                elif k in ['polarization', 'interfaces', 'dimensions_mm', 'vendor_fields']:
-                                    # Keep as-is for non-numeric fields
-                                    canonical[k] = value
-                                else:
-                                    # Convert to float for numeric fields
-                                    try:
-                                        canonical[k] = float(value) if value is not None else None
-                                    except (ValueError, TypeError):
+            for pid, product, docs, models in work:
+                # Create normalized spec for each model
+                for model_name, model_specs in models.items():
+                    canonical, extras = heuristics[(pid, model_name)]
+                    
+                    # Add model name to extras
+                    extras['model'] = model_name
+                    canonical["vendor_fields"] = extras or None
+                    
+                    # Count non-null fields
+                    mapped_count = sum(1 for v in canonical.values() if v is not None and v != {})
+                    
+                    # Always use LLM for better consistency
+                    # Only skip if we already have good heuristic results (>10 fields mapped)
+                    if use_llm and mapped_count < 10:
+                        try:
+                            context = f"Laser model: {model_name}\nProduct family: {product.name}"
+                            llm_result = llm_normalize(model_specs, context, model=model)
+                            
+                            # Merge LLM results
+                            for k in CANONICAL_SPEC_KEYS:
+                                if k in llm_result and llm_result[k] is not None:
+                                    # Handle different formats from LLM
+                                    value = llm_result[k]
+                                    if isinstance(value, dict):
+                                        # Extract from dict format
+                                        if 'value' in value:
+                                            canonical[k] = float(value['value']) if isinstance(value['value'], (int, float)) else value['value']
+                                        elif 'typical' in value:
+                                            canonical[k] = float(value['typical']) if isinstance(value['typical'], (int, float)) else value['typical']
+                                        elif 'nominal' in value:
+                                            canonical[k] = float(value['nominal']) if isinstance(value['nominal'], (int, float)) else value['nominal']
+                                    elif k in ['polarization', 'interfaces', 'dimensions_mm', 'vendor_fields']:
+                                        # Keep as-is for non-numeric fields
                                         canonical[k] = value
-                        
-                        # Update vendor fields
-                        if 'vendor_fields' in llm_result:
-                            if isinstance(llm_result['vendor_fields'], dict):
-                                extras.update(llm_result['vendor_fields'])
-                                canonical['vendor_fields'] = extras
-                    except Exception as e:
-                        # fail open; keep heuristic result
-                        pass
-                
-                # Create normalized spec record
-                ns = NormalizedSpec(
-                    product_id=pid,
-                    source_raw_id=docs[0].id if docs else None,
-                    **canonical
-                )
-                s.add(ns)
-                inserted += 1
-        
-        s.commit()
+                                    else:
+                                        # Convert to float for numeric fields
+                                        try:
+                                            canonical[k] = float(value) if value is not None else None
+                                        except (ValueError, TypeError):
+                                            canonical[k] = value
+                            
+                            # Update vendor fields
+                            if 'vendor_fields' in llm_result:
+                                if isinstance(llm_result['vendor_fields'], dict):
+                                    extras.update(llm_result['vendor_fields'])
+                                    canonical['vendor_fields'] = extras
+                        except Exception as e:
+                            # fail open; keep heuristic result
+                            pass
+                    
+                    # Create normalized spec record
+                    ns = NormalizedSpec(
+                        product_id=pid,
+                        source_raw_id=docs[0].id if docs else None,
+                        **canonical
+                    )
+                    s.add(ns)
+                    new_specs.append(ns)
+                    inserted += 1
+            
+            # Log per-field deltas against each model's previous snapshot
+            record_spec_changes(s, new_specs)
+            s.commit()
+            # Done with this batch: drop its documents and specs from memory
+            s.expunge_all()
         return inserted
     finally:
         s.close()
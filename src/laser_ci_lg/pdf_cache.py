@@ -0,0 +1,312 @@
+"""
+Content-addressed PDF cache.
+
+Datasheets are stored once, by SHA-256, under data/pdf_cache/objects/, and
+indexed by URL in data/pdf_cache/index.json:
+
+    objects/ab/ab12...ef.pdf            the bytes, one file per distinct content
+    <vendor>/<name>.pdf                 hard link to the object, per vendor and URL
+    index.json                          {"urls": {url: {"sha", "path"}},
+                                         "objects": {sha: {"size", "accessed"}}}
+
+The same datasheet fetched from several URLs or vendors is one object with
+several hard links (a copy where the filesystem cannot link). The cache is
+kept under max_bytes (env PDF_CACHE_MAX_MB) by evicting the least recently
+read objects, and verify() re-hashes objects to drop corrupt ones.
+
+Reads only touch access times in memory; the index is written by the next
+put/evict/maintenance call or by flush() at the end of a run.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+PDF_CACHE_DIR = "data/pdf_cache"
+PDF_CACHE_MAX_MB = float(os.getenv("PDF_CACHE_MAX_MB", "2048"))
+INDEX_FILE = "index.json"
+OBJECTS_DIR = "objects"
+
+
+def vendor_dir_name(vendor: str) -> str:
+    """Cache directory name for a vendor (e.g. "hübner_photonics_cobolt")."""
+    return vendor.lower().replace(" ", "_").replace("(", "").replace(")", "")
+
+
+def link_name(url: str) -> str:
+    """Readable file name for a URL: its basename, or a short URL hash."""
+    filename = os.path.basename(urlparse(url).path)
+    if not filename.lower().endswith(".pdf"):
+        return hashlib.md5(url.encode()).hexdigest()[:8] + ".pdf"
+    return re.sub(r"[^\w\-.]", "_", filename)
+
+
+class PdfCache:
+    """SHA-256 object store for PDFs with a URL index, LRU eviction and integrity checks."""
+
+    def __init__(self, root: str = PDF_CACHE_DIR, max_bytes: Optional[int] = None):
+        self.root = Path(root)
+        self.max_bytes = int(PDF_CACHE_MAX_MB * 1024 * 1024) if max_bytes is None else max_bytes
+        self._lock = threading.RLock()
+        self._index = None
+        self._dirty = False
+
+    # Index
+
+    @property
+    def index(self) -> Dict:
+        if self._index is None:
+            path = self.root / INDEX_FILE
+            try:
+                self._index = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._index = {}
+            self._index.setdefault("urls", {})
+            self._index.setdefault("objects", {})
+        return self._index
+
+    def _save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / f"{INDEX_FILE}.tmp"
+        tmp.write_text(json.dumps(self.index, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.root / INDEX_FILE)
+        self._dirty = False
+
+    def flush(self):
+        """Write index changes made by reads (access times, dropped entries)."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def object_path(self, sha: str) -> Path:
+        return self.root / OBJECTS_DIR / sha[:2] / f"{sha}.pdf"
+
+    def link_path(self, url: str, vendor: str) -> Path:
+        """Where url's file lives (or will live) under the vendor's directory."""
+        with self._lock:
+            entry = self.index["urls"].get(url)
+            if entry:
+                return self.root / entry["path"]
+            vendor_dir = self.root / vendor_dir_name(vendor)
+            path = vendor_dir / link_name(url)
+            taken = {e["path"] for e in self.index["urls"].values()}
+            if path.relative_to(self.root).as_posix() in taken:
+                # Same file name from another URL: disambiguate with the URL hash
+                path = vendor_dir / f"{path.stem}-{hashlib.md5(url.encode()).hexdigest()[:8]}.pdf"
+            return path
+
+    # Reads and writes
+
+    def put(self, url: str, content: bytes, vendor: str) -> str:
+        """Store content for url, returning the vendor-facing file path."""
+        sha = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            obj = self.object_path(sha)
+            if not obj.exists():
+                obj.parent.mkdir(parents=True, exist_ok=True)
+                tmp = obj.with_suffix(".tmp")
+                tmp.write_bytes(content)
+                os.replace(tmp, obj)
+            self.index["objects"][sha] = {"size": len(content), "accessed": time.time()}
+
+            path = self.link_path(url, vendor)
+            old = self.index["urls"].get(url)
+            if not (old and old["sha"] == sha and path.exists()):
+                self._link(obj, path)
+            self.index["urls"][url] = {"sha": sha, "path": path.relative_to(self.root).as_posix()}
+            if old and old["sha"] != sha:
+                self._drop_if_unreferenced(old["sha"])
+
+            self._evict_to(self.max_bytes, keep=sha)
+            self._save()
+            return str(path)
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Cached bytes for url, or None."""
+        with self._lock:
+            entry = self.index["urls"].get(url)
+            if not entry:
+                return None
+            try:
+                content = self.object_path(entry["sha"]).read_bytes()
+            except OSError:
+                self.index["urls"].pop(url)
+                self._dirty = True
+                return None
+            self.index["objects"].setdefault(entry["sha"], {"size": len(content)})["accessed"] = time.time()
+            self._dirty = True
+            return content
+
+    def path(self, url: str) -> Optional[str]:
+        """Vendor-facing file path for a cached url, or None."""
+        entry = self.index["urls"].get(url)
+        return str(self.root / entry["path"]) if entry else None
+
+    def _link(self, obj: Path, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".lnk")
+        if tmp.exists():
+            tmp.unlink()
+        try:
+            os.link(obj, tmp)
+        except OSError:
+            # No hard links here (e.g. across devices): fall back to a copy
+            tmp.write_bytes(obj.read_bytes())
+        os.replace(tmp, path)
+
+    def _urls_of(self, sha: str) -> List[str]:
+        return [url for url, e in self.index["urls"].items() if e["sha"] == sha]
+
+    def _remove_object(self, sha: str) -> int:
+        """Delete an object, its links and index entries; returns bytes freed."""
+        for url in self._urls_of(sha):
+            link = self.root / self.index["urls"].pop(url)["path"]
+            if link.exists():
+                link.unlink()
+        obj = self.object_path(sha)
+        if obj.exists():
+            obj.unlink()
+        return self.index["objects"].pop(sha, {}).get("size", 0)
+
+    def _drop_if_unreferenced(self, sha: str):
+        if not self._urls_of(sha):
+            self._remove_object(sha)
+
+    # Maintenance
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """{vendor_dir: {"files", "bytes"}} plus "total" with unique object bytes."""
+        with self._lock:
+            sizes = {sha: o.get("size", 0) for sha, o in self.index["objects"].items()}
+            per_vendor: Dict[str, Dict[str, int]] = {}
+            for entry in self.index["urls"].values():
+                vendor = entry["path"].split("/", 1)[0]
+                s = per_vendor.setdefault(vendor, {"files": 0, "bytes": 0})
+                s["files"] += 1
+                s["bytes"] += sizes.get(entry["sha"], 0)
+            per_vendor["total"] = {"files": len(sizes), "bytes": sum(sizes.values())}
+            return per_vendor
+
+    def _evict_to(self, max_bytes: int, keep: Optional[str] = None) -> int:
+        objects = self.index["objects"]
+        total = sum(o.get("size", 0) for o in objects.values())
+        freed = 0
+        for sha in sorted(objects, key=lambda s: objects[s].get("accessed", 0)):
+            if total - freed <= max_bytes:
+                break
+            if sha != keep:
+                freed += self._remove_object(sha)
+        return freed
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """Evict least recently read objects until under max_bytes; returns bytes freed."""
+        with self._lock:
+            freed = self._evict_to(self.max_bytes if max_bytes is None else max_bytes)
+            self._save()
+            return freed
+
+    def remove_vendor(self, vendor: str, dry_run: bool = False) -> Dict[str, int]:
+        """
+        Drop a vendor's files; objects no other vendor links to are deleted.
+        Returns {"files", "bytes"} removed (or that would be, with dry_run).
+        """
+        prefix = vendor_dir_name(vendor) + "/"
+        vendor_dir = self.root / prefix
+        with self._lock:
+            urls = [u for u, e in self.index["urls"].items() if e["path"].startswith(prefix)]
+            indexed = {self.index["urls"][u]["path"] for u in urls}
+            shas = {self.index["urls"][u]["sha"] for u in urls}
+            shared = {e["sha"] for e in self.index["urls"].values()
+                      if not e["path"].startswith(prefix)}
+            freed = sum(self.index["objects"].get(sha, {}).get("size", 0) for sha in shas - shared)
+            # Files saved before the object store are not in the index
+            legacy = [p for p in vendor_dir.rglob("*") if p.is_file()
+                      and p.relative_to(self.root).as_posix() not in indexed] if vendor_dir.exists() else []
+            freed += sum(p.stat().st_size for p in legacy)
+            if not dry_run:
+                for url in urls:
+                    self.index["urls"].pop(url)
+                for sha in shas - shared:
+                    self._remove_object(sha)
+                if vendor_dir.exists():
+                    shutil.rmtree(vendor_dir)
+                self._save()
+            return {"files": len(urls) + len(legacy), "bytes": freed}
+
+    def verify(self) -> Dict[str, int]:
+        """Re-hash every object; drop corrupt or missing ones and restore broken links."""
+        with self._lock:
+            result = {"ok": 0, "corrupt": 0, "missing": 0, "relinked": 0}
+            for sha in list(self.index["objects"]):
+                obj = self.object_path(sha)
+                if not obj.exists():
+                    result["missing"] += 1
+                    self._remove_object(sha)
+                    continue
+                h = hashlib.sha256()
+                with open(obj, "rb") as f:
+                    for block in iter(lambda: f.read(1 << 20), b""):
+                        h.update(block)
+                if h.hexdigest() != sha:
+                    result["corrupt"] += 1
+                    self._remove_object(sha)
+                    continue
+                result["ok"] += 1
+                for url in self._urls_of(sha):
+                    link = self.root / self.index["urls"][url]["path"]
+                    if not link.exists() or not os.path.samefile(link, obj):
+                        self._link(obj, link)
+                        result["relinked"] += 1
+            self._save()
+            return result
+
+    def adopt(self, paths_to_urls: Dict[str, str]) -> int:
+        """
+        Move files saved before the object store (path -> url, e.g. from
+        RawDocument.file_path) into it; duplicates collapse to one object.
+        Returns the number of files adopted.
+        """
+        adopted = 0
+        with self._lock:
+            for file_path, url in paths_to_urls.items():
+                path = Path(file_path)
+                if url in self.index["urls"] or not path.is_file():
+                    continue
+                try:
+                    rel = path.resolve().relative_to(self.root.resolve())
+                except ValueError:
+                    continue
+                content = path.read_bytes()
+                sha = hashlib.sha256(content).hexdigest()
+                obj = self.object_path(sha)
+                if not obj.exists():
+                    obj.parent.mkdir(parents=True, exist_ok=True)
+                    obj.write_bytes(content)
+                self.index["objects"].setdefault(sha, {"size": len(content), "accessed": time.time()})
+                self._link(obj, path)
+                self.index["urls"][url] = {"sha": sha, "path": rel.as_posix()}
+                adopted += 1
+            self._save()
+        return adopted
+
+
+_shared_cache: Optional[PdfCache] = None
+_shared_lock = threading.Lock()
+
+
+def shared_pdf_cache() -> PdfCache:
+    """Process-wide PdfCache so every scraper shares one index."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = PdfCache()
+            atexit.register(_shared_cache.flush)
+        return _shared_cache
@@ -0,0 +1,201 @@
+"""
+Page readiness for browser scraping, instead of fixed sleeps.
+
+wait_until_ready() returns as soon as the DOM has been quiet (no mutations)
+for QUIET_MS, or, on sites learned to never go quiet (carousels, live
+widgets), as soon as a spec-table selector is present. Either way it gives
+up after a cap.
+
+Each domain's observed time-to-ready and matching selector are kept in
+data/readiness.json. Later runs then use a cap of about twice the usual
+time. Where spec content was seen before, they wait for its selector as
+well as quiet; where the DOM never went quiet, they stop at the selector.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+READINESS_FILE = "data/readiness.json"
+
+# Selectors that mark a rendered spec section
+SPEC_SELECTORS = ["table", ".specifications", ".specs", ".datasheet", ".product-specs"]
+
+QUIET_MS = 300          # DOM quiet this long = ready
+DEFAULT_CAP_MS = 5000   # cap for domains without history
+MIN_CAP_MS = 1000
+MAX_CAP_MS = 8000
+EWMA_ALPHA = 0.3
+
+# Resolves when the DOM is quiet for quietMs (and, with needSelector, a
+# selector matches; with selectorOnly, as soon as one does), or at capMs.
+# Reports which selector matched, if any.
+_READY_JS = """
+({quietMs, capMs, selectors, needSelector, selectorOnly}) => new Promise(resolve => {
+  const start = performance.now();
+  let last = start;
+  const observer = new MutationObserver(() => { last = performance.now(); });
+  observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+  const matched = () => selectors.find(s => { try { return document.querySelector(s); } catch (e) { return false; } }) || null;
+  const tick = () => {
+    const now = performance.now();
+    const selector = matched();
+    const quiet = now - last >= quietMs;
+    if ((quiet && (selector || !needSelector)) || (selectorOnly && selector) || now - start >= capMs) {
+      observer.disconnect();
+      resolve({quiet: quiet, selector: selector, elapsed: now - start});
+    } else {
+      setTimeout(tick, 50);
+    }
+  };
+  setTimeout(tick, 50);
+})
+"""
+
+
+def _domain(url: str) -> str:
+    return urlparse(url or "").netloc.lower()
+
+
+class ReadinessProfiles:
+    """Per-domain readiness history: {domain: {ready_ms, selector, signal, samples, timeouts}}."""
+
+    def __init__(self, path: Optional[str] = READINESS_FILE):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._profiles = None
+
+    @property
+    def profiles(self) -> Dict[str, Dict]:
+        if self._profiles is None:
+            try:
+                self._profiles = json.loads(self.path.read_text(encoding="utf-8")) if self.path else {}
+            except (OSError, ValueError):
+                self._profiles = {}
+        return self._profiles
+
+    def get(self, domain: str) -> Dict:
+        with self._lock:
+            return dict(self.profiles.get(domain, {}))
+
+    def cap_ms(self, domain: str) -> float:
+        """About twice the domain's usual time to ready, within MIN/MAX_CAP_MS."""
+        profile = self.get(domain)
+        if not profile.get("samples"):
+            return DEFAULT_CAP_MS
+        return max(MIN_CAP_MS, min(MAX_CAP_MS, 2 * profile["ready_ms"] + QUIET_MS))
+
+    def record(self, domain: str, result: Dict):
+        """Fold one observation ({quiet, selector, elapsed}) into the domain's profile."""
+        with self._lock:
+            profile = self.profiles.setdefault(domain, {"samples": 0})
+            if not result.get("quiet") and not result.get("selector"):
+                # Hit the cap with no signal: says nothing about time to ready
+                profile["timeouts"] = profile.get("timeouts", 0) + 1
+                self._save()
+                return
+            elapsed = float(result.get("elapsed", 0))
+            samples = profile["samples"]
+            profile["ready_ms"] = elapsed if not samples else \
+                (1 - EWMA_ALPHA) * profile["ready_ms"] + EWMA_ALPHA * elapsed
+            profile["samples"] = samples + 1
+            if result.get("selector"):
+                profile["selector"] = result["selector"]
+            # Selector present but the DOM never settled: next time stop at the selector
+            profile["signal"] = "selector" if result.get("selector") and not result.get("quiet") \
+                else "quiet"
+            self._save()
+
+    def _save(self):
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.profiles, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+_shared_profiles: Optional[ReadinessProfiles] = None
+_shared_lock = threading.Lock()
+
+
+def shared_profiles() -> ReadinessProfiles:
+    global _shared_profiles
+    with _shared_lock:
+        if _shared_profiles is None:
+            _shared_profiles = ReadinessProfiles()
+        return _shared_profiles
+
+
+def _ready_params(page, url, selectors, cap_ms, learn, profiles):
+    domain = _domain(url or page.url)
+    profile = profiles.get(domain) if learn else {}
+    candidates = list(SPEC_SELECTORS if selectors is None else selectors)
+    learned = profile.get("selector") in candidates
+    if learned:
+        candidates.remove(profile["selector"])
+        candidates.insert(0, profile["selector"])
+    if cap_ms is None:
+        cap_ms = profiles.cap_ms(domain) if learn else DEFAULT_CAP_MS
+    params = {
+        "quietMs": QUIET_MS,
+        "capMs": cap_ms,
+        "selectors": candidates,
+        # Spec content seen here before: don't stop at a quiet page without it
+        "needSelector": learned,
+        "selectorOnly": learned and profile.get("signal") == "selector",
+    }
+    return domain, params
+
+
+def wait_until_ready(page, url: Optional[str] = None, selectors: Optional[List[str]] = None,
+                     cap_ms: Optional[float] = None, learn: bool = True,
+                     profiles: Optional[ReadinessProfiles] = None) -> Dict:
+    """
+    Wait until page is ready and return {quiet, selector, elapsed} (ms).
+
+    selectors defaults to SPEC_SELECTORS; the domain's learned selector is
+    tried first. With learn=False (e.g. settling after a click) nothing is
+    recorded and the cap defaults to the domain's cap without history.
+    """
+    profiles = profiles or shared_profiles()
+    domain, params = _ready_params(page, url, selectors, cap_ms, learn, profiles)
+    start = time.perf_counter()
+    try:
+        result = page.evaluate(_READY_JS, params)
+    except Exception:
+        # Not a DOM we can observe (PDF viewer, navigation in flight)
+        return {"quiet": False, "selector": None, "elapsed": (time.perf_counter() - start) * 1000}
+    if learn and domain:
+        profiles.record(domain, result)
+    return result
+
+
+async def wait_until_ready_async(page, url: Optional[str] = None, selectors: Optional[List[str]] = None,
+                                 cap_ms: Optional[float] = None, learn: bool = True,
+                                 profiles: Optional[ReadinessProfiles] = None) -> Dict:
+    """wait_until_ready for a Playwright async API page."""
+    profiles = profiles or shared_profiles()
+    domain, params = _ready_params(page, url, selectors, cap_ms, learn, profiles)
+    start = time.perf_counter()
+    try:
+        result = await page.evaluate(_READY_JS, params)
+    except Exception:
+        return {"quiet": False, "selector": None, "elapsed": (time.perf_counter() - start) * 1000}
+    if learn and domain:
+        profiles.record(domain, result)
+    return result
+
+
+def settle(page, cap_ms: float = 1500) -> Dict:
+    """Short wait for the DOM to settle after an interaction (click, scroll, search)."""
+    return wait_until_ready(page, selectors=[], cap_ms=cap_ms, learn=False)
+
+
+async def settle_async(page, cap_ms: float = 1500) -> Dict:
+    """settle for a Playwright async API page."""
+    return await wait_until_ready_async(page, selectors=[], cap_ms=cap_ms, learn=False)
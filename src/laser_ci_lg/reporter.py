@@ -1,28 +1,39 @@
 from datetime import datetime, timedelta
 from sqlalchemy import select
 from .db import SessionLocal
-from .models import Manufacturer, Product, NormalizedSpec
+from .models import Manufacturer, Product, SpecChange
+
+# (field, relative-change threshold, label, unit) for "significant" changes
+SIGNIFICANT_CHANGES = [
+    ("output_power_mw_nominal", 0.10, "Power", "mW"),
+    ("rms_noise_pct", 0.25, "RMS noise", "%"),
+    ("power_stability_pct", 0.25, "Stability", "%"),
+    ("modulation_digital_hz", 1.0, "Digital mod BW", "Hz"),
+]
 
 
 def monthly_report(days: int = 35) -> str:
     s = SessionLocal()
     try:
         since = datetime.utcnow() - timedelta(days=days)
-        latest, prev = {}, {}
-        ns_rows = (
-            s.execute(
-                select(NormalizedSpec).order_by(
-                    NormalizedSpec.product_id, NormalizedSpec.snapshot_ts.desc()
-                )
-            )
-            .scalars()
-            .all()
-        )
-        for ns in ns_rows:
-            if ns.product_id not in latest:
-                latest[ns.product_id] = ns
-            elif ns.snapshot_ts < latest[ns.product_id].snapshot_ts:
-                prev.setdefault(ns.product_id, ns)
+
+        # Deltas are precomputed at normalization time (see changes.py);
+        # only the window's changes are read here.
+        thresholds = {f: (th, label, unit) for f, th, label, unit in SIGNIFICANT_CHANGES}
+        change_rows = s.execute(
+            select(SpecChange, Product)
+            .join(Product, SpecChange.product_id == Product.id)
+            .where(SpecChange.snapshot_ts >= since, SpecChange.field.in_(list(thresholds)))
+            .order_by(SpecChange.snapshot_ts, SpecChange.id)
+        ).all()
+        # Net change per (product, model, field) across the window
+        net = {}
+        for ch, p in change_rows:
+            key = (p.id, ch.model, ch.field)
+            if key in net:
+                net[key]["new"] = ch.new_value
+            else:
+                net[key] = {"product": p, "old": ch.old_value, "new": ch.new_value}
 
         prows = s.execute(
             select(Product, Manufacturer).join(
@@ -43,34 +54,22 @@ def monthly_report(days: int = 35) -> str:
             lines.append("")
 
         lines.append("## Significant Spec Changes")
-        for pid, ns in latest.items():
-            pv = prev.get(pid)
-            if not pv:
-                continue
 
-            def big_change(a, b, th):
-                if a is None or b is None or b == 0:
-                    return False
-                return abs(a - b) / abs(b) >= th
+        def big_change(a, b, th):
+            if a is None or b is None or b == 0:
+                return False
+            return abs(a - b) / abs(b) >= th
+
+        by_model = {}
+        for (pid, model, field), d in net.items():
+            th, label, unit = thresholds[field]
+            if big_change(d["new"], d["old"], th):
+                entry = by_model.setdefault((pid, model), (d["product"], {}))
+                entry[1][field] = f"{label} {d['old']}→{d['new']} {unit}"
 
-            changes = []
-            if big_change(ns.output_power_mw_nominal, pv.output_power_mw_nominal, 0.10):
-                changes.append(
-                    f"Power {pv.output_power_mw_nominal}→{ns.output_power_mw_nominal} mW"
-                )
-            if big_change(ns.rms_noise_pct, pv.rms_noise_pct, 0.25):
-                changes.append(f"RMS noise {pv.rms_noise_pct}→{ns.rms_noise_pct} %")
-            if big_change(ns.power_stability_pct, pv.power_stability_pct, 0.25):
-                changes.append(
-                    f"Stability {pv.power_stability_pct}→{ns.power_stability_pct} %"
-                )
-            if big_change(ns.modulation_digital_hz, pv.modulation_digital_hz, 1.0):
-                changes.append(
-                    f"Digital mod BW {pv.modulation_digital_hz}→{ns.modulation_digital_hz} Hz"
-                )
-            if changes:
-                p = s.get(Product, pid)
-                lines.append(f"- **{p.name}** ({p.segment_id}) — " + "; ".join(changes))
+        for (pid, model), (p, changes) in sorted(by_model.items(), key=lambda kv: (kv[1][0].name, kv[0][1])):
+            ordered = [changes[f] for f, *_ in SIGNIFICANT_CHANGES if f in changes]
+            lines.append(f"- **{model or p.name}** ({p.segment_id}) — " + "; ".join(ordered))
         return "\n".join(lines) + "\n"
     finally:
         s.close()
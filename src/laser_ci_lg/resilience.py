@@ -0,0 +1,241 @@
+"""
+Resilient HTTP fetching for the scrapers.
+
+fetch() wraps requests.get with:
+
+- a circuit breaker per host: after FETCH_BREAKER_THRESHOLD consecutive
+  failures the host is skipped (CircuitOpenError, raised immediately) for
+  FETCH_BREAKER_RESET_S seconds, then one trial request decides whether
+  it closes again;
+- retries with full-jitter exponential backoff for transient errors
+  (connection errors, timeouts, 429 and 5xx), honouring Retry-After;
+- a deadline budget per call: retries, backoff and per-attempt timeouts
+  together never exceed FETCH_DEADLINE_S.
+
+Every attempt is counted per host in fetch_metrics(), which the crawlers
+print and return with their run results.
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+FETCH_MAX_RETRIES = int(os.getenv("FETCH_MAX_RETRIES", "2"))
+FETCH_DEADLINE_S = float(os.getenv("FETCH_DEADLINE_S", "45"))
+FETCH_BREAKER_THRESHOLD = int(os.getenv("FETCH_BREAKER_THRESHOLD", "3"))
+FETCH_BREAKER_RESET_S = float(os.getenv("FETCH_BREAKER_RESET_S", "300"))
+
+# Statuses worth retrying; other responses are returned to the caller as-is
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+BACKOFF_BASE_S = 0.5
+BACKOFF_MAX_S = 8.0
+
+
+class CircuitOpenError(requests.RequestException):
+    """The host's circuit breaker is open; the request was not sent."""
+
+
+class DeadlineExceeded(requests.Timeout):
+    """The call's deadline budget ran out before a response arrived."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open (one trial) -> closed."""
+
+    def __init__(self, threshold: int = FETCH_BREAKER_THRESHOLD,
+                 reset_after: float = FETCH_BREAKER_RESET_S):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._trial:
+            self._trial = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+        self._trial = False
+
+
+class ResilientFetcher:
+    """requests.get with per-host breakers, jittered retries and deadlines."""
+
+    def __init__(self, max_retries: int = FETCH_MAX_RETRIES, deadline: float = FETCH_DEADLINE_S,
+                 breaker_threshold: int = FETCH_BREAKER_THRESHOLD,
+                 breaker_reset_after: float = FETCH_BREAKER_RESET_S,
+                 sleep=time.sleep, get=None):
+        self.max_retries = max_retries
+        self.deadline = deadline
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset_after = breaker_reset_after
+        self._sleep = sleep
+        self._get = get or requests.get
+        self._lock = threading.Lock()
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.metrics: Dict[str, Dict[str, float]] = {}
+
+    def _host(self, url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def _stats(self, host: str) -> Dict[str, float]:
+        return self.metrics.setdefault(host, {
+            "requests": 0, "ok": 0, "failed": 0, "retries": 0,
+            "skipped": 0, "trips": 0, "seconds": 0.0,
+        })
+
+    def _breaker(self, host: str) -> CircuitBreaker:
+        if host not in self.breakers:
+            self.breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_reset_after)
+        return self.breakers[host]
+
+    def get(self, url: str, timeout: float = 30, deadline: Optional[float] = None,
+            **kwargs) -> requests.Response:
+        """
+        GET url. Transient failures are retried within the deadline; the last
+        retryable response is returned if retries run out, the last exception
+        is raised. Other request errors are raised at once. Raises CircuitOpenError without sending when the host's
+        breaker is open.
+        """
+        host = self._host(url)
+        with self._lock:
+            stats = self._stats(host)
+            if not self._breaker(host).allow():
+                stats["skipped"] += 1
+                raise CircuitOpenError(f"circuit open for {host}, skipping {url}")
+            stats["requests"] += 1
+
+        start = time.monotonic()
+        end = start + (self.deadline if deadline is None else deadline)
+        attempt = 0
+        try:
+            while True:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    raise DeadlineExceeded(f"deadline exceeded for {url}")
+                retry_after = None
+                try:
+                    response = self._get(url, timeout=min(timeout, remaining), **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error, response = e, None
+                except requests.RequestException:
+                    # Not transient (redirect loops, bad URLs, broken bodies): no retry,
+                    # but the failure still counts and ends a half-open trial
+                    self._record(host, ok=False)
+                    raise
+                else:
+                    if response.status_code not in RETRY_STATUSES:
+                        self._record(host, ok=True)
+                        return response
+                    error = None
+                    retry_after = self._retry_after(response)
+
+                delay = retry_after if retry_after is not None else \
+                    random.uniform(0, min(BACKOFF_MAX_S, BACKOFF_BASE_S * 2 ** attempt))
+                if attempt >= self.max_retries or time.monotonic() + delay >= end:
+                    self._record(host, ok=False)
+                    if response is not None:
+                        return response
+                    raise error
+                attempt += 1
+                with self._lock:
+                    stats["retries"] += 1
+                self._sleep(delay)
+        except DeadlineExceeded:
+            self._record(host, ok=False)
+            raise
+        finally:
+            with self._lock:
+                stats["seconds"] += time.monotonic() - start
+
+    @staticmethod
+    def _retry_after(response) -> Optional[float]:
+        value = response.headers.get("Retry-After", "")
+        try:
+            return min(float(value), BACKOFF_MAX_S)
+        except ValueError:
+            return None
+
+    def _record(self, host: str, ok: bool):
+        with self._lock:
+            stats, breaker = self._stats(host), self._breaker(host)
+            if ok:
+                stats["ok"] += 1
+                breaker.record_success()
+                return
+            stats["failed"] += 1
+            was_open = breaker.opened_at is not None
+            breaker.record_failure()
+            if breaker.opened_at is not None and not was_open:
+                stats["trips"] += 1
+                print(f"  → Circuit open for {host} after {breaker.failures} failures")
+
+    def format_stats(self) -> List[str]:
+        """One line per host that had failures, retries or skips."""
+        lines = []
+        with self._lock:
+            for host, s in sorted(self.metrics.items()):
+                if s["failed"] or s["retries"] or s["skipped"]:
+                    lines.append(
+                        f"{host}: {s['ok']}/{s['requests']} ok, {s['retries']} retries, "
+                        f"{s['failed']} failed, {s['skipped']} skipped (circuit open), "
+                        f"{s['seconds']:.1f}s"
+                    )
+        return lines
+
+    def reset(self):
+        """Start a new run: clear metrics and close all breakers."""
+        with self._lock:
+            self.metrics.clear()
+            self.breakers.clear()
+
+
+_shared_fetcher: Optional[ResilientFetcher] = None
+_shared_lock = threading.Lock()
+
+
+def shared_fetcher() -> ResilientFetcher:
+    """Process-wide fetcher so every scraper shares the host breakers."""
+    global _shared_fetcher
+    with _shared_lock:
+        if _shared_fetcher is None:
+            _shared_fetcher = ResilientFetcher()
+        return _shared_fetcher
+
+
+def fetch(url: str, timeout: float = 30, **kwargs) -> requests.Response:
+    """requests.get through the shared ResilientFetcher."""
+    return shared_fetcher().get(url, timeout=timeout, **kwargs)
+
+
+def fetch_metrics() -> Dict[str, Dict[str, float]]:
+    """Per-host fetch accounting for the current run."""
+    fetcher = shared_fetcher()
+    with fetcher._lock:
+        return {host: dict(stats) for host, stats in fetcher.metrics.items()}
@@ -6,9 +6,10 @@ from pathlib import Path
 import tempfile
 import hashlib
 import os
-from urllib.parse import urlparse
 import re
-from ..extraction import AdvancedHTMLExtractor, AdvancedPDFExtractor
+from ..extraction import AdvancedHTMLExtractor, shared_pdf_extractor
+from ..pdf_cache import shared_pdf_cache
+from ..resilience import fetch
 from typing import Union
 
 
@@ -19,13 +20,29 @@ class BaseScraper(ABC):
     def __init__(self, targets: list[dict], force_refresh: bool = False):
         self._targets = targets
         self.force_refresh = force_refresh
-        self.cache_dir = Path("data/pdf_cache")
+        self.pdf_cache = shared_pdf_cache()
+        self.cache_dir = self.pdf_cache.root
         self.html_extractor = AdvancedHTMLExtractor()
-        self.pdf_extractor = AdvancedPDFExtractor()
+        self.pdf_extractor = shared_pdf_extractor()
+        self._browser_profile = None
 
     @abstractmethod
     def vendor(self) -> str: ...
 
+    @property
+    def browser_profile(self):
+        """Lightweight scraping profile for this vendor's browser pages (loaded on first use)."""
+        if self._browser_profile is None:
+            from ..browser import scrape_profile_for
+            self._browser_profile = scrape_profile_for(self.vendor())
+        return self._browser_profile
+
+    def format_browser_stats(self) -> List[str]:
+        """Requests, blocks and bytes of this scraper's browser pages, if it used any."""
+        if self._browser_profile is None or not self._browser_profile.stats["requests"]:
+            return []
+        return [self._browser_profile.format_stats()]
+
     def iter_targets(self) -> Iterable[Target]:
         for t in self._targets:
             pid = t["product_id"]
@@ -35,7 +52,7 @@ class BaseScraper(ABC):
                 yield {"product_id": pid, "url": ds, "kind": "pdf"}
 
     def fetch(self, url: str) -> tuple[int, str, str]:
-        r = requests.get(url, timeout=30)
+        r = fetch(url, timeout=30)
         ctype = (
             "pdf"
             if url.lower().endswith(".pdf")
@@ -71,9 +88,13 @@ class BaseScraper(ABC):
         return self.html_extractor.extract_all_specs(html_text)
     
     def extract_pdf_specs_with_docling(self, pdf_content: bytes) -> Tuple[str, dict]:
-        """Extract text and structured data from PDF using advanced extraction"""
+        """
+        Extract text and structured data from PDF, escalating to Docling only when needed.
+        When the pdfplumber text layer is complete enough, the returned text is its
+        plain text (tables as markdown) rather than Docling markdown.
+        """
         try:
-            return self.pdf_extractor.extract_specs(pdf_content)
+            return self.pdf_extractor.extract_specs_tiered(pdf_content)
         except Exception as e:
             print(f"Advanced extraction failed: {e}, falling back to pdfplumber")
             # Fallback to pdfplumber
@@ -87,19 +108,9 @@ class BaseScraper(ABC):
         return hashlib.sha256(content).hexdigest()
     
     def get_pdf_cache_path(self, url: str) -> Path:
-        """Generate cache path for PDF based on URL"""
-        parsed = urlparse(url)
-        vendor_dir = self.vendor().lower().replace(" ", "_").replace("(", "").replace(")", "")
-        
-        # Extract filename from URL
-        filename = os.path.basename(parsed.path)
-        if not filename.endswith('.pdf'):
-            filename = hashlib.md5(url.encode()).hexdigest()[:8] + ".pdf"
-        
-        # Create path: data/pdf_cache/vendor/filename
-        cache_path = self.cache_dir / vendor_dir / filename
+        """Cache path for a PDF URL: data/pdf_cache/<vendor>/<filename> (a link into the object store)"""
+        cache_path = self.pdf_cache.link_path(url, self.vendor())
         cache_path.parent.mkdir(parents=True, exist_ok=True)
-        
         return cache_path
     
     def should_skip_document(self, url: str, current_hash: str) -> Tuple[bool, Optional[str], Optional[str]]:
@@ -130,20 +141,15 @@ class BaseScraper(ABC):
             s.close()
     
     def cache_pdf(self, url: str, content: bytes) -> str:
-        """Save PDF to cache and return the file path"""
-        cache_path = self.get_pdf_cache_path(url)
-        cache_path.write_bytes(content)
-        return str(cache_path)
+        """Save PDF to the content-addressed cache and return the file path"""
+        return self.pdf_cache.put(url, content, self.vendor())
     
     def get_cached_pdf(self, url: str) -> Optional[bytes]:
         """Retrieve cached PDF if it exists"""
         if self.force_refresh:
             return None
             
-        cache_path = self.get_pdf_cache_path(url)
-        if cache_path.exists():
-            return cache_path.read_bytes()
-        return None
+        return self.pdf_cache.get(url)
     
     def requires_browser(self, url: str, initial_response: Union[requests.Response, None] = None) -> bool:
         """
@@ -158,7 +164,7 @@ class BaseScraper(ABC):
         # Fetch if not provided
         if initial_response is None:
             try:
-                initial_response = requests.get(url, timeout=10, allow_redirects=True)
+                initial_response = fetch(url, timeout=10, allow_redirects=True)
             except:
                 return False
         
@@ -227,75 +233,57 @@ class BaseScraper(ABC):
         Returns: (status_code, content_type, text, content_hash, file_path, raw_specs)
         """
         try:
-            from playwright.sync_api import sync_playwright
-            import time
+            from ..browser import browser_page
+            from ..readiness import settle, wait_until_ready
             
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                context = browser.new_context()
-                page = context.new_page()
+            with browser_page(profile=self.browser_profile) as page:
+                print(f"  → Browser fetching: {url}")
+                response = page.goto(url, wait_until="domcontentloaded", timeout=30000)
                 
-                try:
-                    print(f"  → Browser fetching: {url}")
-                    response = page.goto(url, wait_until="networkidle", timeout=30000)
+                if url.lower().endswith(".pdf"):
+                    # Wait for potential redirect or download
+                    settle(page, cap_ms=2000)
                     
-                    if url.lower().endswith(".pdf"):
-                        # Wait for potential redirect or download
-                        time.sleep(2)
-                        
-                        # Check if we got an actual PDF or HTML
-                        content = page.content()
-                        if '<html' in content.lower():
-                            # Still HTML, might need to trigger download
-                            # Try to find and click download link
-                            download_link = page.locator('a[href*=".pdf"], button:has-text("Download")')
-                            if download_link.count() > 0:
-                                with page.expect_download() as download_info:
-                                    download_link.first.click()
-                                download = download_info.value
-                                
-                                cache_path = self.get_pdf_cache_path(url)
-                                download.save_as(cache_path)
-                                content = cache_path.read_bytes()
-                            else:
-                                # Can't find PDF, return HTML
-                                content = content.encode()
-                        else:
-                            # Got PDF content directly
-                            content = page.content().encode()
-                        
-                        if content.startswith(b'%PDF'):
-                            # It's a real PDF
-                            cache_path = self.get_pdf_cache_path(url)
-                            cache_path.write_bytes(content)
-                            content_hash = self.calculate_content_hash(content)
-                            text, raw_specs = self.extract_pdf_specs_with_docling(content)
-                            return response.status, "pdf_text", text, content_hash, str(cache_path), raw_specs
+                    # Check if we got an actual PDF or HTML
+                    content = page.content()
+                    if '<html' in content.lower():
+                        # Still HTML, might need to trigger download
+                        # Try to find and click download link
+                        download_link = page.locator('a[href*=".pdf"], button:has-text("Download")')
+                        if download_link.count() > 0:
+                            with page.expect_download() as download_info:
+                                download_link.first.click()
+                            download = download_info.value
+                            
+                            content = Path(download.path()).read_bytes()
                         else:
-                            # Still HTML, process as HTML
-                            content_hash = self.calculate_content_hash(content)
-                            raw_specs = self.extract_all_html_specs(content.decode('utf-8', errors='ignore'))
-                            return response.status, "html", content.decode('utf-8', errors='ignore'), content_hash, None, raw_specs
+                            # Can't find PDF, return HTML
+                            content = content.encode()
+                    else:
+                        # Got PDF content directly
+                        content = page.content().encode()
                     
+                    if content.startswith(b'%PDF'):
+                        # It's a real PDF
+                        file_path = self.cache_pdf(url, content)
+                        content_hash = self.calculate_content_hash(content)
+                        text, raw_specs = self.extract_pdf_specs_with_docling(content)
+                        return response.status, "pdf_text", text, content_hash, file_path, raw_specs
                     else:
-                        # HTML page - wait for content
-                        time.sleep(3)
-                        
-                        # Try to wait for specific content
-                        try:
-                            page.wait_for_selector("table, .specifications, .specs, .datasheet, .product-specs", 
-                                                 timeout=5000, state="visible")
-                        except:
-                            pass  # Content might be there even without these selectors
-                        
-                        html_content = page.content()
-                        content_hash = self.calculate_content_hash(html_content.encode())
-                        raw_specs = self.extract_all_html_specs(html_content)
-                        
-                        return response.status, "html", html_content, content_hash, None, raw_specs
-                        
-                finally:
-                    browser.close()
+                        # Still HTML, process as HTML
+                        content_hash = self.calculate_content_hash(content)
+                        raw_specs = self.extract_all_html_specs(content.decode('utf-8', errors='ignore'))
+                        return response.status, "html", content.decode('utf-8', errors='ignore'), content_hash, None, raw_specs
+                
+                else:
+                    # HTML page - wait until rendered (spec content or a quiet DOM)
+                    wait_until_ready(page, url)
+                    
+                    html_content = page.content()
+                    content_hash = self.calculate_content_hash(html_content.encode())
+                    raw_specs = self.extract_all_html_specs(html_content)
+                    
+                    return response.status, "html", html_content, content_hash, None, raw_specs
                     
         except ImportError:
             print(f"  → Playwright not available, falling back to requests")
@@ -311,7 +299,7 @@ class BaseScraper(ABC):
         is_pdf = url.lower().endswith(".pdf")
         
         # Fetch from network
-        r = requests.get(url, timeout=30)
+        r = fetch(url, timeout=30)
         content = r.content
         content_hash = self.calculate_content_hash(content)
         
@@ -352,11 +340,11 @@ class BaseScraper(ABC):
                 # Process cached PDF
                 print(f"  → Processing cached PDF: {url}")
                 text, raw_specs = self.extract_pdf_specs_with_docling(cached_content)
-                return 200, "pdf_text", text, content_hash, str(self.get_pdf_cache_path(url)), raw_specs
+                return 200, "pdf_text", text, content_hash, self.pdf_cache.path(url), raw_specs
         
         # Fetch from network
         print(f"  → Fetching: {url}")
-        r = requests.get(url, timeout=30)
+        r = fetch(url, timeout=30)
         
         # Check if browser is needed
         if self.requires_browser(url, r):
@@ -7,10 +7,8 @@ This scraper uses a headless browser to:
 3. Extract specifications from both HTML and PDF content
 """
 
-from playwright.sync_api import sync_playwright
 from .base import BaseScraper
 from ..db import SessionLocal
-import time
 from pathlib import Path
 import hashlib
 
@@ -27,16 +25,14 @@ class LumencorBrowserScraper(BaseScraper):
         Fetch content using Playwright browser.
         Handles JavaScript-rendered pages and dynamic PDF downloads.
         """
-        with sync_playwright() as p:
-            # Launch browser in headless mode
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context()
-            page = context.new_page()
-            
+        from ..browser import browser_page
+        from ..readiness import wait_until_ready
+
+        with browser_page(profile=self.browser_profile) as page:
             try:
                 # Navigate to URL
                 print(f"  → Browser fetching: {url}")
-                response = page.goto(url, wait_until="networkidle", timeout=30000)
+                response = page.goto(url, wait_until="domcontentloaded", timeout=30000)
                 
                 if url.lower().endswith(".pdf"):
                     # Handle PDF download
@@ -46,28 +42,20 @@ class LumencorBrowserScraper(BaseScraper):
                         page.goto(url)
                     download = download_info.value
                     
-                    # Save PDF to cache
-                    cache_path = self.get_pdf_cache_path(url)
-                    download.save_as(cache_path)
-                    
-                    # Read the content
-                    content = cache_path.read_bytes()
+                    # Read the content and save the PDF to cache
+                    content = Path(download.path()).read_bytes()
+                    file_path = self.cache_pdf(url, content)
                     content_hash = self.calculate_content_hash(content)
                     
                     # Extract specs from PDF
                     text, raw_specs = self.extract_pdf_specs_with_docling(content)
                     
-                    return response.status, "pdf_text", text, content_hash, str(cache_path), raw_specs
+                    return response.status, "pdf_text", text, content_hash, file_path, raw_specs
                     
                 else:
-                    # Handle HTML page - wait for content to load
-                    # Wait a bit for JavaScript to render
-                    time.sleep(3)
-                    
-                    # Try to find specification tables or content
-                    # Look for common patterns in the rendered content
-                    page.wait_for_selector("table, .specifications, .specs, .datasheet", 
-                                         timeout=5000, state="visible")
+                    # Handle HTML page - wait for JavaScript to render
+                    # the specification tables (or for the DOM to go quiet)
+                    wait_until_ready(page, url)
                     
                     # Get the rendered HTML
                     html_content = page.content()
@@ -82,9 +70,6 @@ class LumencorBrowserScraper(BaseScraper):
                 print(f"  → Browser error: {e}")
                 # Fall back to basic fetch
                 return self.fetch_with_cache(url)
-                
-            finally:
-                browser.close()
     
     def run(self):
         """Run the enhanced Lumencor scraper with browser support."""
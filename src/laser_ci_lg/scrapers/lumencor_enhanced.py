@@ -212,82 +212,74 @@ class LumencorEnhancedScraper(BaseScraper):
         Waits for dynamic content and interacts with the page as needed.
         """
         try:
-            from playwright.sync_api import sync_playwright
+            from ..browser import browser_page
+            from ..readiness import settle, wait_until_ready
             
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                context = browser.new_context(
-                    viewport={'width': 1920, 'height': 1080},
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                )
-                page = context.new_page()
+            with browser_page(
+                profile=self.browser_profile,
+                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            ) as page:
+                print(f"  → Enhanced browser fetching: {url}")
                 
+                # Navigate to the page
+                response = page.goto(url, wait_until="domcontentloaded", timeout=60000)
+                
+                # Wait for Vue/Nuxt to render
+                wait_until_ready(page, url)
+                
+                # Try to find and click on specifications tab if present
                 try:
-                    print(f"  → Enhanced browser fetching: {url}")
-                    
-                    # Navigate to the page
-                    response = page.goto(url, wait_until="networkidle", timeout=60000)
-                    
-                    # Wait for Vue/Nuxt to render
-                    page.wait_for_timeout(5000)
-                    
-                    # Try to find and click on specifications tab if present
-                    try:
-                        spec_buttons = page.locator('button:has-text("Specification"), button:has-text("Technical"), button:has-text("Specs"), a:has-text("Specification"), a:has-text("Technical")')
-                        if spec_buttons.count() > 0:
-                            spec_buttons.first.click()
-                            page.wait_for_timeout(2000)
-                    except:
-                        pass
-                    
-                    # Try to expand any collapsed sections
-                    try:
-                        expanders = page.locator('[aria-expanded="false"], .collapsed, .accordion-button')
-                        for i in range(min(expanders.count(), 5)):
-                            try:
-                                expanders.nth(i).click()
-                                page.wait_for_timeout(500)
-                            except:
-                                pass
-                    except:
-                        pass
-                    
-                    # Scroll to load lazy content
-                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    page.wait_for_timeout(2000)
-                    
-                    # Get the fully rendered HTML
-                    html_content = page.content()
-                    
-                    # Check if it's a PDF URL that actually delivered a PDF
-                    if url.lower().endswith('.pdf'):
-                        if html_content.startswith('%PDF'):
-                            # It's a real PDF
-                            content = html_content.encode()
-                            cache_path = self.get_pdf_cache_path(url)
-                            cache_path.write_bytes(content)
-                            content_hash = self.calculate_content_hash(content)
-                            text, raw_specs = self.extract_pdf_specs_with_docling(content)
-                            return response.status, "pdf_text", text, content_hash, str(cache_path), raw_specs
-                    
-                    # Process as HTML with custom extraction
-                    content_hash = self.calculate_content_hash(html_content.encode())
-                    
-                    # Use custom extraction for Lumencor
-                    raw_specs = self.extract_lumencor_specs(html_content, url)
-                    
-                    # Also try standard extraction and merge (but don't overwrite custom fields)
-                    standard_specs = self.extract_all_html_specs(html_content)
-                    if standard_specs:
-                        # Only add specs that don't exist in custom extraction
-                        for key, value in standard_specs.items():
-                            if key not in raw_specs:
-                                raw_specs[key] = value
-                    
-                    return response.status, "html", html_content, content_hash, None, raw_specs
-                    
-                finally:
-                    browser.close()
+                    spec_buttons = page.locator('button:has-text("Specification"), button:has-text("Technical"), button:has-text("Specs"), a:has-text("Specification"), a:has-text("Technical")')
+                    if spec_buttons.count() > 0:
+                        spec_buttons.first.click()
+                        settle(page, cap_ms=2000)
+                except:
+                    pass
+                
+                # Try to expand any collapsed sections
+                try:
+                    expanders = page.locator('[aria-expanded="false"], .collapsed, .accordion-button')
+                    for i in range(min(expanders.count(), 5)):
+                        try:
+                            expanders.nth(i).click()
+                            settle(page, cap_ms=500)
+                        except:
+                            pass
+                except:
+                    pass
+                
+                # Scroll to load lazy content
+                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                settle(page, cap_ms=2000)
+                
+                # Get the fully rendered HTML
+                html_content = page.content()
+                
+                # Check if it's a PDF URL that actually delivered a PDF
+                if url.lower().endswith('.pdf'):
+                    if html_content.startswith('%PDF'):
+                        # It's a real PDF
+                        content = html_content.encode()
+                        file_path = self.cache_pdf(url, content)
+                        content_hash = self.calculate_content_hash(content)
+                        text, raw_specs = self.extract_pdf_specs_with_docling(content)
+                        return response.status, "pdf_text", text, content_hash, file_path, raw_specs
+                
+                # Process as HTML with custom extraction
+                content_hash = self.calculate_content_hash(html_content.encode())
+                
+                # Use custom extraction for Lumencor
+                raw_specs = self.extract_lumencor_specs(html_content, url)
+                
+                # Also try standard extraction and merge (but don't overwrite custom fields)
+                standard_specs = self.extract_all_html_specs(html_content)
+                if standard_specs:
+                    # Only add specs that don't exist in custom extraction
+                    for key, value in standard_specs.items():
+                        if key not in raw_specs:
+                            raw_specs[key] = value
+                
+                return response.status, "html", html_content, content_hash, None, raw_specs
                     
         except Exception as e:
             print(f"  → Enhanced browser error: {e}")
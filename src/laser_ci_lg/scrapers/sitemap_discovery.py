@@ -0,0 +1,220 @@
+"""
+Sitemap-driven product discovery (`discovery_mode: sitemap`).
+
+Instead of searching the site, read the URLs it publishes: the vendor's
+`sitemaps:` config, else the Sitemap lines of robots.txt, else
+/sitemap.xml. Sitemaps are streamed and parsed incrementally (gzip and
+sitemap indexes included), so large sitemaps never sit in memory whole.
+
+Every URL is checked against one compiled matcher built from all segments'
+product_patterns, include_categories and exclude_categories. A URL goes to
+the segment with the longest matching pattern. Each product carries the
+sitemap's lastmod so the scraper can skip pages unchanged since they were
+last fetched.
+"""
+
+import gzip
+import io
+import re
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional
+from urllib.parse import unquote, urljoin, urlparse
+from xml.etree.ElementTree import iterparse
+
+import requests
+from dateutil.parser import isoparse
+
+from ..resilience import fetch
+
+# Path fragments that mark a product page when a segment lists include_categories
+PRODUCT_INDICATORS = ['/product', '/laser', '/system', '-engine']
+
+# Nested sitemap indexes are followed up to this many sitemaps per vendor
+MAX_SITEMAPS = 200
+
+# Between the words of a pattern, URLs have a separator or nothing ("obis-lx", "obislx")
+_SEPARATORS = r"(?:[-_./+\s]|%20)*"
+
+
+@dataclass
+class SitemapEntry:
+    loc: str
+    lastmod: Optional[datetime] = None
+    is_index: bool = False
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """W3C datetime as naive UTC (like RawDocument.fetched_at), or None."""
+    if not value:
+        return None
+    try:
+        parsed = isoparse(value.strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def iter_sitemap(stream: BinaryIO) -> Iterator[SitemapEntry]:
+    """
+    Stream <url> and <sitemap> entries from a sitemap or sitemap index,
+    gzipped or not. Parsed elements are cleared as they are yielded.
+    """
+    if not hasattr(stream, "peek"):
+        stream = io.BufferedReader(stream)
+    if stream.peek(2)[:2] == b"\x1f\x8b":
+        stream = gzip.GzipFile(fileobj=stream)
+
+    root = None
+    for event, elem in iterparse(stream, events=("start", "end")):
+        if root is None:
+            root = elem
+        if event != "end":
+            continue
+        tag = elem.tag.rsplit("}", 1)[-1]
+        if tag not in ("url", "sitemap"):
+            continue
+        fields = {child.tag.rsplit("}", 1)[-1]: (child.text or "").strip() for child in elem}
+        if fields.get("loc"):
+            yield SitemapEntry(fields["loc"], parse_lastmod(fields.get("lastmod")), tag == "sitemap")
+        root.clear()
+
+
+def open_url(url: str, timeout: float = 30) -> BinaryIO:
+    """Response body of url as a stream (Content-Encoding already decoded)."""
+    response = fetch(url, timeout=timeout, stream=True)
+    if response.status_code != 200:
+        response.close()
+        raise requests.HTTPError(f"{response.status_code} for {url}")
+    response.raw.decode_content = True
+    return response.raw
+
+
+def _phrase(text: str) -> str:
+    words = [re.escape(w) for w in re.split(r"[\s\-_]+", text.lower()) if w]
+    # Word boundary at the start; a digit may follow at the end ("obis405")
+    return r"(?<![a-z0-9])" + _SEPARATORS.join(words) + r"(?![a-z])"
+
+
+class SitemapMatcher:
+    """One compiled regex over all segments' patterns and categories."""
+
+    def __init__(self, segments: List[Dict[str, Any]]):
+        self.segments = segments
+        self._groups: Dict[str, tuple] = {}
+        alternatives = []
+        for s, segment in enumerate(segments):
+            for kind, key in (("p", "product_patterns"), ("i", "include_categories"),
+                              ("x", "exclude_categories")):
+                for n, text in enumerate(segment.get(key) or []):
+                    name = f"{kind}{s}_{n}"
+                    self._groups[name] = (kind, s, text)
+                    alternatives.append((len(text), name, _phrase(text)))
+        # Longest first, so at any position the most specific phrase is the one reported
+        alternatives.sort(key=lambda a: -a[0])
+        self._regex = re.compile("|".join(f"(?=(?P<{name}>{regex}))" for _, name, regex in alternatives)) \
+            if alternatives else None
+
+    def match(self, url: str) -> Optional[tuple]:
+        """(segment index, pattern) for a relevant product URL, else None."""
+        if self._regex is None:
+            return None
+        path = unquote(urlparse(url).path).lower()
+        hits = {"p": {}, "i": set(), "x": set()}
+        for m in self._regex.finditer(path):
+            kind, s, text = self._groups[m.lastgroup]
+            if kind == "p":
+                best = hits["p"].get(s)
+                if best is None or len(text) > len(best):
+                    hits["p"][s] = text
+            else:
+                hits[kind].add(s)
+        candidates = [(len(text), s, text) for s, text in hits["p"].items() if s not in hits["x"]]
+        for _, s, text in sorted(candidates, key=lambda c: (-c[0], c[1])):
+            if not self.segments[s].get("include_categories") or s in hits["i"] \
+                    or any(ind in path for ind in PRODUCT_INDICATORS):
+                return s, text
+        return None
+
+
+def product_name(url: str, pattern: str) -> str:
+    """Readable name from the URL's last path segment, keeping the pattern's casing."""
+    slug = unquote(urlparse(url).path.rstrip("/").rsplit("/", 1)[-1])
+    slug = re.sub(r"\.(html?|php|aspx?)$", "", slug, flags=re.I)
+    casing = {w.lower(): w for w in re.split(r"[\s\-_]+", pattern) if w}
+    words = [w for w in re.split(r"[-_\s]+", slug) if w]
+    return " ".join(casing.get(w.lower(), w.capitalize()) for w in words) or pattern
+
+
+class SitemapDiscovery:
+    """Discover product URLs for a vendor's segments from its sitemaps."""
+
+    def __init__(self, open_url: Callable[[str], BinaryIO] = open_url, max_sitemaps: int = MAX_SITEMAPS):
+        self.open_url = open_url
+        self.max_sitemaps = max_sitemaps
+
+    def sitemap_urls(self, homepage: str) -> List[str]:
+        """Sitemap lines of robots.txt, else /sitemap.xml."""
+        try:
+            with closing(self.open_url(urljoin(homepage, "/robots.txt"))) as robots:
+                text = robots.read().decode("utf-8", errors="ignore")
+            found = [line.split(":", 1)[1].strip() for line in text.splitlines()
+                     if line.lower().startswith("sitemap:")]
+            if found:
+                return found
+        except Exception:
+            pass
+        return [urljoin(homepage, "/sitemap.xml")]
+
+    def entries(self, sitemaps: List[str]) -> Iterator[SitemapEntry]:
+        """Page entries of sitemaps, following indexes breadth-first."""
+        queue, seen = list(sitemaps), set()
+        while queue and len(seen) < self.max_sitemaps:
+            url = queue.pop(0)
+            if url in seen:
+                continue
+            seen.add(url)
+            try:
+                with closing(self.open_url(url)) as stream:
+                    for entry in iter_sitemap(stream):
+                        if entry.is_index:
+                            queue.append(entry.loc)
+                        else:
+                            yield entry
+            except Exception as e:
+                print(f"    Sitemap error for {url}: {e}")
+
+    def discover(self, homepage: str, segments: List[Dict[str, Any]],
+                 sitemaps: Optional[List[str]] = None,
+                 max_products: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        {segment id: [{name, url, pdfs, lastmod}]} in sitemap order,
+        deduplicated by URL and capped at max_products per segment.
+        """
+        matcher = SitemapMatcher(segments)
+        results = {segment.get("id", "unknown"): [] for segment in segments}
+        seen, scanned = set(), 0
+        for entry in self.entries(sitemaps or self.sitemap_urls(homepage)):
+            scanned += 1
+            if entry.loc in seen:
+                continue
+            seen.add(entry.loc)
+            hit = matcher.match(entry.loc)
+            if hit is None:
+                continue
+            s, pattern = hit
+            products = results[segments[s].get("id", "unknown")]
+            if max_products and len(products) >= max_products:
+                continue
+            products.append({
+                'name': product_name(entry.loc, pattern),
+                'url': entry.loc,
+                'pdfs': [],
+                'lastmod': entry.lastmod,
+            })
+        found = sum(len(p) for p in results.values())
+        print(f"  → Sitemap discovery: {found} products from {scanned} URLs")
+        return results
@@ -4,17 +4,41 @@ Maintains SHA-256 fingerprinting and supports both discovery modes.
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import os
+from datetime import datetime
 import re
 import hashlib
-from pathlib import Path
-from urllib.parse import urljoin, urlparse
-from playwright.sync_api import sync_playwright, Page
-import requests
+from urllib.parse import urljoin
 from ..db import SessionLocal
 from ..models import Manufacturer, Product, RawDocument
-from ..extraction import AdvancedHTMLExtractor, AdvancedPDFExtractor
+from ..extraction import AdvancedHTMLExtractor, shared_pdf_extractor
+from ..pdf_cache import shared_pdf_cache
+from ..browser import ScrapeProfile, async_browser_context, browser_page
+from ..readiness import settle_async, wait_until_ready, wait_until_ready_async
+from ..resilience import fetch
+from .sitemap_discovery import PRODUCT_INDICATORS, SitemapDiscovery
 from ruamel.yaml import YAML
+from sqlalchemy import func
+
+# Site search boxes, tried in order during smart discovery
+SEARCH_SELECTORS = [
+    'input[type="search"]',
+    'input[placeholder*="search" i]',
+    'input[name*="search" i]',
+    'input[id*="search" i]'
+]
+
+# Pages open at once during smart discovery (one browser context)
+DISCOVERY_PAGES = int(os.getenv("DISCOVERY_PAGES", "4"))
+
+# Every matching link as [href attribute, absolute URL, text]
+_LINKS_JS = """
+(selector) => Array.from(document.querySelectorAll(selector),
+  a => [a.getAttribute('href'), a.href, (a.textContent || '').trim()])
+"""
 
 
 class UnifiedBaseScraper(ABC):
@@ -27,14 +51,15 @@ class UnifiedBaseScraper(ABC):
         """Initialize unified scraper with configuration."""
         self.config_path = config_path
         self.force_refresh = force_refresh
-        self.cache_dir = Path("data/pdf_cache")
+        self.pdf_cache = shared_pdf_cache()
+        self.cache_dir = self.pdf_cache.root
         
         # Load configuration
         self.load_config()
         
         # Initialize extractors
         self.html_extractor = AdvancedHTMLExtractor()
-        self.pdf_extractor = AdvancedPDFExtractor()
+        self.pdf_extractor = shared_pdf_extractor()
         
         # Track discovered content
         self.discovered_products = []
@@ -66,6 +91,7 @@ class UnifiedBaseScraper(ABC):
         self.discovery_mode = self.vendor_config.get("discovery_mode", "static")
         self.max_products = self.vendor_config.get("max_products", None)
         self.requires_browser = self.vendor_config.get("requires_browser", False)
+        self.browser_profile = ScrapeProfile.from_config(self.vendor_config.get("browser"))
     
     def calculate_content_hash(self, content: bytes) -> str:
         """Calculate SHA-256 hash of content."""
@@ -99,151 +125,152 @@ class UnifiedBaseScraper(ABC):
         Smart discovery of products based on patterns.
         Returns list of {name, url, pdfs} dictionaries.
         """
-        discovered = []
-        
-        # Get discovery patterns
-        patterns = segment_config.get("product_patterns", [])
-        include_cats = segment_config.get("include_categories", [])
-        exclude_cats = segment_config.get("exclude_categories", [])
+        return self.discover_all_segments([segment_config]).get(segment_config.get("id", "unknown"), [])
+    
+    def discover_all_segments(self, segments: List[dict]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Smart discovery for several segments at once.
         
-        if not patterns:
-            return discovered
+        Every (segment, pattern) pair is searched on its own page in one shared
+        browser context, at most DISCOVERY_PAGES pages at a time. Returns
+        {segment id: products} in pattern order, deduplicated by URL and
+        capped at max_products per segment.
+        """
+        jobs = [(segment, pattern) for segment in segments
+                for pattern in segment.get("product_patterns", [])]
+        results = {segment.get("id", "unknown"): [] for segment in segments}
+        if not jobs:
+            return results
         
-        print(f"  → Smart discovery for patterns: {patterns[:3]}...")
+        print(f"  → Smart discovery: {len(jobs)} patterns across {len(segments)} segments, "
+              f"{DISCOVERY_PAGES} pages at a time")
         
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                context = browser.new_context(viewport={'width': 1920, 'height': 1080})
-                page = context.new_page()
-                
-                # Go to homepage
-                page.goto(self.homepage, wait_until="domcontentloaded", timeout=15000)
-                page.wait_for_timeout(2000)
-                
-                # Search for each pattern
-                for pattern in patterns:
-                    if self.max_products and len(discovered) >= self.max_products:
-                        break
-                    
-                    # Try site search first
-                    products = self.search_for_pattern(page, pattern, include_cats, exclude_cats)
-                    
-                    # Then browse categories
-                    if len(products) < 3:
-                        products.extend(self.browse_for_pattern(page, pattern, include_cats, exclude_cats))
-                    
-                    discovered.extend(products)
-                
-                browser.close()
-                
+            # The async API gets an event loop of its own, away from any sync browser
+            with ThreadPoolExecutor(max_workers=1) as loop_thread:
+                found = loop_thread.submit(asyncio.run, self._discover_async(jobs)).result()
         except Exception as e:
             print(f"    Smart discovery error: {e}")
+            return results
         
-        # Deduplicate
-        seen_urls = set()
-        unique = []
-        for product in discovered:
-            if product['url'] not in seen_urls:
-                seen_urls.add(product['url'])
-                unique.append(product)
+        for (segment, pattern), products in zip(jobs, found):
+            if isinstance(products, Exception):
+                print(f"    Smart discovery error for {pattern}: {products}")
+                continue
+            results[segment.get("id", "unknown")].extend(products)
         
-        return unique[:self.max_products] if self.max_products else unique
+        for segment_id, discovered in results.items():
+            seen_urls = set()
+            unique = []
+            for product in discovered:
+                if product['url'] not in seen_urls:
+                    seen_urls.add(product['url'])
+                    unique.append(product)
+            results[segment_id] = unique[:self.max_products] if self.max_products else unique
+        return results
     
-    def search_for_pattern(self, page: Page, pattern: str, include_cats: List[str], exclude_cats: List[str]) -> List[Dict]:
-        """Search for a product pattern using site search."""
-        products = []
-        
-        # Find search box
-        search_selectors = [
-            'input[type="search"]',
-            'input[placeholder*="search" i]',
-            'input[name*="search" i]',
-            'input[id*="search" i]'
-        ]
+    async def _discover_async(self, jobs: List[Tuple[dict, str]]) -> List[Any]:
+        """Run every (segment, pattern) job concurrently; a failed job yields its exception."""
+        pages = asyncio.Semaphore(DISCOVERY_PAGES)
+        # Category pages shared by several patterns are loaded once
+        category_links: Dict[str, "asyncio.Task"] = {}
+        async with async_browser_context(profile=self.browser_profile) as context:
+            return await asyncio.gather(
+                *(self.discover_pattern(context, pages, category_links, segment, pattern)
+                  for segment, pattern in jobs),
+                return_exceptions=True,
+            )
+    
+    async def discover_pattern(self, context, pages: asyncio.Semaphore,
+                               category_links: Dict[str, "asyncio.Task"],
+                               segment_config: dict, pattern: str) -> List[Dict]:
+        """Search the site for one pattern, browsing categories if search finds little."""
+        include_cats = segment_config.get("include_categories", [])
+        exclude_cats = segment_config.get("exclude_categories", [])
         
-        for selector in search_selectors:
+        async with pages:
+            page = await context.new_page()
             try:
-                search_box = page.locator(selector).first
-                if search_box.is_visible(timeout=1000):
-                    search_box.clear()
-                    search_box.fill(pattern)
-                    search_box.press("Enter")
-                    page.wait_for_timeout(2000)  # Reduced timeout
-                    
-                    # Extract product links from results
-                    links = page.locator('a[href]').all()
-                    for link in links[:30]:
-                        try:
-                            href = link.get_attribute('href')
-                            # Use text_content which is faster than inner_text
-                            text = link.text_content(timeout=100)
-                            if text:
-                                text = text.strip()
-                            
-                            if href and self.is_relevant_product(href, text, pattern, include_cats, exclude_cats):
-                                full_url = urljoin(page.url, href)
-                                products.append({
-                                    'name': text if text else pattern,
-                                    'url': full_url,
-                                    'pdfs': []
-                                })
-                        except:
-                            continue
-                    break
-            except:
-                continue
+                await page.goto(self.homepage, wait_until="domcontentloaded", timeout=15000)
+                await wait_until_ready_async(page, self.homepage, selectors=SEARCH_SELECTORS, learn=False)
+                
+                # Try site search first
+                products = await self.search_for_pattern(page, pattern, include_cats, exclude_cats)
+                
+                # Then browse categories
+                categories = await self.category_urls(page, include_cats) if len(products) < 3 else []
+            finally:
+                await page.close()
         
+        # Category pages take their own page slots, so release ours first
+        for url in categories:
+            if url not in category_links:
+                category_links[url] = asyncio.ensure_future(self.load_links(context, pages, url))
+        for links in await asyncio.gather(*(category_links[url] for url in categories)):
+            for href, full_url, text in links[:30]:
+                if href and pattern.lower() in text.lower():
+                    products.append({'name': text, 'url': full_url, 'pdfs': []})
         return products
     
-    def browse_for_pattern(self, page: Page, pattern: str, include_cats: List[str], exclude_cats: List[str]) -> List[Dict]:
-        """Browse categories looking for pattern."""
+    @staticmethod
+    async def page_links(page, selector: str = "a[href]") -> List[List[str]]:
+        """[href attribute, absolute URL, text] for every matching link, in one round trip."""
+        return await page.evaluate(_LINKS_JS, selector)
+    
+    async def search_for_pattern(self, page, pattern: str, include_cats: List[str], exclude_cats: List[str]) -> List[Dict]:
+        """Search for a product pattern using site search."""
         products = []
         
-        # Navigate to relevant category pages
-        category_links = page.locator('a[href*="laser"], a[href*="product"]').all()
-        
-        for cat_link in category_links[:5]:
+        # Find search box
+        for selector in SEARCH_SELECTORS:
             try:
-                cat_href = cat_link.get_attribute('href')
-                cat_text = cat_link.text_content(timeout=100)
-                if cat_text:
-                    cat_text = cat_text.strip().lower()
-                else:
+                search_box = page.locator(selector).first
+                if not await search_box.is_visible():
                     continue
+                await search_box.clear()
+                await search_box.fill(pattern)
+                await search_box.press("Enter")
+                await settle_async(page, cap_ms=2000)
                 
-                # Check if category is relevant
-                if any(inc in cat_text for inc in include_cats):
-                    cat_link.click()
-                    page.wait_for_timeout(2000)
-                    
-                    # Look for products matching pattern
-                    prod_links = page.locator('a[href]').all()
-                    for link in prod_links[:30]:
-                        try:
-                            href = link.get_attribute('href')
-                            # Use text_content which is faster than inner_text
-                            text = link.text_content(timeout=100)
-                            if text:
-                                text = text.strip()
-                            
-                            if href and pattern.lower() in text.lower():
-                                full_url = urljoin(page.url, href)
-                                products.append({
-                                    'name': text,
-                                    'url': full_url,
-                                    'pdfs': []
-                                })
-                        except:
-                            continue
-                    
-                    # Go back
-                    page.go_back()
-            except:
+                # Extract product links from results
+                for href, full_url, text in (await self.page_links(page))[:30]:
+                    if href and self.is_relevant_product(href, text, pattern, include_cats, exclude_cats):
+                        products.append({
+                            'name': text if text else pattern,
+                            'url': full_url,
+                            'pdfs': []
+                        })
+                break
+            except Exception:
                 continue
         
         return products
     
+    async def category_urls(self, page, include_cats: List[str]) -> List[str]:
+        """URLs of the page's relevant category links."""
+        try:
+            links = await self.page_links(page, 'a[href*="laser"], a[href*="product"]')
+        except Exception:
+            return []
+        urls = []
+        for _, full_url, text in links[:5]:
+            if text and any(inc in text.lower() for inc in include_cats) and full_url not in urls:
+                urls.append(full_url)
+        return urls
+    
+    async def load_links(self, context, pages: asyncio.Semaphore, url: str) -> List[List[str]]:
+        """Open url in a new page and return its links (empty on failure)."""
+        async with pages:
+            page = await context.new_page()
+            try:
+                await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+                await settle_async(page, cap_ms=2000)
+                return await self.page_links(page)
+            except Exception:
+                return []
+            finally:
+                await page.close()
+    
     def is_relevant_product(self, url: str, text: str, pattern: str, include_cats: List[str], exclude_cats: List[str]) -> bool:
         """Check if a URL/text represents a relevant product."""
         combined = f"{url.lower()} {text.lower()}"
@@ -258,24 +285,45 @@ class UnifiedBaseScraper(ABC):
             return False
         
         # Check for product indicators
-        product_indicators = ['/product', '/laser', '/system', '-engine']
-        if not any(ind in url.lower() for ind in product_indicators):
+        if not any(ind in url.lower() for ind in PRODUCT_INDICATORS):
             return False
         
         return True
     
+    def discover_from_sitemaps(self, segments: List[dict]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Sitemap discovery for all segments: {segment id: products}, each with
+        the page's sitemap lastmod. Uses the vendor's `sitemaps:` list if set.
+        """
+        try:
+            return SitemapDiscovery().discover(
+                self.homepage, segments,
+                sitemaps=self.vendor_config.get("sitemaps"),
+                max_products=self.max_products,
+            )
+        except Exception as e:
+            print(f"    Sitemap discovery error: {e}")
+            return {}
+    
+    def unchanged_since_fetch(self, session, prod_data: Dict[str, Any]) -> bool:
+        """True if the page's sitemap lastmod is not newer than our last fetch of it."""
+        lastmod = prod_data.get('lastmod')
+        if self.force_refresh or lastmod is None:
+            return False
+        fetched_at = session.query(func.max(RawDocument.fetched_at)).filter_by(
+            url=prod_data['url']
+        ).scalar()
+        return fetched_at is not None and lastmod <= fetched_at
+    
     def discover_pdfs(self, product_url: str) -> List[str]:
         """Discover PDF URLs on a product page."""
         pdfs = []
         
         try:
             if self.requires_browser:
-                with sync_playwright() as p:
-                    browser = p.chromium.launch(headless=True)
-                    page = browser.new_page()
-                    
+                with browser_page(profile=self.browser_profile) as page:
                     page.goto(product_url, wait_until="domcontentloaded", timeout=15000)
-                    page.wait_for_timeout(2000)
+                    wait_until_ready(page, product_url)
                     
                     # Find PDF links
                     pdf_links = page.locator('a[href*=".pdf"], a:has-text("datasheet"), a:has-text("download")').all()
@@ -287,11 +335,9 @@ class UnifiedBaseScraper(ABC):
                                 pdfs.append(urljoin(product_url, href))
                         except:
                             continue
-                    
-                    browser.close()
             else:
                 # Use regular requests
-                response = requests.get(product_url, timeout=10)
+                response = fetch(product_url, timeout=10)
                 if response.status_code == 200:
                     from bs4 import BeautifulSoup
                     soup = BeautifulSoup(response.text, 'html.parser')
@@ -315,16 +361,13 @@ class UnifiedBaseScraper(ABC):
             # Fetch content
             if self.requires_browser and content_type != 'pdf':
                 # Use browser for JavaScript-heavy sites
-                with sync_playwright() as p:
-                    browser = p.chromium.launch(headless=True)
-                    page = browser.new_page()
+                with browser_page(profile=self.browser_profile) as page:
                     page.goto(url, wait_until="domcontentloaded", timeout=30000)
-                    page.wait_for_timeout(3000)
+                    wait_until_ready(page, url)
                     content = page.content().encode()
-                    browser.close()
             else:
                 # Use regular requests
-                response = requests.get(url, timeout=30)
+                response = fetch(url, timeout=30)
                 if response.status_code != 200:
                     print(f"      ✗ Failed: {response.status_code}")
                     return
@@ -335,22 +378,21 @@ class UnifiedBaseScraper(ABC):
             
             # Check if should skip
             if self.should_skip_document(url, content_hash):
+                # Confirmed current: sitemap lastmod checks compare against fetched_at
+                session.query(RawDocument).filter_by(product_id=product.id, url=url).update(
+                    {"fetched_at": datetime.utcnow()}
+                )
                 return
             
             # Determine content type
             is_pdf = url.lower().endswith('.pdf') or content.startswith(b'%PDF')
             
             if is_pdf:
-                # Cache PDF
-                cache_dir = self.cache_dir / self.vendor().lower()
-                cache_dir.mkdir(parents=True, exist_ok=True)
+                # Cache PDF (content-addressed, shared with the other scrapers)
+                cache_path = self.pdf_cache.put(url, content, self.vendor())
                 
-                pdf_name = re.sub(r'[^\w\-_\.]', '_', Path(url).stem) + '.pdf'
-                cache_path = cache_dir / pdf_name
-                cache_path.write_bytes(content)
-                
-                # Extract specs
-                text, specs = self.pdf_extractor.extract_specs(content)
+                # Extract specs (text layer first, Docling only if incomplete)
+                text, specs = self.pdf_extractor.extract_specs_tiered(content)
                 
                 # Store or update
                 existing = session.query(RawDocument).filter_by(
@@ -362,7 +404,8 @@ class UnifiedBaseScraper(ABC):
                     existing.text = text[:1000000]
                     existing.raw_specs = specs
                     existing.content_hash = content_hash
-                    existing.file_path = str(cache_path)
+                    existing.fetched_at = datetime.utcnow()
+                    existing.file_path = cache_path
                 else:
                     doc = RawDocument(
                         product_id=product.id,
@@ -371,7 +414,7 @@ class UnifiedBaseScraper(ABC):
                         text=text[:1000000],
                         raw_specs=specs,
                         content_hash=content_hash,
-                        file_path=str(cache_path)
+                        file_path=cache_path
                     )
                     session.add(doc)
                 
@@ -391,6 +434,7 @@ class UnifiedBaseScraper(ABC):
                     existing.text = html_content[:1000000]
                     existing.raw_specs = specs
                     existing.content_hash = content_hash
+                    existing.fetched_at = datetime.utcnow()
                 else:
                     doc = RawDocument(
                         product_id=product.id,
@@ -414,6 +458,7 @@ class UnifiedBaseScraper(ABC):
         print(f"\n{self.vendor()} Unified Scraper")
         print("="*60)
         print(f"  Mode: {self.discovery_mode}")
+        self.pdf_extractor.reset_tier_stats()
         
         s = SessionLocal()
         
@@ -425,16 +470,26 @@ class UnifiedBaseScraper(ABC):
                 s.add(manufacturer)
                 s.flush()
             
+            segments = self.vendor_config.get("segments", [])
+            
+            # Discovery for all segments at once, if enabled
+            if self.discovery_mode == "smart":
+                discovered_by_segment = self.discover_all_segments(segments)
+            elif self.discovery_mode == "sitemap":
+                discovered_by_segment = self.discover_from_sitemaps(segments)
+            else:
+                discovered_by_segment = {}
+            
             # Process each segment
-            for segment in self.vendor_config.get("segments", []):
+            for segment in segments:
                 segment_id = segment.get("id", "unknown")
                 print(f"\n  Segment: {segment_id}")
                 
                 all_products = []
                 
-                # Smart discovery if enabled
-                if self.discovery_mode == "smart":
-                    discovered = self.discover_products_smart(segment)
+                # Discovered products if enabled
+                if self.discovery_mode in ("smart", "sitemap"):
+                    discovered = discovered_by_segment.get(segment_id, [])
                     if discovered:
                         print(f"    ✓ Discovered {len(discovered)} products")
                         all_products.extend(discovered)
@@ -473,6 +528,10 @@ class UnifiedBaseScraper(ABC):
                     
                     print(f"\n  Processing: {product.name}")
                     
+                    if self.unchanged_since_fetch(s, prod_data):
+                        print(f"    → Unchanged since last fetch (sitemap lastmod {prod_data['lastmod']:%Y-%m-%d})")
+                        continue
+                    
                     # Fetch product page
                     self.fetch_and_store(s, product, prod_data['url'])
                     
@@ -488,6 +547,10 @@ class UnifiedBaseScraper(ABC):
             
             s.commit()
             print(f"\n✓ {self.vendor()} scraping complete")
+            for line in self.pdf_extractor.format_tier_stats():
+                print(f"  → PDF tier {line}")
+            if self.browser_profile.stats["requests"]:
+                print(f"  → Browser {self.browser_profile.format_stats()}")
             
         except Exception as e:
             print(f"\n✗ Error: {e}")
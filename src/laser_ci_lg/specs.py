@@ -1,5 +1,10 @@
 import re
-from typing import Optional, Any
+from copy import copy
+from functools import lru_cache
+from typing import Optional, Any, Iterable, List
+
+import numpy as np
+import pandas as pd
 
 CANONICAL_SPEC_KEYS = {
     "wavelength_nm",
@@ -47,6 +52,7 @@ KEY_MAP = {
 }
 
 
+@lru_cache(maxsize=4096)
 def canonical_key(vendor_key: str) -> Optional[str]:
     k = vendor_key.strip().lower()
     for pattern, ck in KEY_MAP.items():
@@ -55,106 +61,179 @@ def canonical_key(vendor_key: str) -> Optional[str]:
     return None
 
 
-def parse_value_to_unit(key: str, value: str) -> Any:
-    v = value.strip()
-
-    def to_float(x: str):
-        try:
-            # Handle comparison operators
-            x = re.sub(r'^[<>≤≥]\s*', '', x)
-            # Remove commas from numbers
-            x = x.replace(',', '')
-            return float(x)
-        except:
-            return None
-
-    if key == "wavelength_nm":
-        m = re.search(r"([\d\.]+)\s*nm", v, re.I)
-        return to_float(m.group(1)) if m else to_float(v)
-
-    if key in {"output_power_mw_nominal", "output_power_mw_min"}:
-        m = re.search(r"([\d\.]+)\s*(mW|W)", v, re.I)
-        if not m:
-            return to_float(v)
-        num, unit = float(m.group(1)), m.group(2).lower()
-        return num * 1000.0 if unit == "w" else num
-
-    if key in {"rms_noise_pct", "power_stability_pct"}:
-        m = re.search(r"([\d\.]+)\s*%", v, re.I)
-        return to_float(m.group(1)) if m else to_float(v)
-
-    if key in {"linewidth_mhz", "linewidth_nm"}:
-        mhz = re.search(r"([\d\.]+)\s*MHz", v, re.I)
-        if mhz:
-            return to_float(mhz.group(1))
-        nm = re.search(r"([\d\.]+)\s*(nm|pm)", v, re.I)
-        if nm:
-            return to_float(nm.group(1))
-        return to_float(v)
-
-    if key == "beam_diameter_mm":
-        m = re.search(r"([\d\.]+)\s*mm", v, re.I)
-        return to_float(m.group(1)) if m else to_float(v)
-
-    if key == "beam_divergence_mrad":
-        m = re.search(r"([\d\.]+)\s*mrad", v, re.I)
-        return to_float(m.group(1)) if m else to_float(v)
-
-    if key == "m2":
-        return to_float(v)
-
-    if key in {"modulation_analog_hz", "modulation_digital_hz"}:
-        m = re.search(r"([\d\.]+)\s*(Hz|kHz|MHz)", v, re.I)
-        if not m:
-            return to_float(v)
-        factor = {"hz": 1, "khz": 1e3, "mhz": 1e6}[m.group(2).lower()]
-        return float(m.group(1)) * factor
+# Unit multipliers into the canonical unit, keyed by lowercased unit text
+POWER_MW_FACTORS = {"mw": 1.0, "w": 1000.0, "kw": 1000000.0}
+FREQUENCY_HZ_FACTORS = {"hz": 1.0, "khz": 1e3, "mhz": 1e6}
+# Divisors into minutes
+TIME_MIN_DIVISORS = {"min": 1.0, "s": 60.0}
+
+# Numeric keys: (pattern, unit factors, divide) tried in order on each value;
+# values matching none of them are parsed as bare numbers
+NUMERIC_UNIT_RULES = {
+    "wavelength_nm": [(re.compile(r"([\d\.]+)\s*nm", re.I), None, False)],
+    "output_power_mw_nominal": [(re.compile(r"([\d\.]+)\s*(kW|mW|W)", re.I), POWER_MW_FACTORS, False)],
+    "output_power_mw_min": [(re.compile(r"([\d\.]+)\s*(kW|mW|W)", re.I), POWER_MW_FACTORS, False)],
+    "rms_noise_pct": [(re.compile(r"([\d\.]+)\s*%", re.I), None, False)],
+    "power_stability_pct": [(re.compile(r"([\d\.]+)\s*%", re.I), None, False)],
+    "linewidth_mhz": [
+        (re.compile(r"([\d\.]+)\s*MHz", re.I), None, False),
+        (re.compile(r"([\d\.]+)\s*(?:nm|pm)", re.I), None, False),
+    ],
+    "linewidth_nm": [
+        (re.compile(r"([\d\.]+)\s*MHz", re.I), None, False),
+        (re.compile(r"([\d\.]+)\s*(?:nm|pm)", re.I), None, False),
+    ],
+    "beam_diameter_mm": [(re.compile(r"([\d\.]+)\s*mm", re.I), None, False)],
+    "beam_divergence_mrad": [(re.compile(r"([\d\.]+)\s*mrad", re.I), None, False)],
+    "m2": [],
+    "modulation_analog_hz": [(re.compile(r"([\d\.]+)\s*(Hz|kHz|MHz)", re.I), FREQUENCY_HZ_FACTORS, False)],
+    "modulation_digital_hz": [(re.compile(r"([\d\.]+)\s*(Hz|kHz|MHz)", re.I), FREQUENCY_HZ_FACTORS, False)],
+    "fiber_na": [(re.compile(r"na\s*=?\s*([\d\.]+)", re.I), None, False)],
+    "fiber_mfd_um": [(re.compile(r"([\d\.]+)\s*µ?m", re.I), None, False)],
+    "warmup_time_min": [(re.compile(r"([\d\.]+)\s*(min|s)", re.I), TIME_MIN_DIVISORS, True)],
+}
+
+COMPARATOR_PREFIX = re.compile(r"^[<>≤≥]\s*")
+DIMENSIONS_MM = re.compile(r"([\d\.]+)\s*[x×]\s*([\d\.]+)\s*[x×]\s*([\d\.]+)\s*mm", re.I)
+INTERFACE_SEPARATORS = re.compile(r"[,/;]| and ", re.I)
+FIBER_OUTPUT_VALUES = {"yes", "true", "1", "smf", "mmf", "fiber", "integrated fiber"}
+
+
+def _float_or_none(x: str) -> Optional[float]:
+    try:
+        return float(x)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_floats(values: pd.Series) -> List[Optional[float]]:
+    """Numbers from strings, allowing a leading comparator and thousands commas."""
+    cleaned = (
+        values.str.replace(COMPARATOR_PREFIX, "", regex=True)
+        .str.replace(",", "", regex=False)
+        .to_numpy(dtype=object)
+    )
+    try:
+        return cleaned.astype(np.float64).tolist()
+    except (TypeError, ValueError):
+        # Some values are not numbers; convert one by one
+        return [_float_or_none(x) for x in cleaned]
+
+
+def _parse_numeric(values: pd.Series, rules: list) -> List[Optional[float]]:
+    parsed: List[Optional[float]] = [None] * len(values)
+    pending = pd.Series(True, index=values.index)
+
+    for pattern, factors, divide in rules:
+        found = values[pending].str.extract(pattern)
+        found = found[found[0].notna()]
+        if found.empty:
+            continue
+
+        numbers = np.array([np.nan if x is None else x for x in _to_floats(found[0])])
+        if factors:
+            scale = found[1].str.lower().map(factors).to_numpy(dtype=np.float64)
+            numbers = numbers / scale if divide else numbers * scale
+
+        for i, number in zip(found.index, numbers.tolist()):
+            parsed[i] = None if number != number else number
+        pending[found.index] = False
+
+    rest = pending[pending].index
+    if len(rest):
+        for i, number in zip(rest, _to_floats(values[rest])):
+            parsed[i] = number
+    return parsed
+
+
+def parse_values_to_unit(key: str, values: Iterable[str]) -> List[Any]:
+    """
+    Parse a column of raw values for one canonical key into canonical units.
+
+    Each distinct raw string is parsed once. Numeric keys run one regex
+    extraction over the column and scale the numbers with a unit-factor lookup
+    (mW/W/kW, Hz/kHz/MHz, s/min). Values that cannot be parsed come back as
+    None. Returns one result per input, in order.
+    """
+    codes, distinct = pd.factorize(pd.Series([str(x) for x in values], dtype=object))
+    if len(codes) == 0:
+        return []
+
+    parsed = _parse_distinct(key, pd.Series(distinct, dtype=object).str.strip())
+    if key in {"interfaces", "dimensions_mm"}:
+        # Lists and dicts are mutable; give each row its own copy
+        return [copy(parsed[code]) for code in codes]
+    return [parsed[code] for code in codes]
+
+
+def _parse_distinct(key: str, v: pd.Series) -> List[Any]:
+    rules = NUMERIC_UNIT_RULES.get(key)
+    if rules is not None:
+        return _parse_numeric(v, rules)
 
     if key == "ttl_shutter":
-        return v.lower() in {"yes", "true", "1"} or "shutter" in v.lower()
+        lower = v.str.lower()
+        return (lower.isin({"yes", "true", "1"}) | lower.str.contains("shutter", regex=False)).tolist()
 
     if key == "fiber_output":
-        return v.lower() in {
-            "yes",
-            "true",
-            "1",
-            "smf",
-            "mmf",
-            "fiber",
-            "integrated fiber",
-        }
-
-    if key == "fiber_na":
-        m = re.search(r"na\s*=?\s*([\d\.]+)", v, re.I)
-        return float(m.group(1)) if m else to_float(v)
-
-    if key == "fiber_mfd_um":
-        m = re.search(r"([\d\.]+)\s*µ?m", v, re.I)
-        return float(m.group(1)) if m else to_float(v)
-
-    if key == "warmup_time_min":
-        m = re.search(r"([\d\.]+)\s*(min|s)", v, re.I)
-        if not m:
-            return to_float(v)
-        num, unit = float(m.group(1)), m.group(2).lower()
-        return num / 60.0 if unit == "s" else num
+        return v.str.lower().isin(FIBER_OUTPUT_VALUES).tolist()
 
     if key == "interfaces":
-        import re as _re
-
-        toks = _re.split(r"[,/;]| and ", v, flags=_re.I)
-        return [t.strip().upper().replace("RS232", "RS-232") for t in toks if t.strip()]
+        return [
+            [t.strip().upper().replace("RS232", "RS-232") for t in INTERFACE_SEPARATORS.split(x) if t.strip()]
+            for x in v
+        ]
 
     if key == "dimensions_mm":
-        m = re.search(r"([\d\.]+)\s*[x×]\s*([\d\.]+)\s*[x×]\s*([\d\.]+)\s*mm", v, re.I)
-        if m:
-            return {
-                "x": float(m.group(1)),
-                "y": float(m.group(2)),
-                "z": float(m.group(3)),
-            }
-        return None
+        found = v.str.extract(DIMENSIONS_MM)
+        dims = []
+        for x, y, z in found.itertuples(index=False):
+            xyz = [None if d != d else _float_or_none(d) for d in (x, y, z)]
+            dims.append(None if None in xyz else dict(zip("xyz", xyz)))
+        return dims
 
     if key == "polarization":
-        return v.upper()
-    return v
+        return v.str.upper().tolist()
+    return v.tolist()
+
+
+def parse_value_to_unit(key: str, value: str) -> Any:
+    """Parse a single raw value; thin wrapper over parse_values_to_unit."""
+    return parse_values_to_unit(key, [value])[0]
+
+
+def map_models_to_canonical(models: dict) -> dict:
+    """
+    Heuristic canonical mapping for many models at once.
+
+    models is {model_id: {spec_name: value}}. Raw values are grouped by
+    canonical key across all models and parsed with one parse_values_to_unit
+    call per key. Returns {model_id: (canonical, extras)}: canonical has every
+    CANONICAL_SPEC_KEYS field, extras holds the specs that did not map.
+    """
+    columns = {}
+    for model_id, specs in models.items():
+        for position, (spec_name, spec_value) in enumerate(specs.items()):
+            ck = canonical_key(spec_name)
+            if ck:
+                columns.setdefault(ck, []).append(((model_id, position), str(spec_value)))
+
+    parsed = {}
+    for ck, entries in columns.items():
+        results = parse_values_to_unit(ck, [value for _, value in entries])
+        for (slot, _), result in zip(entries, results):
+            parsed[slot] = (ck, result)
+
+    mapped = {}
+    for model_id, specs in models.items():
+        canonical = {k: None for k in CANONICAL_SPEC_KEYS}
+        extras = {}
+        for position, (spec_name, spec_value) in enumerate(specs.items()):
+            if (model_id, position) in parsed:
+                ck, result = parsed[(model_id, position)]
+                if result is not None:
+                    canonical[ck] = result
+            else:
+                extras[spec_name] = spec_value
+        mapped[model_id] = (canonical, extras)
+    return mapped
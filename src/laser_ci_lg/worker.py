@@ -0,0 +1,209 @@
+"""
+Warm worker daemon: `cli serve` keeps the pipeline resident between jobs.
+
+The worker holds one shared PDF extractor (Docling converters built once),
+a BrowserPool with a resident Chromium and the pooled database engine, and
+accepts jobs over a local TCP socket as newline-delimited JSON:
+
+    {"job": "crawl", "vendor": "omicron"}
+    {"job": "extract_pdf", "path": "data/pdf_cache/omicron/luxx.pdf"}
+    {"job": "normalize", "product_id": 12}
+    {"job": "ping"} / {"job": "shutdown"}
+
+Each request gets one JSON line back: {"ok": true, "result": ..., "seconds": ...}
+or {"ok": false, "error": "..."}. Jobs run one at a time on a single job
+thread, since Docling, Playwright's sync API and the SQLite writers are not
+safe to share across concurrent jobs; connections are accepted concurrently
+and wait for their result.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = int(os.getenv("LASER_CI_WORKER_PORT", "8765"))
+
+
+class Worker:
+    """Resident extractor, browser pool and DB engine serving jobs in order."""
+
+    def __init__(self, config_path: str = "config/competitors.yml"):
+        self.config_path = config_path
+        self.started = time.time()
+        self.jobs_done = 0
+        # One job thread: the browser pool is bound to it and jobs never overlap
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="laser-ci-job")
+        self._pool = None
+        self.handlers: Dict[str, Callable[..., Any]] = {
+            "ping": self.ping,
+            "crawl": self.crawl,
+            "extract_pdf": self.extract_pdf,
+            "normalize": self.normalize,
+        }
+
+    def warm_up(self, browser: bool = True):
+        """Load the pipeline modules, Docling converter, DB engine and (optionally) Chromium."""
+        return self._executor.submit(self._warm_up, browser).result()
+
+    def _warm_up(self, browser: bool):
+        from sqlalchemy import text
+        from . import crawler, normalize  # noqa: F401  (import cost paid once)
+        from .db import engine
+        from .extraction import shared_pdf_extractor
+
+        start = time.perf_counter()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        shared_pdf_extractor().converter
+        print(f"  → Docling converter ready ({time.perf_counter() - start:.1f}s)")
+        if browser:
+            self._browser_pool().start()
+
+    def _browser_pool(self):
+        from .browser import BrowserPool, activate_pool
+
+        if self._pool is None:
+            self._pool = BrowserPool()
+            activate_pool(self._pool)
+        return self._pool
+
+    def run_job(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one job on the job thread and return the response dict."""
+        params = dict(request)
+        name = params.pop("job", None)
+        handler = self.handlers.get(name)
+        if handler is None:
+            return {"ok": False, "error": f"unknown job {name!r}; expected one of {sorted(self.handlers)}"}
+
+        start = time.perf_counter()
+        try:
+            result = self._executor.submit(handler, **params).result()
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}",
+                    "seconds": round(time.perf_counter() - start, 3)}
+        self.jobs_done += 1
+        return {"ok": True, "result": result, "seconds": round(time.perf_counter() - start, 3)}
+
+    def close(self):
+        """Stop the job thread, closing the browser from the thread that owns it."""
+        if self._pool is not None:
+            from .browser import activate_pool
+
+            self._executor.submit(self._pool.close).result()
+            activate_pool(None)
+            self._pool = None
+        self._executor.shutdown(wait=True)
+
+    # Jobs
+
+    def ping(self) -> Dict[str, Any]:
+        return {"uptime_s": round(time.time() - self.started, 1), "jobs_done": self.jobs_done}
+
+    def crawl(self, vendor: Optional[str] = None, force_refresh: bool = False,
+              config_path: Optional[str] = None) -> Dict[str, Any]:
+        from .crawler import run_scrapers_from_config
+
+        self._browser_pool()
+        fetch_stats = run_scrapers_from_config(config_path or self.config_path,
+                                               force_refresh=force_refresh, scraper_filter=vendor)
+        return {"vendor": vendor or "all", "fetch_stats": fetch_stats or {}}
+
+    def extract_pdf(self, path: Optional[str] = None, url: Optional[str] = None) -> Dict[str, Any]:
+        from .extraction import shared_pdf_extractor
+
+        if path:
+            with open(path, "rb") as f:
+                content = f.read()
+        elif url:
+            from .resilience import fetch
+
+            response = fetch(url, timeout=30)
+            response.raise_for_status()
+            content = response.content
+        else:
+            raise ValueError("extract_pdf needs 'path' or 'url'")
+        text, specs = shared_pdf_extractor().extract_specs_tiered(content)
+        return {"chars": len(text), "specs": specs}
+
+    def normalize(self, product_id: Optional[int] = None, use_llm: bool = True,
+                  model: Optional[str] = None) -> Dict[str, Any]:
+        from .normalize import normalize_all
+
+        if isinstance(product_id, list):
+            product_ids = [int(pid) for pid in product_id]
+        else:
+            product_ids = None if product_id is None else [int(product_id)]
+        inserted = normalize_all(use_llm=use_llm, model=model, product_ids=product_ids)
+        return {"inserted": inserted}
+
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as e:
+                response = {"ok": False, "error": f"bad request: {e}"}
+            else:
+                if request.get("job") == "shutdown":
+                    response = {"ok": True, "result": "shutting down"}
+                    self._reply(response)
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    return
+                response = self.server.worker.run_job(request)
+            self._reply(response)
+
+    def _reply(self, response):
+        self.wfile.write((json.dumps(response, default=str) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+
+class WorkerServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, worker: Worker, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.worker = worker
+        super().__init__((host, port), _JobHandler)
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, warm: bool = True,
+          browser: bool = True, config_path: str = "config/competitors.yml"):
+    """Run the worker until a shutdown job or Ctrl-C."""
+    worker = Worker(config_path=config_path)
+    if warm:
+        print("Warming up worker...")
+        worker.warm_up(browser=browser)
+    server = WorkerServer(worker, host, port)
+    print(f"Worker listening on {host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        worker.close()
+        print("Worker stopped")
+
+
+def submit_job(job: str, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+               timeout: Optional[float] = None, **params) -> Dict[str, Any]:
+    """Send one job to a running worker and return its response."""
+    request = {"job": job, **{k: v for k, v in params.items() if v is not None}}
+    with socket.create_connection((host, port), timeout=timeout) as conn:
+        conn.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        with conn.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("worker closed the connection without a response")
+    return json.loads(line)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+"""Test the token-budgeted map-reduce mode of AICompetitiveAnalyzer"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import json
+import tempfile
+import threading
+from types import SimpleNamespace
+from src.laser_ci_lg import ai_competitive_analysis as ai
+from src.laser_ci_lg.ai_competitive_analysis import (
+    AICompetitiveAnalyzer, chunk_vendor_data, estimate_tokens, SYSTEM_PROMPT
+)
+
+
+class FakeCompletions:
+    def __init__(self, reply=None):
+        self.calls = []
+        self.lock = threading.Lock()
+        self.reply = reply
+
+    def create(self, **params):
+        with self.lock:
+            self.calls.append(params)
+        text = f"summary {len(self.calls)} by {params['model']}"
+        if self.reply:
+            text = self.reply(params['messages'][1]['content'], text)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+def make_analyzer(cache_dir, reply=None):
+    analyzer = AICompetitiveAnalyzer.__new__(AICompetitiveAnalyzer)
+    analyzer.model = "gpt-4.1"
+    analyzer.map_model = "gpt-4o-mini"
+    analyzer.cache_dir = Path(cache_dir)
+    analyzer.client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(reply)))
+    return analyzer
+
+
+def make_data(vendors=6, products=40):
+    data = {'timestamp': "2025-08-01T00:00:00", 'vendors': {}, 'raw_capabilities': {}}
+    for v in range(vendors):
+        name = "Coherent" if v == 0 else f"Vendor {v}"
+        data['vendors'][name] = {
+            'homepage': f"https://vendor{v}.example.com",
+            'product_count': products,
+            'products': [
+                {'name': f"Laser {v}-{i}", 'segment': "dpss" if i % 2 else "diode",
+                 'wavelengths': [405 + i, 488, 640], 'powers': [20, 50, 100 + i],
+                 'features': [], 'control_interfaces': ["USB", "RS-232"], 'spec_count': 12}
+                for i in range(products)
+            ],
+            'specifications': {}, 'capabilities': {},
+        }
+    data['market_overview'] = {'total_vendors': vendors, 'total_products': vendors * products,
+                               'coherent_product_count': products}
+    return data
+
+
+def test_chunks_fit_budget():
+    data = make_data(vendors=3, products=60)
+    chunks = chunk_vendor_data(data, max_tokens=1500)
+    for label, payload in chunks:
+        assert estimate_tokens(json.dumps(payload, indent=2)) <= 1500, label
+    # Every product lands in exactly one chunk
+    names = [p['name'] for _, payload in chunks for p in payload['products']]
+    assert sorted(names) == sorted(p['name'] for v in data['vendors'].values() for p in v['products'])
+    assert any(" / dpss" in label for label, _ in chunks)
+    # Small vendors stay whole
+    assert [label for label, _ in chunk_vendor_data(make_data(2, 2))] == ["Coherent", "Vendor 1"]
+
+
+def test_small_catalog_single_call():
+    with tempfile.TemporaryDirectory() as tmp:
+        analyzer = make_analyzer(tmp)
+        analyzer.generate_ai_analysis(make_data(vendors=2, products=2))
+        calls = analyzer.client.chat.completions.calls
+        assert len(calls) == 1 and calls[0]['model'] == "gpt-4.1"
+
+
+def test_large_catalog_map_reduce_with_cache():
+    original = ai.PROMPT_TOKEN_BUDGET, ai.MAP_CHUNK_TOKENS
+    ai.PROMPT_TOKEN_BUDGET, ai.MAP_CHUNK_TOKENS = 4000, 2000
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            data = make_data()
+            analyzer = make_analyzer(tmp)
+            analyzer.generate_ai_analysis(data)
+            calls = analyzer.client.chat.completions.calls
+            map_calls = [c for c in calls if c['model'] == "gpt-4o-mini"]
+            reduce_calls = [c for c in calls if c['model'] == "gpt-4.1"]
+            assert len(map_calls) == len(chunk_vendor_data(data)) > 6
+            assert len(reduce_calls) == 1
+            for call in calls:
+                prompt = call['messages'][1]['content']
+                assert estimate_tokens(SYSTEM_PROMPT + prompt) <= ai.PROMPT_TOKEN_BUDGET
+            assert "VENDOR SUMMARIES" in reduce_calls[0]['messages'][1]['content']
+
+            # Unchanged data: summaries come from the cache, only the reduce runs
+            analyzer = make_analyzer(tmp)
+            data['timestamp'] = "2025-09-01T00:00:00"
+            analyzer.generate_ai_analysis(data)
+            assert [c['model'] for c in analyzer.client.chat.completions.calls] == ["gpt-4.1"]
+    finally:
+        ai.PROMPT_TOKEN_BUDGET, ai.MAP_CHUNK_TOKENS = original
+
+
+def test_oversized_product_split_into_text_parts():
+    data = make_data(vendors=1, products=2)
+    data['vendors']['Coherent']['products'][0]['wavelengths'] = list(range(3000))
+    chunks = chunk_vendor_data(data, max_tokens=1500)
+    parts = [(label, payload) for label, payload in chunks if isinstance(payload, str)]
+    assert len(parts) > 1 and parts[0][0].endswith(f"(1/{len(parts)})")
+    for label, payload in chunks:
+        body = payload if isinstance(payload, str) else json.dumps(payload, indent=2)
+        assert estimate_tokens(body) <= 1500, label
+    assert "".join(payload for _, payload in parts).count("\n") > 3000
+
+
+def check_budget(calls):
+    for call in calls:
+        prompt = call['messages'][1]['content']
+        assert estimate_tokens(SYSTEM_PROMPT + prompt) <= ai.PROMPT_TOKEN_BUDGET
+
+
+def test_oversized_summary_condensed_to_budget():
+    original = ai.PROMPT_TOKEN_BUDGET, ai.MAP_CHUNK_TOKENS
+    ai.PROMPT_TOKEN_BUDGET, ai.MAP_CHUNK_TOKENS = 4000, 2000
+    # Vendor summaries come back larger than the whole reduce budget
+    reply = lambda prompt, text: text if "(vendor summaries)" in prompt else "- fact\n" * 3000
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            analyzer = make_analyzer(tmp, reply)
+            analyzer.generate_map_reduce_analysis(make_data(vendors=1, products=2))
+            calls = analyzer.client.chat.completions.calls
+            check_budget(calls)
+            assert calls[-1]['model'] == "gpt-4.1"
+            assert len([c for c in calls if "(vendor summaries)" in c['messages'][1]['content']]) >= 3
+
+        # An overview that can never fit is refused, not sent
+        with tempfile.TemporaryDirectory() as tmp:
+            data = make_data(vendors=1, products=2)
+            data['market_overview']['vendor_names'] = [f"Vendor {i}" for i in range(3000)]
+            analyzer = make_analyzer(tmp)
+            try:
+                analyzer.generate_map_reduce_analysis(data)
+            except ValueError as e:
+                assert "AI_PROMPT_TOKEN_BUDGET" in str(e)
+            else:
+                raise AssertionError("expected ValueError")
+            check_budget(analyzer.client.chat.completions.calls)
+            assert "AI analysis unavailable" in analyzer.generate_ai_analysis(data)
+    finally:
+        ai.PROMPT_TOKEN_BUDGET, ai.MAP_CHUNK_TOKENS = original
+
+
+def test_empty_summary_not_cached():
+    with tempfile.TemporaryDirectory() as tmp:
+        analyzer = make_analyzer(tmp, lambda prompt, text: None)
+        assert analyzer._summarize_chunk("Coherent", {'products': []}) == ""
+        assert not list(Path(tmp).glob("*.md"))
+
+
+if __name__ == "__main__":
+    test_chunks_fit_budget()
+    test_small_catalog_single_call()
+    test_large_catalog_map_reduce_with_cache()
+    test_oversized_product_split_into_text_parts()
+    test_oversized_summary_condensed_to_budget()
+    test_empty_summary_not_cached()
+    print("✅ AI analysis chunking tests passed")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""Test the lightweight scraping browser profile and its request blocking"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import tempfile
+from src.laser_ci_lg.browser import ScrapeProfile, scrape_profile_for, DEFAULT_VIEWPORT
+
+
+class FakeFrame:
+    parent_frame = None
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type, navigation=False, sizes=None):
+        self.url = url
+        self.resource_type = resource_type
+        self.frame = FakeFrame()
+        self._navigation = navigation
+        self._sizes = sizes or {"responseBodySize": 1000, "responseHeadersSize": 24}
+
+    def is_navigation_request(self):
+        return self._navigation
+
+    def sizes(self):
+        return self._sizes
+
+
+class FakeRoute:
+    def __init__(self, request):
+        self.request = request
+        self.outcome = None
+
+    def abort(self):
+        self.outcome = "abort"
+
+    def continue_(self):
+        self.outcome = "continue"
+
+
+class FakeContext:
+    def __init__(self):
+        self.handlers = {}
+
+    def route(self, pattern, handler):
+        self.handlers["route"] = handler
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+
+def test_blocking_rules():
+    profile = ScrapeProfile()
+    assert profile.should_block("https://lumencor.com/img/hero.jpg", "image")
+    assert profile.should_block("https://lumencor.com/f/inter.woff2", "font")
+    assert profile.should_block("https://www.googletagmanager.com/gtm.js", "script")
+    assert profile.should_block("https://static.hotjar.com/c/hotjar.js", "script")
+    assert not profile.should_block("https://lumencor.com/_nuxt/app.js", "script")
+    assert not profile.should_block("https://lumencor.com/api/specs", "xhr")
+    # The page itself is never blocked, even on a blocked host
+    assert not profile.should_block("https://www.youtube.com/watch", "document", is_main_document=True)
+    # Host matching is by domain, not substring
+    assert not profile.should_block("https://notyoutube.com/x.js", "script")
+
+
+def test_vendor_config_extends_defaults():
+    profile = ScrapeProfile.from_config({
+        "block_domains": ["chat.example.com"],
+        "allow_domains": ["fonts.lumencor.com"],
+        "block_resources": ["image", "media"],
+        "viewport": {"width": 1024, "height": 768},
+    })
+    assert profile.should_block("https://chat.example.com/widget.js", "script")
+    assert profile.should_block("https://www.google-analytics.com/a.js", "script")  # defaults kept
+    assert not profile.should_block("https://lumencor.com/f/inter.woff2", "font")
+    assert not profile.should_block("https://fonts.lumencor.com/x.png", "image")
+    options = profile.context_options(user_agent="UA")
+    assert options["viewport"] == {"width": 1024, "height": 768}
+    assert options["service_workers"] == "block" and options["user_agent"] == "UA"
+
+    assert ScrapeProfile.from_config(None).viewport == DEFAULT_VIEWPORT
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg = Path(tmp) / "targets.yml"
+        cfg.write_text("vendors:\n  - name: Lumencor\n    browser:\n      block_domains: [x.io]\n")
+        assert scrape_profile_for("Lumencor", str(cfg)).should_block("https://x.io/a", "script")
+        assert not scrape_profile_for("Omicron", str(cfg)).should_block("https://x.io/a", "script")
+        assert scrape_profile_for("Lumencor", str(Path(tmp) / "missing.yml")).viewport == DEFAULT_VIEWPORT
+
+
+def test_install_routes_and_counts():
+    profile = ScrapeProfile()
+    context = FakeContext()
+    profile.install(context)
+
+    routes = [FakeRoute(FakeRequest("https://lumencor.com/celesta", "document", navigation=True)),
+              FakeRoute(FakeRequest("https://lumencor.com/hero.png", "image")),
+              FakeRoute(FakeRequest("https://connect.facebook.net/fbevents.js", "script")),
+              FakeRoute(FakeRequest("https://lumencor.com/_nuxt/app.js", "script"))]
+    for route in routes:
+        context.handlers["route"](route)
+    assert [r.outcome for r in routes] == ["continue", "abort", "abort", "continue"]
+
+    context.handlers["requestfinished"](routes[0].request)
+    context.handlers["requestfinished"](routes[3].request)
+    assert profile.stats == {"requests": 4, "blocked": 2, "bytes": 2048}
+    assert profile.format_stats() == "4 requests, 2 blocked, 2 KB transferred"
+
+    # Async API: sizes() is a coroutine, the handler hands one back to be awaited
+    class AsyncRequest(FakeRequest):
+        async def sizes(self):
+            return self._sizes
+
+    pending = context.handlers["requestfinished"](AsyncRequest("https://lumencor.com/x.js", "script"))
+    asyncio.run(pending)
+    assert profile.stats["bytes"] == 3072
+
+
+if __name__ == "__main__":
+    test_blocking_rules()
+    test_vendor_config_extends_defaults()
+    test_install_routes_and_counts()
+    print("✅ Browser profile tests passed")
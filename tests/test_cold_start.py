@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+"""Regression test: the CLI starts without loading heavy pipeline dependencies"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.startup import cold_start
+
+# Generous bound for slow CI machines; a clean import takes well under a second
+MAX_COLD_START_SECONDS = 1.5
+
+
+def test_cli_imports_no_heavy_modules():
+    for module in ("src.laser_ci_lg.cli", "src.laser_ci_lg"):
+        _, heavy = cold_start(module)
+        assert heavy == [], f"{module} loads {heavy} at import time"
+
+
+def test_cli_cold_start_time():
+    best = min(cold_start("src.laser_ci_lg.cli")[0] for _ in range(3))
+    assert best < MAX_COLD_START_SECONDS, f"CLI cold start took {best:.2f}s"
+
+
+if __name__ == "__main__":
+    test_cli_imports_no_heavy_modules()
+    test_cli_cold_start_time()
+    print("✅ Cold start tests passed")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""Test nearest-competitor matching used by benchmark_vs_coherent"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import random
+import time
+from src.laser_ci_lg.catalog import SpecCatalog
+from src.laser_ci_lg.benchmark import match_competitors
+
+
+def record(vendor, model, wl, power, noise=None, stability=None, linewidth=None):
+    return {
+        "product_id": 1, "vendor": vendor, "segment_id": "diode", "product_name": model,
+        "model": model, "wavelength_nm": wl, "output_power_mw_nominal": power,
+        "rms_noise_pct": noise, "power_stability_pct": stability, "linewidth_mhz": linewidth,
+    }
+
+
+def test_matches_across_bucket_edges():
+    catalog = SpecCatalog([
+        record("Coherent", "OBIS 488-150", 488.0, 149.0, 0.15),
+        record("Coherent", "OBIS 640-100", 640.0, 100.0),
+        record("Oxxius", "LBX-487", 487.0, 151.0, 0.1),
+        record("Omicron", "LuxX 488-50", 488.0, 50.0, 0.1),
+        record("Omicron", "LuxX 638-100", 638.0, 100.0),
+        record("Hübner", "Cobolt unknown power", 488.0, None),
+    ])
+    rows = match_competitors(catalog, k=2)
+    by_model = {}
+    for row in rows:
+        by_model.setdefault(row["coherent_model"], []).append(row["model"])
+
+    # 487 nm / 151 mW is the closest match for 488 nm / 149 mW, then the 50 mW LuxX
+    assert by_model["OBIS 488-150"] == ["LBX-487", "LuxX 488-50"]
+    # Matches beyond max_distance are dropped; unknown power never matches
+    assert by_model["OBIS 640-100"] == ["LuxX 638-100"]
+
+    first = rows[0]
+    assert first["Δwl_nm"] == -1.0 and first["Δpower_mw"] == 2.0
+    assert abs(first["Δnoise_pct"] + 0.05) < 1e-9
+    assert first["Δstability_pct"] is None
+
+    assert match_competitors(SpecCatalog([record("Coherent", "A", 488.0, 1.0)])) == []
+
+
+def test_scales_to_thousands_of_skus():
+    rng = random.Random(0)
+    wavelengths = [405, 445, 488, 520, 561, 640]
+    catalog = SpecCatalog([
+        record("Coherent" if i % 2 else f"V{i % 7}", f"M{i}",
+               rng.choice(wavelengths) + rng.uniform(-2, 2), rng.uniform(5, 500),
+               rng.uniform(0.05, 0.5), rng.uniform(0.5, 3))
+        for i in range(6000)
+    ])
+    start = time.perf_counter()
+    rows = match_competitors(catalog, k=3)
+    elapsed = time.perf_counter() - start
+    assert len(rows) == 3 * 3000
+    assert elapsed < 10, f"matching took {elapsed:.1f}s"
+
+
+if __name__ == "__main__":
+    test_matches_across_bucket_edges()
+    test_scales_to_thousands_of_skus()
+    print("✅ Competitor matching tests passed")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""Test the set-based config-to-DB sync used by the crawler"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import tempfile
+from sqlalchemy import create_engine, event, select, func
+from sqlalchemy.orm import sessionmaker
+from src.laser_ci_lg.crawler import sync_config_to_db
+from src.laser_ci_lg.models import Base, Manufacturer, Product
+
+
+def make_config(vendors, products_per_segment):
+    return {"vendors": [
+        {"name": f"Vendor {v}", "homepage": f"https://v{v}.example.com", "segments": [
+            {"id": seg, "products": [
+                {"name": f"Laser {i}", "product_url": f"https://v{v}.example.com/{seg}/{i}"}
+                for i in range(products_per_segment)
+            ]}
+            for seg in ("diode_instrumentation", "light_engines")
+        ]}
+        for v in range(vendors)
+    ]}
+
+
+def make_session(tmp):
+    engine = create_engine(f"sqlite:///{Path(tmp) / 'sync.sqlite'}", future=True)
+    Base.metadata.create_all(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, stmt, *args: statements.append(stmt))
+    return sessionmaker(bind=engine, autoflush=False, future=True)(), statements
+
+
+def test_sync_is_idempotent_and_keeps_existing_rows():
+    with tempfile.TemporaryDirectory() as tmp:
+        s, _ = make_session(tmp)
+        existing = Manufacturer(name="Vendor 0", homepage="https://kept.example.com")
+        s.add(existing)
+        s.flush()
+        s.add(Product(manufacturer_id=existing.id, segment_id="light_engines", name="Laser 1"))
+        s.commit()
+
+        cfg = make_config(vendors=2, products_per_segment=3)
+        id_map = sync_config_to_db(cfg, s)
+        s.commit()
+        assert len(id_map) == 12
+        assert s.scalar(select(func.count()).select_from(Product)) == 12
+        assert s.scalar(select(Manufacturer.homepage).where(Manufacturer.name == "Vendor 0")) \
+            == "https://kept.example.com"
+
+        product = s.get(Product, id_map[("Vendor 1", "light_engines", "Laser 2")])
+        assert (product.manufacturer.name, product.segment_id, product.name) == \
+            ("Vendor 1", "light_engines", "Laser 2")
+        assert product.product_url == "https://v1.example.com/light_engines/2"
+
+        # Second sync inserts nothing and returns the same ids
+        assert sync_config_to_db(cfg, s) == id_map
+        assert s.scalar(select(func.count()).select_from(Product)) == 12
+        s.close()
+
+
+def test_statement_count_is_constant():
+    counts = []
+    for products in (2, 500):
+        with tempfile.TemporaryDirectory() as tmp:
+            s, statements = make_session(tmp)
+            id_map = sync_config_to_db(make_config(vendors=5, products_per_segment=products), s)
+            s.commit()
+            assert len(id_map) == 5 * 2 * products
+            counts.append(len(statements))
+            s.close()
+    assert counts[0] == counts[1] <= 6, counts
+
+
+if __name__ == "__main__":
+    test_sync_is_idempotent_and_keeps_existing_rows()
+    test_statement_count_is_constant()
+    print("✅ Config sync tests passed")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""Test that vectorized DataFrame-to-spec conversion matches the previous row loops"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+from benchmarks.dataframe_specs import compare, build_tables
+from src.laser_ci_lg import extraction
+from src.laser_ci_lg.extraction import clean_spec_name, clean_spec_names
+
+
+def edge_case_tables():
+    return [
+        # Comparison table with footnotes, units, duplicate specs and an unnamed column
+        pd.DataFrame(
+            {"OBIS 405 (mW) ": ["100", "<0.2 %", np.nan, " 5  mW "],
+             "Unnamed: 2": ["x", None, "1:100", "a  b"],
+             "": [1, 2, 3, 4]},
+            index=["Wavelength 1 (nm)", " Power 2", "Noise", "Power 2"],
+        ),
+        # Mixed int/float columns (iterrows upcasts ints to floats)
+        pd.DataFrame({"a": [1, 2], "b": [1.5, np.nan]}, index=["x (1)", "y"]),
+        # Single column and non-string headers
+        pd.DataFrame({"a": [1, 2]}, index=["x", "y"]),
+        pd.DataFrame([[1, 2], [3, 4]], columns=[0, "x"], index=[1, 2]),
+        # Two-level headers, as read_html(header=[0, 1]) returns
+        pd.DataFrame(
+            [[1, "q"], [np.nan, "r"]],
+            columns=pd.MultiIndex.from_tuples([("A", "b"), ("Unnamed: 1_level_0", "c")]),
+            index=["Output Power 3", "M2"],
+        ),
+        # Empty tables
+        pd.DataFrame(columns=["a", "b"]),
+        pd.DataFrame({"Unnamed: 0": [1], "Unnamed: 1": [2]}),
+    ]
+
+
+def test_same_output_as_row_loops():
+    timings = compare(edge_case_tables() + build_tables(4, 6))
+    assert set(timings) == {"html", "pdf"}
+
+
+def test_clean_spec_names():
+    names = ["Wavelength 1", "Output Power (mW)", "  Beam   Diameter  ", "Wavelength 1"]
+    expected = ["Wavelength", "Output Power", "Beam Diameter", "Wavelength"]
+    assert clean_spec_names(names) == expected
+    assert [clean_spec_name(name) for name in names] == expected
+
+
+def test_clean_spec_names_cache_overflow():
+    original = extraction._CLEAN_SPEC_NAMES_MAX
+    extraction._CLEAN_SPEC_NAMES.clear()
+    extraction._CLEAN_SPEC_NAMES_MAX = 3
+    try:
+        assert clean_spec_names(["a", "b"]) == ["a", "b"]
+        # Remembering "c" and "d" clears the cache, including the hit on "a"
+        assert clean_spec_names(["a", "c", "d"]) == ["a", "c", "d"]
+        assert len(extraction._CLEAN_SPEC_NAMES) <= 3
+    finally:
+        extraction._CLEAN_SPEC_NAMES_MAX = original
+        extraction._CLEAN_SPEC_NAMES.clear()
+
+
+if __name__ == "__main__":
+    test_same_output_as_row_loops()
+    test_clean_spec_names()
+    test_clean_spec_names_cache_overflow()
+    print("✅ Vectorized DataFrame-to-spec conversion matches the row loops")
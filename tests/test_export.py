@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""Test the partitioned Parquet/Arrow export of the spec catalog"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import tempfile
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from src.laser_ci_lg.models import Base, Manufacturer, Product, RawDocument, NormalizedSpec
+from src.laser_ci_lg.export import export_catalog, open_dataset, read_table
+
+
+def build_catalog(path):
+    engine = create_engine(f"sqlite:///{path}", future=True)
+    Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        coherent = Manufacturer(name="Coherent")
+        hubner = Manufacturer(name="Hübner Photonics")
+        s.add_all([coherent, hubner])
+        s.flush()
+        obis = Product(manufacturer_id=coherent.id, segment_id="diode", name="OBIS")
+        cobolt = Product(manufacturer_id=hubner.id, segment_id="diode", name="Cobolt 06")
+        s.add_all([obis, cobolt])
+        s.flush()
+        s.add(RawDocument(
+            product_id=obis.id, url="https://example.com/obis", content_type="html",
+            text="", fetched_at=datetime(2025, 7, 3),
+            raw_specs={"Wavelength_OBIS 405": "405 nm", "Output Power_OBIS 405": 100},
+        ))
+        s.add_all([
+            # OBIS 405 was normalized twice; the August row is the latest
+            NormalizedSpec(product_id=obis.id, snapshot_ts=datetime(2025, 7, 3),
+                           wavelength_nm=405.0, output_power_mw_nominal=50.0,
+                           vendor_fields={"model": "OBIS 405"}),
+            NormalizedSpec(product_id=obis.id, snapshot_ts=datetime(2025, 8, 1),
+                           wavelength_nm=405.0, output_power_mw_nominal=100.0,
+                           interfaces=["USB", "RS-232"], ttl_shutter=True,
+                           vendor_fields={"model": "OBIS 405"}),
+            NormalizedSpec(product_id=obis.id, snapshot_ts=datetime(2025, 7, 3),
+                           wavelength_nm=488.0, vendor_fields={"model": "OBIS 488"}),
+            NormalizedSpec(product_id=cobolt.id, snapshot_ts=datetime(2025, 8, 2),
+                           wavelength_nm=532.0, dimensions_mm={"length": 100}),
+        ])
+        s.commit()
+    return engine
+
+
+def test_export_and_read_back():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_catalog(Path(tmp) / "catalog.sqlite")
+
+        for file_format in ("parquet", "arrow"):
+            root = str(Path(tmp) / file_format)
+            counts = export_catalog(root, file_format, engine=engine)
+            assert counts == {"latest": 3, "history": 4, "raw_specs": 2}
+
+            # Hive partitions by vendor and month
+            assert (Path(root) / "history" / "vendor=Coherent" / "month=2025-07").is_dir()
+
+            latest = read_table("latest", root).sort_by("spec_id").to_pylist()
+            assert [(r["model"], r["output_power_mw_nominal"]) for r in latest] == [
+                ("OBIS 405", 100.0), ("OBIS 488", None), ("Cobolt 06", None)
+            ]
+            assert latest[0]["interfaces"] == ["USB", "RS-232"]
+            assert latest[0]["ttl_shutter"] is True
+            assert latest[2]["vendor"] == "Hübner Photonics"
+            assert latest[2]["dimensions_mm"] == '{"length": 100}'
+
+            # Partition pruning and projection
+            july = read_table("history", root, columns=["model"], vendor="Coherent", month="2025-07")
+            assert sorted(july["model"].to_pylist()) == ["OBIS 405", "OBIS 488"]
+
+            raw = open_dataset("raw_specs", root).to_table().to_pylist()
+            assert {(r["spec_name"], r["spec_value"]) for r in raw} == {
+                ("Wavelength_OBIS 405", "405 nm"), ("Output Power_OBIS 405", "100")
+            }
+
+        # Re-exporting replaces the previous files
+        export_catalog(str(Path(tmp) / "parquet"), engine=engine)
+        assert read_table("history", str(Path(tmp) / "parquet")).num_rows == 4
+        # Staging and the swapped-out export are removed
+        assert not [p for p in (Path(tmp) / "parquet").iterdir() if p.name.startswith(".")]
+
+
+def test_unknown_format_and_dataset():
+    for call in (lambda: export_catalog("unused", "csv"), lambda: open_dataset("nope")):
+        try:
+            call()
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError")
+
+
+if __name__ == "__main__":
+    test_export_and_read_back()
+    test_unknown_format_and_dataset()
+    print("✅ Spec catalog export tests passed")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""Test feature bitmasks and incremental feature tagging"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import json
+import tempfile
+from datetime import datetime
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from src.laser_ci_lg import features
+from src.laser_ci_lg.features import FEATURES, feature_mask, feature_names, refresh_product_features
+from src.laser_ci_lg.models import Base, Manufacturer, Product, RawDocument, ProductFeature
+
+
+def keyword_loop_features(raw_specs):
+    """The report's original per-feature keyword scan, for comparison."""
+    found = set()
+    for feature, keywords in FEATURES:
+        for value in raw_specs.values():
+            if any(keyword in str(value) for keyword in keywords):
+                found.add(feature)
+                break
+    return found
+
+
+def test_mask_matches_keyword_scan():
+    samples = [
+        {"Control Interfaces": "USB, RS232, Ethernet", "Modulation": "TTL up to 150 kHz"},
+        {"Output": "Free space", "Cooling": "TEC stabilized", "Modulation": "analog modulation"},
+        {"Fiber": "FC/APC", "Monitoring": "Power Monitoring photodiode", "Interface": "serial"},
+        {"Wavelength": "488 nm", "Power": 100},
+        {"Notes": "USB-C port", "Power": "internal power monitor"},
+    ]
+    for specs in samples:
+        assert set(feature_names(feature_mask(specs))) == keyword_loop_features(specs), specs
+
+    # JSON text is accepted; anything unreadable carries no features
+    assert feature_names(feature_mask(json.dumps({"I/O": "USB"}))) == ["USB Control"]
+    assert feature_mask("not json") == 0 and feature_mask(None) == 0 and feature_mask([1]) == 0
+    # Keywords never match across two values
+    assert feature_mask({"a": "US", "b": "B"}) == 0
+
+
+def test_keywords_starting_together_all_match():
+    # "fiber" and "fiber delivery" start at the same position but belong to two features
+    extended = FEATURES + [("Fiber Delivery", ["fiber delivery"])]
+    original = features._MATCHERS
+    features._MATCHERS = features._compile_matchers(extended)
+    try:
+        mask = feature_mask({"Output": "fiber delivery, TTL"})
+    finally:
+        features._MATCHERS = original
+    assert mask == 1 << 0 | 1 << 5 | 1 << len(FEATURES)
+
+
+def test_refresh_only_retags_changed_products():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'features.sqlite'}", future=True)
+        Base.metadata.create_all(engine)
+        with Session(engine) as s:
+            m = Manufacturer(name="Omicron")
+            s.add(m)
+            s.flush()
+            docs = []
+            for name, specs in (("LuxX", {"Interface": "USB"}), ("BrixX", {"Output": "fiber"})):
+                p = Product(manufacturer_id=m.id, segment_id="diode", name=name)
+                s.add(p)
+                s.flush()
+                doc = RawDocument(product_id=p.id, url="https://example.com", text="",
+                                  content_hash="a", fetched_at=datetime(2025, 8, 1), raw_specs=specs)
+                s.add(doc)
+                docs.append(doc)
+            s.commit()
+
+            assert refresh_product_features(s) == 2
+            s.commit()
+            masks = dict(s.execute(select(ProductFeature.product_id, ProductFeature.feature_mask)).all())
+            assert feature_names(masks[docs[0].product_id]) == ["USB Control"]
+            assert feature_names(masks[docs[1].product_id]) == ["Fiber Output"]
+
+            # Nothing changed: nothing rescanned
+            assert refresh_product_features(s) == 0
+
+            # A document updated in place is picked up by its content hash
+            docs[0].content_hash = "b"
+            docs[0].raw_specs = {"Interface": "USB, Ethernet"}
+            s.commit()
+            assert refresh_product_features(s) == 1
+            s.commit()
+            pf = s.get(ProductFeature, docs[0].product_id)
+            assert feature_names(pf.feature_mask) == ["USB Control", "Ethernet"]
+
+            # Products whose documents are gone lose their tags
+            s.delete(docs[1])
+            s.commit()
+            refresh_product_features(s)
+            s.commit()
+            assert s.get(ProductFeature, docs[1].product_id) is None
+
+
+if __name__ == "__main__":
+    test_mask_matches_keyword_scan()
+    test_keywords_starting_together_all_match()
+    test_refresh_only_retags_changed_products()
+    print("✅ Feature tagging tests passed")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""Test the model-variant engine and the model matrices stored with raw documents"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import re
+import tempfile
+from collections import defaultdict
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from src.laser_ci_lg import normalize
+from src.laser_ci_lg.model_variants import (
+    MATRIX_FORMAT, explode_models, matrix_models, merge_matrices, model_matrix, split_key
+)
+from src.laser_ci_lg.models import Base, Manufacturer, Product, RawDocument
+
+
+def key_scan_models(raw_specs):
+    """The original per-key scan from normalize.py, for comparison."""
+    models = defaultdict(dict)
+    spec_words = ['wavelength', 'power', 'beam', 'noise', 'stability', 'linewidth', 'm²', 'polarization']
+    for key, value in raw_specs.items():
+        if '_' in key:
+            parts = key.split('_', 1)
+            if any(w in parts[0].lower() for w in spec_words):
+                spec_name, model_name = parts[0], parts[1]
+            elif any(w in parts[1].lower() for w in spec_words):
+                model_name, spec_name = parts[0], parts[1]
+            else:
+                spec_name, model_name = parts[0], parts[1]
+            if (re.search(r'\d+', model_name) or
+                any(p in model_name.upper() for p in
+                    ['LX', 'LS', 'LBX', 'LCX', 'OBIS', 'LUXX', 'CELESTA', 'SPECTRA', 'SOLA'])):
+                models[model_name][spec_name] = value
+    return dict(models)
+
+
+SAMPLES = [
+    {"Wavelength_OBIS 405 LX": "405 nm", "Output Power_OBIS 405 LX": "100 mW",
+     "Wavelength_OBIS 488 LS": "488 nm", "Noise_OBIS 488 LS": "<0.2%", "Weight": "1 kg"},
+    {"LBX-405_wavelength": "405 nm", "LBX-405_output_power": "300 mW",
+     "LCX-532_beam_quality": "1.1", "Interface_USB": "yes", "Cooling_Celesta": "TEC"},
+    {"M²_Sola SE": "<1.2", "Size_Spectra X": "small", "Notes_misc": "none", "Power": "5 W"},
+]
+
+
+def test_explode_matches_key_scan():
+    for raw in SAMPLES:
+        assert explode_models(raw) == key_scan_models(raw), raw
+    assert split_key("Wavelength_OBIS 405") == ("OBIS 405", "Wavelength")
+    assert split_key("LBX-405_output_power") == ("LBX-405", "output_power")
+    assert split_key("Weight") is None and split_key("Notes_misc") is None
+    print("✅ Model split matches the original key scan")
+
+
+def test_matrix_round_trip_and_merge():
+    matrix = model_matrix(SAMPLES[0])
+    assert matrix["specs"] == ["Wavelength", "Output Power", "Noise"]
+    assert matrix["models"]["OBIS 488 LS"] == [[0, "488 nm"], [2, "<0.2%"]]
+    assert matrix_models(matrix) == explode_models(SAMPLES[0])
+    assert model_matrix({"Weight": "1 kg"}) == {"format": MATRIX_FORMAT, "specs": [], "models": {}}
+    assert model_matrix(None) is None
+
+    newer = {"Output Power_OBIS 405 LX": "120 mW"}
+    merged = merge_matrices([model_matrix(SAMPLES[0]), None, model_matrix(newer)])
+    assert merged == explode_models({**SAMPLES[0], **newer})
+    print("✅ Compact matrices round-trip and merge like raw specs")
+
+
+def test_merge_equals_explode_of_merged_raw():
+    docs = [
+        {"Output Power_OBIS 405 LX": "100 mW", "Wavelength_OBIS 405 LX": "405 nm",
+         "Noise_OBIS 488 LS": "<0.2%"},
+        # An explicit None overrides the older value; keys come in another order
+        {"Wavelength_OBIS 488 LS": "488 nm", "Noise_OBIS 405 LX": None,
+         "Wavelength_OBIS 405 LX": None, "Output Power_OBIS 405 LX": "120 mW"},
+        {"LBX-405_wavelength": "405 nm", "Weight": "1 kg"},
+    ]
+    merged_raw = {}
+    for raw in docs:
+        merged_raw.update(raw)
+    merged = merge_matrices(model_matrix(raw) for raw in docs)
+    expected = explode_models(merged_raw)
+    # Equal including dict order, model by model
+    assert merged == expected
+    assert [(m, list(specs.items())) for m, specs in merged.items()] == \
+        [(m, list(specs.items())) for m, specs in expected.items()]
+    assert merged["OBIS 405 LX"] == {"Output Power": "120 mW", "Wavelength": None, "Noise": None}
+    assert list(matrix_models(model_matrix(docs[1]))["OBIS 405 LX"]) == ["Noise", "Wavelength", "Output Power"]
+    print("✅ Merged matrices equal the models of the merged raw specs")
+
+
+def test_matrix_stored_with_raw_specs():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'variants.sqlite'}", future=True)
+        Base.metadata.create_all(engine)
+        with Session(engine) as s:
+            m = Manufacturer(name="Coherent")
+            s.add(m)
+            s.flush()
+            p = Product(manufacturer_id=m.id, segment_id="diode", name="OBIS")
+            s.add(p)
+            s.flush()
+            doc = RawDocument(product_id=p.id, url="https://coherent.test/obis", text="",
+                              raw_specs=SAMPLES[0])
+            s.add(doc)
+            s.commit()
+            assert matrix_models(doc.model_matrix) == explode_models(SAMPLES[0])
+
+            doc.raw_specs = SAMPLES[1]
+            s.commit()
+            assert set(matrix_models(doc.model_matrix)) == {"LBX-405", "LCX-532", "Celesta"}
+
+            # A document stored before the column existed gets its matrix at normalization
+            s.execute(text("UPDATE raw_documents SET model_matrix = NULL"))
+            s.commit()
+            s.expire_all()
+            [(pid, _, _, models)] = next(normalize.iter_product_batches(s))
+            assert models == explode_models(SAMPLES[1])
+            s.commit()
+            s.expire_all()
+            assert s.get(RawDocument, doc.id).model_matrix["format"] == MATRIX_FORMAT
+
+            # So does one stored in an older matrix layout
+            s.execute(text("""UPDATE raw_documents SET model_matrix = '{"specs": ["wavelength"], "models": {"LBX-405": ["405 nm"]}}'"""))
+            s.commit()
+            s.expire_all()
+            [(pid, _, _, models)] = next(normalize.iter_product_batches(s))
+            assert models == explode_models(SAMPLES[1])
+    print("✅ Model matrices stored with raw specs and backfilled")
+
+
+if __name__ == "__main__":
+    test_explode_matches_key_scan()
+    test_matrix_round_trip_and_merge()
+    test_merge_equals_explode_of_merged_raw()
+    test_matrix_stored_with_raw_specs()
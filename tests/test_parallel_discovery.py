@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+"""Test parallel smart discovery across segments and patterns"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+from contextlib import asynccontextmanager
+from src.laser_ci_lg.browser import ScrapeProfile
+from src.laser_ci_lg.scrapers import unified_base
+from src.laser_ci_lg.scrapers.unified_base import UnifiedBaseScraper, _LINKS_JS
+
+HOME = "https://vendor.test/"
+
+# Links per page URL (search result pages are keyed by the query)
+SITE = {
+    HOME: [["/lasers", HOME + "lasers", "Lasers"],
+           ["/products/accessories", HOME + "products/accessories", "Accessories"]],
+    "search:obis": [["/product/obis-lx", HOME + "product/obis-lx", "OBIS LX"],
+                    ["/product/obis-ls", HOME + "product/obis-ls", "OBIS LS"],
+                    ["/product/obis-cart", HOME + "product/obis-cart", "OBIS accessories cart"],
+                    ["/product/obis-galaxy", HOME + "product/obis-galaxy", "OBIS Galaxy"]],
+    "search:cube": [],
+    "search:sapphire": [],
+    HOME + "lasers": [["/product/cube", HOME + "product/cube", "CUBE 405"],
+                      ["/product/sapphire", HOME + "product/sapphire", "Sapphire SF"],
+                      [None, HOME + "lasers#", "Sapphire menu"]],
+}
+
+
+class FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.visible = selector == 'input[type="search"]'
+        self.first = self
+
+    async def is_visible(self):
+        return self.visible
+
+    async def clear(self):
+        pass
+
+    async def fill(self, text):
+        self.page.query = text
+
+    async def press(self, key):
+        self.page.url = "search:" + self.page.query.lower()
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.url = "about:blank"
+        self.query = ""
+
+    async def goto(self, url, **kwargs):
+        self.context.visits.append(url)
+        await asyncio.sleep(0.01)
+        self.url = url
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+    async def evaluate(self, js, arg):
+        if js != _LINKS_JS:
+            return {"quiet": True, "selector": None, "elapsed": 5}
+        if arg != "a[href]":
+            # Category links: the site menu, on every page
+            return [l for l in SITE[HOME] if "laser" in l[0] or "product" in l[0]]
+        return SITE.get(self.url, [])
+
+    async def close(self):
+        self.context.open -= 1
+
+
+class FakeContext:
+    def __init__(self):
+        self.open = 0
+        self.peak = 0
+        self.visits = []
+
+    async def new_page(self):
+        self.open += 1
+        self.peak = max(self.peak, self.open)
+        return FakePage(self)
+
+
+class FakeScraper(UnifiedBaseScraper):
+    def __init__(self, max_products=None):
+        # No config or extractors needed for discovery
+        self.homepage = HOME
+        self.max_products = max_products
+        self.browser_profile = ScrapeProfile()
+
+    def vendor(self):
+        return "Fake"
+
+
+def run_discovery(segments, pages=2, max_products=None):
+    context = FakeContext()
+
+    @asynccontextmanager
+    async def fake_browser_context(**kwargs):
+        yield context
+
+    original = unified_base.async_browser_context, unified_base.DISCOVERY_PAGES
+    unified_base.async_browser_context, unified_base.DISCOVERY_PAGES = fake_browser_context, pages
+    try:
+        return FakeScraper(max_products).discover_all_segments(segments), context
+    finally:
+        unified_base.async_browser_context, unified_base.DISCOVERY_PAGES = original
+
+
+SEGMENTS = [
+    {"id": "diode", "product_patterns": ["OBIS", "CUBE"],
+     "include_categories": ["laser"], "exclude_categories": ["accessories"]},
+    {"id": "dpss", "product_patterns": ["Sapphire"], "include_categories": ["laser"]},
+]
+
+
+def test_discovers_all_segments_in_pattern_order():
+    results, context = run_discovery(SEGMENTS)
+    assert [p["name"] for p in results["diode"]] == ["OBIS LX", "OBIS LS", "OBIS Galaxy", "CUBE 405"]
+    assert [p["url"] for p in results["dpss"]] == [HOME + "product/sapphire"]
+    print("✅ All segments discovered, pattern order kept, exclusions applied")
+
+
+def test_pages_bounded_and_categories_shared():
+    _, context = run_discovery(SEGMENTS, pages=2)
+    assert context.peak <= 2
+    assert context.open == 0
+    # Both browsing patterns need the lasers category; it is loaded once
+    assert context.visits.count(HOME + "lasers") == 1
+    assert context.visits.count(HOME) == 3
+    print("✅ Open pages bounded, shared category page loaded once")
+
+
+def test_max_products_and_dedupe():
+    segments = [{"id": "diode", "product_patterns": ["OBIS", "OBIS"], "exclude_categories": ["accessories"]}]
+    results, _ = run_discovery(segments, max_products=2)
+    assert [p["name"] for p in results["diode"]] == ["OBIS LX", "OBIS LS"]
+    results, _ = run_discovery(segments)
+    assert len(results["diode"]) == 3
+    print("✅ Results deduplicated and capped at max_products")
+
+
+def test_single_segment_and_no_patterns():
+    scraper = FakeScraper()
+    assert scraper.discover_all_segments([{"id": "empty"}]) == {"empty": []}
+    results, _ = run_discovery([SEGMENTS[1]])
+    assert list(results) == ["dpss"]
+    print("✅ Empty segments skip the browser")
+
+
+if __name__ == "__main__":
+    test_discovers_all_segments_in_pattern_order()
+    test_pages_bounded_and_categories_shared()
+    test_max_products_and_dedupe()
+    test_single_segment_and_no_patterns()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""Test the content-addressed PDF cache: dedup, eviction, integrity and vendor cleanup"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import os
+import hashlib
+import tempfile
+from src.laser_ci_lg.pdf_cache import PdfCache
+
+
+def test_dedup_across_urls_and_vendors():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PdfCache(tmp, max_bytes=10_000)
+        pdf = b"%PDF-1.4 OBIS datasheet"
+        a = cache.put("https://coherent.com/ds/obis-family-ds.pdf", pdf, "Coherent")
+        b = cache.put("https://coherent.com/dl?id=7", pdf, "Coherent")
+        c = cache.put("https://distributor.com/obis-family-ds.pdf", pdf, "Omicron")
+
+        assert a.endswith("coherent/obis-family-ds.pdf") and c.endswith("omicron/obis-family-ds.pdf")
+        sha = hashlib.sha256(pdf).hexdigest()
+        obj = cache.object_path(sha)
+        assert all(os.path.samefile(p, obj) for p in (a, b, c))
+        assert cache.stats()["total"] == {"files": 1, "bytes": len(pdf)}
+        assert cache.stats()["coherent"]["files"] == 2
+
+        # A fresh instance reads the same index
+        assert PdfCache(tmp).get("https://coherent.com/dl?id=7") == pdf
+
+        # Same file name from another URL of the same vendor gets its own link
+        d = cache.put("https://coherent.com/other/obis-family-ds.pdf", b"%PDF other", "Coherent")
+        assert d != a and Path(a).read_bytes() == pdf
+
+        # New content for a URL replaces the link; the old object goes once unreferenced
+        cache.put("https://distributor.com/obis-family-ds.pdf", b"%PDF v2", "Omicron")
+        assert obj.exists()
+        cache.put("https://coherent.com/ds/obis-family-ds.pdf", b"%PDF v2", "Coherent")
+        cache.put("https://coherent.com/dl?id=7", b"%PDF v2", "Coherent")
+        assert not obj.exists()
+
+
+def test_lru_eviction_and_verify():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PdfCache(tmp, max_bytes=250)
+        for i in range(3):
+            cache.put(f"https://x.com/{i}.pdf", bytes([i]) * 100, "Omicron")
+        # 300 bytes > 250: the least recently used object (0) was evicted on the third put
+        assert cache.get("https://x.com/0.pdf") is None
+        assert not (Path(tmp) / "omicron" / "0.pdf").exists()
+
+        cache.get("https://x.com/1.pdf")  # 2 is now least recently used
+        assert cache.evict(100) == 100
+        assert cache.get("https://x.com/1.pdf") == bytes([1]) * 100
+        assert cache.get("https://x.com/2.pdf") is None
+
+        # Corrupt objects are dropped; deleted links are restored
+        cache.put("https://x.com/3.pdf", b"%PDF three", "Omicron")
+        cache.object_path(hashlib.sha256(bytes([1]) * 100).hexdigest()).write_bytes(b"garbage")
+        (Path(tmp) / "omicron" / "3.pdf").unlink()
+        result = cache.verify()
+        assert result == {"ok": 1, "corrupt": 1, "missing": 0, "relinked": 1}
+        assert cache.get("https://x.com/1.pdf") is None
+        assert (Path(tmp) / "omicron" / "3.pdf").read_bytes() == b"%PDF three"
+
+
+def test_remove_vendor_and_adopt_legacy_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PdfCache(tmp, max_bytes=10_000)
+        shared, own = b"%PDF shared", b"%PDF only omicron"
+        cache.put("https://a.com/shared.pdf", shared, "Coherent")
+        cache.put("https://b.com/shared.pdf", shared, "Omicron")
+        cache.put("https://b.com/own.pdf", own, "Omicron")
+
+        # A file saved by the old per-vendor scheme, known from RawDocument.file_path
+        legacy = Path(tmp) / "omicron" / "legacy.pdf"
+        legacy.write_bytes(shared)
+        assert cache.adopt({str(legacy): "https://b.com/legacy.pdf"}) == 1
+        assert os.path.samefile(legacy, cache.object_path(hashlib.sha256(shared).hexdigest()))
+        assert cache.stats()["total"]["files"] == 2
+
+        (Path(tmp) / "omicron" / "stray.pdf").write_bytes(b"12345")
+        preview = cache.remove_vendor("Omicron", dry_run=True)
+        assert preview == {"files": 4, "bytes": len(own) + 5}
+        assert (Path(tmp) / "omicron").exists()
+
+        assert cache.remove_vendor("Omicron") == preview
+        assert not (Path(tmp) / "omicron").exists()
+        assert cache.get("https://a.com/shared.pdf") == shared
+        assert cache.get("https://b.com/own.pdf") is None
+        assert cache.stats()["total"] == {"files": 1, "bytes": len(shared)}
+
+
+def test_reads_flush_index_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PdfCache(tmp, max_bytes=10_000)
+        cache.put("https://x.com/a.pdf", b"%PDF a", "Omicron")
+        index = Path(tmp) / "index.json"
+        written = index.stat().st_mtime_ns, index.read_text()
+
+        for _ in range(5):
+            assert cache.get("https://x.com/a.pdf") == b"%PDF a"
+        # Hits only touch access times in memory
+        assert (index.stat().st_mtime_ns, index.read_text()) == written
+
+        cache.flush()
+        assert index.read_text() != written[1]
+        flushed = index.stat().st_mtime_ns
+        cache.flush()  # nothing new to write
+        assert index.stat().st_mtime_ns == flushed
+        sha = hashlib.sha256(b"%PDF a").hexdigest()
+        assert PdfCache(tmp).index["objects"][sha]["accessed"] == cache.index["objects"][sha]["accessed"]
+
+
+if __name__ == "__main__":
+    test_dedup_across_urls_and_vendors()
+    test_lru_eviction_and_verify()
+    test_remove_vendor_and_adopt_legacy_files()
+    test_reads_flush_index_once()
+    print("✅ PDF cache tests passed")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""Test the PDF page pre-pass that picks spec pages for Docling"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import io
+import pdfplumber
+from src.laser_ci_lg.extraction import AdvancedPDFExtractor
+
+
+def make_pdf(pages):
+    """Build a minimal text-only PDF; each page is a list of text lines."""
+    objects = [b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    pages_id = 2 + 2 * len(pages)
+    kids = []
+    for lines in pages:
+        stream = b"BT /F1 10 Tf 50 750 Td 14 TL " + b" ".join(
+            b"(" + line.encode("latin-1") + b") '" for line in lines
+        ) + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 1 0 R >> >> >>" % (pages_id, len(objects))
+        )
+        kids.append(len(objects))
+    objects.append(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)))
+    objects.append(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out, offsets = b"%PDF-1.4\n", []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, len(objects), xref)
+    return out
+
+
+FILLER = ["Safety information", "Read this manual before operating the laser."]
+SPEC_PAGE = [
+    "Specifications",
+    "Wavelength: 488 nm",
+    "Output Power: 100 mW",
+    "RMS Noise: <0.2 %",
+    "Power Stability: <2 %",
+    "Operating Temperature: 10-40 C",
+]
+
+
+def test_select_spec_pages():
+    extractor = AdvancedPDFExtractor(max_spec_pages=2)
+
+    # Short documents and documents without spec hits go through whole
+    assert extractor.select_spec_pages([5.0, 1.0]) is None
+    assert extractor.select_spec_pages([0.0, 0.0, 0.0, 0.0]) is None
+
+    # Top pages are returned in document order
+    assert extractor.select_spec_pages([1.0, 30.0, 0.0, 20.0, 2.0]) == [1, 3]
+
+    # Pages below MIN_PAGE_SCORE_RATIO of the best page are dropped
+    assert extractor.select_spec_pages([30.0, 5.0, 0.0, 0.0, 0.0]) == [0]
+
+    # Flat scores: the top pages are not clearly ahead, use the whole document
+    assert extractor.select_spec_pages([1.0, 1.0, 1.0, 1.0, 1.0, 1.0]) is None
+    assert extractor.select_spec_pages([30.0, 20.0, 19.0, 0.0, 0.0]) is None
+
+
+def test_score_pages_and_subset():
+    extractor = AdvancedPDFExtractor(max_spec_pages=2)
+    pdf = make_pdf([FILLER, FILLER, SPEC_PAGE, FILLER, FILLER, FILLER])
+
+    scores = extractor.score_pages(pdf)
+    assert len(scores) == 6
+    assert scores.index(max(scores)) == 2
+    assert extractor.select_spec_pages(scores) == [2]
+
+    subset = extractor._subset_pdf(pdf, [2])
+    with pdfplumber.open(io.BytesIO(subset)) as sub:
+        assert len(sub.pages) == 1
+        assert "Wavelength: 488 nm" in sub.pages[0].extract_text()
+
+
+def test_subset_fallbacks():
+    extractor = AdvancedPDFExtractor(max_spec_pages=2)
+    pdf = make_pdf([FILLER, FILLER, SPEC_PAGE, FILLER, FILLER, FILLER])
+    converted = []
+
+    def convert(pdf_content, mode):
+        converted.append(pdf_content)
+        return "# Specifications", {"Wavelength": "488 nm"}
+
+    extractor._convert_and_extract = convert
+
+    # Subset path keeps the text of the other pages
+    text, specs = extractor.extract_specs(pdf)
+    assert len(converted) == 1 and converted[0] != pdf
+    assert text.startswith("# Specifications")
+    assert "Safety information" in text
+
+    # A failing sub-PDF falls back to the whole document
+    def broken_subset(pdf_content, pages):
+        raise RuntimeError("cannot build sub-PDF")
+
+    extractor._subset_pdf = broken_subset
+    converted.clear()
+    extractor.extract_specs(pdf)
+    assert converted == [pdf]
+
+
+if __name__ == "__main__":
+    test_select_spec_pages()
+    test_score_pages_and_subset()
+    test_subset_fallbacks()
+    print("✅ PDF page selection tests passed")
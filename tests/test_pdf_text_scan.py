@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+"""Test that the single-scan PDF text extractor matches the previous multi-pass one"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.pdf_text_scan import compare, synthetic_document
+
+EDGE_CASES = [
+    "",
+    "No specs here at all.",
+    # Values on the line after the keyword, lowercase m2 and repeated keywords
+    "M2\n1.1 and m2 < 1.5\nPower Power Power 5 mW\nNoise\n0.2 %",
+    # Keywords inside other words and Greek capital lambda
+    "Powerful 20 W laser, Λ 640 nm, noiseless <1% drift",
+    # Case-folded keywords that str.lower() does not map (fallback path)
+    "RMS NOIſE 0.3 % and Operatİng Temperature 10 to 40 °C",
+    # Ratios, headers and tables separated by prose
+    "Polarization Ratio: >100:1\n| a | b |\n|---|---|\n| Wavelength | 405 nm |\nTail: 3 mm\n\n| x |",
+]
+
+
+def test_same_output_as_multi_pass():
+    corpus = EDGE_CASES + [synthetic_document(i) for i in range(5)]
+    timings = compare(corpus)
+    assert set(timings) == {"legacy", "single_scan"}
+
+
+if __name__ == "__main__":
+    test_same_output_as_multi_pass()
+    print("✅ Single-scan PDF text extraction matches the multi-pass version")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""Test tiered PDF extraction (text layer first, Docling only when needed)"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.laser_ci_lg.extraction import AdvancedPDFExtractor
+
+
+def make_extractor(tier_results):
+    """Extractor whose tiers return canned results (or raise) instead of parsing a PDF."""
+    extractor = AdvancedPDFExtractor()
+    calls = []
+
+    def result(tier):
+        calls.append(tier)
+        outcome = tier_results[tier]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return f"{tier} text", outcome
+
+    extractor._scan_pages = lambda pdf_content, with_tables=False: []
+    extractor.extract_text_layer = lambda pdf_content, scan=None: result("text_layer")
+    extractor._docling_extract = lambda pdf_content, mode, pages, scan=None, retry_whole=True: result(
+        "docling_fast" if calls[-1] == "text_layer" else "docling_accurate"
+    )
+    return extractor, calls
+
+
+COMPLETE = {
+    "Wavelength": "488 nm",
+    "Output Power": "100 mW",
+    "RMS Noise": "<0.2%",
+    "Power Stability": "<2%",
+}
+
+
+def test_spec_completeness_key_shapes():
+    extractor = AdvancedPDFExtractor()
+
+    # Snake-case keys are read with spaces
+    snake = {"beam_diameter": "0.7 mm", "power_stability": "<2%", "m2": "<1.1"}
+    assert extractor.spec_completeness(snake) == 3 / 6
+
+    # Composite name_model keys are matched part by part
+    composite = {"Output Power_OBIS 405": "100 mW", "Wavelength_OBIS 405": "405 nm"}
+    assert extractor.spec_completeness(composite) == 2 / 6
+
+    assert extractor.spec_completeness({"Weight": "1 kg"}) == 0.0
+
+
+def test_text_layer_accepted():
+    extractor, calls = make_extractor({"text_layer": COMPLETE})
+    text, specs = extractor.extract_specs_tiered(b"%PDF")
+
+    assert calls == ["text_layer"]
+    assert specs == COMPLETE
+    assert extractor.tier_stats["text_layer"]["accepted"] == 1
+    assert extractor.tier_stats["docling_fast"]["attempts"] == 0
+
+
+def test_escalates_to_docling():
+    extractor, calls = make_extractor({
+        "text_layer": {"Wavelength": "488 nm"},
+        "docling_fast": COMPLETE,
+    })
+    text, specs = extractor.extract_specs_tiered(b"%PDF")
+
+    assert calls == ["text_layer", "docling_fast"]
+    assert text == "docling_fast text"
+    assert extractor.tier_stats["docling_fast"]["accepted"] == 1
+
+
+def test_best_result_when_none_accepted():
+    extractor, calls = make_extractor({
+        "text_layer": {"Wavelength": "488 nm", "Output Power": "100 mW"},
+        "docling_fast": {"Wavelength": "488 nm"},
+        "docling_accurate": RuntimeError("docling crashed"),
+    })
+    text, specs = extractor.extract_specs_tiered(b"%PDF")
+
+    assert calls == ["text_layer", "docling_fast", "docling_accurate"]
+    assert text == "text_layer text"
+    assert sum(stats["accepted"] for stats in extractor.tier_stats.values()) == 0
+
+
+def test_all_tiers_fail_reraises():
+    extractor, calls = make_extractor({
+        "text_layer": ValueError("no text layer"),
+        "docling_fast": RuntimeError("docling crashed"),
+        "docling_accurate": RuntimeError("docling crashed again"),
+    })
+    try:
+        extractor.extract_specs_tiered(b"%PDF")
+    except RuntimeError as e:
+        assert str(e) == "docling crashed again"
+    else:
+        raise AssertionError("expected the last tier error to be raised")
+
+    assert all(stats["attempts"] == 1 for stats in extractor.tier_stats.values())
+
+
+if __name__ == "__main__":
+    test_spec_completeness_key_shapes()
+    test_text_layer_accepted()
+    test_escalates_to_docling()
+    test_best_result_when_none_accepted()
+    test_all_tiers_fail_reraises()
+    print("✅ Tiered PDF extraction tests passed")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""Test adaptive page readiness and per-domain learning"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import tempfile
+from src.laser_ci_lg.readiness import (ReadinessProfiles, wait_until_ready, settle,
+                                       DEFAULT_CAP_MS, MIN_CAP_MS)
+
+
+class FakePage:
+    """Records the readiness parameters and answers with scripted observations."""
+
+    def __init__(self, *results, url="https://lumencor.com/products/celesta"):
+        self.url = url
+        self.results = list(results)
+        self.calls = []
+
+    def evaluate(self, script, params):
+        self.calls.append(params)
+        return self.results.pop(0)
+
+
+def test_learns_domain_selector_and_cap():
+    with tempfile.TemporaryDirectory() as tmp:
+        profiles = ReadinessProfiles(Path(tmp) / "readiness.json")
+        page = FakePage(
+            {"quiet": True, "selector": ".specs", "elapsed": 900},
+            {"quiet": True, "selector": ".specs", "elapsed": 700},
+        )
+        # First visit: default cap, no selector required
+        wait_until_ready(page, profiles=profiles)
+        first = page.calls[0]
+        assert first["capMs"] == DEFAULT_CAP_MS and first["needSelector"] is False
+        assert first["selectors"][0] == "table"
+
+        # Second visit: learned selector first and required, cap from history
+        wait_until_ready(page, profiles=profiles)
+        second = page.calls[1]
+        assert second["selectors"][0] == ".specs" and second["needSelector"] is True
+        assert second["capMs"] == 2 * 900 + 300 and second["selectorOnly"] is False
+
+        # History survives restarts, smoothed
+        profile = ReadinessProfiles(Path(tmp) / "readiness.json").get("lumencor.com")
+        assert profile["samples"] == 2 and 700 < profile["ready_ms"] < 900
+
+
+def test_never_quiet_domain_stops_at_selector():
+    with tempfile.TemporaryDirectory() as tmp:
+        profiles = ReadinessProfiles(Path(tmp) / "readiness.json")
+        page = FakePage(
+            {"quiet": False, "selector": "table", "elapsed": 5000},  # carousel keeps mutating
+            {"quiet": False, "selector": "table", "elapsed": 60},
+            {"quiet": False, "selector": None, "elapsed": 5000},
+            {"quiet": True, "selector": None, "elapsed": 400},
+        )
+        wait_until_ready(page, profiles=profiles)
+        wait_until_ready(page, profiles=profiles)
+        assert page.calls[1]["selectorOnly"] is True
+
+        # Capped-out observations without any signal don't inflate the cap
+        before = profiles.cap_ms("lumencor.com")
+        wait_until_ready(page, profiles=profiles)
+        assert profiles.cap_ms("lumencor.com") == before
+        assert profiles.get("lumencor.com")["timeouts"] == 1
+
+        # Settling after a click is not learned and has a short cap
+        settle(page, cap_ms=500)
+        assert page.calls[3]["capMs"] == 500 and page.calls[3]["selectors"] == []
+        assert profiles.get("lumencor.com")["samples"] == 2
+
+
+def test_unobservable_page_returns_without_learning():
+    class PdfViewer(FakePage):
+        def evaluate(self, script, params):
+            raise RuntimeError("Execution context was destroyed")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        profiles = ReadinessProfiles(Path(tmp) / "readiness.json")
+        result = wait_until_ready(PdfViewer(), profiles=profiles)
+        assert result["quiet"] is False and result["selector"] is None
+        assert profiles.get("lumencor.com") == {}
+        assert profiles.cap_ms("unknown.com") == DEFAULT_CAP_MS >= MIN_CAP_MS
+
+
+if __name__ == "__main__":
+    test_learns_domain_selector_and_cap()
+    test_never_quiet_domain_stops_at_selector()
+    test_unobservable_page_returns_without_learning()
+    print("✅ Readiness tests passed")
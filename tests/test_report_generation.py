@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""Test the preloaded, parallel and memoized competitive intelligence report"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import tempfile
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.laser_ci_lg import enhanced_reporter
+from src.laser_ci_lg.enhanced_reporter import CompetitiveIntelligenceReport
+from src.laser_ci_lg.features import refresh_product_features
+from src.laser_ci_lg.models import Base, Manufacturer, Product, NormalizedSpec, RawDocument
+
+
+def make_sessionmaker(tmp):
+    engine = create_engine(f"sqlite:///{Path(tmp) / 'report.sqlite'}", future=True)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False, future=True)
+    with Session() as s:
+        rows = [
+            ("Coherent", "OBIS", "diode_instrumentation", [(488.0, 150.0, 0.1), (640.0, 100.0, None)]),
+            ("Omicron", "LuxX", "diode_instrumentation", [(488.0, 100.0, 0.2)]),
+            ("Hübner Photonics", "Cobolt 06", "diode_instrumentation", [(640.0, 120.0, 0.15)]),
+            ("Oxxius", "LCX", "dpss", []),
+        ]
+        for vendor, name, segment, specs in rows:
+            m = Manufacturer(name=vendor)
+            s.add(m)
+            s.flush()
+            p = Product(manufacturer_id=m.id, segment_id=segment, name=name)
+            s.add(p)
+            s.flush()
+            for wl, power, noise in specs:
+                s.add(NormalizedSpec(product_id=p.id, wavelength_nm=wl,
+                                     output_power_mw_nominal=power, rms_noise_pct=noise))
+            s.add(RawDocument(product_id=p.id, url="https://example.com", text="",
+                              content_hash=name, fetched_at=datetime(2025, 8, 1),
+                              raw_specs={"Control Interfaces": "USB, TTL", "Output": "FC/APC fiber"}))
+        s.flush()
+        refresh_product_features(s)  # tagged at crawl time in the pipeline
+        s.commit()
+    return Session
+
+
+def render(Session, cache_dir):
+    original = enhanced_reporter.SessionLocal
+    enhanced_reporter.SessionLocal = Session
+    try:
+        with CompetitiveIntelligenceReport(cache_dir=cache_dir) as report:
+            return report.generate_full_report(), report
+    finally:
+        enhanced_reporter.SessionLocal = original
+
+
+def test_full_report_sections():
+    with tempfile.TemporaryDirectory() as tmp:
+        Session = make_sessionmaker(tmp)
+        text, report = render(Session, Path(tmp) / "cache")
+
+        headings = ["# Competitive Intelligence Executive Summary", "## Market Positioning Analysis",
+                    "## Technical Specifications Comparison", "## Feature Comparison",
+                    "## Strategic Recommendations"]
+        positions = [text.index(h) for h in headings]
+        assert positions == sorted(positions)
+
+        assert "- **Coherent**: 1 products\n  - OBIS" in text
+        assert "- Oxxius: 1 products\n  - LCX" in text
+        assert "- **Coherent Market Share**: 2/4 products" in text
+        assert "### 488 nm Wavelength" in text and "### 640 nm Wavelength" in text
+        assert "| **Coherent** | OBIS | 150.00 | 0.10 | - | - | - |" in text
+        assert "Higher output power: 50% above nearest competitor" in text
+        assert "| **Coherent - OBIS** | ✓ | ✓ | ✓ |" in text
+
+        # Section bodies are memoized on disk by the dataset digest and code version
+        assert report.cache_key.startswith(report.dataset.digest)
+        assert (Path(tmp) / "cache" / f"{report.cache_key}.json").exists()
+
+
+def test_unchanged_data_reuses_sections():
+    with tempfile.TemporaryDirectory() as tmp:
+        Session = make_sessionmaker(tmp)
+        enhanced_reporter._SECTION_CACHE.clear()
+        writes = []
+        original_save = CompetitiveIntelligenceReport._save_cache
+        CompetitiveIntelligenceReport._save_cache = lambda self: writes.append(1) or original_save(self)
+        try:
+            first, report = render(Session, Path(tmp) / "cache")
+        finally:
+            CompetitiveIntelligenceReport._save_cache = original_save
+        assert writes == [1]  # once per run, not once per section
+        digest = report.dataset.digest
+
+        enhanced_reporter._SECTION_CACHE.clear()
+        calls = []
+        original = CompetitiveIntelligenceReport._technical_comparison_body
+        CompetitiveIntelligenceReport._technical_comparison_body = \
+            lambda self, data: calls.append(data) or original(self, data)
+        try:
+            second, report = render(Session, Path(tmp) / "cache")
+            assert report.dataset.digest == digest
+            assert calls == []  # served from the on-disk cache
+            assert second.split("\n", 3)[3] == first.split("\n", 3)[3]
+
+            # New data changes the digest and re-renders
+            with Session() as s:
+                s.add(NormalizedSpec(product_id=2, wavelength_nm=488.0, output_power_mw_nominal=200.0))
+                s.commit()
+            third, report = render(Session, Path(tmp) / "cache")
+            assert report.dataset.digest != digest and len(calls) == 1
+            assert "Higher output power" not in third.split("### 488 nm Wavelength")[1].split("###")[0]
+
+            # A new report format version does not reuse sections cached by the old one
+            enhanced_reporter._SECTION_CACHE.clear()
+            enhanced_reporter.REPORT_FORMAT_VERSION += 1
+            try:
+                render(Session, Path(tmp) / "cache")
+            finally:
+                enhanced_reporter.REPORT_FORMAT_VERSION -= 1
+            assert len(calls) == 2
+        finally:
+            CompetitiveIntelligenceReport._technical_comparison_body = original
+
+
+if __name__ == "__main__":
+    test_full_report_sections()
+    test_unchanged_data_reuses_sections()
+    print("✅ Report generation tests passed")
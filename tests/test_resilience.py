@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+"""Test retries, circuit breakers and deadlines for vendor fetches"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import requests
+from src.laser_ci_lg.resilience import ResilientFetcher, CircuitOpenError, DeadlineExceeded
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeGet:
+    """Plays back a script of responses/exceptions per call."""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = []
+
+    def __call__(self, url, timeout=None, **kwargs):
+        self.calls.append((url, timeout))
+        outcome = self.script.pop(0) if len(self.script) > 1 else self.script[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome if isinstance(outcome, FakeResponse) else FakeResponse(outcome)
+
+
+def make_fetcher(get, **kwargs):
+    sleeps = []
+    fetcher = ResilientFetcher(sleep=sleeps.append, get=get, **kwargs)
+    return fetcher, sleeps
+
+
+def test_transient_errors_are_retried_with_backoff():
+    get = FakeGet(requests.ConnectionError("reset"), 503, 200)
+    fetcher, sleeps = make_fetcher(get, max_retries=2)
+    assert fetcher.get("https://omicron.de/luxx.pdf").status_code == 200
+    assert len(get.calls) == 3 and len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 0.5 and 0 <= sleeps[1] <= 1.0  # full jitter, doubling cap
+    stats = fetcher.metrics["omicron.de"]
+    assert stats["requests"] == 1 and stats["ok"] == 1 and stats["retries"] == 2
+
+    # Retry-After is honoured; client errors are returned without retrying
+    fetcher, sleeps = make_fetcher(FakeGet(FakeResponse(429, {"Retry-After": "3"}), 200))
+    assert fetcher.get("https://hubner-photonics.com/").status_code == 200 and sleeps == [3.0]
+    fetcher, sleeps = make_fetcher(FakeGet(404))
+    assert fetcher.get("https://oxxius.com/missing").status_code == 404 and sleeps == []
+
+    # Retries exhausted: the last retryable response is returned, errors are raised
+    fetcher, sleeps = make_fetcher(FakeGet(502), max_retries=1)
+    assert fetcher.get("https://a.com/x").status_code == 502 and len(sleeps) == 1
+    fetcher, _ = make_fetcher(FakeGet(requests.Timeout("slow")), max_retries=1)
+    try:
+        fetcher.get("https://a.com/x")
+        assert False, "expected Timeout"
+    except requests.Timeout:
+        pass
+    assert fetcher.metrics["a.com"]["failed"] == 1
+
+
+def test_breaker_trips_and_skips_host():
+    get = FakeGet(requests.ConnectionError("down"))
+    fetcher, _ = make_fetcher(get, max_retries=0, breaker_threshold=3, breaker_reset_after=300)
+    for i in range(3):
+        try:
+            fetcher.get(f"https://slow.example.com/{i}")
+        except requests.ConnectionError:
+            pass
+    assert len(get.calls) == 3
+
+    # Open: later URLs on that host are skipped without a request
+    for i in range(5):
+        try:
+            fetcher.get(f"https://slow.example.com/more/{i}")
+            assert False, "expected CircuitOpenError"
+        except CircuitOpenError:
+            pass
+    assert len(get.calls) == 3
+    stats = fetcher.metrics["slow.example.com"]
+    assert stats["skipped"] == 5 and stats["trips"] == 1
+    assert "5 skipped (circuit open)" in fetcher.format_stats()[0]
+
+    # Other hosts are unaffected
+    fetcher._get = FakeGet(200)
+    assert fetcher.get("https://coherent.com/obis").status_code == 200
+
+    # After the reset window one trial request is let through and closes it again
+    fetcher.breakers["slow.example.com"].reset_after = 0
+    assert fetcher.get("https://slow.example.com/again").status_code == 200
+    assert fetcher.breakers["slow.example.com"].state == "closed"
+
+    fetcher.reset()
+    assert fetcher.metrics == {} and fetcher.breakers == {}
+
+
+def test_other_request_errors_fail_without_retry():
+    get = FakeGet(requests.TooManyRedirects("loop"))
+    fetcher, sleeps = make_fetcher(get, max_retries=3, breaker_threshold=1, breaker_reset_after=0)
+    try:
+        fetcher.get("https://loop.example.com/a")
+        assert False, "expected TooManyRedirects"
+    except requests.TooManyRedirects:
+        pass
+    assert len(get.calls) == 1 and sleeps == []
+    assert fetcher.metrics["loop.example.com"]["failed"] == 1
+
+    # A failed half-open trial reopens the breaker instead of leaving the host blocked
+    breaker = fetcher.breakers["loop.example.com"]
+    for error in (requests.exceptions.ChunkedEncodingError("cut"), requests.exceptions.InvalidURL("bad")):
+        get.script = [error]
+        try:
+            fetcher.get("https://loop.example.com/b")
+            assert False, "expected a RequestException"
+        except requests.RequestException:
+            pass
+        assert breaker.state == "half-open" and not breaker._trial
+    get.script = [200]
+    assert fetcher.get("https://loop.example.com/c").status_code == 200
+    assert breaker.state == "closed"
+
+
+def test_deadline_budget():
+    get = FakeGet(200)
+    fetcher, _ = make_fetcher(get)
+    try:
+        fetcher.get("https://a.com/x", deadline=0)
+        assert False, "expected DeadlineExceeded"
+    except DeadlineExceeded:
+        pass
+    assert get.calls == []
+
+    # Per-attempt timeouts are clipped to the remaining budget
+    fetcher.get("https://a.com/x", timeout=30, deadline=5)
+    assert get.calls[0][1] <= 5
+
+    # No retry is scheduled past the deadline
+    get = FakeGet(FakeResponse(503, {"Retry-After": "2"}), 200)
+    fetcher, sleeps = make_fetcher(get, max_retries=5)
+    assert fetcher.get("https://a.com/x", deadline=1).status_code == 503
+    assert sleeps == [] and len(get.calls) == 1
+
+
+if __name__ == "__main__":
+    test_transient_errors_are_retried_with_backoff()
+    test_breaker_trips_and_skips_host()
+    test_other_request_errors_fail_without_retry()
+    test_deadline_budget()
+    print("✅ Fetch resilience tests passed")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""Test sitemap-driven discovery against local sitemap fixtures"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import io
+import tempfile
+from datetime import datetime
+from urllib.parse import urlparse
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from src.laser_ci_lg.models import Base, Manufacturer, Product, RawDocument
+from src.laser_ci_lg.scrapers.sitemap_discovery import (
+    SitemapDiscovery, SitemapMatcher, iter_sitemap, parse_lastmod, product_name
+)
+from src.laser_ci_lg.scrapers.unified_base import UnifiedBaseScraper
+
+FIXTURES = Path(__file__).parent / "fixtures" / "sitemaps"
+
+SEGMENTS = [
+    {"id": "diode", "product_patterns": ["OBIS", "OBIS LX", "OBIS LS", "Sapphire"],
+     "include_categories": ["cw laser"], "exclude_categories": ["accessories"]},
+    {"id": "light_engines", "product_patterns": ["OBIS Galaxy", "HIVE"],
+     "include_categories": ["light engine"]},
+]
+
+
+def open_fixture(url):
+    """Serve https://vendor.test/<name> from the fixtures directory."""
+    parsed = urlparse(url)
+    path = FIXTURES / parsed.path.lstrip("/")
+    if parsed.netloc != "vendor.test" or not path.is_file():
+        raise FileNotFoundError(url)
+    return open(path, "rb")
+
+
+def test_streams_gzip_and_index():
+    with open_fixture("https://vendor.test/sitemap_index.xml") as f:
+        index = list(iter_sitemap(f))
+    assert [e.is_index for e in index] == [True, True]
+    assert index[0].lastmod == datetime(2025, 3, 1, 8, 0)
+
+    with open_fixture("https://vendor.test/sitemap-products.xml.gz") as f:
+        entries = list(iter_sitemap(f))
+    assert len(entries) == 6 and not any(e.is_index for e in entries)
+    # Offsets are normalized to naive UTC, like RawDocument.fetched_at
+    assert entries[1].lastmod == datetime(2025, 2, 20, 11, 30)
+    assert entries[3].lastmod is None
+
+    # A non-seekable stream (like an HTTP body) works too
+    raw = (FIXTURES / "sitemap-pages.xml").read_bytes()
+    assert len(list(iter_sitemap(io.BufferedReader(io.BytesIO(raw))))) == 5
+    assert parse_lastmod("not a date") is None
+    print("✅ Sitemaps streamed: gzip, indexes and lastmod")
+
+
+def test_matcher():
+    matcher = SitemapMatcher(SEGMENTS)
+    assert matcher.match("https://vendor.test/products/lasers/obis-lx-laser") == (0, "OBIS LX")
+    assert matcher.match("https://vendor.test/lasers/OBIS%20LS") == (0, "OBIS LS")
+    # The longest pattern wins across segments
+    assert matcher.match("https://vendor.test/products/obis-galaxy") == (1, "OBIS Galaxy")
+    assert matcher.match("https://vendor.test/products/accessories/obis-remote") is None
+    # With include_categories, a category or product path is required
+    assert matcher.match("https://vendor.test/news/obis-anniversary") is None
+    assert matcher.match("https://vendor.test/cw-laser/obis") == (0, "OBIS")
+    # Patterns match whole words only
+    assert matcher.match("https://vendor.test/products/archive") is None
+    assert SitemapMatcher([{"id": "empty"}]).match("https://vendor.test/products/x") is None
+
+    assert product_name("https://vendor.test/products/obis-lx-laser/", "OBIS LX") == "OBIS LX Laser"
+    assert product_name("https://vendor.test/light-engine/hive.html", "HIVE") == "HIVE"
+    print("✅ One compiled matcher over patterns and categories")
+
+
+def test_discover_from_robots():
+    results = SitemapDiscovery(open_url=open_fixture).discover("https://vendor.test/", SEGMENTS)
+    assert [p["name"] for p in results["diode"]] == ["OBIS LX Laser", "OBIS LS", "Sapphire Fp"]
+    assert [p["url"] for p in results["light_engines"]] == [
+        "https://vendor.test/products/light-engines/obis-galaxy",
+        "https://vendor.test/light-engine/hive",
+    ]
+    assert results["diode"][0]["lastmod"] == datetime(2025, 2, 10)
+
+    capped = SitemapDiscovery(open_url=open_fixture).discover(
+        "https://vendor.test/", SEGMENTS, sitemaps=["https://vendor.test/sitemap-products.xml.gz"],
+        max_products=1)
+    assert [len(p) for p in capped.values()] == [1, 1]
+
+    # No robots.txt: fall back to /sitemap.xml
+    assert SitemapDiscovery(open_url=open_fixture).sitemap_urls("https://other.test/") == \
+        ["https://other.test/sitemap.xml"]
+    print("✅ Products discovered from robots.txt sitemaps")
+
+
+class FakeScraper(UnifiedBaseScraper):
+    def __init__(self, force_refresh=False):
+        self.force_refresh = force_refresh
+
+    def vendor(self):
+        return "Fake"
+
+
+def test_lastmod_skips_unchanged_pages():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'sitemap.sqlite'}", future=True)
+        Base.metadata.create_all(engine)
+        with Session(engine) as s:
+            m = Manufacturer(name="Fake")
+            s.add(m)
+            s.flush()
+            p = Product(manufacturer_id=m.id, segment_id="diode", name="OBIS LS")
+            s.add(p)
+            s.flush()
+            url = "https://vendor.test/products/lasers/obis-ls"
+            s.add(RawDocument(product_id=p.id, url=url, text="", content_hash="a",
+                              fetched_at=datetime(2025, 2, 15)))
+            s.flush()
+
+            scraper = FakeScraper()
+            assert scraper.unchanged_since_fetch(s, {"url": url, "lastmod": datetime(2025, 2, 1)})
+            assert not scraper.unchanged_since_fetch(s, {"url": url, "lastmod": datetime(2025, 2, 20)})
+            assert not scraper.unchanged_since_fetch(s, {"url": url})
+            assert not scraper.unchanged_since_fetch(s, {"url": url + "-new", "lastmod": datetime(2025, 1, 1)})
+            assert not FakeScraper(force_refresh=True).unchanged_since_fetch(
+                s, {"url": url, "lastmod": datetime(2025, 2, 1)})
+    print("✅ Pages unchanged since their last fetch are skipped")
+
+
+if __name__ == "__main__":
+    test_streams_gzip_and_index()
+    test_matcher()
+    test_discover_from_robots()
+    test_lastmod_skips_unchanged_pages()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""Test the indexed in-memory spec catalog (range and nearest queries)"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import random
+import time
+from src.laser_ci_lg.catalog import SpecCatalog
+
+
+def record(vendor, model, wl, power, noise=None, stability=None):
+    return {
+        "product_id": hash((vendor, model)) % 1000, "vendor": vendor, "segment_id": "diode",
+        "product_name": model.split()[0], "model": model, "wavelength_nm": wl,
+        "output_power_mw_nominal": power, "rms_noise_pct": noise, "power_stability_pct": stability,
+    }
+
+
+CATALOG = SpecCatalog([
+    record("Coherent", "OBIS 488", 488.0, 100.0, 0.15, 2.0),
+    record("Coherent", "OBIS 488 LX", 488.0, 150.0, 0.25),
+    record("Oxxius", "LBX-488", 487.0, 50.0, 0.1),
+    record("Omicron", "LuxX 488", 493.0, 200.0, 0.2),
+    record("Omicron", "LuxX 405", 405.0, 120.0, None),
+    record("Hübner", "Cobolt 06-MLD 488", None, 80.0, 0.1),
+])
+
+
+def models(rows):
+    return sorted(r["model"] for r in rows)
+
+
+def test_range_queries():
+    rows = CATALOG.query(
+        wavelength_nm=(483, 493), output_power_mw_nominal=(50, 150), rms_noise_pct=(None, 0.2)
+    )
+    assert models(rows) == ["LBX-488", "OBIS 488"]
+
+    # Bounds are inclusive; open sides; unknown values never match a range
+    assert models(CATALOG.query(wavelength_nm=(493, None))) == ["LuxX 488"]
+    assert len(CATALOG.query(rms_noise_pct=(None, None))) == 5
+    assert models(CATALOG.query(vendor="Omicron", output_power_mw_nominal=(100, None))) == [
+        "LuxX 405", "LuxX 488"
+    ]
+    assert len(CATALOG.query(exclude_vendor="Coherent")) == 4
+    assert CATALOG.query(wavelength_nm=(600, 700)) == []
+
+    try:
+        CATALOG.query(colour=(1, 2))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for an unknown field")
+
+
+def test_nearest():
+    rows = CATALOG.nearest(k=3, wavelength_nm=488, output_power_mw_nominal=100)
+    assert [r["model"] for r in rows] == ["OBIS 488", "OBIS 488 LX", "LBX-488"]
+    assert rows[0]["distance"] == 0.0
+
+    # Rows without the target fields are never returned; filters apply first
+    rows = CATALOG.nearest(k=10, wavelength_nm=488, filters={"exclude_vendor": "Coherent"})
+    assert [r["model"] for r in rows] == ["LBX-488", "LuxX 488", "LuxX 405"]
+
+
+def test_query_speed():
+    rng = random.Random(0)
+    big = SpecCatalog([
+        record(f"V{i % 20}", f"M{i}", rng.choice([405, 445, 488, 520, 561, 640]) + rng.uniform(-3, 3),
+               rng.uniform(5, 500), rng.uniform(0.05, 0.5), rng.uniform(0.5, 3))
+        for i in range(5000)
+    ])
+    start = time.perf_counter()
+    for _ in range(100):
+        big.select(wavelength_nm=(483, 493), output_power_mw_nominal=(50, 150), rms_noise_pct=(None, 0.2))
+    per_query = (time.perf_counter() - start) / 100
+    assert per_query < 0.001, f"range query took {per_query * 1000:.2f} ms"
+
+
+if __name__ == "__main__":
+    test_range_queries()
+    test_nearest()
+    test_query_speed()
+    print("✅ Spec catalog tests passed")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""Test the spec change log written at normalization time and read by monthly_report"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import tempfile
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from src.laser_ci_lg import reporter
+from src.laser_ci_lg.changes import record_spec_changes, backfill_spec_changes
+from src.laser_ci_lg.models import Base, Manufacturer, Product, NormalizedSpec, SpecChange
+
+
+def make_session(tmp):
+    engine = create_engine(f"sqlite:///{Path(tmp) / 'changes.sqlite'}", future=True)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False, future=True)
+    s = Session()
+    m = Manufacturer(name="Coherent")
+    s.add(m)
+    s.flush()
+    p = Product(manufacturer_id=m.id, segment_id="diode", name="OBIS")
+    s.add(p)
+    s.flush()
+    return Session, s, p
+
+
+def snapshot(p, ts, model, **specs):
+    return NormalizedSpec(product_id=p.id, snapshot_ts=ts, vendor_fields={"model": model}, **specs)
+
+
+def test_changes_recorded_per_model():
+    with tempfile.TemporaryDirectory() as tmp:
+        Session, s, p = make_session(tmp)
+        old = datetime.utcnow() - timedelta(days=60)
+        first = [
+            snapshot(p, old, "OBIS 405", output_power_mw_nominal=100.0, rms_noise_pct=0.2),
+            snapshot(p, old, "OBIS 488", output_power_mw_nominal=50.0),
+        ]
+        s.add_all(first)
+        assert record_spec_changes(s, first) == 0
+
+        now = datetime.utcnow()
+        second = [
+            snapshot(p, now, "OBIS 405", output_power_mw_nominal=120.0, rms_noise_pct=0.2, m2=1.1),
+            snapshot(p, now, "OBIS 488", output_power_mw_nominal=50.0),
+        ]
+        s.add_all(second)
+        assert record_spec_changes(s, second) == 2
+        s.commit()
+
+        changes = {c.field: c for c in s.execute(select(SpecChange)).scalars()}
+        assert set(changes) == {"output_power_mw_nominal", "m2"}
+        power = changes["output_power_mw_nominal"]
+        assert (power.model, power.old_value, power.new_value) == ("OBIS 405", 100.0, 120.0)
+        assert abs(power.rel_change - 0.2) < 1e-9
+        assert power.prev_spec_id == first[0].id and power.spec_id == second[0].id
+        assert changes["m2"].old_value is None and changes["m2"].rel_change is None
+
+        # Backfill from history produces the same log
+        assert backfill_spec_changes(s) == 2
+        s.commit()
+        s.close()
+
+
+def test_monthly_report_reads_window_deltas():
+    with tempfile.TemporaryDirectory() as tmp:
+        Session, s, p = make_session(tmp)
+        now = datetime.utcnow()
+        history = [
+            (now - timedelta(days=90), 100.0, 0.2),
+            (now - timedelta(days=20), 105.0, 0.1),   # +5 % power, -50 % noise
+            (now - timedelta(days=5), 115.0, 0.1),    # power is +15 % over the window
+        ]
+        for ts, power, noise in history:
+            ns = snapshot(p, ts, "OBIS 405", output_power_mw_nominal=power, rms_noise_pct=noise)
+            s.add(ns)
+            record_spec_changes(s, [ns])
+        s.commit()
+        s.close()
+
+        original = reporter.SessionLocal
+        reporter.SessionLocal = Session
+        try:
+            report = reporter.monthly_report(days=35)
+        finally:
+            reporter.SessionLocal = original
+
+        assert "- **OBIS 405** (diode) — Power 100.0→115.0 mW; RMS noise 0.2→0.1 %" in report
+
+
+if __name__ == "__main__":
+    test_changes_recorded_per_model()
+    test_monthly_report_reads_window_deltas()
+    print("✅ Spec change log tests passed")
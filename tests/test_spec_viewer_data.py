@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""Test incremental, sharded data generation for the spec viewer"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "spec_viewer"))
+
+import json
+import base64
+import tempfile
+from array import array
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from src.laser_ci_lg.models import Base, Manufacturer, Product, RawDocument, NormalizedSpec
+from generate_data import generate_shards, encode_columns, MANIFEST_FILE
+
+
+def build_db(path):
+    engine = create_engine(f"sqlite:///{path}", future=True)
+    Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        for vendor, model, wl in (("Coherent", "OBIS", 488.0), ("Hübner Photonics", "Cobolt 06", 532.0)):
+            m = Manufacturer(name=vendor)
+            s.add(m)
+            s.flush()
+            p = Product(manufacturer_id=m.id, segment_id="diode", name=model)
+            s.add(p)
+            s.flush()
+            s.add(NormalizedSpec(product_id=p.id, wavelength_nm=wl, ttl_shutter=True,
+                                 interfaces=["USB"]))
+            s.add(RawDocument(product_id=p.id, url="https://example.com", text="",
+                              content_hash="a", fetched_at=datetime(2025, 8, 1),
+                              raw_specs={"Wavelength": f"{wl:.0f} nm"}))
+        s.commit()
+    return engine
+
+
+def read_manifest(out_dir):
+    text = (out_dir / MANIFEST_FILE).read_text(encoding="utf-8")
+    return json.loads(text.split("=", 1)[1].strip().rstrip(";"))
+
+
+def read_shard(out_dir, filename):
+    text = (out_dir / filename).read_text(encoding="utf-8")
+    return json.loads(text.split("register(", 1)[1].rsplit(");", 1)[0])
+
+
+def test_shards_and_incremental_updates():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, out_dir = Path(tmp) / "ci.sqlite", Path(tmp) / "data"
+        engine = build_db(db_path)
+
+        summary = generate_shards(db_path, out_dir)
+        assert sorted(summary["written"]) == ["Coherent", "Hübner Photonics"]
+
+        manifest = read_manifest(out_dir)
+        assert manifest["lastUpdated"] == "2025-08-01"
+        assert [(e["vendor"], e["count"]) for e in manifest["shards"]] == [
+            ("Coherent", 1), ("Hübner Photonics", 1)
+        ]
+        shard = read_shard(out_dir, manifest["shards"][0]["file"])
+        product = shard["products"][0]
+        assert product["name"] == "OBIS" and product["specs"]["wavelength_nm"] == 488.0
+        assert product["specs"]["ttl_shutter"] is True
+        assert product["specs"]["interfaces"] == ["USB"]
+        assert product["raw_specs"] == {"Wavelength": "488 nm"}
+
+        # Nothing changed: nothing rewritten
+        summary = generate_shards(db_path, out_dir)
+        assert summary["written"] == [] and len(summary["unchanged"]) == 2
+
+        # A new snapshot for one vendor rewrites only that vendor's shard
+        old_file = manifest["shards"][1]["file"]
+        with Session(engine) as s:
+            cobolt = s.query(Product).filter_by(name="Cobolt 06").one()
+            s.add(NormalizedSpec(product_id=cobolt.id, wavelength_nm=561.0))
+            s.commit()
+        summary = generate_shards(db_path, out_dir)
+        assert summary["written"] == ["Hübner Photonics"]
+        assert summary["removed"] == [old_file]
+        assert not (out_dir / old_file).exists()
+        assert read_manifest(out_dir)["shards"][1]["count"] == 2
+
+        # Raw documents updated in place (new content hash) are detected too
+        with Session(engine) as s:
+            doc = s.query(RawDocument).join(Product).filter(Product.name == "OBIS").one()
+            doc.content_hash = "b"
+            doc.raw_specs = {"Wavelength": "488 nm", "Power": "100 mW"}
+            s.commit()
+        assert generate_shards(db_path, out_dir)["written"] == ["Coherent"]
+
+
+def test_typed_column_encodings():
+    products = [
+        {"specs": {"wavelength_nm": 640.0, "output_power_mw_nominal": 100}},
+        {"specs": {"wavelength_nm": None, "output_power_mw_nominal": True}},
+        {"specs": {"wavelength_nm": 405.0, "output_power_mw_nominal": 20.5}},
+        {"specs": {"wavelength_nm": 405.0}},
+    ]
+    columns, order = encode_columns(products)
+
+    def decode(typecode, b64):
+        values = array(typecode)
+        values.frombytes(base64.b64decode(b64))
+        return values.tolist()
+
+    wavelengths = decode("d", columns["wavelength_nm"])
+    assert wavelengths[0] == 640.0 and wavelengths[1] != wavelengths[1]  # NaN when unknown
+    # Sort orders skip unknown values and keep ties in row order
+    assert decode("I", order["wavelength_nm"]) == [2, 3, 0]
+    assert decode("I", order["output_power_mw_nominal"]) == [2, 0]
+
+
+if __name__ == "__main__":
+    test_shards_and_incremental_updates()
+    test_typed_column_encodings()
+    print("✅ Spec viewer data generation tests passed")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""Test bounded-memory normalization: documents streamed and committed per product batch"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import tempfile
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, event, func, inspect, select
+from sqlalchemy.orm import sessionmaker
+from src.laser_ci_lg import normalize, normalize_batch
+from src.laser_ci_lg.models import Base, Manufacturer, Product, RawDocument, NormalizedSpec
+
+BIG_TEXT = "Datasheet page\n" * 50000
+
+
+def make_db(tmp, products=7):
+    engine = create_engine(f"sqlite:///{Path(tmp) / 'normalize.sqlite'}", future=True)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False, future=True)
+    with Session() as s:
+        m = Manufacturer(name="Omicron")
+        s.add(m)
+        s.flush()
+        old = datetime(2025, 1, 1)
+        for i in range(products):
+            p = Product(manufacturer_id=m.id, segment_id="diode", name=f"LuxX {i}")
+            s.add(p)
+            s.flush()
+            s.add_all([
+                RawDocument(product_id=p.id, url=f"https://omicron.test/{i}", text=BIG_TEXT,
+                            content_hash=f"a{i}", fetched_at=old,
+                            raw_specs={f"Wavelength_LuxX {400 + i}": f"{400 + i} nm"}),
+                RawDocument(product_id=p.id, url=f"https://omicron.test/{i}.pdf", text=BIG_TEXT,
+                            content_hash=f"b{i}", fetched_at=old + timedelta(days=1),
+                            raw_specs={f"Output Power_LuxX {400 + i}": "100 mW"}),
+            ])
+        # A product whose documents only have text
+        p = Product(manufacturer_id=m.id, segment_id="diode", name="BrixX")
+        s.add(p)
+        s.flush()
+        s.add(RawDocument(product_id=p.id, url="https://omicron.test/brixx", content_hash="c",
+                          text="Wavelength: 488 nm\nOutput power: 50 mW", raw_specs=None))
+        s.commit()
+    return engine, Session
+
+
+def test_batches_stream_without_text():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, Session = make_db(tmp)
+        with Session() as s:
+            batches = []
+            for work in normalize.iter_product_batches(s, batch_size=3):
+                batches.append([pid for pid, _, _, _ in work])
+                # Only this batch's rows are held, and not their text
+                assert len(s.identity_map) <= 3 * 3
+                for _, _, docs, _ in work:
+                    assert all("text" in inspect(d).unloaded for d in docs)
+                s.expunge_all()
+            assert [len(b) for b in batches] == [3, 3, 2]
+
+            s.expunge_all()
+            work = [w for batch in normalize.iter_product_batches(s, batch_size=3) for w in batch]
+            models = {s.get(Product, pid).name: m for pid, _, _, m in work}
+            # Newest document first, as before
+            assert [d.url for d in work[0][2]] == ["https://omicron.test/0.pdf", "https://omicron.test/0"]
+            assert models["LuxX 2"] == {"LuxX 402": {"Wavelength": "402 nm", "Output Power": "100 mW"}}
+            assert models["BrixX"] == {"BrixX": {"Wavelength": "488 nm", "Output power": "50 mW"}}
+
+            only = list(normalize.iter_product_batches(s, product_ids=[work[1][0]]))
+            assert [[pid for pid, _, _, _ in b] for b in only] == [[work[1][0]]]
+    print("✅ Documents streamed per product batch, text loaded only when needed")
+
+
+def test_normalize_commits_per_batch():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, Session = make_db(tmp)
+        commits = []
+        event.listen(engine, "commit", lambda conn: commits.append(1))
+
+        originals = normalize.SessionLocal, normalize_batch.SessionLocal, normalize.NORMALIZE_BATCH_PRODUCTS
+        normalize.SessionLocal = normalize_batch.SessionLocal = Session
+        normalize.NORMALIZE_BATCH_PRODUCTS = 3
+        try:
+            assert normalize.normalize_all(use_llm=False) == 8
+            assert len(commits) == 3
+            assert normalize_batch.normalize_all_batch(use_llm=False) == 8
+        finally:
+            normalize.SessionLocal, normalize_batch.SessionLocal, normalize.NORMALIZE_BATCH_PRODUCTS = originals
+
+        with Session() as s:
+            assert s.scalar(select(func.count(NormalizedSpec.id))) == 16
+            spec = s.execute(select(NormalizedSpec).where(
+                NormalizedSpec.vendor_fields["model"].as_string() == "LuxX 403")).scalars().first()
+            assert spec.wavelength_nm == 403 and spec.output_power_mw_nominal == 100
+    print("✅ Normalization commits once per product batch")
+
+
+if __name__ == "__main__":
+    test_batches_stream_without_text()
+    test_normalize_commits_per_batch()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""Test that batch unit parsing matches the previous one-value-at-a-time parser"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.unit_parsing import compare, build_columns, RAW_VALUES
+from src.laser_ci_lg.specs import (
+    parse_value_to_unit,
+    parse_values_to_unit,
+    map_models_to_canonical,
+)
+
+
+def test_same_output_as_scalar_parser():
+    columns = {key: list(raw) for key, raw in RAW_VALUES.items()}
+    for key, values in build_columns(50).items():
+        columns[key] += values
+    timings = compare(columns)
+    assert set(timings) == {"legacy", "batch"}
+
+
+def test_new_units_and_bad_values():
+    assert parse_values_to_unit("output_power_mw_nominal", ["2 kW", "1.5 W", "..mW"]) == [
+        2000000.0, 1500.0, None
+    ]
+    assert parse_value_to_unit("wavelength_nm", " 488 nm ") == 488.0
+    assert parse_values_to_unit("wavelength_nm", []) == []
+
+    # Repeated list values are independent copies
+    first, second = parse_values_to_unit("interfaces", ["USB, RS-232", "USB, RS-232"])
+    assert first == second and first is not second
+
+
+def test_map_models_to_canonical():
+    models = {
+        "OBIS 405": {"Wavelength": "405 nm", "Weight": "1 kg", "Output Power": "100 mW"},
+        "OBIS 488": {"Output Power": "0.2 W", "output power": "n/a", "Wavelength": "488 nm"},
+    }
+    mapped = map_models_to_canonical(models)
+
+    canonical, extras = mapped["OBIS 405"]
+    assert canonical["wavelength_nm"] == 405.0
+    assert canonical["output_power_mw_nominal"] == 100.0
+    assert extras == {"Weight": "1 kg"}
+
+    # Later specs overwrite earlier ones only when they parse
+    canonical, extras = mapped["OBIS 488"]
+    assert canonical["output_power_mw_nominal"] == 200.0
+    assert canonical["wavelength_nm"] == 488.0
+    assert extras == {}
+
+
+if __name__ == "__main__":
+    test_same_output_as_scalar_parser()
+    test_new_units_and_bad_values()
+    test_map_models_to_canonical()
+    print("✅ Batch unit parsing matches the scalar parser")
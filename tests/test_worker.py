@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""Test the warm worker daemon's job protocol"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.laser_ci_lg.worker import Worker, WorkerServer, submit_job
+from src.laser_ci_lg.extraction import shared_pdf_extractor
+
+
+def start_server(worker):
+    server = WorkerServer(worker, "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, server.server_address[1]
+
+
+def test_jobs_over_socket():
+    worker = Worker()
+    threads = []
+    worker.handlers["record"] = lambda value: threads.append(threading.get_ident()) or value * 2
+    server, port = start_server(worker)
+    try:
+        assert submit_job("ping", port=port)["result"]["jobs_done"] == 0
+
+        # Concurrent clients; jobs still run one at a time on the job thread
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            responses = list(pool.map(lambda v: submit_job("record", port=port, value=v), range(8)))
+        assert [r["result"] for r in responses] == [v * 2 for v in range(8)]
+        assert len(set(threads)) == 1 and threads[0] != threading.get_ident()
+
+        error = submit_job("nope", port=port)
+        assert not error["ok"] and "unknown job" in error["error"]
+        error = submit_job("extract_pdf", port=port)
+        assert not error["ok"] and "needs 'path' or 'url'" in error["error"]
+
+        assert submit_job("shutdown", port=port)["ok"]
+    finally:
+        server.server_close()
+        worker.close()
+
+
+def test_scrapers_share_one_extractor():
+    assert shared_pdf_extractor() is shared_pdf_extractor()
+
+
+if __name__ == "__main__":
+    test_jobs_over_socket()
+    test_scrapers_share_one_extractor()
+    print("✅ Worker tests passed")